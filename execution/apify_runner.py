@@ -0,0 +1,155 @@
+"""
+Apify Runner — start actor runs without blocking a thread for the whole run.
+
+actor(...).call() parks its thread until the run finishes (up to 120s for the
+LinkedIn actors), which is why every in-flight run needed its own worker thread
+and every dataset read came back as one materialized list. The runner starts the
+run, hands back a future and lets one poller thread track every run in flight:
+
+    start     actor(...).start() (fast) -> concurrent.futures.Future of the final run
+    poll      one thread sweeps all pending runs every APIFY_POLL_INTERVAL_SECS and
+              resolves a future when its run reaches a terminal status (the run dict
+              is returned whatever the status, as call() does)
+    deadline  runs not finished APIFY_POLL_GRACE_SECS after their own timeout_secs
+              fail with TimeoutError (Apify normally times them out first)
+    callbacks future callbacks run on a small pool, never on the poller thread
+    limiter   optional resilience.RateLimiter: every start() and poll request waits
+              for the account's request-rate headroom instead of drawing 429s
+
+Datasets are read page by page with iter_dataset_items(), so a caller that only
+wants the first item never downloads the rest.
+
+Usage:
+    runner = ApifyRunner(apify_client)
+    run = await runner.arun("apify/google-search-scraper", {"queries": q}, timeout_secs=60)
+    for item in iter_dataset_items(apify_client, run["defaultDatasetId"]):
+        ...
+    runner.close()
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+APIFY_POLL_INTERVAL_SECS = float(os.environ.get("APIFY_POLL_INTERVAL_SECS", "2"))
+APIFY_POLL_GRACE_SECS = float(os.environ.get("APIFY_POLL_GRACE_SECS", "30"))
+APIFY_DEFAULT_WAIT_SECS = 300  # Deadline for runs started without timeout_secs
+DATASET_PAGE_SIZE = int(os.environ.get("APIFY_DATASET_PAGE_SIZE", "100"))
+TERMINAL_STATUSES = frozenset({"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"})
+
+
+def iter_dataset_items(apify_client, dataset_id: str, page_size: int = None):
+    """Yields dataset items, fetching one page of `page_size` at a time."""
+    page_size = page_size or DATASET_PAGE_SIZE
+    offset = 0
+    while True:
+        items = apify_client.dataset(dataset_id).list_items(offset=offset, limit=page_size).items
+        yield from items
+        offset += len(items)
+        if len(items) < page_size:
+            return
+
+
+class ApifyRunner:
+    """Thread-safe. One poller thread per runner, started on the first run."""
+    def __init__(self, apify_client, poll_interval: float = None, callback_workers: int = 4, clock=time.monotonic,
+                 limiter=None):
+        self.apify_client = apify_client
+        self.limiter = limiter
+        self.poll_interval = APIFY_POLL_INTERVAL_SECS if poll_interval is None else poll_interval
+        self.clock = clock
+        self._pending = {}  # run id -> (future, deadline, actor)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._callbacks = ThreadPoolExecutor(max_workers=callback_workers, thread_name_prefix="apify-runner")
+        self.started = 0
+        self.polls = 0
+        self.peak_in_flight = 0
+
+    def start(self, actor: str, run_input: dict, timeout_secs: int = None, **options) -> Future:
+        """Starts the run (errors from start() raise here) and returns a future of the finished run."""
+        with self._cond:
+            if self._closed:  # Checked before the API call: a run started now would be paid for and never polled
+                raise RuntimeError("ApifyRunner is closed")
+        if self.limiter is not None:
+            self.limiter.acquire()
+        run = self.apify_client.actor(actor).start(run_input=run_input, timeout_secs=timeout_secs, **options)
+        future = Future()
+        deadline = self.clock() + (timeout_secs or APIFY_DEFAULT_WAIT_SECS) + APIFY_POLL_GRACE_SECS
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ApifyRunner is closed")
+            self._pending[run["id"]] = (future, deadline, actor)
+            self.started += 1
+            self.peak_in_flight = max(self.peak_in_flight, len(self._pending))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, name="apify-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    async def arun(self, actor: str, run_input: dict, timeout_secs: int = None, **options) -> dict:
+        return await asyncio.wrap_future(self.start(actor, run_input, timeout_secs, **options))
+
+    def call(self, actor: str, run_input: dict, timeout_secs: int = None, **options) -> dict:
+        """Blocking, like actor(...).call(); the wait is on the future, not on an HTTP long-poll."""
+        return self.start(actor, run_input, timeout_secs, **options).result()
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _resolve(self, run_id: str, run: dict = None, error: Exception = None) -> None:
+        with self._cond:
+            entry = self._pending.pop(run_id, None)
+        if entry is None:
+            return
+        future = entry[0]
+        if error is not None:
+            self._callbacks.submit(future.set_exception, error)
+        else:
+            self._callbacks.submit(future.set_result, run)
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                sweep = list(self._pending.items())
+
+            for run_id, (_, deadline, actor) in sweep:
+                try:
+                    if self.limiter is not None:
+                        self.limiter.acquire()
+                    run = self.apify_client.run(run_id).get()
+                except Exception as e:  # Transient: keep polling until the deadline
+                    run = None
+                    if self.limiter is not None:
+                        self.limiter.observe(e)
+                    print(f"      ⚠️ Apify poll failed for {actor} run {run_id}: {e}")
+                self.polls += 1
+                if run and run.get("status") in TERMINAL_STATUSES:
+                    self._resolve(run_id, run=run)
+                elif self.clock() > deadline:
+                    self._resolve(run_id, error=TimeoutError(f"{actor} run {run_id} still running past its deadline"))
+
+            with self._cond:
+                if self._pending and not self._closed:
+                    self._cond.wait(self.poll_interval)
+
+    def close(self) -> None:
+        """Stops polling; futures of runs still in flight fail (the runs themselves keep going on Apify)."""
+        with self._cond:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._cond.notify_all()
+        for future, _, actor in pending:
+            self._callbacks.submit(future.set_exception, RuntimeError(f"ApifyRunner closed with {actor} run in flight"))
+        self._callbacks.shutdown(wait=True)
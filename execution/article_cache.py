@@ -0,0 +1,169 @@
+"""
+Article Content Cache — shared, persistent store for extract_article_content.
+
+The same PRNewswire / BusinessWire URL is often fetched for several companies
+and again on the next day's scan. Every miss that falls through to the Apify
+crawler costs money, so extracted text is kept on disk, keyed on the normalized
+URL (url_canon.normalize_url: never the container's redirect memo, so every
+container finds it), and consulted before both newspaper4k and the Apify fallback.
+
+Layout (content-addressed, one file per URL so concurrent containers never
+contend on a single database file):
+    <ARTICLE_CACHE_DIR>/<sha256[:2]>/<sha256>.art
+
+Each file is one codec byte followed by the compressed JSON entry:
+    b"Z" zstd (when `zstandard` is installed)
+    b"L" zlib (always available)
+
+Entries:
+    positive  {"status": "ok", "text", "used_apify", ["published"], ...}  TTL: ARTICLE_CACHE_TTL_HOURS (168)
+    negative  {"status": "negative", "reason", ...}             TTL: ARTICLE_CACHE_NEGATIVE_TTL_HOURS (24)
+Negative entries record pages that came back thin or paywalled from every
+source, so we stop paying Apify to re-learn that.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+
+from url_canon import normalize_url
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib keeps the cache working without it
+    zstandard = None
+
+
+ARTICLE_CACHE_DIR = os.environ.get(
+    "ARTICLE_CACHE_DIR",
+    "/cache/articles" if os.path.isdir("/cache") else os.path.join(tempfile.gettempdir(), "pulsepoint_article_cache")
+)
+ARTICLE_CACHE_TTL_HOURS = float(os.environ.get("ARTICLE_CACHE_TTL_HOURS", "168"))
+ARTICLE_CACHE_NEGATIVE_TTL_HOURS = float(os.environ.get("ARTICLE_CACHE_NEGATIVE_TTL_HOURS", "24"))
+
+
+class ArticleCache:
+    """
+    Disk-backed article cache. Thread-safe: writes go to a temp file and are
+    atomically renamed into place, so readers never see a partial entry.
+    """
+    def __init__(self, root: str = None, ttl_hours: float = None, negative_ttl_hours: float = None):
+        self.root = root or ARTICLE_CACHE_DIR
+        self.ttl = (ttl_hours if ttl_hours is not None else ARTICLE_CACHE_TTL_HOURS) * 3600
+        self.negative_ttl = (negative_ttl_hours if negative_ttl_hours is not None else ARTICLE_CACHE_NEGATIVE_TTL_HOURS) * 3600
+        self.enabled = True
+        try:
+            os.makedirs(self.root, exist_ok=True)
+        except OSError as e:
+            print(f"      ⚠️ Article cache disabled ({self.root}): {e}")
+            self.enabled = False
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.art")
+
+    @staticmethod
+    def _encode(entry: dict) -> bytes:
+        raw = json.dumps(entry).encode()
+        if zstandard is not None:
+            return b"Z" + zstandard.ZstdCompressor(level=6).compress(raw)
+        return b"L" + zlib.compress(raw, 6)
+
+    @staticmethod
+    def _decode(blob: bytes) -> dict:
+        codec, body = blob[:1], blob[1:]
+        if codec == b"Z":
+            if zstandard is None:
+                return None  # Written by a zstd-enabled worker; treat as a miss here
+            return json.loads(zstandard.ZstdDecompressor().decompress(body))
+        if codec == b"L":
+            return json.loads(zlib.decompress(body))
+        return None
+
+    def get(self, url: str) -> dict:
+        """Fresh entry for `url` ({"status": "ok"|"negative", ...}) or None."""
+        if not self.enabled:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                entry = self._decode(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"      ⚠️ Article cache read failed: {e}")
+            return None
+        if not entry:
+            return None
+        ttl = self.negative_ttl if entry.get("status") == "negative" else self.ttl
+        if time.time() - entry.get("stored_at", 0) > ttl:
+            return None
+        return entry
+
+    def _put(self, url: str, entry: dict) -> None:
+        if not self.enabled:
+            return
+        entry["url"] = normalize_url(url)
+        entry["stored_at"] = time.time()
+        path = self._path(url)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(entry))
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"      ⚠️ Article cache write failed: {e}")
+
+    def put(self, url: str, text: str, used_apify: bool, published: dict = None) -> None:
+        entry = {"status": "ok", "text": text, "used_apify": used_apify}
+        if published:
+            entry["published"] = published  # DateMatch.to_record() from the page's HTML metadata
+        self._put(url, entry)
+
+    def put_negative(self, url: str, reason: str) -> None:
+        self._put(url, {"status": "negative", "reason": reason})
+
+
+class CommitThrottle:
+    """
+    Runs `commit` (the cache volume's commit) at most once per `interval` seconds,
+    so a container scanning many companies doesn't commit after every scan.
+    Thread-safe; force=True always commits (container exit). A failed commit is
+    logged, not raised: the entries are still on the local disk.
+    """
+    def __init__(self, commit, interval: float, clock=time.monotonic):
+        self._commit = commit
+        self.interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last = clock()
+        self.commits = 0
+
+    def maybe_commit(self, force: bool = False) -> bool:
+        with self._lock:
+            if not force and self._clock() - self._last < self.interval:
+                return False
+            self._last = self._clock()
+            self.commits += 1
+        try:
+            self._commit()
+        except Exception as e:
+            print(f"   ⚠️ Article cache commit failed: {e}")
+        return True
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_article_cache() -> ArticleCache:
+    """Process-wide cache instance (one per container)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArticleCache()
+        return _cache
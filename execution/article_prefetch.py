@@ -0,0 +1,144 @@
+"""
+Article Prefetch — speculative free-tier article fetches overlapped with triage.
+
+The analysis loop used to download an article only after triage had judged it,
+and the next item waited for both the download and the deep analysis. The
+prefetcher starts the free tier (article cache + newspaper4k) for the top-ranked
+validated candidates while the triage call is in flight, then:
+
+    keep(shortlist)  drops what triage rejected (queued fetches are cancelled; ones
+                     already downloading finish into the article cache and are
+                     discarded here) and queues the rest of the shortlist
+    take(url)        waits for that article, in rank order, while the later ones
+                     keep downloading behind the deep analysis
+
+Only the free tier runs speculatively: the paid Apify fallback is left to the
+analysis loop, for shortlisted items it actually reaches. Every fetch that
+started counts against max_pages (MAX_FETCHED_PAGES_TOTAL), used or not.
+
+    ArticlePrefetcher       own bounded thread pool (threaded scans)
+    AsyncArticlePrefetcher  ScanEngine "fetch" slots (asyncio scans)
+
+fetch(url) returns whatever extract_article_content accepts as `prefetched`.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "4"))
+FAILED_FETCH = ("", False)  # Free tier raised: let the paid fallback decide
+
+
+class _Prefetcher:
+    """Bookkeeping shared by both flavours: page cap, pending handles, counters."""
+    def __init__(self, fetch, max_pages: int):
+        self.fetch = fetch
+        self.max_pages = max_pages
+        self.started = 0     # Fetches submitted and not cancelled before they ran
+        self.used = 0        # Taken by the analysis loop
+        self.discarded = 0   # Ran (or were running) for items triage rejected
+        self._pending = {}   # url -> handle
+
+    def _submit(self, url: str):
+        raise NotImplementedError
+
+    def _cancel(self, handle) -> bool:
+        """Cancel a pending fetch; True when it never started (its page is given back)."""
+        raise NotImplementedError
+
+    @property
+    def pages(self) -> int:
+        return self.started
+
+    def start(self, urls) -> None:
+        for url in urls:
+            if not url or url in self._pending:
+                continue
+            if self.started >= self.max_pages:
+                break
+            self._pending[url] = self._submit(url)
+            self.started += 1
+
+    def keep(self, urls) -> None:
+        """Discard every pending fetch not in urls, then start the rest of urls."""
+        urls = list(urls)
+        wanted = set(urls)
+        for url in [u for u in self._pending if u not in wanted]:
+            if self._cancel(self._pending.pop(url)):
+                self.started -= 1
+            else:
+                self.discarded += 1
+        self.start(urls)
+
+    def counters(self) -> dict:
+        """monitor_scan_log columns (migration 19)."""
+        return {"prefetch_started": self.started, "prefetch_used": self.used, "prefetch_discarded": self.discarded}
+
+
+class ArticlePrefetcher(_Prefetcher):
+    def __init__(self, fetch, max_pages: int, max_workers: int = None):
+        super().__init__(fetch, max_pages)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+    def _submit(self, url: str):
+        return self._executor.submit(contextvars.copy_context().run, self.fetch, url)
+
+    def _cancel(self, future) -> bool:
+        return future.cancel()
+
+    def take(self, url: str):
+        """The prefetched article, or None when it was never started (page cap reached)."""
+        future = self._pending.pop(url, None)
+        if future is None:
+            return None
+        self.used += 1
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"      ⚠️ Prefetch failed for {url[:60]}: {e}")
+            return FAILED_FETCH
+
+    def close(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False)
+
+
+class AsyncArticlePrefetcher(_Prefetcher):
+    def __init__(self, engine, fetch, max_pages: int):
+        super().__init__(fetch, max_pages)
+        self.engine = engine
+
+    def _submit(self, url: str):
+        running = threading.Event()
+
+        def _run():
+            running.set()
+            return self.fetch(url)
+
+        return asyncio.ensure_future(self.engine.run("fetch", _run)), running
+
+    def _cancel(self, handle) -> bool:
+        task, running = handle
+        task.cancel()
+        return not running.is_set()
+
+    async def take(self, url: str):
+        handle = self._pending.pop(url, None)
+        if handle is None:
+            return None
+        self.used += 1
+        try:
+            return await handle[0]
+        except Exception as e:
+            print(f"      ⚠️ Prefetch failed for {url[:60]}: {e}")
+            return FAILED_FETCH
+
+    def close(self) -> None:
+        for task, _ in self._pending.values():
+            task.cancel()
+        self._pending.clear()
@@ -0,0 +1,255 @@
+"""
+Date Extraction Engine — publication dates without an LLM, built once.
+
+Every shortlisted article (and every search/scout snippet) is dated before it
+can reach an OpenAI call, so stale news is rejected for free. The original
+extract_date_from_text rebuilt its month table and ran three uncompiled
+finditer passes per call. DateExtractor compiles everything once:
+
+    HTML metadata                 article:published_time / datePublished /
+                                  <time datetime="...">   (when HTML is available)
+    body text                     one combined regex pass over the window:
+                                  "January 15, 2026", "15 Jan 2026", "2026-01-15",
+                                  US numeric "01/15/2026", relative "3 days ago",
+                                  "yesterday"
+
+Each result carries a confidence (0-1) so callers can choose how much to trust
+it: metadata beats a dateline, a dateline beats a bare numeric date, and a date
+equal to today (usually the site's nav bar) or a relative phrase inside an
+article body is only used when nothing else is found, at half confidence.
+
+Dates learned from HTML at fetch time are memoized per canonical URL
+(remember_published_date) so the pre-check can use them after the HTML is gone.
+See test_date_extractor.py for the fixture corpus.
+"""
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from url_canon import normalize_url
+
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Confidence per source (0-1)
+CONFIDENCE = {
+    'meta': 0.95,          # article:published_time, datePublished, pubdate
+    'time_tag': 0.85,      # <time datetime="...">
+    'relative': 0.8,       # "3 days ago", "yesterday"
+    'month_name': 0.75,    # "January 15, 2026" / "15 January 2026"
+    'iso': 0.7,            # "2026-01-15"
+    'numeric': 0.55,       # "01/15/2026" (US order unless the first field is > 12)
+}
+TODAY_PENALTY = 0.5        # Multiplier for a date equal to today (likely the nav bar)
+BODY_RELATIVE_PENALTY = 0.5  # Multiplier for "N days ago" inside an article body
+
+HEADER_SKIP_CHARS = 200    # Many sites print the current date in the header
+MAX_PUBLISHED_MEMO = 20000
+
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)")
+
+_TEXT_RE = re.compile(
+    r"\b(?P<mdy_mon>" + _MONTH + r")\.?\s+(?P<mdy_day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<mdy_year>\d{4})\b"
+    r"|\b(?P<dmy_day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<dmy_mon>" + _MONTH + r")\.?,?\s+(?P<dmy_year>\d{4})\b"
+    r"|\b(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})(?!\d)"
+    r"|\b(?P<num_a>\d{1,2})/(?P<num_b>\d{1,2})/(?P<num_year>\d{4})\b"
+    r"|\b(?P<rel_n>\d{1,3}|an?|one)\s+(?P<rel_unit>minute|min|hour|hr|day|week|month|year)s?\s+ago\b"
+    r"|\b(?P<yesterday>yesterday)\b",
+    re.IGNORECASE,
+)
+
+_META_RE = re.compile(
+    r"<meta\b[^>]*?(?:property|name|itemprop)\s*=\s*[\"'](?:article:published_time|og:published_time"
+    r"|datePublished|pubdate|publishdate|date|dc\.date)[\"'][^>]*>",
+    re.IGNORECASE,
+)
+_META_CONTENT_RE = re.compile(r"content\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+_JSONLD_RE = re.compile(r"[\"']datePublished[\"']\s*:\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+_TIME_TAG_RE = re.compile(r"<time\b[^>]*?datetime\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+_ISO_PREFIX_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+_RELATIVE_UNITS = {
+    'minute': timedelta(minutes=1), 'min': timedelta(minutes=1),
+    'hour': timedelta(hours=1), 'hr': timedelta(hours=1),
+    'day': timedelta(days=1), 'week': timedelta(weeks=1),
+    'month': timedelta(days=30), 'year': timedelta(days=365),
+}
+
+_published_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+class DateMatch(NamedTuple):
+    date: datetime
+    date_str: str       # YYYY-MM-DD
+    confidence: float   # 0-1, see CONFIDENCE
+    source: str         # key of CONFIDENCE
+
+    def to_record(self) -> dict:
+        return {"date": self.date_str, "confidence": self.confidence, "source": self.source}
+
+    @classmethod
+    def from_record(cls, record: dict) -> Optional["DateMatch"]:
+        try:
+            d = datetime.strptime(record["date"], "%Y-%m-%d")
+            return cls(d, record["date"], float(record["confidence"]), record["source"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def _make(year: int, month: int, day: int, source: str, now: datetime) -> Optional[DateMatch]:
+    if not (1990 <= year <= now.year + 1):
+        return None
+    try:
+        d = datetime(year, month, day)
+    except ValueError:
+        return None
+    confidence = CONFIDENCE[source]
+    if d.date() == now.date() and source not in ('meta', 'time_tag', 'relative'):
+        confidence *= TODAY_PENALTY
+    return DateMatch(d, d.strftime("%Y-%m-%d"), confidence, source)
+
+
+class DateExtractor:
+    """
+    Precompiled publication-date extractor. Stateless and thread-safe; one
+    instance per process (see get_date_extractor) is enough.
+
+    extract(text, html=None) -> DateMatch or None
+    extract_many(texts, htmls=None) -> list of the same
+    extract_html(html) -> DateMatch or None (metadata only)
+    """
+    def __init__(self, now: datetime = None):
+        # Fixed reference time for tests/benchmarks; None means "now" at call time
+        self._now = now
+
+    def _reference(self) -> datetime:
+        return self._now or datetime.now()
+
+    def extract_html(self, html: str, now: datetime = None) -> Optional[DateMatch]:
+        if not html:
+            return None
+        now = now or self._reference()
+        head = html[:200_000]
+        for source, values in (
+            ('meta', (_META_CONTENT_RE.search(tag.group(0)) for tag in _META_RE.finditer(head))),
+            ('meta', _JSONLD_RE.finditer(head)),
+            ('time_tag', _TIME_TAG_RE.finditer(head)),
+        ):
+            for m in values:
+                if not m:
+                    continue
+                iso = _ISO_PREFIX_RE.match(m.group(1).strip())
+                if iso:
+                    found = _make(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)), source, now)
+                    if found:
+                        return found
+        return None
+
+    def extract(self, text: str, html: str = None, max_chars: int = 800,
+                snippet: bool = False, now: datetime = None) -> Optional[DateMatch]:
+        """
+        Best publication date for one document. HTML metadata wins when given;
+        otherwise the first max_chars of text are scanned.
+
+        Article bodies (snippet=False) keep the legacy header rule: the first 200
+        chars are skipped when the text is longer than 300. Relative phrases in a
+        body ("acquired 2 years ago") rarely date the article, so they only count
+        as a fallback at reduced confidence. Search/scout snippets (snippet=True)
+        are scanned from the start and trust "3 days ago".
+        """
+        now = now or self._reference()
+        if html:
+            found = self.extract_html(html, now)
+            if found:
+                return found
+        if not text:
+            return None
+        skip_chars = HEADER_SKIP_CHARS if not snippet and len(text) > 300 else 0
+        window = text[skip_chars:skip_chars + max_chars]
+
+        fallback = None
+        for m in _TEXT_RE.finditer(window):
+            found = self._from_match(m, now)
+            if not found:
+                continue
+            if found.source == 'relative' and not snippet:
+                found = found._replace(confidence=found.confidence * BODY_RELATIVE_PENALTY)
+            elif found.confidence >= CONFIDENCE[found.source]:
+                return found  # First full-confidence date in reading order
+            if fallback is None or found.confidence > fallback.confidence:
+                fallback = found  # Today's date / body-relative: keep looking for a real one
+        return fallback
+
+    def extract_many(self, texts, htmls=None, **kwargs) -> list:
+        now = kwargs.pop('now', None) or self._reference()
+        if htmls is None:
+            return [self.extract(t, now=now, **kwargs) for t in texts]
+        return [self.extract(t, html=h, now=now, **kwargs) for t, h in zip(texts, htmls)]
+
+    @staticmethod
+    def _from_match(m, now: datetime) -> Optional[DateMatch]:
+        g = m.groupdict()
+        if g['mdy_mon']:
+            return _make(int(g['mdy_year']), MONTHS[g['mdy_mon'][:3].lower()], int(g['mdy_day']), 'month_name', now)
+        if g['dmy_mon']:
+            return _make(int(g['dmy_year']), MONTHS[g['dmy_mon'][:3].lower()], int(g['dmy_day']), 'month_name', now)
+        if g['iso_year']:
+            return _make(int(g['iso_year']), int(g['iso_month']), int(g['iso_day']), 'iso', now)
+        if g['num_a']:
+            a, b = int(g['num_a']), int(g['num_b'])
+            month, day = (b, a) if a > 12 else (a, b)  # US order unless impossible
+            return _make(int(g['num_year']), month, day, 'numeric', now)
+        if g['rel_unit']:
+            n = g['rel_n'].lower()
+            count = 1 if n in ('a', 'an', 'one') else int(n)
+            d = now - count * _RELATIVE_UNITS[g['rel_unit'].lower()]
+            return DateMatch(d, d.strftime("%Y-%m-%d"), CONFIDENCE['relative'], 'relative')
+        if g['yesterday']:
+            d = now - timedelta(days=1)
+            return DateMatch(d, d.strftime("%Y-%m-%d"), CONFIDENCE['relative'], 'relative')
+        return None
+
+
+def is_stale(match: Optional[DateMatch], max_age_days: int, min_confidence: float = 0.0, now: datetime = None) -> bool:
+    """True when `match` is confidently older than max_age_days. Undated is never stale."""
+    if not match or match.confidence < min_confidence:
+        return False
+    return match.date < (now or datetime.now()) - timedelta(days=max_age_days)
+
+
+def remember_published_date(url: str, match: Optional[DateMatch]) -> None:
+    """Memoize a date learned from the page's HTML (lost once only text is kept)."""
+    key = normalize_url(url)
+    if not key or not match:
+        return
+    with _memo_lock:
+        _published_memo[key] = match
+        _published_memo.move_to_end(key)
+        while len(_published_memo) > MAX_PUBLISHED_MEMO:
+            _published_memo.popitem(last=False)
+
+
+def published_date_for(url: str) -> Optional[DateMatch]:
+    key = normalize_url(url)
+    with _memo_lock:
+        return _published_memo.get(key) if key else None
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_date_extractor() -> DateExtractor:
+    """Process-wide extractor instance."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = DateExtractor()
+        return _extractor
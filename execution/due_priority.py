@@ -0,0 +1,75 @@
+"""
+Due Priority — fill each client's daily scan limit by expected triggers per dollar.
+
+Oldest-first rotation gave a company that has not produced a signal in a year the
+same slot as one that triggered three times this month. Due companies are now
+ranked by
+
+    priority = trigger_rate x velocity x staleness / expected_cost
+
+    trigger_rate   (triggers + PRIOR_TRIGGERS) / (scans + PRIOR_SCANS) over the last
+                   HISTORY_DAYS of monitor_scan_log (new companies get the prior, ~9%)
+    velocity       account_signal_baselines.velocity_ratio, clamped to [0.5, 3]
+    staleness      days since the last scan / the frequency's due interval, capped at 3
+    expected_cost  fingerprint-skip rate x skip cost + (1 - rate) x full-scan cost
+                   (mean cost_usd per status from monitor_scan_log, migration 18)
+
+Starvation guarantee: never-scanned companies and companies not scanned for
+MAX_SCAN_INTERVAL_DAYS sort ahead of every scored one (oldest first), so a
+low-yield company still gets scanned within the interval as long as the client's
+limit covers its starved companies.
+
+The get_prioritized_due_companies RPC (migration 20) computes the same formula
+in Postgres; this module is the reference used by the Python fallback.
+"""
+import math
+import os
+from datetime import datetime
+
+
+PRIOR_TRIGGERS = 1.0
+PRIOR_SCANS = 10.0
+HISTORY_DAYS = int(os.environ.get("DUE_HISTORY_DAYS", "90"))
+MAX_SCAN_INTERVAL_DAYS = int(os.environ.get("MAX_SCAN_INTERVAL_DAYS", "21"))
+DEFAULT_FULL_SCAN_COST_USD = 0.05
+DEFAULT_SKIP_SCAN_COST_USD = 0.005
+FREQUENCY_DAYS = {"daily": 20 / 24, "biweekly": 3.0, "weekly": 6.0}  # Same thresholds as due selection
+
+
+def trigger_rate(scans: int, triggers: int) -> float:
+    return (triggers + PRIOR_TRIGGERS) / (scans + PRIOR_SCANS)
+
+
+def expected_cost(scans: int, skips: int, full_cost: float = None, skip_cost: float = None) -> float:
+    skip_rate = skips / scans if scans else 0.0
+    return max(0.001, skip_rate * (skip_cost or DEFAULT_SKIP_SCAN_COST_USD)
+               + (1 - skip_rate) * (full_cost or DEFAULT_FULL_SCAN_COST_USD))
+
+
+def staleness(days_since: float, frequency: str) -> float:
+    return min(days_since / FREQUENCY_DAYS.get(frequency, FREQUENCY_DAYS["weekly"]), 3.0)
+
+
+def priority(history: dict, velocity_ratio: float, days_since: float, frequency: str) -> float:
+    """history: {scans, triggers, skips, full_cost, skip_cost} (missing keys = no history)."""
+    history = history or {}
+    scans = history.get("scans", 0)
+    velocity = min(max(velocity_ratio or 1.0, 0.5), 3.0)
+    return (trigger_rate(scans, history.get("triggers", 0)) * velocity * staleness(days_since, frequency)
+            / expected_cost(scans, history.get("skips", 0), history.get("full_cost"), history.get("skip_cost")))
+
+
+def days_since(last_monitored_at: str, now: datetime) -> float:
+    """Days since the last scan; inf when never scanned."""
+    if not last_monitored_at:
+        return math.inf
+    last = datetime.fromisoformat(last_monitored_at.replace('Z', '+00:00'))
+    return (now - last).total_seconds() / 86400
+
+
+def priority_sort_key(comp: dict, now: datetime, history: dict = None, velocity_ratio: float = 1.0) -> tuple:
+    """Ascending sort key: starved companies first (oldest first), then highest priority."""
+    age = days_since(comp.get("last_monitored_at"), now)
+    if age >= MAX_SCAN_INTERVAL_DAYS:
+        return (0, -age, comp.get("id") or "")
+    return (1, -priority(history, velocity_ratio, age, comp.get("monitoring_frequency") or "weekly"), comp.get("id") or "")
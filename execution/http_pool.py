@@ -0,0 +1,197 @@
+"""
+Pooled HTTP Transport — one keep-alive connection pool per container.
+
+Blog discovery probes up to 14 paths on the same host with bare requests.head /
+requests.get, newspaper4k opens its own connection per Article.download(), and
+EnrichmentClient kept a third session: every probe paid a fresh DNS lookup,
+TCP and TLS handshake. All of them now go through one httpx pool:
+
+    keep-alive      connections are reused across probes, scouts and scans
+    HTTP/2          negotiated when `h2` is installed (HTTP_POOL_HTTP2=1, default)
+    per-host cap    HTTP_PER_HOST_LIMIT concurrent requests per host (polite to
+                    small company sites; the pool itself caps HTTP_POOL_MAX_CONNECTIONS)
+    DNS cache       getaddrinfo results kept HTTP_DNS_CACHE_TTL seconds (0 disables)
+    timeouts        connect HTTP_CONNECT_TIMEOUT, read / write / pool HTTP_READ_TIMEOUT
+
+Usage:
+    http = get_http_client()                      # threads (httpx.Client is thread-safe)
+    r = http.head(url, timeout=5)
+    html = http.download_html(url)                # -> Article(url).download(input_html=html)
+
+    r = await http.aget(url)                      # asyncio: one AsyncClient per event loop
+
+`allow_redirects=` is accepted for requests compatibility; redirects are followed by default.
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401  Optional: HTTP/2 needs httpx[http2]
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+HTTP_POOL_MAX_CONNECTIONS = int(os.environ.get("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_KEEPALIVE = int(os.environ.get("HTTP_POOL_KEEPALIVE", "40"))
+HTTP_PER_HOST_LIMIT = int(os.environ.get("HTTP_PER_HOST_LIMIT", "6"))
+HTTP_POOL_HTTP2 = os.environ.get("HTTP_POOL_HTTP2", "1") == "1"
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "20"))
+HTTP_DNS_CACHE_TTL = float(os.environ.get("HTTP_DNS_CACHE_TTL", "300"))
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+
+class DNSCache:
+    """TTL cache in front of socket.getaddrinfo (both sync and anyio resolution go through it)."""
+    def __init__(self, ttl: float, resolver=None):
+        self.ttl = ttl
+        self._resolve = resolver or socket.getaddrinfo
+        self._entries = {}  # args -> (expires_at, result)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def getaddrinfo(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        result = self._resolve(*args, **kwargs)  # Failures propagate and are not cached
+        with self._lock:
+            self._entries[key] = (now + self.ttl, result)
+        return result
+
+
+_dns_cache = None
+
+
+def install_dns_cache(ttl: float = None) -> DNSCache:
+    """Route socket.getaddrinfo through a process-wide DNSCache (idempotent)."""
+    global _dns_cache
+    ttl = HTTP_DNS_CACHE_TTL if ttl is None else ttl
+    if _dns_cache is None and ttl > 0:
+        _dns_cache = DNSCache(ttl)
+        socket.getaddrinfo = _dns_cache.getaddrinfo
+    return _dns_cache
+
+
+def _host(url: str) -> str:
+    return urlsplit(str(url)).netloc.lower()
+
+
+def _kwargs(kwargs: dict) -> dict:
+    """requests-style keyword arguments -> httpx."""
+    if "allow_redirects" in kwargs:
+        kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+    return kwargs
+
+
+class HttpPool:
+    """
+    Shared sync + async clients with a per-host concurrency cap. Sync calls may come
+    from any thread; async calls get a client and host semaphores bound to their loop.
+    """
+    def __init__(self, per_host: int = None, http2: bool = None):
+        self.per_host = per_host or HTTP_PER_HOST_LIMIT
+        self.http2 = (HTTP_POOL_HTTP2 if http2 is None else http2) and HAS_HTTP2
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._client = httpx.Client(**self._client_options())
+        self._async = weakref.WeakKeyDictionary()  # loop -> (AsyncClient, {host: Semaphore})
+
+    def _client_options(self) -> dict:
+        return {
+            "http2": self.http2,
+            "limits": httpx.Limits(max_connections=HTTP_POOL_MAX_CONNECTIONS, max_keepalive_connections=HTTP_POOL_KEEPALIVE),
+            "timeout": httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            "follow_redirects": True,
+            "headers": {"User-Agent": USER_AGENT},
+        }
+
+    # ---------------- threads ----------------
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = _host(url)
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        with self._slot(url):
+            return self._client.request(method, url, **_kwargs(kwargs))
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def download_html(self, url: str, timeout: float = None) -> str:
+        """Page HTML for newspaper's Article.download(input_html=...); raises on HTTP errors."""
+        resp = self.get(url, timeout=timeout or HTTP_READ_TIMEOUT)
+        resp.raise_for_status()
+        return resp.text
+
+    # ---------------- asyncio ----------------
+
+    def _async_state(self):
+        loop = asyncio.get_running_loop()
+        state = self._async.get(loop)
+        if state is None:
+            state = (httpx.AsyncClient(**self._client_options()), {})
+            self._async[loop] = state
+        return state
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        client, slots = self._async_state()
+        host = _host(url)
+        if host not in slots:
+            slots[host] = asyncio.Semaphore(self.per_host)
+        async with slots[host]:
+            return await client.request(method, url, **_kwargs(kwargs))
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def ahead(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("HEAD", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close this loop's AsyncClient (call before the loop shuts down)."""
+        state = self._async.pop(asyncio.get_running_loop(), None)
+        if state:
+            await state[0].aclose()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpPool:
+    """Process-wide pool (one per container); installs the DNS cache on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            install_dns_cache()
+            _client = HttpPool()
+        return _client
@@ -0,0 +1,272 @@
+"""
+LLM Response Cache — prompt-hash keyed, two tiers.
+
+Triage, relevance, context-anchor and draft prompts are built deterministically
+from their inputs, so a re-scan after a crash, a dashboard force_rescan or the
+same syndicated press release seen by several companies used to pay for an
+identical completion again. Completions are cached on:
+
+    key = sha256(json({model, messages, response_format, temperature, variant}))
+
+    local   SQLite file per container (LLM_CACHE_PATH), TTL + size-bounded LRU
+    remote  optional shared tier (LLM_CACHE_REMOTE=supabase -> llm_response_cache,
+            migration 17); any object with get(key) / set(key, value, ttl_seconds)
+
+Only responses that parse are stored, so a malformed completion is retried next
+time instead of being replayed. Call sites go through a per-scan LLMCacheSession,
+which carries the bypass flag (force_rescan: skip reads, still refresh entries)
+and the per-call-site hit/miss counters written to monitor_scan_log. With a
+ScanBudget attached, every miss records the completion's token usage (hits are free).
+
+Usage:
+    llm_cache = get_llm_cache().session(bypass_cache=force_rescan)
+    result = llm_cache.fetch("triage", request, lambda: call_model(request), parse=json.loads)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from scan_spans import span
+
+
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "pulsepoint_llm_cache.sqlite"))
+LLM_CACHE_TTL_HOURS = float(os.environ.get("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_REMOTE = os.environ.get("LLM_CACHE_REMOTE", "")  # "" | supabase
+
+
+def cache_key(request: dict, variant=None) -> str:
+    """Stable hash over the parts of a chat request that determine the completion."""
+    material = {
+        "model": request.get("model"),
+        "messages": request.get("messages"),
+        "response_format": request.get("response_format"),
+        "temperature": request.get("temperature"),
+        "variant": variant,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    Local tier. One connection guarded by a lock (calls are short); WAL so a
+    second process on the same file can read while this one writes.
+    """
+    EVICT_EVERY = 100  # puts between size checks
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or LLM_CACHE_PATH
+        self.max_entries = LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.enabled = True
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_cache(last_used)")
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"      ⚠️ LLM cache disabled ({self.path}): {e}")
+            self.enabled = False
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if row[1] < now:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"      ⚠️ LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, now + ttl_seconds, now),
+                )
+                self._puts += 1
+                if self._puts % self.EVICT_EVERY == 0:
+                    self._evict(now)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"      ⚠️ LLM cache write failed: {e}")
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then least-recently-used rows beyond max_entries. Caller holds the lock."""
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class SupabaseCacheBackend:
+    """Remote tier shared by every container: llm_response_cache (migration 17)."""
+    def __init__(self, supabase, table: str = "llm_response_cache"):
+        self.supabase = supabase
+        self.table = table
+
+    def get(self, key: str):
+        now = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+        resp = self.supabase.table(self.table).select("value").eq("key", key).gt("expires_at", now).limit(1).execute()
+        return resp.data[0].get("value") if resp.data else None
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        expires = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(time.time() + ttl_seconds))
+        self.supabase.table(self.table).upsert({"key": key, "value": value, "expires_at": expires}).execute()
+
+
+class LLMCache:
+    """Local tier in front of an optional remote tier. Remote failures degrade to local-only."""
+    def __init__(self, local=None, remote=None, ttl_hours: float = None):
+        self.local = local if local is not None else SQLiteCacheBackend()
+        self.remote = remote
+        self.ttl = (LLM_CACHE_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+
+    def set_remote(self, remote) -> None:
+        self.remote = remote
+
+    def get(self, key: str):
+        value = self.local.get(key)
+        if value is not None or self.remote is None:
+            return value
+        try:
+            value = self.remote.get(key)
+        except Exception as e:
+            print(f"      ⚠️ Remote LLM cache read failed: {e}")
+            return None
+        if value is not None:
+            self.local.set(key, value, self.ttl)  # Promote for the rest of this container's life
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.local.set(key, value, self.ttl)
+        if self.remote is not None:
+            try:
+                self.remote.set(key, value, self.ttl)
+            except Exception as e:
+                print(f"      ⚠️ Remote LLM cache write failed: {e}")
+
+    def session(self, bypass_cache: bool = False, budget=None) -> "LLMCacheSession":
+        return LLMCacheSession(self, bypass_cache=bypass_cache, budget=budget)
+
+
+class LLMCacheSession:
+    """
+    One scan's view of the cache: bypass flag, per-call-site counters and the
+    scan's budget (optional). Thread-safe (scouts and the async engine call from
+    worker threads).
+    """
+    def __init__(self, cache: LLMCache, bypass_cache: bool = False, budget=None):
+        self.cache = cache
+        self.bypass_cache = bypass_cache
+        self.budget = budget
+        self.sites = {}  # site -> {"hits": n, "misses": n}
+        self._lock = threading.Lock()
+
+    def _count(self, site: str, hit: bool) -> None:
+        with self._lock:
+            counts = self.sites.setdefault(site, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def fetch(self, site: str, request: dict, call, parse=json.loads, variant=None):
+        """
+        Cached parse(call()). call() returns the chat completion (or its text), or
+        None when no completion was produced (circuit open) — then fetch returns
+        None and nothing is stored. parse() errors propagate and nothing is stored.
+        """
+        with span(f"llm:{site}") as s:
+            key = cache_key(request, variant)
+            if not self.bypass_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    try:
+                        result = parse(cached)
+                        self._count(site, True)
+                        s["hit"] = 1
+                        return result
+                    except Exception:
+                        pass  # Unparseable entry: fall through and overwrite it
+            self._count(site, False)
+            s["hit"] = 0
+            completion = call()
+            if completion is None:
+                s["st"] = "no_completion"
+                return None
+            if isinstance(completion, str):
+                text = completion
+            else:
+                text = completion.choices[0].message.content
+                usage = getattr(completion, "usage", None)
+                s["ti"] = getattr(usage, "prompt_tokens", None)
+                s["to"] = getattr(usage, "completion_tokens", None)
+                if self.budget is not None:
+                    self.budget.record_llm(site, request.get("model"), usage)
+            result = parse(text)
+            self.cache.set(key, text)
+            return result
+
+    def counters(self) -> dict:
+        """monitor_scan_log columns (migration 17)."""
+        with self._lock:
+            sites = {site: dict(c) for site, c in self.sites.items()}
+        return {
+            "llm_cache_hits": sum(c["hits"] for c in sites.values()),
+            "llm_cache_misses": sum(c["misses"] for c in sites.values()),
+            "llm_cache_sites": sites,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide cache instance (one SQLite connection per container)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+def attach_remote_backend(supabase) -> None:
+    """Enable the shared Supabase tier when LLM_CACHE_REMOTE=supabase (idempotent)."""
+    if LLM_CACHE_REMOTE != "supabase" or supabase is None:
+        return
+    cache = get_llm_cache()
+    if cache.remote is None:
+        cache.set_remote(SupabaseCacheBackend(supabase))
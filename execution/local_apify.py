@@ -0,0 +1,130 @@
+"""
+Local Apify — an in-memory stand-in for ApifyClient, for tests and load runs.
+
+The search broker, ApifyRunner and the cassette recorder all talk to the real
+client through the same few calls. LocalApify implements them over in-memory
+runs and datasets:
+
+    actor(name)     .start(run_input=, timeout_secs=)  -> run dict, status RUNNING
+                    .call(run_input=, timeout_secs=)   -> blocks run_secs, finished run
+    run(id)         .get()                             -> run dict, terminal once run_secs passed
+    dataset(id)     .list_items(offset=, limit=)       -> page with .items
+                    .iterate_items()
+    actors          register_actor(name, handler): handler(run_input) -> dataset items;
+                    unregistered actors produce an empty dataset
+    outcomes        `status` for finished runs (SUCCEEDED, FAILED, ...); `poll_errors`
+                    transient errors raised by run(id).get()
+    counters        runs (actor, run_input) in start order, list_calls, calls per op
+
+Usage:
+    apify = LocalApify(run_secs=0.2)
+    apify.register_actor("apify/google-search-scraper", google_search_results())
+    broker = SearchBroker(apify, runner=ApifyRunner(apify, poll_interval=0.02))
+"""
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+
+RUN_COST_USD = 0.004
+
+
+def google_search_results(per_query: int = 3):
+    """Handler with google-search-scraper's output shape: one item per newline-separated query."""
+    def handler(run_input: dict) -> list:
+        return [
+            {"searchQuery": {"term": q, "page": 1},
+             "organicResults": [{"url": f"https://news.example/{q}/{i}"} for i in range(per_query)]}
+            for q in run_input.get("queries", "").split("\n") if q
+        ]
+    return handler
+
+
+class _Actor:
+    def __init__(self, client: "LocalApify", name: str):
+        self.client, self.name = client, name
+
+    def start(self, run_input: dict = None, timeout_secs: int = None, **options) -> dict:
+        return self.client._start(self.name, run_input or {})
+
+    def call(self, run_input: dict = None, timeout_secs: int = None, **options) -> dict:
+        run = self.client._start(self.name, run_input or {})
+        if self.client.run_secs:
+            self.client.sleep(self.client.run_secs)
+        return self.client._get(run["id"], finished=True)
+
+
+class _Dataset:
+    def __init__(self, client: "LocalApify", dataset_id: str):
+        self.client, self.dataset_id = client, dataset_id
+
+    def list_items(self, offset: int = 0, limit: int = None):
+        with self.client._lock:
+            self.client.list_calls += 1
+            self.client.calls["dataset.list_items"] += 1
+            items = self.client.datasets[self.dataset_id]
+        return SimpleNamespace(items=list(items[offset:offset + limit if limit else None]))
+
+    def iterate_items(self):
+        with self.client._lock:
+            self.client.calls["dataset.iterate_items"] += 1
+            return iter(list(self.client.datasets[self.dataset_id]))
+
+
+class LocalApify:
+    """Thread-safe; runs finish run_secs after they start, on `clock`."""
+    def __init__(self, run_secs: float = 0.0, status: str = "SUCCEEDED", poll_errors: int = 0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.run_secs = run_secs
+        self.status = status
+        self.poll_errors = poll_errors
+        self.clock = clock
+        self.sleep = sleep
+        self.runs = []       # (actor, run_input) in start order
+        self.datasets = {}   # dataset id -> items
+        self.list_calls = 0
+        self.calls = Counter()
+        self._handlers = {}
+        self._finish_at = {}  # run id -> (clock time, actor)
+        self._lock = threading.Lock()
+
+    # ---------------- client surface ----------------
+
+    def actor(self, name: str) -> _Actor:
+        return _Actor(self, name)
+
+    def run(self, run_id: str):
+        return SimpleNamespace(get=lambda: self._get(run_id))
+
+    def dataset(self, dataset_id: str) -> _Dataset:
+        return _Dataset(self, dataset_id)
+
+    def register_actor(self, name: str, handler) -> None:
+        """handler(run_input) -> dataset items for every run of `name`."""
+        self._handlers[name] = handler
+
+    # ---------------- runs ----------------
+
+    def _run_dict(self, run_id: str, status: str) -> dict:
+        return {"id": run_id, "status": status, "defaultDatasetId": f"ds-{run_id}", "usageTotalUsd": RUN_COST_USD}
+
+    def _start(self, actor: str, run_input: dict) -> dict:
+        handler = self._handlers.get(actor)
+        items = handler(run_input) if handler else []
+        with self._lock:
+            self.calls["actor.start"] += 1
+            run_id = f"run-{len(self.runs)}"
+            self.runs.append((actor, run_input))
+            self.datasets[f"ds-{run_id}"] = items
+            self._finish_at[run_id] = self.clock() + self.run_secs
+        return self._run_dict(run_id, "RUNNING" if self.run_secs else self.status)
+
+    def _get(self, run_id: str, finished: bool = False) -> dict:
+        with self._lock:
+            self.calls["run.get"] += 1
+            if self.poll_errors and not finished:
+                self.poll_errors -= 1
+                raise ConnectionError("transient")
+            done = finished or self.clock() >= self._finish_at[run_id]
+        return self._run_dict(run_id, self.status if done else "RUNNING")
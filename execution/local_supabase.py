@@ -0,0 +1,585 @@
+"""
+Local Supabase — an in-memory stand-in for the Supabase client, for load tests.
+
+Every module talks to the live project through create_client(...), so due
+selection, the claim / merge RPCs and the scan-log lifecycle could not be
+exercised at 10x the current universe. LocalSupabase implements the part of the
+postgrest builder the monitor uses over in-memory tables, plus the RPCs:
+
+    builder     select (columns, count="exact", one level of embedding: "*, client_profiles(*)")
+                eq / neq / lt / lte / gt / gte / ilike / in_ / is_ / order / limit / range
+                insert / update / upsert(on_conflict=) / delete        -> .execute()
+    semantics   writes return the affected rows; "now()" values become the current time;
+                ids are generated; primary-key / unique violations raise LocalAPIError
+                (code 23505); NULLs never match comparisons, sort last ascending
+    rpc         merge_score_factors, claim_company_for_scan, get_prioritized_due_companies,
+                client_spend_today, rollup_scan_spans, breaker_* (Python ports of migrations
+                09 / 10 / 18 / 20 / 21 / 22); unknown names raise LocalAPIError (PGRST202), like a
+                missing migration; register_rpc() adds or replaces one
+    cost        every execute() is one round-trip: counted per table.op / rpc.name and,
+                with `latency`, slept outside the lock so concurrent callers overlap
+
+Each execute() runs atomically, which is what the claim and merge RPCs rely on.
+
+Usage:
+    db = LocalSupabase(latency=0.004)
+    seed_synthetic(db, companies=20000)
+    due = get_due_companies(db)            # any code that takes a Supabase client
+    print(db.round_trips, db.calls.most_common(5))
+"""
+import copy
+import fnmatch
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from due_priority import FREQUENCY_DAYS, days_since, priority
+from resilience import _apply_failure, _apply_probe, _closed_row
+
+
+PRIMARY_KEYS = {"llm_response_cache": ("key",), "reference_data_versions": ("name",), "circuit_breakers": ("name",),
+                "scan_span_daily": ("day", "client_context", "span")}
+UNIQUE_KEYS = {"company_seen_urls": [("company_id", "url_canonical")], "trigger_dedup": [("company_id", "source_url")],
+               "client_strategies": [("slug",)]}
+EMBEDS = {("client_strategies", "client_profiles"): "strategy_id"}  # (parent, child) -> child column referencing parent.id
+INSERT_DEFAULTS = {"monitor_scan_log": {"started_at": "now()"}}
+_ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+class LocalAPIError(Exception):
+    """Shaped like postgrest's APIError (.code / .message)."""
+    def __init__(self, message: str, code: str = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _comparable(value):
+    """Timestamps compare as aware datetimes (naive = UTC), everything else as is."""
+    if isinstance(value, str) and _ISO_TIMESTAMP.match(value):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _ilike(value, pattern: str) -> bool:
+    if value is None:
+        return False
+    regex = fnmatch.translate(pattern.replace("%", "*").replace("_", "?"))
+    return re.match(regex, str(value), re.IGNORECASE) is not None
+
+
+_FILTERS = {
+    "eq": lambda v, x: v is not None and _comparable(v) == _comparable(x),
+    "neq": lambda v, x: v is not None and _comparable(v) != _comparable(x),
+    "lt": lambda v, x: v is not None and _comparable(v) < _comparable(x),
+    "lte": lambda v, x: v is not None and _comparable(v) <= _comparable(x),
+    "gt": lambda v, x: v is not None and _comparable(v) > _comparable(x),
+    "gte": lambda v, x: v is not None and _comparable(v) >= _comparable(x),
+    "ilike": _ilike,
+    "in_": lambda v, x: v is not None and v in x,
+    "is_": lambda v, x: v is None if x in (None, "null") else v is x,
+}
+
+
+def _percentile(values: list, q: float) -> float:
+    """percentile_cont over sorted values."""
+    if not values:
+        return None
+    pos = (len(values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class _Query:
+    def __init__(self, db: "LocalSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.columns = "*"
+        self.count = None
+        self.payload = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.limit_n = None
+
+    # ---------------- operations ----------------
+
+    def select(self, columns: str = "*", count: str = None):
+        if self.op == "select":
+            self.columns, self.count = columns, count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def update(self, patch: dict, **kwargs):
+        self.op, self.payload = "update", patch
+        return self
+
+    def upsert(self, rows, on_conflict: str = None, ignore_duplicates: bool = False, **kwargs):
+        self.op, self.payload = "upsert", rows
+        self.on_conflict = tuple(c.strip() for c in on_conflict.split(",")) if on_conflict else None
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def delete(self, **kwargs):
+        self.op = "delete"
+        return self
+
+    # ---------------- filters / modifiers ----------------
+
+    def _filter(self, op: str, column: str, value):
+        self.filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def neq(self, column, value):
+        return self._filter("neq", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def ilike(self, column, pattern):
+        return self._filter("ilike", column, pattern)
+
+    def in_(self, column, values):
+        return self._filter("in_", column, list(values))
+
+    def is_(self, column, value):
+        return self._filter("is_", column, value)
+
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n: int, **kwargs):
+        self.limit_n = n
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self.offset, self.limit_n = start, end - start + 1
+        return self
+
+    def execute(self):
+        return self.db._execute(f"{self.table}.{self.op}", lambda: self.db._run_query(self))
+
+
+class _RPC:
+    def __init__(self, db: "LocalSupabase", name: str, params: dict):
+        self.db = db
+        self.name = name
+        self.params = params or {}
+
+    def execute(self):
+        func = self.db._rpcs.get(self.name)
+        if func is None:
+            raise LocalAPIError(f"Could not find the function public.{self.name} in the schema cache", code="PGRST202")
+        return self.db._execute(f"rpc.{self.name}", lambda: SimpleNamespace(data=func(self.db, **self.params), count=None))
+
+
+class LocalSupabase:
+    """Thread-safe; one lock serializes statements (each execute() is atomic)."""
+    def __init__(self, latency: float = 0.0, clock=None):
+        self.latency = latency
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.tables = defaultdict(list)
+        self.calls = Counter()
+        self.round_trips = 0
+        self._lock = threading.RLock()
+        self._rpcs = dict(RPCS)
+
+    # ---------------- client surface ----------------
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: dict = None) -> _RPC:
+        return _RPC(self, name, params)
+
+    def register_rpc(self, name: str, func) -> None:
+        """func(db, **params) -> data; None removes the RPC (callers see PGRST202)."""
+        if func is None:
+            self._rpcs.pop(name, None)
+        else:
+            self._rpcs[name] = func
+
+    def now(self) -> datetime:
+        return self.clock()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.round_trips = 0
+
+    def rows(self, table: str) -> list:
+        """Direct read for assertions and seeding (not a round-trip)."""
+        return self.tables[table]
+
+    # ---------------- execution ----------------
+
+    def _execute(self, label: str, run):
+        with self._lock:
+            self.calls[label] += 1
+            self.round_trips += 1
+            result = run()
+        if self.latency:
+            time.sleep(self.latency)
+        return result
+
+    def _resolve(self, values: dict) -> dict:
+        now = self.now().isoformat()
+        return {k: now if v == "now()" else copy.deepcopy(v) for k, v in values.items()}
+
+    def _matches(self, row: dict, filters: list) -> bool:
+        return all(_FILTERS[op](row.get(column), value) for op, column, value in filters)
+
+    def _key(self, table: str, row: dict, columns: tuple) -> tuple:
+        return tuple(row.get(c) for c in columns)
+
+    def _find(self, table: str, row: dict, columns: tuple):
+        key = self._key(table, row, columns)
+        if None in key:
+            return None
+        return next((r for r in self.tables[table] if self._key(table, r, columns) == key), None)
+
+    def _check_unique(self, table: str, row: dict, ignore: dict = None) -> None:
+        for columns in [PRIMARY_KEYS.get(table, ("id",))] + UNIQUE_KEYS.get(table, []):
+            clash = self._find(table, row, columns)
+            if clash is not None and clash is not ignore:
+                raise LocalAPIError(f"duplicate key value violates unique constraint on {table}({', '.join(columns)})", code="23505")
+
+    def _new_row(self, table: str, values: dict) -> dict:
+        row = self._resolve({**INSERT_DEFAULTS.get(table, {}), **values})
+        if PRIMARY_KEYS.get(table, ("id",)) == ("id",):
+            row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", self.now().isoformat())
+        return row
+
+    def _run_query(self, q: _Query):
+        rows = self.tables[q.table]
+        if q.op == "insert":
+            new = [self._new_row(q.table, r) for r in (q.payload if isinstance(q.payload, list) else [q.payload])]
+            before = len(rows)
+            try:
+                for row in new:
+                    self._check_unique(q.table, row)
+                    rows.append(row)
+            except LocalAPIError:
+                del rows[before:]  # A statement is all or nothing
+                raise
+            return SimpleNamespace(data=copy.deepcopy(new), count=None)
+
+        if q.op == "upsert":
+            conflict = q.on_conflict or PRIMARY_KEYS.get(q.table, ("id",))
+            written = []
+            for values in (q.payload if isinstance(q.payload, list) else [q.payload]):
+                existing = self._find(q.table, values, conflict)
+                if existing is None:
+                    row = self._new_row(q.table, values)
+                    self._check_unique(q.table, row)
+                    rows.append(row)
+                elif q.ignore_duplicates:
+                    continue
+                else:
+                    existing.update(self._resolve(values))
+                    row = existing
+                written.append(row)
+            return SimpleNamespace(data=copy.deepcopy(written), count=None)
+
+        matched = [r for r in rows if self._matches(r, q.filters)]
+        if q.op == "update":
+            patch = self._resolve(q.payload)
+            for row in matched:
+                row.update(patch)
+            return SimpleNamespace(data=copy.deepcopy(matched), count=None)
+        if q.op == "delete":
+            ids = {id(r) for r in matched}
+            self.tables[q.table] = [r for r in rows if id(r) not in ids]
+            return SimpleNamespace(data=copy.deepcopy(matched), count=None)
+
+        for column, desc in reversed(q.orders):
+            present = [r for r in matched if r.get(column) is not None]
+            missing = [r for r in matched if r.get(column) is None]
+            present.sort(key=lambda r: _comparable(r[column]), reverse=desc)
+            matched = missing + present if desc else present + missing
+        total = len(matched)
+        end = q.offset + q.limit_n if q.limit_n is not None else None
+        page = [self._project(q.table, r, q.columns) for r in matched[q.offset:end]]
+        return SimpleNamespace(data=page, count=total if q.count else None)
+
+    def _project(self, table: str, row: dict, columns: str) -> dict:
+        out = {}
+        for part in re.split(r",\s*(?![^()]*\))", columns.strip()):
+            part = part.strip()
+            embed = re.match(r"^(\w+)\((.*)\)$", part)
+            if part == "*":
+                out.update(copy.deepcopy(row))
+            elif embed:
+                child, child_columns = embed.groups()
+                fk = EMBEDS.get((table, child))
+                out[child] = [self._project(child, r, child_columns)
+                              for r in self.tables[child] if fk and r.get(fk) == row.get("id")]
+            elif part:
+                out[part] = copy.deepcopy(row.get(part))
+        return out
+
+
+# ---------------- RPCs (Python ports of the migrations) ----------------
+
+def _find_company(db: LocalSupabase, company_id: str):
+    return next((r for r in db.tables["triggered_companies"] if r.get("id") == company_id), None)
+
+
+def merge_score_factors(db: LocalSupabase, p_company_id: str, p_delta: dict):
+    """Migration 09: score_factors = COALESCE(score_factors, '{}') || p_delta."""
+    row = _find_company(db, p_company_id)
+    if row is not None:
+        row["score_factors"] = {**(row.get("score_factors") or {}), **copy.deepcopy(p_delta)}
+    return None
+
+
+def claim_company_for_scan(db: LocalSupabase, p_company_id: str, p_cutoff: str):
+    """Migration 10: claim when never claimed or the claim is older than p_cutoff."""
+    row = _find_company(db, p_company_id)
+    claimed = row is not None and (row.get("scan_claimed_at") is None
+                                   or _comparable(row["scan_claimed_at"]) < _comparable(p_cutoff))
+    if claimed:
+        row["scan_claimed_at"] = db.now().isoformat()
+    return [{"claimed": claimed}]
+
+
+def client_spend_today(db: LocalSupabase, p_client_context: str):
+    """Migration 18: today's cost_usd for one client."""
+    midnight = db.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return sum(float(l.get("cost_usd") or 0) for l in db.tables["monitor_scan_log"]
+               if l.get("client_context") == p_client_context and _comparable(l.get("started_at")) >= midnight)
+
+
+def get_prioritized_due_companies(db: LocalSupabase, p_client_limits: dict = None, p_default_limit: int = 50,
+                                  p_page_size: int = 500, p_after_client: str = None, p_after_rank: int = 0,
+                                  p_max_interval_days: int = 21, p_history_days: int = 90):
+    """Migration 20, scored with due_priority.py."""
+    now = db.now()
+    limits = p_client_limits or {}
+    due = []
+    for comp in db.tables["triggered_companies"]:
+        if comp.get("monitoring_status") != "active":
+            continue
+        age = days_since(comp.get("last_monitored_at"), now)
+        if age > FREQUENCY_DAYS.get(comp.get("monitoring_frequency"), FREQUENCY_DAYS["weekly"]):
+            due.append((comp, age))
+
+    due_ids = {comp["id"] for comp, _ in due}
+    history_cutoff = now - timedelta(days=p_history_days)
+    history = defaultdict(lambda: {"scans": 0, "triggers": 0, "skips": 0, "full": [], "skip": []})
+    for log in db.tables["monitor_scan_log"]:
+        if log.get("company_id") not in due_ids or _comparable(log.get("started_at")) <= history_cutoff:
+            continue
+        h = history[log["company_id"]]
+        h["scans"] += 1
+        h["triggers"] += bool(log.get("trigger_found"))
+        cost = float(log.get("cost_usd") or 0)
+        if log.get("status") == "skipped_fingerprint":
+            h["skips"] += 1
+            if cost > 0:
+                h["skip"].append(cost)
+        elif log.get("status") == "success" and cost > 0:
+            h["full"].append(cost)
+    velocity = {(b.get("account_id"), b.get("client_id")): b.get("velocity_ratio")
+                for b in db.tables["account_signal_baselines"]}
+
+    by_client = defaultdict(list)
+    for comp, age in due:
+        h = history.get(comp["id"])
+        if h:
+            h = {"scans": h["scans"], "triggers": h["triggers"], "skips": h["skips"],
+                 "full_cost": sum(h["full"]) / len(h["full"]) if h["full"] else None,
+                 "skip_cost": sum(h["skip"]) / len(h["skip"]) if h["skip"] else None}
+        starved = age >= p_max_interval_days
+        score = priority(h, velocity.get((comp["id"], comp.get("client_context"))),
+                         0.0 if age == float("inf") else age, comp.get("monitoring_frequency") or "weekly")
+        key = (0, -age, comp["id"]) if starved else (1, -score, comp["id"])
+        by_client[comp.get("client_context") or ""].append((key, comp, score, starved))
+
+    rows = []
+    for client_key in sorted(by_client):
+        ranked = sorted(by_client[client_key], key=lambda r: r[0])
+        limit = int(limits.get(client_key, p_default_limit))
+        for rank, (_, comp, score, starved) in enumerate(ranked[:limit], 1):
+            if p_after_client is not None and (client_key, rank) <= (p_after_client, p_after_rank):
+                continue
+            rows.append({
+                "id": comp["id"], "company": comp.get("company"), "client_context": comp.get("client_context"),
+                "website": comp.get("website"), "industry": comp.get("industry"), "event_title": comp.get("event_title"),
+                "user_id": comp.get("user_id"), "score_factors": copy.deepcopy(comp.get("score_factors")),
+                "last_monitored_at": comp.get("last_monitored_at"), "monitoring_frequency": comp.get("monitoring_frequency"),
+                "last_search_hash": comp.get("last_search_hash"), "client_key": client_key, "due_rank": rank,
+                "due_total": len(ranked), "priority": score, "starved": starved,
+            })
+            if len(rows) >= p_page_size:
+                return rows
+    return rows
+
+
+def rollup_scan_spans(db: LocalSupabase, p_day: str = None):
+    """Migration 21: one day of monitor_scan_log.spans -> scan_span_daily."""
+    day = datetime.fromisoformat(p_day).date() if p_day else (db.now() - timedelta(days=1)).date()
+    groups = defaultdict(lambda: {"ms": [], "errors": 0, "scans": set(), "ti": 0, "to": 0, "b": 0})
+    for log in db.tables["monitor_scan_log"]:
+        if _comparable(log.get("started_at")).date() != day:
+            continue
+        for s in log.get("spans") or []:
+            if "ms" not in s:
+                continue
+            g = groups[(log.get("client_context") or "unknown", s["n"])]
+            g["ms"].append(s["ms"])
+            g["errors"] += s.get("st") == "error"
+            g["scans"].add(log.get("id"))
+            for attr in ("ti", "to", "b"):
+                g[attr] += s.get(attr) or 0
+    for (client, name), g in groups.items():
+        ms = sorted(g["ms"])
+        row = {"day": day.isoformat(), "client_context": client, "span": name, "calls": len(ms),
+               "errors": g["errors"], "scans": len(g["scans"]), "p50_ms": _percentile(ms, 0.5),
+               "p90_ms": _percentile(ms, 0.9), "p99_ms": _percentile(ms, 0.99), "max_ms": ms[-1],
+               "total_ms": sum(ms), "tokens_in": g["ti"], "tokens_out": g["to"], "bytes": g["b"]}
+        existing = db._find("scan_span_daily", row, PRIMARY_KEYS["scan_span_daily"])
+        if existing is not None:
+            existing.update(row)
+        else:
+            db.tables["scan_span_daily"].append(row)
+    return len(groups)
+
+
+def _breaker_row(db: LocalSupabase, name: str) -> dict:
+    row = next((r for r in db.tables["circuit_breakers"] if r.get("name") == name), None)
+    if row is None:
+        row = {"name": name, **_closed_row()}
+        db.tables["circuit_breakers"].append(row)
+    return row
+
+
+def breaker_record_failure(db: LocalSupabase, p_name: str, p_threshold: int, p_window_secs: float = 0):
+    """Migration 22."""
+    row = _breaker_row(db, p_name)
+    opened = _apply_failure(row, p_threshold, p_window_secs, db.now().timestamp())
+    return [{**{k: row[k] for k in _closed_row()}, "opened": opened}]
+
+
+def breaker_acquire_probe(db: LocalSupabase, p_name: str, p_reset_secs: float, p_lease_secs: float):
+    """Migration 22."""
+    return _apply_probe(_breaker_row(db, p_name), p_reset_secs, p_lease_secs, db.now().timestamp())
+
+
+def breaker_record_success(db: LocalSupabase, p_name: str):
+    """Migration 22."""
+    _breaker_row(db, p_name).update(_closed_row())
+    return None
+
+
+RPCS = {
+    "breaker_record_failure": breaker_record_failure,
+    "breaker_acquire_probe": breaker_acquire_probe,
+    "breaker_record_success": breaker_record_success,
+    "merge_score_factors": merge_score_factors,
+    "claim_company_for_scan": claim_company_for_scan,
+    "client_spend_today": client_spend_today,
+    "get_prioritized_due_companies": get_prioritized_due_companies,
+    "rollup_scan_spans": rollup_scan_spans,
+}
+
+
+# ---------------- synthetic data ----------------
+
+DEFAULT_CLIENTS = {
+    "pulsepoint_strategic": {"daily_scan_limit": 50, "leads_table": "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS"},
+    "quantifire": {"daily_scan_limit": 40, "leads_table": "QUANTIFIRE_TRIGGERED_LEADS"},
+}
+
+
+def seed_synthetic(db: LocalSupabase, companies: int = 1000, clients: dict = None, leads_per_company: int = 3,
+                   history_days: int = 90, scans_per_company: int = 6, seed: int = 0) -> dict:
+    """
+    Fills the tables the monitor reads: client_strategies / client_profiles, triggered_companies
+    (5% paused, 5% never scanned, the rest scanned 0-30 days ago), leads, monitor_scan_log
+    history with per-company trigger rates and costs, and velocity baselines for half the
+    companies. Deterministic for a given seed; not counted as round-trips.
+    """
+    rng = random.Random(seed)
+    now = db.now()
+    clients = clients or DEFAULT_CLIENTS
+    new_id = lambda: str(uuid.UUID(int=rng.getrandbits(128)))
+    stamp = lambda days_ago: (now - timedelta(days=days_ago)).isoformat()
+    slugs = list(clients)
+    counts = Counter()
+
+    with db._lock:
+        for slug, config in clients.items():
+            strategy_id = new_id()
+            db.tables["client_strategies"].append({"id": strategy_id, "name": slug.replace("_", " ").title(), "slug": slug,
+                                                   "config": dict(config), "sourcing_criteria": {}})
+            db.tables["client_profiles"].append({"id": new_id(), "strategy_id": strategy_id, "scoring_config": {},
+                                                 "voice_config": {"tone": "direct", "value_proposition": "synthetic"},
+                                                 "commercial_config": {}, "intelligence_profile": {}})
+
+        for i in range(companies):
+            slug = slugs[i % len(slugs)]
+            company_id = new_id()
+            scanned = rng.random() >= 0.05
+            db.tables["triggered_companies"].append({
+                "id": company_id, "company": f"Synthetic Co {i:06d}", "client_context": slug,
+                "website": f"https://synthetic-{i:06d}.example", "industry": rng.choice(["Fintech", "SaaS", "Biotech", "Retail"]),
+                "event_title": None, "user_id": None, "score_factors": {},
+                "monitoring_status": "paused" if rng.random() < 0.05 else "active",
+                "monitoring_frequency": rng.choices(["daily", "biweekly", "weekly"], weights=[1, 2, 7])[0],
+                "last_monitored_at": stamp(rng.uniform(0, 30)) if scanned else None,
+                "last_search_hash": None, "scan_claimed_at": None, "created_at": stamp(history_days),
+            })
+            for j in range(leads_per_company):
+                db.tables[clients[slug].get("leads_table", "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS")].append({
+                    "id": new_id(), "triggered_company_id": company_id, "name": f"Contact {i}-{j}",
+                    "email": f"contact{j}@synthetic-{i:06d}.example", "title": rng.choice(["CEO", "CFO", "CMO", "VP Sales"]),
+                })
+            counts["leads"] += leads_per_company
+
+            rate = rng.betavariate(1, 12)
+            for _ in range(rng.randint(0, scans_per_company) if scanned else 0):
+                skipped = rng.random() < 0.3
+                db.tables["monitor_scan_log"].append({
+                    "id": new_id(), "company_id": company_id, "company_name": f"Synthetic Co {i:06d}", "client_context": slug,
+                    "status": "skipped_fingerprint" if skipped else "success", "started_at": stamp(rng.uniform(1, history_days)),
+                    "trigger_found": not skipped and rng.random() < rate,
+                    "cost_usd": round(rng.uniform(0.002, 0.008) if skipped else rng.uniform(0.02, 0.12), 6),
+                })
+                counts["scan_logs"] += 1
+            if rng.random() < 0.5:
+                db.tables["account_signal_baselines"].append({"account_id": company_id, "client_id": slug,
+                                                              "velocity_ratio": round(rng.lognormvariate(0, 0.5), 3)})
+    return {"companies": companies, "leads": counts["leads"], "scan_logs": counts["scan_logs"]}
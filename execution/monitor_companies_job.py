@@ -3,6 +3,9 @@ import os
 import json
 import time
 import uuid
+import asyncio
+import functools
+import threading
 from datetime import datetime, timedelta
 from supabase import create_client, Client
 from apify_client import ApifyClient
@@ -22,7 +25,29 @@ from scouts.social_scout import scout_executive_social_activity
 from scouts.linkedin_scout import scout_linkedin_activity
 from scouts.hiring_scout import scout_hiring_activity
 from scouts.webchange_scout import scout_website_changes
-from resilience import retry_with_backoff, CircuitBreaker
+from resilience import (
+    retry_with_backoff, CircuitBreaker, rate_limit_count, attach_breaker_state, BREAKER_FAILURE_WINDOW_SECS,
+    RateLimitedOpenAI, get_rate_limiter,
+)
+from scan_engine import ScanEngine
+from spawn_controller import AdaptiveConcurrency, SpawnScheduler
+from article_cache import CommitThrottle, get_article_cache
+from article_prefetch import ArticlePrefetcher, AsyncArticlePrefetcher
+from http_pool import get_http_client
+from search_broker import SearchBroker
+from apify_runner import ApifyRunner, iter_dataset_items
+from url_validator import get_url_validator
+from url_canon import canonicalize_url, normalize_url, remember_redirect, resolve_redirect, is_redirect_host
+from reference_cache import get_reference_cache
+from scan_writes import ScanWriteBuffer
+from scan_spans import SpanRecorder, span, traced, current as current_spans
+from trigger_filter import TriggerDedupFilter, load_trigger_dedup_index, source_url_keys
+from triage import rejected_verdict, shortlist_triaged, verdicts_from_response
+from seen_urls import filter_unseen, load_seen_urls, mark_seen, record_seen_urls
+from llm_cache import LLMCacheSession, get_llm_cache, attach_remote_backend
+from due_priority import priority_sort_key, MAX_SCAN_INTERVAL_DAYS, HISTORY_DAYS
+from scan_budget import ScanBudget, APIFY_PRICES, estimate_llm_cost, company_ceiling, client_daily_budget
+from date_extractor import DateMatch, get_date_extractor, is_stale, remember_published_date, published_date_for
 from v6_signal_pipeline import (
     extract_evidence_objects, classify_evidence,
     persist_classified_signals, v6_to_v5_result,
@@ -52,10 +77,11 @@ image = (
         "openai",
         "python-dotenv",
         "fastapi[standard]",
-        "httpx",
+        "httpx[http2]",
         "newspaper4k",
         "beautifulsoup4",
-        "lxml"
+        "lxml",
+        "zstandard"
     )
     .add_local_dir(
         Path(__file__).parent.parent, # Upload root (so we can import if needed, though this is standalone)
@@ -66,23 +92,54 @@ image = (
 
 app = modal.App("pulsepoint-monitor-worker")
 
+# Shared article cache (see article_cache.py): survives containers and days
+article_cache_volume = modal.Volume.from_name("pulsepoint-article-cache", create_if_missing=True)
+
 # UTILITIES
 def get_supabase() -> Client:
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
     return create_client(url, key)
 
+@functools.lru_cache(maxsize=1)
+def _container_clients():
+    """
+    (supabase, apify_client, openai_key) built once per container and shared by every
+    scan it runs, warm invocations included. apify_client / openai_key are None when
+    the key is missing.
+    """
+    apify_token = os.environ.get("APIFY_API_KEY")
+    return get_supabase(), ApifyClient(apify_token) if apify_token else None, os.environ.get("OPENAI_API_KEY")
+
 # Default scan limit if not specified per client
 DEFAULT_DAILY_SCAN_LIMIT = 50
 
 # GLOBAL BUDGETS (Per Company Scan)
+# Spend is gated in dollars by ScanBudget (scan_budget.py); the page cap is only a runaway backstop.
 MAX_FETCHED_PAGES_TOTAL = 25
-MAX_LLM_CALLS = 5
 MAX_LLM_CHARS = 3000
+MAX_TRIAGE_ITEMS = 40          # Results sent to the batched relevance triage (one LLM call)
+PREFETCH_TOP_K = int(os.environ.get("PREFETCH_TOP_K", "8"))  # Articles downloaded speculatively while triage runs
+TRIAGE_DESCRIPTION_CHARS = 300 # Per-item description budget inside the triage prompt
+ANCHOR_JUDGEMENT_COST_USD = 0.03   # One gpt-4o context-anchor judgement (~6k prompt chars)
+ANCHOR_MIN_COST_USD = 0.05         # Portfolio + testimonial scouts and one judgement
+SNIPPET_DATE_MIN_CONFIDENCE = 0.7  # Snippet dates below this (bare numeric, nav-bar "today") never reject
+ARTICLE_DATE_MIN_CONFIDENCE = 0.5  # Article dates below this (body "N years ago") never reject
 
 # RESILIENCE
-GLOBAL_LLM_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=3600)
-GLOBAL_APIFY_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=3600)
+# With BREAKER_STATE=supabase the state is shared by every container (migration 22): an
+# outage seen by one worker skips the calls of all of them, and one worker probes recovery.
+GLOBAL_LLM_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=3600, name="llm", failure_window=BREAKER_FAILURE_WINDOW_SECS)
+GLOBAL_APIFY_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=3600, name="apify", failure_window=BREAKER_FAILURE_WINDOW_SECS)
+
+
+@functools.lru_cache(maxsize=None)
+def _openai_client(openai_key: str) -> RateLimitedOpenAI:
+    """
+    OpenAI client whose completions wait on the per-model RPM / TPM buckets (resilience.RATE_LIMITS).
+    One per key per container: the client is thread-safe and keeps its connection pool warm.
+    """
+    return RateLimitedOpenAI(OpenAI(api_key=openai_key))
 
 
 def merge_score_factors(supabase: Client, company_id: str, delta: dict) -> None:
@@ -153,23 +210,43 @@ def compute_deal_score(confidence, signal_type, signal_date_str, icp_match_score
     return min(max(total, 0), 100)
 
 
-def get_due_companies(supabase: Client):
+DUE_PAGE_SIZE = 500
+
+def _client_scan_limits() -> dict:
+    """{client_context: daily_scan_limit} for every loaded strategy."""
+    return {slug: strategy.get("daily_scan_limit", DEFAULT_DAILY_SCAN_LIMIT) for slug, strategy in CLIENT_STRATEGIES.items()}
+
+def iter_due_companies(supabase: Client, client_limits: dict, page_size: int = DUE_PAGE_SIZE):
     """
-    Fetches companies that are 'active' and due for a scan.
-    Applies PER-CLIENT daily scan limits to control costs.
-    
-    Each client can have their own daily_scan_limit in CLIENT_STRATEGIES.
-    Companies are prioritized by oldest scanned first (fair rotation).
+    Streams due companies from the get_prioritized_due_companies RPC (migration 20), keyset-paged.
+    Rows are ordered by client, then starved companies (oldest first) and expected triggers per
+    dollar (due_priority.py), already cut to each client's limit, and carry due_rank / due_total
+    (due companies for that client before the limit) / priority / starved.
     """
-    # 1. Fetch ALL active companies
-    resp = supabase.table("triggered_companies").select("*").eq("monitoring_status", "active").execute()
-    companies = resp.data
-    
-    # Use timezone-aware datetime to match Supabase timestamps
-    from datetime import timezone
-    now = datetime.now(timezone.utc)
-    
-    # 2. Build list of due companies with their client context
+    after_client, after_rank = None, 0
+    while True:
+        rows = supabase.rpc("get_prioritized_due_companies", {
+            "p_client_limits": client_limits,
+            "p_default_limit": DEFAULT_DAILY_SCAN_LIMIT,
+            "p_page_size": page_size,
+            "p_after_client": after_client,
+            "p_after_rank": after_rank,
+            "p_max_interval_days": MAX_SCAN_INTERVAL_DAYS,
+            "p_history_days": HISTORY_DAYS,
+        }).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after_client, after_rank = rows[-1]["client_key"], rows[-1]["due_rank"]
+
+def select_due_companies(companies: list, client_limits: dict, now: datetime) -> tuple:
+    """
+    In-Python due selection (same due rules as the RPC), used when the RPC is unavailable.
+    No scan history is loaded here, so the priority falls back to the prior: starved
+    companies first, then the most overdue relative to their frequency.
+    Returns (selected, {client_context: due_total}).
+    """
+    # 1. Build list of due companies with their client context
     due_by_client = {}  # {client_context: [companies]}
     
     for comp in companies:
@@ -199,24 +276,59 @@ def get_due_companies(supabase: Client):
                 due_by_client[client_ctx] = []
             due_by_client[client_ctx].append(comp)
     
-    # 3. Apply per-client limits (oldest scanned first)
+    # 2. Apply per-client limits (starved first, then by priority)
     final_due_list = []
+    due_totals = {}
     
     for client_ctx, client_companies in due_by_client.items():
-        # Get client-specific limit from strategy, or use default
-        strategy = CLIENT_STRATEGIES.get(client_ctx, {})
-        limit = strategy.get("daily_scan_limit", DEFAULT_DAILY_SCAN_LIMIT)
+        limit = client_limits.get(client_ctx, DEFAULT_DAILY_SCAN_LIMIT)
         
-        # Sort by oldest scanned first (fair rotation)
-        client_companies.sort(
-            key=lambda x: x.get('last_monitored_at') or '1970-01-01'
-        )
+        client_companies.sort(key=lambda x: priority_sort_key(x, now))
         
         # Take up to the limit
-        selected = client_companies[:limit]
-        final_due_list.extend(selected)
-        
-        print(f"   📊 {client_ctx}: {len(selected)}/{len(client_companies)} due (limit: {limit})")
+        final_due_list.extend(client_companies[:limit])
+        due_totals[client_ctx] = len(client_companies)
+    
+    return final_due_list, due_totals
+
+def get_due_companies(supabase: Client):
+    """
+    Fetches companies that are 'active' and due for a scan.
+    Applies PER-CLIENT daily scan limits to control costs.
+    
+    Each client can have their own daily_scan_limit in CLIENT_STRATEGIES.
+    Companies are prioritized by expected triggers per dollar, with companies not scanned
+    for MAX_SCAN_INTERVAL_DAYS (or never) always first (due_priority.py).
+
+    Selection runs in Postgres (get_prioritized_due_companies RPC, migration 20), which returns
+    only the columns the scanner reads; falls back to selecting in Python if the RPC is missing.
+    """
+    client_limits = _client_scan_limits()
+    starved_counts = {}
+    try:
+        rows = list(iter_due_companies(supabase, client_limits))
+        final_due_list, due_totals = [], {}
+        for row in rows:
+            row.pop("client_key", None)
+            row.pop("due_rank", None)
+            row.pop("priority", None)
+            if row.pop("starved", False):
+                starved_counts[row.get("client_context")] = starved_counts.get(row.get("client_context"), 0) + 1
+            due_totals[row.get("client_context")] = row.pop("due_total", 0)
+            final_due_list.append(row)
+    except Exception as e:
+        print(f"   ⚠️ Due-selection RPC unavailable, selecting in Python: {e}")
+        # Fetch ALL active companies
+        resp = supabase.table("triggered_companies").select("*").eq("monitoring_status", "active").execute()
+        # Use timezone-aware datetime to match Supabase timestamps
+        from datetime import timezone
+        final_due_list, due_totals = select_due_companies(resp.data or [], client_limits, datetime.now(timezone.utc))
+
+    for client_ctx, total in due_totals.items():
+        selected = sum(1 for c in final_due_list if c.get("client_context") == client_ctx)
+        limit = client_limits.get(client_ctx, DEFAULT_DAILY_SCAN_LIMIT)
+        starved = f", {starved_counts[client_ctx]} past the {MAX_SCAN_INTERVAL_DAYS}-day max interval" if starved_counts.get(client_ctx) else ""
+        print(f"   📊 {client_ctx}: {selected}/{total} due (limit: {limit}{starved})")
     
     return final_due_list
 
@@ -227,56 +339,73 @@ def get_due_companies(supabase: Client):
 # This dictionary is now populated at runtime from the `client_strategies` table.
 CLIENT_STRATEGIES = {}
 
-def fetch_client_strategies(supabase: Client):
+def _load_client_strategies(supabase: Client) -> dict:
     """
-    Populates the global CLIENT_STRATEGIES table from the database.
-    Now joins with `client_profiles` to load Voice, Scoring, and Commercial configs.
+    Reads `client_strategies` joined with `client_profiles` (Voice, Scoring, and
+    Commercial configs) into {slug: config}. Raises on DB errors.
     """
-    global CLIENT_STRATEGIES
-    try:
-        print("   📥 Fetching Client Strategies & Profiles from Database...")
-        # Join with client_profiles
-        resp = supabase.table("client_strategies")\
-            .select("*, client_profiles(*)")\
-            .execute()
+    print("   📥 Fetching Client Strategies & Profiles from Database...")
+    # Join with client_profiles
+    resp = supabase.table("client_strategies")\
+        .select("*, client_profiles(*)")\
+        .execute()
+    strategies = {}
+        
+    if resp.data:
+        for row in resp.data:
+            slug = row.get("slug")
+            # Base config from strategy table (legacy support)
+            config = row.get("config") or {}
             
-        if resp.data:
-            for row in resp.data:
-                slug = row.get("slug")
-                # Base config from strategy table (legacy support)
-                config = row.get("config") or {}
-                
-                # Merge Profile Data if available
-                profiles = row.get("client_profiles")
-                # Supabase returns array or object depending on relationship. 
-                # Since it's 1:1, usually object or list of 1.
-                profile = None
-                if isinstance(profiles, list) and len(profiles) > 0:
-                    profile = profiles[0]
-                elif isinstance(profiles, dict):
-                    profile = profiles
+            # Merge Profile Data if available
+            profiles = row.get("client_profiles")
+            # Supabase returns array or object depending on relationship. 
+            # Since it's 1:1, usually object or list of 1.
+            profile = None
+            if isinstance(profiles, list) and len(profiles) > 0:
+                profile = profiles[0]
+            elif isinstance(profiles, dict):
+                profile = profiles
+            
+                if profile:
+                    config["voice_config"] = profile.get("voice_config")
+                    config["scoring_config"] = profile.get("scoring_config")
+                    config["commercial_config"] = profile.get("commercial_config")
+                    config["service_implication"] = profile.get("service_implication")
+                    config["social_proof"] = profile.get("social_proof")
+                    config["intelligence_profile"] = profile.get("intelligence_profile") or {}
+                    # Also map 'hook_context' to value_proposition if missing
+                    if not config.get("hook_context") and profile.get("voice_config"):
+                         val_prop = profile.get("voice_config", {}).get("value_proposition", "")
+                         tone = profile.get("voice_config", {}).get("tone", "")
+                         config["hook_context"] = f"Tone: {tone}. Value Prop: {val_prop}"
                 
-                    if profile:
-                        config["voice_config"] = profile.get("voice_config")
-                        config["scoring_config"] = profile.get("scoring_config")
-                        config["commercial_config"] = profile.get("commercial_config")
-                        config["service_implication"] = profile.get("service_implication")
-                        config["social_proof"] = profile.get("social_proof")
-                        config["intelligence_profile"] = profile.get("intelligence_profile") or {}
-                        # Also map 'hook_context' to value_proposition if missing
-                        if not config.get("hook_context") and profile.get("voice_config"):
-                             val_prop = profile.get("voice_config", {}).get("value_proposition", "")
-                             tone = profile.get("voice_config", {}).get("tone", "")
-                             config["hook_context"] = f"Tone: {tone}. Value Prop: {val_prop}"
-                    
-                    config["sourcing_criteria"] = row.get("sourcing_criteria", {})
+                config["sourcing_criteria"] = row.get("sourcing_criteria", {})
 
-                CLIENT_STRATEGIES[slug] = config
-                
-            print(f"   ✅ Loaded {len(CLIENT_STRATEGIES)} strategies: {list(CLIENT_STRATEGIES.keys())}")
-        else:
-            print("   ⚠️ No strategies found in DB! Using default/empty.")
+            strategies[slug] = config
             
+        print(f"   ✅ Loaded {len(strategies)} strategies: {list(strategies.keys())}")
+    else:
+        print("   ⚠️ No strategies found in DB! Using default/empty.")
+        
+    return strategies
+
+def fetch_client_strategies(supabase: Client):
+    """
+    Populates the global CLIENT_STRATEGIES table from the database.
+    Served from the container's reference cache: the join only re-runs when
+    client_strategies / client_profiles changed (see reference_cache.py).
+    """
+    try:
+        strategies = get_reference_cache().get(
+            supabase, "client_strategies", lambda: _load_client_strategies(supabase),
+            depends_on=("client_strategies", "client_profiles")
+        )
+        # Update in place: concurrent scans in this container hold the same dict
+        if strategies:
+            for slug in set(CLIENT_STRATEGIES) - set(strategies):
+                CLIENT_STRATEGIES.pop(slug, None)
+            CLIENT_STRATEGIES.update(strategies)
     except Exception as e:
         print(f"   ❌ Error loading strategies from DB: {e}")
         print("      Falling back to empty configuration.")
@@ -375,93 +504,13 @@ def is_valid_article_url(url: str, company_name: str) -> tuple:
     - Generic landing pages without specific article slugs
     - About/contact pages
     - Directory/Database pages (ZoomInfo, Crunchbase, etc.)
-    """
-    from urllib.parse import urlparse
-    
-    if not url:
-        return (False, "No URL provided")
-    
-    parsed = urlparse(url.lower())
-    path = parsed.path.rstrip('/')
-    domain = parsed.netloc.lower()
-    
-    
-    # BLOCK DIRECTORY SITES (Always Reject)
-    # These are static profiles, not news.
-    blocked_domains = [
-        'zoominfo.com', 'apollo.io', 'crunchbase.com', 'pitchbook.com',
-        'clutch.co', 'upcity.com', 'yelp.com', 'glassdoor.com', 
-        'rocketreach.co', 'lusha.com', 'seamless.ai', 'signalhire.com',
-        'dnb.com', 'owler.com', 'g2.com', 'capterra.com', 'trustpilot.com',
-        'google.com', 'bing.com', 'yahoo.com', # Search results themselves
-        'facebook.com', 'twitter.com', 'instagram.com', 'tiktok.com', 'youtube.com'
-    ]
-    
-    if any(d in domain for d in blocked_domains):
-        print(f"      ⛔ DEBUG: Blocking {domain}")
-        return (False, f"Directory/Database domain rejected: {domain}")
-    
-    # Known valid third-party sources (allow these even if path looks generic)
-    valid_sources = [
-        'prnewswire.com', 'businesswire.com', 'globenewswire.com',
-        'linkedin.com', 'bloomberg.com', 'reuters.com', 'forbes.com',
-        'adweek.com', 'adage.com', 'marketingweek.com', 'thedrum.com',
-        'campaignlive.com', 'prweek.com'
-    ]
-    
-    is_third_party = any(source in domain for source in valid_sources)
-    
-    # Generic landing page patterns (reject these)
 
-    generic_patterns = [
-        '/press-releases', '/press-release', '/pressroom', '/press-room',
-        '/news', '/newsroom', '/news-room', '/media', '/media-center',
-        '/about-us', '/about', '/contact', '/team', '/blog',
-        '/articles', '/resources', '/insights',
-        '/careers', '/jobs', '/opportunities', '/join-us', '/working-at'
-    ]
-    
-    # Case studies / portfolio on the company's own site are evergreen, not news.
-    # These are blocked from Google Search analysis (Portfolio Scout has its own path).
-    own_site_portfolio_patterns = [
-        '/case-studies', '/case-study', '/portfolio', '/our-work',
-        '/work', '/projects', '/clients', '/testimonials'
-    ]
-    
-    # Check if URL ends with a generic pattern (no specific article after it)
-    for pattern in generic_patterns:
-        if path == pattern or path.endswith(pattern):
-            return (False, f"Generic landing page detected: {pattern}")
-            
-    # Check for 'jobs' in path segment (e.g. /jobs/software-engineer)
-    if '/jobs/' in path or '/careers/' in path:
-        return (False, "Job posting page detected")
-        
-    # Check for Financial Noise keywords in URL path (earnings, stock, q1-results)
-    financial_keywords = ['earnings', 'quarterly-results', 'stock-price', 'dividend', 'investor-relations', '10-k', '10-q']
-    if any(k in path for k in financial_keywords):
-        return (False, "Financial/Stock news rejected")
-    
-    # Check if the URL is on the company's own domain
-    company_slug = company_name.lower().replace(' ', '').replace('-', '').replace('.', '')
-    domain_slug = domain.replace('www.', '').replace('.com', '').replace('.org', '').replace('-', '')
-    
-    if company_slug in domain_slug and not is_third_party:
-        # Block portfolio/case-study pages on the company's own site
-        for pattern in own_site_portfolio_patterns:
-            if pattern in path:
-                return (False, f"Company's own portfolio/case-study page: {pattern}")
-        
-        # It's the company's own website - only valid if it's a specific article
-        path_parts = [p for p in path.split('/') if p]
-        if len(path_parts) < 2:
-            return (False, f"Company's own website without specific article path")
-        # Check if last segment looks like an article (has words/slug)
-        last_segment = path_parts[-1] if path_parts else ''
-        if len(last_segment) < 10 or last_segment in ['index', 'home', 'main']:
-            return (False, f"Company's own website - appears to be generic page")
-    
-    return (True, None)
+    Rules live in url_validator.ArticleUrlValidator (compiled once, memoized per URL).
+    """
+    is_valid, reason = get_url_validator().validate(url, company_name)
+    if reason and reason.startswith("Directory/Database"):
+        print(f"      ⛔ DEBUG: Blocking {reason.split(': ', 1)[-1]}")
+    return (is_valid, reason)
 
 def extract_date_from_text(text: str, max_chars: int = 800) -> tuple:
     """
@@ -471,134 +520,157 @@ def extract_date_from_text(text: str, max_chars: int = 800) -> tuple:
     Returns: (date_obj, date_str) or (None, None) if not found
     
     This enables early rejection of old articles WITHOUT using AI tokens.
+    Patterns live in date_extractor.DateExtractor (compiled once; use
+    get_date_extractor().extract() directly for the confidence score).
     """
-    import re
-    from datetime import datetime
-    
-    # Only scan first portion of text, BUT skip first 200 chars to avoid "Today's Date" in headers
-    # Many sites put the current date in the nav bar.
-    start_idx = 200 if len(text) > 300 else 0
-    text_to_scan = text[start_idx:max_chars+start_idx] if text else ""
-    
-    today = datetime.now()
-    found_dates = []
-
-    # Month name mapping
-    months = {
-        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-        'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-    }
-    
-    # Helper to validate date
-    def matches_today(d):
-        return d.year == today.year and d.month == today.month and d.day == today.day
+    found = get_date_extractor().extract(text, max_chars=max_chars)
+    return (found.date, found.date_str) if found else (None, None)
 
-    # Pattern 1: "January 15, 2026" or "Jan 15, 2026"
-    for match in re.finditer(r'\b(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2}),?\s+(\d{4})\b', text_to_scan, re.IGNORECASE):
-        month_str, day, year = match.groups()
-        try:
-            month = months.get(month_str.lower())
-            if month:
-                d = datetime(int(year), month, int(day))
-                if not matches_today(d): return (d, d.strftime("%Y-%m-%d")) # Prioritize non-today
-                found_dates.append(d)
-        except: pass
-    
-    # Pattern 2: "15 January 2026" (European format)
-    for match in re.finditer(r'\b(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{4})\b', text_to_scan, re.IGNORECASE):
-        day, month_str, year = match.groups()
-        try:
-            month = months.get(month_str.lower())
-            if month:
-                d = datetime(int(year), month, int(day))
-                if not matches_today(d): return (d, d.strftime("%Y-%m-%d"))
-                found_dates.append(d)
-        except: pass
-
-    # Pattern 3: "2026-01-15" (ISO format)
-    for match in re.finditer(r'\b(\d{4})-(\d{2})-(\d{2})\b', text_to_scan):
-        year, month, day = match.groups()
-        try:
-            d = datetime(int(year), int(month), int(day))
-            if not matches_today(d): return (d, d.strftime("%Y-%m-%d"))
-            found_dates.append(d)
-        except: pass
-        
-    # If only found today's date, return it (better than nothing, but risky)
-    if found_dates:
-        return (found_dates[0], found_dates[0].strftime("%Y-%m-%d"))
-    
-    return (None, None)
+# Common paywall keywords to reject
+PAYWALL_KEYWORDS = ["log in", "sign in", "subscribe to read", "access denied", "403 forbidden", "subscription required", "please login"]
 
-def extract_article_content(url: str, apify_client) -> tuple[str, bool]:
-    """
-    Returns (content, used_apify_boolean)
-    ATTEMPT 1: newspaper4k (Standard - Free)
-    ATTEMPT 2: Apify (Fallback - Paid)
-    """
+def _is_paywalled(text):
+    if len(text) < 300: return True
+    intro = text[:500].lower()
+    if any(k in intro for k in PAYWALL_KEYWORDS): return True
+    return False
+
+@traced("fetch:article", result_attrs=lambda r: {"b": len(r[0])})
+def _extract_article_free(url: str, cache_stats: dict = None) -> tuple[str, bool]:
     """
-    Use newspaper4k first (Free/Fast).
-    Fallback to Apify Website Content Crawler if newspaper fails or returns thin content.
-    Returns up to 5000 chars of article content.
+    The free tiers of extract_article_content (ATTEMPT 0 + 1). Returns (content, final):
+    final=False means only the paid Apify fallback can still recover the page.
+    Never spends money, so ArticlePrefetcher runs it speculatively during triage.
     """
-    
-    # Common paywall keywords to reject
-    PAYWALL_KEYWORDS = ["log in", "sign in", "subscribe to read", "access denied", "403 forbidden", "subscription required", "please login"]
-
-    def _is_paywalled(text):
-        if len(text) < 300: return True
-        intro = text[:500].lower()
-        if any(k in intro for k in PAYWALL_KEYWORDS): return True
-        return False
+    # ATTEMPT 0: Article cache (positive and negative entries)
+    cache = get_article_cache()
+    cached = cache.get(url)
+    if cache_stats is not None:
+        key = "article_cache_hits" if cached else "article_cache_misses"
+        cache_stats[key] = cache_stats.get(key, 0) + 1
+    if cached:
+        if cached.get("status") == "negative":
+            print(f"      🗃️ Article cache: known thin/paywalled ({cached.get('reason')}), skipping fetch")
+            return "", True
+        print(f"      🗃️ Article cache hit ({len(cached.get('text', ''))} chars)")
+        if cached.get("published"):
+            remember_published_date(url, DateMatch.from_record(cached["published"]))
+        return cached.get("text", ""), True
 
     # ATTEMPT 1: newspaper4k (Standard - Free)
     try:
         print(f"      🗞️ Extracting via newspaper4k: {url[:60]}...")
         from newspaper import Article
         
-        # Set generous timeout for manual fetch
+        # Set generous timeout for manual fetch; the download goes through the shared keep-alive pool
         art = Article(url, request_timeout=20)
-        art.download()
+        resp = get_http_client().get(url, timeout=20)
+        resp.raise_for_status()
+        if str(resp.url) != url:
+            remember_redirect(url, str(resp.url))
+        art.download(input_html=resp.text)
         art.parse()
         text = art.text
+        if getattr(art, "canonical_link", None):
+            remember_redirect(url, art.canonical_link)
+        published = get_date_extractor().extract_html(getattr(art, "html", "") or "")
+        remember_published_date(url, published)
         
         if not _is_paywalled(text):
-            return text[:5000], False
+            cache.put(url, text[:5000], False, published=published.to_record() if published else None)
+            return text[:5000], True
         print(f"      ⚠️ newspaper4k returned thin/paywalled content")
         
     except Exception as e:
         print(f"      ⚠️ newspaper4k extraction failed: {e}")
+    return "", False
+
+def extract_article_content(url: str, apify_client, cache_stats: dict = None, budget: ScanBudget = None, prefetched: tuple = None) -> tuple[str, bool]:
+    """
+    Returns (content, used_apify_boolean), up to 5000 chars of article content.
+    ATTEMPT 0: Article cache (shared across scans and companies)
+    ATTEMPT 1: newspaper4k (Standard - Free)
+    ATTEMPT 2: Apify Website Content Crawler (Fallback - Paid), when newspaper fails
+               or returns thin / paywalled content
+    cache_stats, when given, gets article_cache_hits / article_cache_misses incremented.
+    used_apify is False on a cache hit: no Apify run was paid for this scan.
+    budget, when given, is charged for the Apify crawler run.
+    prefetched, when given, is the (content, final) result of _extract_article_free
+    already run by the prefetcher: only the Apify fallback is left to try.
+    """
+    text, final = prefetched if prefetched is not None else _extract_article_free(url, cache_stats)
+    if final:
+        return text, False
 
     # ATTEMPT 2: Apify (Fallback - Paid)
     try:
         print(f"      🔄 Falling back to Apify Crawler for {url[:60]}...")
         def _call_apify():
             return apify_client.actor("apify/website-content-crawler").call(
-                run_input={
-                    "startUrls": [{"url": url}],
-                    "maxCrawlPages": 1,
-                    "maxCrawlDepth": 0,
-                    "proxyConfiguration": {"useApifyProxy": True}
-                },
+                run_input=_crawler_run_input(url),
                 timeout_secs=45
             )
             
-        run = GLOBAL_APIFY_BREAKER.call(_call_apify)
+        with span("apify:crawler"):
+            run = GLOBAL_APIFY_BREAKER.call(_call_apify)
         if run:
-            items = apify_client.dataset(run["defaultDatasetId"]).list_items().items
-            if items and len(items) > 0:
-                text = items[0].get("text", "")
-                if not _is_paywalled(text):
-                    print(f"      ✅ Apify recovered content ({len(text)} chars)")
-                    return text[:5000], True
-                print(f"      ⛔ Apify returned thin/paywalled content ({len(text)} chars)")
+            return _crawled_content(url, run, apify_client, budget)
     except Exception as e:
         print(f"      ⚠️ Apify extraction failed: {e}")
 
     return "", False
 
+def _crawler_run_input(url: str) -> dict:
+    return {
+        "startUrls": [{"url": url}],
+        "maxCrawlPages": 1,
+        "maxCrawlDepth": 0,
+        "proxyConfiguration": {"useApifyProxy": True}
+    }
+
+def _crawled_content(url: str, run: dict, apify_client, budget: ScanBudget = None) -> tuple[str, bool]:
+    """(content, used_apify) from a finished website-content-crawler run; reads only its first item."""
+    cache = get_article_cache()
+    if budget is not None:
+        budget.record_apify("apify/website-content-crawler", run)
+    item = next(iter_dataset_items(apify_client, run["defaultDatasetId"], page_size=1), None)
+    if item:
+        text = item.get("text", "")
+        loaded_url = (item.get("metadata") or {}).get("canonicalUrl") or item.get("url")
+        if loaded_url:
+            remember_redirect(url, loaded_url)
+        if not _is_paywalled(text):
+            print(f"      ✅ Apify recovered content ({len(text)} chars)")
+            cache.put(url, text[:5000], True)
+            return text[:5000], True
+        print(f"      ⛔ Apify returned thin/paywalled content ({len(text)} chars)")
+        cache.put_negative(url, f"thin/paywalled ({len(text)} chars)")
+    else:
+        cache.put_negative(url, "no content from crawler")
+    return "", False
+
+async def _apify_run_async(runner: ApifyRunner, actor: str, run_input: dict, timeout_secs: int):
+    """GLOBAL_APIFY_BREAKER-guarded runner start; awaits the finished run (None when the circuit is open)."""
+    started = GLOBAL_APIFY_BREAKER.call(runner.start, actor, run_input, timeout_secs)
+    return await asyncio.wrap_future(started) if started else None
+
+async def extract_article_content_async(url: str, apify_client, runner: ApifyRunner, engine: ScanEngine, budget: ScanBudget = None, prefetched: tuple = None) -> tuple[str, bool]:
+    """extract_article_content for the asyncio path: the crawler run is polled, not waited on in a thread."""
+    if prefetched is None:
+        prefetched = await engine.run("fetch", _extract_article_free, url)
+    text, final = prefetched
+    if final:
+        return text, False
+    try:
+        print(f"      🔄 Falling back to Apify Crawler for {url[:60]}...")
+        with span("apify:crawler"):
+            run = await _apify_run_async(runner, "apify/website-content-crawler", _crawler_run_input(url), 45)
+        if run:
+            return await engine.run("apify", _crawled_content, url, run, apify_client, budget)
+    except Exception as e:
+        print(f"      ⚠️ Apify extraction failed: {e}")
+    return "", False
+
 def truncate_and_structure_for_llm(text: str, source_url: str, title: str) -> str:
     """
     TOKEN DISCIPLINE: 
@@ -628,26 +700,31 @@ def truncate_and_structure_for_llm(text: str, source_url: str, title: str) -> st
     
     return json.dumps(structured_input, indent=2)
 
-def call_openai_analysis(item: dict, sys_prompt: str, openai_key: str, model: str = "gpt-4o") -> dict:
+def call_openai_analysis(item: dict, sys_prompt: str, openai_key: str, model: str = "gpt-4o", llm_cache: LLMCacheSession = None) -> dict:
     """
     Standard helper for AI analysis with JSON format support.
-    Used for specialized scouts and context anchors.
+    Used for specialized scouts and context anchors. Responses are cached on the prompt hash.
     """
     from openai import OpenAI
     import json
     
-    client = OpenAI(api_key=openai_key)
+    client = _openai_client(openai_key)
     
     # Ensure JSON format is requested
     prompt = f"{sys_prompt}\n\nCONTENT TO ANALYZE:\n{item}\n\nReturn valid JSON."
     
+    request = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+    llm_cache = llm_cache or get_llm_cache().session()
+    
     try:
-        completion = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
+        return llm_cache.fetch(
+            "call_openai_analysis", request,
+            lambda: client.chat.completions.create(**request)
         )
-        return json.loads(completion.choices[0].message.content)
     except Exception as e:
         print(f"      [AI Error] {e}")
         # Degrade gracefully: Return un-scored but preserved item
@@ -658,7 +735,7 @@ def call_openai_analysis(item: dict, sys_prompt: str, openai_key: str, model: st
             "summary": f"Unscored signal from {item.get('url', 'unknown source')}"
         }
 
-def analyze_with_article_context(news_item: dict, article_text: str, company_name: str, client_context: str, openai_key: str, account_id: str = None, supabase_client = None, signal_collection_list: list = None) -> dict:
+def analyze_with_article_context(news_item: dict, article_text: str, company_name: str, client_context: str, openai_key: str, account_id: str = None, supabase_client = None, signal_collection_list: list = None, budget: ScanBudget = None) -> dict:
     """
     ADVANCED AI TRIGGER ANALYSIS — Backward-Compatible Wrapper.
 
@@ -669,12 +746,15 @@ def analyze_with_article_context(news_item: dict, article_text: str, company_nam
 
     When use_v6_pipeline=False (default):
       → Runs the existing single-pass analysis (V5 behavior, unchanged)
+
+    budget, when given, is charged from completion.usage (V5) or a size estimate (V6 stages
+    run inside v6_signal_pipeline, which doesn't expose usage).
     """
     from datetime import datetime, timedelta
     from openai import OpenAI
     
     strategy = CLIENT_STRATEGIES.get(client_context, CLIENT_STRATEGIES["pulsepoint_strategic"])
-    client = OpenAI(api_key=openai_key)
+    client = _openai_client(openai_key)
 
     # ── V6 PIPELINE DISPATCH ──
     if strategy.get("use_v6_pipeline", False) and account_id:
@@ -709,6 +789,9 @@ def analyze_with_article_context(news_item: dict, article_text: str, company_nam
             )
             trigger_count = sum(1 for c in classifications if c.get("classification") == "TRIGGER")
             context_count = sum(1 for c in classifications if c.get("classification") == "CONTEXT_ONLY")
+            if budget is not None:
+                budget.record_llm("v6_stage1_extraction", "gpt-4o-mini", prompt_chars=len(article_text or "") + 3000)
+                budget.record_llm("v6_stage2_classification", "gpt-4o", prompt_chars=4000)
             print(f"      🔬 [V6 Stage 2] Classified: {trigger_count} TRIGGER, {context_count} CONTEXT_ONLY, {len(classifications) - trigger_count - context_count} REJECTED")
 
             # Persist all signals to account_context_signals
@@ -806,6 +889,8 @@ Return ONLY valid JSON:
         completion = GLOBAL_LLM_BREAKER.call(_call_gpt)
         if not completion:
             return {"is_relevant": False, "rejection_reason": "LLM Circuit Open"}
+        if budget is not None:
+            budget.record_llm("analyze_with_article_context", "gpt-4o-mini", getattr(completion, "usage", None))
         result = json.loads(completion.choices[0].message.content)
         
         # MAPPING NEW SCHEMA TO OLD (Backwards Compatibility)
@@ -881,7 +966,7 @@ def check_recent_context_anchor(company_id, supabase):
         print(f"      ⚠️ Error checking context history: {e}")
         return False
 
-def analyze_event_relevance(news_item, company_name, client_context, openai_key):
+def analyze_event_relevance(news_item, company_name, client_context, openai_key, llm_cache: LLMCacheSession = None):
     """
     BATTLE-TESTED Trigger Detection.
     Uses OpenAI to filter news for relevance based on CLIENT CONTEXT.
@@ -895,7 +980,7 @@ def analyze_event_relevance(news_item, company_name, client_context, openai_key)
     """
     strategy = CLIENT_STRATEGIES.get(client_context, CLIENT_STRATEGIES["pulsepoint_strategic"])
     
-    client = OpenAI(api_key=openai_key)
+    client = _openai_client(openai_key)
     
     prompt = f"""You are a STRICT Trigger Detection System for {company_name}.
     
@@ -928,17 +1013,22 @@ Return JSON only:
     "rejection_reason": "If rejected, explain why. If approved, null."
 }}"""
     
+    request = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+    llm_cache = llm_cache or get_llm_cache().session()
+
     try:
         def _call_gpt_relevance():
-            return client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
-            )
+            return client.chat.completions.create(**request)
             
-        completion = GLOBAL_LLM_BREAKER.call(_call_gpt_relevance)
-        if not completion: return {"is_relevant": False}
-        result = json.loads(completion.choices[0].message.content)
+        result = llm_cache.fetch(
+            "analyze_event_relevance", request,
+            lambda: GLOBAL_LLM_BREAKER.call(_call_gpt_relevance)
+        )
+        if result is None: return {"is_relevant": False}
         
         # Log rejections for debugging
         if not result.get("is_relevant"):
@@ -950,6 +1040,94 @@ Return JSON only:
         print(f"Analysis Error: {e}")
         return {"is_relevant": False, "rejection_reason": f"API Error: {e}"}
 
+def triage_relevance_batch(news_items: list, company_name: str, client_context: str, openai_key: str, llm_cache: LLMCacheSession = None) -> list:
+    """
+    Batched Trigger Triage.
+    Sends every candidate (title + description) for one company in a single
+    gpt-4o-mini call, with the same rejection criteria as analyze_event_relevance.
+
+    Returns one verdict per input item, in input order:
+        {"is_relevant", "trigger_type", "summary", "confidence", "rejection_reason", "rank"}
+    rank is 1-based among approved items (None when rejected). Items beyond
+    MAX_TRIAGE_ITEMS, or missing from the model's answer, come back rejected
+    with judged=False (they were never actually looked at).
+    """
+    if not news_items:
+        return []
+
+    strategy = CLIENT_STRATEGIES.get(client_context, CLIENT_STRATEGIES["pulsepoint_strategic"])
+    batch = news_items[:MAX_TRIAGE_ITEMS]
+
+    listing = "\n".join(
+        f"[{i}] Title: {item.get('title') or ''}\n    URL: {item.get('url') or ''}\n    Description: {(item.get('description') or '')[:TRIAGE_DESCRIPTION_CHARS]}"
+        for i, item in enumerate(batch)
+    )
+
+    prompt = f"""You are a STRICT Trigger Detection System for {company_name}.
+    
+CONTEXT: {strategy['trigger_prompt']}
+VALID TRIGGER TYPES: {strategy['trigger_types']}
+
+You are given {len(batch)} NEWS ITEMS, numbered [0]..[{len(batch) - 1}]. Judge EACH item independently.
+
+NEWS ITEMS:
+{listing}
+
+CRITICAL REJECTION CRITERIA (if ANY apply, set is_relevant=false):
+1. PORTFOLIO/PROJECT PAGE: If the URL or content appears to be a project showcase, case study, or portfolio page (e.g., from an architecture firm or agency showing past work), REJECT.
+2. GENERIC INDUSTRY ARTICLE: If it's a think-piece, opinion, or industry trend article not specifically about THIS company, REJECT.
+3. OLD NEWS: If there's any indication the event happened more than 30 days ago, or the article is undated, REJECT.
+4. STOCK TICKER NOISE: If it's about stock prices, trading, or financial performance without a real business event, REJECT.
+5. AWARDS WITHOUT CONTEXT: If it's an award but there's no clear indication of when it was received or announced, REJECT.
+6. COMPANY NOT THE SUBJECT: If {company_name} is mentioned but is not the PRIMARY subject of the news, REJECT.
+7. DUPLICATE EVENT: If several items cover the same event, approve only the most informative one.
+
+ONLY approve if:
+- The event is RECENT (within last 30 days)
+- The event is NEWSWORTHY and SPECIFIC to {company_name}
+- The event matches one of the valid trigger types
+
+Return JSON only, one verdict per item:
+{{
+    "verdicts": [
+        {{
+            "index": 0,
+            "is_relevant": true/false,
+            "trigger_type": "One of {strategy['trigger_types']}",
+            "summary": "1-sentence summary of the event",
+            "confidence": 0-10,
+            "rejection_reason": "If rejected, explain why. If approved, null."
+        }}
+    ]
+}}"""
+
+    client = _openai_client(openai_key)
+    request = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+    llm_cache = llm_cache or get_llm_cache().session()
+    try:
+        def _call_gpt_triage():
+            return client.chat.completions.create(**request)
+
+        parsed = llm_cache.fetch(
+            "triage_relevance_batch", request,
+            lambda: GLOBAL_LLM_BREAKER.call(_call_gpt_triage)
+        )
+        if parsed is None:
+            return [rejected_verdict("LLM unavailable (circuit open)") for _ in news_items]
+        raw = parsed.get("verdicts") or []
+    except Exception as e:
+        print(f"Triage Error: {e}")
+        return [rejected_verdict(f"API Error: {e}") for _ in news_items]
+
+    verdicts = verdicts_from_response(raw, len(news_items), len(batch))
+    approved = sum(1 for v in verdicts if v.get("is_relevant"))
+    print(f"      🧮 Triage: {approved}/{len(news_items)} approved in one call")
+    return verdicts
+
 def generate_hook(company_name, event, contact_name, client_context, openai_key):
     """
     Generates ONLY a 1-2 sentence personalized hook referencing the trigger event.
@@ -958,7 +1136,7 @@ def generate_hook(company_name, event, contact_name, client_context, openai_key)
     strategy = CLIENT_STRATEGIES.get(client_context, CLIENT_STRATEGIES["pulsepoint_strategic"])
     hook_context = strategy.get("hook_context", "")
     
-    client = OpenAI(api_key=openai_key)
+    client = _openai_client(openai_key)
     
     # Build prompt with client-specific voice instructions
     prompt = f"""Write a 1-2 sentence opening hook for a cold email to {contact_name} at {company_name}.
@@ -989,36 +1167,44 @@ Return ONLY the hook text, nothing else."""
         return f"The recent news about {company_name} caught my attention."
 
 
+def _load_client_template(supabase, client_context, template_type):
+    # Try client-scoped query first
+    resp = supabase.table("pulsepoint_email_templates")\
+        .select("*")\
+        .eq("type", template_type)\
+        .eq("is_default", True)\
+        .eq("client_context", client_context)\
+        .limit(1)\
+        .execute()
+    
+    if resp.data and len(resp.data) > 0:
+        return resp.data[0]
+    
+    # Fallback: no client-scoped template, try global default
+    resp = supabase.table("pulsepoint_email_templates")\
+        .select("*")\
+        .eq("type", template_type)\
+        .eq("is_default", True)\
+        .limit(1)\
+        .execute()
+    
+    if resp.data and len(resp.data) > 0:
+        return resp.data[0]
+    return None
+
 def get_client_template(supabase, client_context, template_type="initial_outreach"):
     """
     Fetches the default template for a client from the pulsepoint_email_templates table.
     Filters by client_context if the column exists, falls back to global default.
     Returns None if no template exists.
+    Cached per (client, type) until pulsepoint_email_templates changes.
     """
     try:
-        # Try client-scoped query first
-        resp = supabase.table("pulsepoint_email_templates")\
-            .select("*")\
-            .eq("type", template_type)\
-            .eq("is_default", True)\
-            .eq("client_context", client_context)\
-            .limit(1)\
-            .execute()
-        
-        if resp.data and len(resp.data) > 0:
-            return resp.data[0]
-        
-        # Fallback: no client-scoped template, try global default
-        resp = supabase.table("pulsepoint_email_templates")\
-            .select("*")\
-            .eq("type", template_type)\
-            .eq("is_default", True)\
-            .limit(1)\
-            .execute()
-        
-        if resp.data and len(resp.data) > 0:
-            return resp.data[0]
-        return None
+        return get_reference_cache().get(
+            supabase, ("email_template", client_context, template_type),
+            lambda: _load_client_template(supabase, client_context, template_type),
+            depends_on=("pulsepoint_email_templates",)
+        )
     except Exception as e:
         print(f"Template fetch failed: {e}")
         return None
@@ -1239,6 +1425,7 @@ BANNED_OPENERS = {
     "just", "wanted", "reaching", "excited", "thrilled", "delighted",
 }
 
+@traced("draft")
 def generate_draft(
     company_name: str,
     trigger_type_matched: str,
@@ -1251,6 +1438,7 @@ def generate_draft(
     outcome_delta: str = None,
     prospect_style: dict = None,
     client_profile: dict = None,
+    llm_cache: LLMCacheSession = None,
 ):
     """
     Generates a personalised email draft using the strict PulsePoint Email Framework.
@@ -1263,6 +1451,7 @@ def generate_draft(
       profile_completeness, attempt_count
 
     Returns None if intelligence_profile is empty or service_implication is missing.
+    Each attempt's response is cached on (prompt hash, attempt), so a re-run replays the same drafts.
     """
     import json
 
@@ -1309,8 +1498,15 @@ def generate_draft(
     ] + ["insights", "synergies", "touch base", "circle back", "leverage",
          "game-changer", "innovative", "exciting opportunity"]
 
-    openai_client = OpenAI(api_key=openai_key)
+    openai_client = _openai_client(openai_key)
     MAX_ATTEMPTS = 3
+    request = {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.4,
+    }
+    llm_cache = llm_cache or get_llm_cache().session()
 
     last_result = None
     last_constraint_check = None
@@ -1318,19 +1514,17 @@ def generate_draft(
     for attempt in range(1, MAX_ATTEMPTS + 1):
         try:
             def _call_gpt():
-                return openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    temperature=0.4,
-                )
-
-            completion = GLOBAL_LLM_BREAKER.call(_call_gpt)
-            if not completion:
+                return openai_client.chat.completions.create(**request)
+
+            result = llm_cache.fetch(
+                "generate_draft", request,
+                lambda: GLOBAL_LLM_BREAKER.call(_call_gpt),
+                variant=attempt
+            )
+            if result is None:
                 print(f"      [Draft Gen] Circuit breaker open on attempt {attempt}.")
                 break
 
-            result = json.loads(completion.choices[0].message.content)
             body = result.get("body", "")
             cc = result.get("constraint_check") or {}
 
@@ -1493,156 +1687,201 @@ def generate_search_hash(urls: list) -> str:
     import hashlib
     if not urls: return ""
     
-    # Normalize: lowercase, strip query params if needed (simplest is just sorted list)
-    sorted_urls = sorted([u.lower().strip() for u in urls if u])
+    # Normalize: tracking/AMP/mobile variants don't look like new content (memo-free, same in every container)
+    sorted_urls = sorted(set(normalize_url(u) for u in urls if u))
     content = "|".join(sorted_urls)
     
     return hashlib.md5(content.encode()).hexdigest()
 
-def process_company_scan(comp: dict, apify_client, supabase, openai_key: str, force_rescan: bool = False, scan_start: float = None, scan_batch_id: str = None):
+class ScanLog:
     """
-    Orchestrates the monitoring process for a single company.
-    1. Identify Client Strategy
-    2. Build Search Queries
-    3. Execute Search (Apify)
-    4. Fingerprint Check (Efficiency)
-    5. AI Analysis (OpenAI)
-    6. Database Updates
+    OBSERVABILITY: Owns the monitor_scan_log row for a single company scan.
+    The row is inserted as 'running' on creation and closed out by finalize(),
+    which also persists the scan's timing spans (scan_spans.py): the recorder
+    active when the log is created, else a fresh one.
     """
-    company_start = time.time()
-    
-    # OBSERVABILITY: Create scan log entry
-    scan_log_id = None
-    try:
-        log_resp = supabase.table("monitor_scan_log").insert({
-            "company_id": comp.get('id'),
-            "company_name": comp.get('company'),
-            "client_context": comp.get('client_context', 'pulsepoint_strategic'),
-            "scan_batch_id": scan_batch_id,
-            "status": "running"
-        }).execute()
-        if log_resp.data:
-            scan_log_id = log_resp.data[0]['id']
-    except Exception as e:
-        print(f"      ⚠️ Scan log insert failed: {e}")
-    
-    analysis_log = [] # PHASE 6: Confidence Logging
-
+    def __init__(self, supabase, comp: dict, scan_batch_id: str = None):
+        self.supabase = supabase
+        self.started = time.time()
+        self.spans = current_spans() or SpanRecorder()
+        self.analysis_log = []  # PHASE 6: Confidence Logging
+        self.scan_log_id = None
+        try:
+            log_resp = supabase.table("monitor_scan_log").insert({
+                "company_id": comp.get('id'),
+                "company_name": comp.get('company'),
+                "client_context": comp.get('client_context', 'pulsepoint_strategic'),
+                "scan_batch_id": scan_batch_id,
+                "status": "running"
+            }).execute()
+            if log_resp.data:
+                self.scan_log_id = log_resp.data[0]['id']
+        except Exception as e:
+            print(f"      ⚠️ Scan log insert failed: {e}")
 
-    
-    # Helper to finalize the scan log entry
-    def _finalize_scan_log(status, error=None, trigger_found=False, trigger_type=None, counters=None):
-        if not scan_log_id:
+    def finalize(self, status, error=None, trigger_found=False, trigger_type=None, counters=None):
+        if not self.scan_log_id:
             return
         try:
             update = {
                 "status": status,
                 "completed_at": "now()",
-                "elapsed_seconds": round(time.time() - company_start, 2),
+                "elapsed_seconds": round(time.time() - self.started, 2),
                 "trigger_found": trigger_found,
                 "trigger_type": trigger_type,
-                "analysis_log": analysis_log
+                "analysis_log": self.analysis_log
             }
             if error:
                 update["error"] = str(error)[:500]
             if counters:
                 update.update(counters)
-            supabase.table("monitor_scan_log").update(update).eq("id", scan_log_id).execute()
+            update.update(self.spans.counters())
+            self.supabase.table("monitor_scan_log").update(update).eq("id", self.scan_log_id).execute()
         except Exception as e:
             print(f"      ⚠️ Scan log update failed: {e}")
-    
-    # TIME BUDGET GUARD: Skip if we're running low on wall-clock time
-    if scan_start and (time.time() - scan_start) > 780:  # 13 min guard (out of 15 min worker limit)
-        print(f"⏱️ TIME BUDGET EXHAUSTED: Skipping {comp.get('company')} (elapsed: {int(time.time() - scan_start)}s)")
-        _finalize_scan_log("skipped_budget")
-        return
 
-    print(f"🏢 Scanning: {comp.get('company')} (Strategy: {comp.get('client_context')})")
-    
-    strategy_slug = comp.get("client_context", "pulsepoint_strategic")
-    client_context = strategy_slug  # Alias used throughout this function
-    strategy = CLIENT_STRATEGIES.get(strategy_slug, CLIENT_STRATEGIES.get("pulsepoint_strategic"))
-    
-    if not strategy:
-        print(f"❌ CRITICAL ERROR: Strategy '{strategy_slug}' not found and fallback 'pulsepoint_strategic' missing.")
-        print(f"   Available strategies: {list(CLIENT_STRATEGIES.keys())}")
-        _finalize_scan_log("failed_no_strategy")
-        return
 
-    # ── V6: Fetch velocity baseline BEFORE scouts run
-    # Must be available at Stage 2.5 call site — fetched here so scouts don't delay it.
+# ==================== SCAN STAGES ====================
+# Shared by process_company_scan (threaded) and process_company_scan_async (asyncio).
+
+def _load_velocity_ratio(supabase, account_id: str, client_id: str) -> float:
+    """One account's velocity_ratio (1.0 without a baseline row)."""
+    rows = (
+        supabase.table("account_signal_baselines")
+        .select("velocity_ratio")
+        .eq("account_id", account_id)
+        .eq("client_id", client_id)
+        .execute()
+    ).data
+    return float(rows[0].get("velocity_ratio", 1.0) or 1.0) if rows else 1.0
+
+@traced("supabase:velocity")
+def _fetch_velocity_ratio(comp: dict, strategy: dict, supabase) -> float:
+    """
+    V6: Fetch velocity baseline BEFORE scouts run.
+    Must be available at Stage 2.5 call site — fetched up front so scouts don't delay it.
+    Cached per account on the reference cache's plain TTL (the table is rewritten too
+    often for version tracking, and one row is all a scan needs).
+    """
     v6_velocity_ratio = 1.0  # Default: no spike
     if strategy.get("use_v6_pipeline", False) and comp.get('id'):
         try:
             strategy_slug_for_baseline = comp.get("client_context", "pulsepoint_strategic")
-            baseline_resp = (
-                supabase.table("account_signal_baselines")
-                .select("velocity_ratio")
-                .eq("account_id", comp['id'])
-                .eq("client_id", strategy_slug_for_baseline)
-                .execute()
+            v6_velocity_ratio = get_reference_cache().get(
+                supabase, ("velocity_baseline", strategy_slug_for_baseline, comp['id']),
+                lambda: _load_velocity_ratio(supabase, comp['id'], strategy_slug_for_baseline)
             )
-            if baseline_resp.data:
-                v6_velocity_ratio = float(baseline_resp.data[0].get("velocity_ratio", 1.0) or 1.0)
             print(f"      📊 [V6] Velocity ratio: {v6_velocity_ratio:.2f}x baseline")
         except Exception as e:
             print(f"      ⚠️ [V6] Baseline lookup failed (non-fatal): {e}")
+    return v6_velocity_ratio
+
+# Primary search run input (minus "queries"); the search broker batches scans with identical options
+GOOGLE_NEWS_SEARCH_INPUT = {
+    "resultsPerPage": 15,
+    "maxPagesPerQuery": 1,
+    "languageCode": "",
+    "mobileResults": False,
+    "includeUnfilteredResults": False,
+    "saveHtml": False,
+    "saveHtmlToKeyValueStore": False,
+    "includeIcons": False,
+    # CRITICAL: Enforce Time Range to prevent "Ghost Dates" (old news ranking high)
+    "timeRange": "week" # strict "last 7 days"
+}
 
-    # Buffer for Stage 2.5: collects all classified signals from this scan pass
-    all_v6_classified_signals = []
+def _google_search_query(comp: dict, strategy: dict) -> str:
+    # Limit to 1 query for cost/speed (Deep Monitoring uses scouts)
+    return build_search_queries(comp.get('company'), strategy, website=comp.get('website'))[0]
+
+def _organic_to_results(organic: list) -> list:
+    return [{
+        "title": res.get("title"),
+        "url": res.get("url"),
+        "description": res.get("description"),
+        "date": res.get("date")
+    } for res in organic]
+
+def _brokered_results(hit: dict, budget: ScanBudget = None) -> list:
+    """Search results from a SearchBroker hit; bills this scan its share of the batched run."""
+    if budget is not None:
+        budget.record_apify("apify/google-search-scraper", {"usageTotalUsd": hit.get("cost_usd")})
+    return _organic_to_results(hit["organic"])
+
+@traced("search")
+def _run_google_search(comp: dict, strategy: dict, apify_client, budget: ScanBudget = None, search_broker: SearchBroker = None):
+    """
+    Runs the primary Google Search (Apify) for a company.
+    With a search_broker, the query rides a batched run shared with concurrent scans
+    (falls back to a direct run if the batch fails).
+    Returns the list of organic results, or None if the search failed after retry.
+    """
+    query = _google_search_query(comp, strategy)
 
-    # 1. Build Queries and Search
-    queries = build_search_queries(comp.get('company'), strategy, website=comp.get('website'))
+    print(f"      🔎 Searching Google News (Last 7 Days)...")
+    if search_broker is not None:
+        try:
+            return _brokered_results(search_broker.search(query, **GOOGLE_NEWS_SEARCH_INPUT), budget)
+        except Exception as e:
+            print(f"      ⚠️ Batched search failed ({e}). Running it directly...")
     
     # Run Google Search via Apify
     # Use Circuit Breaker to prevent cascading failures + retry on failure
     def _call_apify_search():
         return apify_client.actor("apify/google-search-scraper").call(
-            run_input={
-                "queries": "\n".join(queries[:1]),  # Limit to 1 query for cost/speed (Deep Monitoring uses scouts)
-                "resultsPerPage": 15,
-                "maxPagesPerQuery": 1,
-                "languageCode": "",
-                "mobileResults": False,
-                "includeUnfilteredResults": False,
-                "saveHtml": False,
-                "saveHtmlToKeyValueStore": False,
-                "includeIcons": False,
-                # CRITICAL: Enforce Time Range to prevent "Ghost Dates" (old news ranking high)
-                "timeRange": "week" # strict "last 7 days"
-            },
+            run_input={"queries": query, **GOOGLE_NEWS_SEARCH_INPUT},
             timeout_secs=60
         )
-    
-    print(f"      🔎 Searching Google News (Last 7 Days)...")
+
     run = GLOBAL_APIFY_BREAKER.call(_call_apify_search)
     
-    # RETRY: If first attempt failed, wait and try once more
-    if not run:
+    # RETRY: If first attempt failed, wait and try once more (pointless while the circuit is open)
+    if not run and not GLOBAL_APIFY_BREAKER.is_open:
         print("      ⚠️ Search failed. Retrying in 10s...")
         time.sleep(10)
         run = GLOBAL_APIFY_BREAKER.call(_call_apify_search)
     
     if not run:
         print("      ❌ Search failed after retry. Skipping.")
-        _finalize_scan_log("failed_search", error="Apify search failed after retry")
-        return
+        return None
+    if budget is not None:
+        budget.record_apify("apify/google-search-scraper", run)
 
     # Extract Results
     search_results = []
-    dataset = apify_client.dataset(run["defaultDatasetId"])
-    
-    for item in dataset.list_items().items:
-        organic = item.get("organicResults", [])
-        for res in organic:
-            search_results.append({
-                "title": res.get("title"),
-                "url": res.get("url"),
-                "description": res.get("description"),
-                "date": res.get("date")
-            })
-            
-    # ==================== EFFICIENCY: FINGERPRINT CHECK ====================
+    for item in iter_dataset_items(apify_client, run["defaultDatasetId"]):
+        search_results.extend(_organic_to_results(item.get("organicResults", [])))
+
+    return search_results
+
+@traced("search")
+async def _run_google_search_async(comp: dict, strategy: dict, apify_client, runner: ApifyRunner, engine: ScanEngine, budget: ScanBudget = None):
+    """_run_google_search for the asyncio path: same retry, the run is polled by `runner`."""
+    query = _google_search_query(comp, strategy)
+    run_input = {"queries": query, **GOOGLE_NEWS_SEARCH_INPUT}
+    print(f"      🔎 Searching Google News (Last 7 Days)...")
+    run = await _apify_run_async(runner, "apify/google-search-scraper", run_input, 60)
+    if not run and not GLOBAL_APIFY_BREAKER.is_open:  # Pointless while the circuit is open
+        print("      ⚠️ Search failed. Retrying in 10s...")
+        await asyncio.sleep(10)
+        run = await _apify_run_async(runner, "apify/google-search-scraper", run_input, 60)
+    if not run:
+        print("      ❌ Search failed after retry. Skipping.")
+        return None
+    if budget is not None:
+        budget.record_apify("apify/google-search-scraper", run)
+
+    def _read():
+        return [res for item in iter_dataset_items(apify_client, run["defaultDatasetId"])
+                for res in _organic_to_results(item.get("organicResults", []))]
+    return await engine.run("apify", _read)
+
+@traced("fingerprint")
+def _check_search_fingerprint(comp: dict, search_results: list, writes: ScanWriteBuffer, force_rescan: bool = False) -> tuple:
+    """
+    EFFICIENCY: Compares the result fingerprint against the previous scan.
+    Returns (unchanged: bool, new_hash: str). Stores the new hash when content changed.
+    """
     # Calculate hash of ALL URLs found
     current_urls = [r.get("url") for r in search_results]
     new_hash = generate_search_hash(current_urls)
@@ -1651,156 +1890,941 @@ def process_company_scan(comp: dict, apify_client, supabase, openai_key: str, fo
     if not force_rescan and last_hash and new_hash == last_hash:
         print(f"      💨 EFFICIENCY: Result Fingerprint matches previous scan. No new news. Skipping AI analysis.")
         # Update timestamp only
-        supabase.table("triggered_companies").update({
-            "last_monitored_at": "now()"
-        }).eq("id", comp['id']).execute()
-        _finalize_scan_log("skipped_fingerprint", counters={"apify_calls": 1})
-        return
+        writes.update_company({"last_monitored_at": "now()"})
+        return (True, new_hash)
 
-    # Update hash immediately so next run knows
-    supabase.table("triggered_companies").update({
-        "last_search_hash": new_hash
-    }).eq("id", comp['id']).execute()
-    
-    # Initialize merged result list and dedup set from Google search results
-    all_results = list(search_results)
-    seen_urls = set(r.get("url") for r in search_results if r.get("url"))
-    
-    print(f"      ✨ New Content Detected (Hash: {new_hash[:8]}). Analyzing {len(search_results)} items...")
+    # Store hash so next run knows (flushed with the scan's other writes, even on crash)
+    writes.update_company({"last_search_hash": new_hash})
+    return (False, new_hash)
+
+@traced("supabase:scout_setup")
+def _build_scout_jobs(comp: dict, strategy: dict, apify_client, supabase, writes: ScanWriteBuffer, force_rescan: bool, score_factors: dict, search_broker: SearchBroker = None) -> list:
+    """
+    Applies scout throttles and returns the scouts to run as (scout_type, func, args) tuples.
+    Throttle timestamps are recorded (write-behind) as soon as a scout is queued.
+    """
+    scout_jobs = []
     
-    # ==================== DEEP SCOUTS (Async Phase 7) ====================
-    # Run Blog, Social, and LinkedIn scouts in parallel
-    score_factors = comp.get('score_factors', {}) or {}  # Always define (fixes crash when no website)
+    # 1. Direct Blog Scout
+    if comp.get('website'):
+        cached_blog_url = score_factors.get('blog_url')
+        scout_jobs.append(('blog', scout_latest_blog_posts, (comp['company'], comp['website'], apify_client, cached_blog_url, search_broker)))
 
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        futures = {}
-        
-        # 1. Direct Blog Scout
-        if comp.get('website'):
-            cached_blog_url = score_factors.get('blog_url')
-            futures[executor.submit(scout_latest_blog_posts, comp['company'], comp['website'], apify_client, cached_blog_url)] = 'blog'
+    # 2. Executive Social Scout
+    contacts = []
+    try:
+        leads_table = strategy.get("leads_table", "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS")
+        contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
+        contacts = contacts_resp.data or []
+        if contacts:
+            print(f"      👥 Social Scout checking {len(contacts[:3])} executives...")
+            for contact in contacts[:3]: # Cap at top 3
+                # Social Scout Throttling (4 Days)
+                last_social = score_factors.get('last_social_scout_at')
+                should_run_social = True
+                if last_social and not force_rescan:
+                     try:
+                        last_date = datetime.fromisoformat(last_social)
+                        if (datetime.now(timezone.utc) - last_date).days < 4:
+                            should_run_social = False
+                     except: pass
+                
+                if should_run_social:
+                    # We update timestamp roughly (per contact is too granular, just use company level)
+                    # We'll update it once for the company if we run any
+                    pass 
+                    scout_jobs.append(('social', scout_executive_social_activity, (contact['name'], comp['company'], apify_client)))
+            
+            # Update social timestamp if we queued any
+            if should_run_social: # Use the flag from loop
+                 writes.merge_score_factors({"last_social_scout_at": datetime.now(timezone.utc).isoformat()})
+    except Exception as e:
+        print(f"      ⚠️ Social Scout setup failed: {e}")
 
-        # 2. Executive Social Scout
-        contacts = []
+        # 3. LinkedIn Activity Scout (Throttled: 4 Days)
         try:
-            leads_table = strategy.get("leads_table", "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS")
-            contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
-            contacts = contacts_resp.data or []
-            if contacts:
-                print(f"      👥 Social Scout checking {len(contacts[:3])} executives...")
-                for contact in contacts[:3]: # Cap at top 3
-                    # Social Scout Throttling (4 Days)
-                    last_social = score_factors.get('last_social_scout_at')
-                    should_run_social = True
-                    if last_social and not force_rescan:
-                         try:
-                            last_date = datetime.fromisoformat(last_social)
-                            if (datetime.now(timezone.utc) - last_date).days < 4:
-                                should_run_social = False
-                         except: pass
-                    
-                    if should_run_social:
-                        # We update timestamp roughly (per contact is too granular, just use company level)
-                        # We'll update it once for the company if we run any
-                        pass 
-                        futures[executor.submit(scout_executive_social_activity, contact['name'], comp['company'], apify_client)] = 'social'
+            should_run_linkedin = True
+            score_factors = comp.get('score_factors', {}) or {}
+            linkedin_company_url = score_factors.get('linkedin_company_url')
+            last_linkedin_scout = score_factors.get('last_linkedin_scout_at')
+            
+            # Check 4-Day Throttle
+            if last_linkedin_scout and not force_rescan:
+                try:
+                    last_date = datetime.fromisoformat(last_linkedin_scout)
+                    if (datetime.now(timezone.utc) - last_date).days < 4:
+                        print(f"      💰 Skipping LinkedIn Scout (Throttled: Last ran {last_linkedin_scout[:10]})")
+                        should_run_linkedin = False
+                except: pass
+            
+            if should_run_linkedin:
+                # Update timestamp
+                writes.merge_score_factors({"last_linkedin_scout_at": datetime.now(timezone.utc).isoformat()})
+                
+                # Build lead LinkedIn URLs from contacts
+                lead_linkedin_urls = [
+                    {"name": c.get("name"), "linkedin": c.get("linkedin_url")}
+                    for c in contacts if c.get("linkedin_url")
+                ][:2]  # Max 2 executives
                 
-                # Update social timestamp if we queued any
-                if should_run_social: # Use the flag from loop
-                     merge_score_factors(supabase, comp['id'], {"last_social_scout_at": datetime.now(timezone.utc).isoformat()})
+                scout_jobs.append(('linkedin', scout_linkedin_activity, (
+                    comp['company'],
+                    linkedin_company_url,
+                    lead_linkedin_urls,
+                    apify_client,
+                    supabase,
+                    comp.get('id')
+                )))
+                
+        except Exception as e:
+            print(f"      ⚠️ LinkedIn Scout setup failed: {e}")
+
+    # 4. HiringScout (V6 — Throttled: 7 Days)
+    if strategy.get("use_v6_pipeline", False) and comp.get('website'):
+        try:
+            last_hiring = score_factors.get('last_hiring_scout_at')
+            should_run_hiring = True
+            if last_hiring and not force_rescan:
+                try:
+                    last_date = datetime.fromisoformat(last_hiring)
+                    if (datetime.now(timezone.utc) - last_date).days < 7:
+                        print(f"      💰 Skipping Hiring Scout (Throttled: Last ran {last_hiring[:10]})")
+                        should_run_hiring = False
+                except: pass
+
+            if should_run_hiring:
+                writes.merge_score_factors({"last_hiring_scout_at": datetime.now(timezone.utc).isoformat()})
+                scout_jobs.append(('hiring', scout_hiring_activity, (
+                    comp['company'],
+                    comp['website'],
+                    apify_client,
+                    supabase,
+                    comp.get('id')
+                )))
+        except Exception as e:
+            print(f"      ⚠️ Hiring Scout setup failed: {e}")
+
+    # 5. WebChangeScout (V6 — Throttled: 14 Days)
+    if strategy.get("use_v6_pipeline", False) and comp.get('website'):
+        try:
+            last_webchange = score_factors.get('last_webchange_scout_at')
+            should_run_webchange = True
+            if last_webchange and not force_rescan:
+                try:
+                    last_date = datetime.fromisoformat(last_webchange)
+                    if (datetime.now(timezone.utc) - last_date).days < 14:
+                        print(f"      💰 Skipping WebChange Scout (Throttled: Last ran {last_webchange[:10]})")
+                        should_run_webchange = False
+                except: pass
+
+            if should_run_webchange:
+                writes.merge_score_factors({"last_webchange_scout_at": datetime.now(timezone.utc).isoformat()})
+                scout_jobs.append(('webchange', scout_website_changes, (
+                    comp['company'],
+                    comp['website'],
+                    apify_client,
+                    supabase,
+                    comp.get('id')
+                )))
         except Exception as e:
-            print(f"      ⚠️ Social Scout setup failed: {e}")
+            print(f"      ⚠️ WebChange Scout setup failed: {e}")
+
+    return [(scout_type, _resolving_redirects(func), args) for scout_type, func, args in scout_jobs]
+
+def _resolving_redirects(scout):
+    """
+    Wraps a scout so shortener URLs in its output are resolved (and memoized) on the
+    scout's worker thread; _merge_scout_items then only reads the memo, never does I/O.
+    """
+    @functools.wraps(scout)
+    def run(*args):
+        res = scout(*args)
+        for item in res or []:
+            url = item.get('url', '')
+            if is_redirect_host(url):
+                resolve_redirect(url)
+        return res
+    return run
+
+def _dedup_search_results(search_results: list) -> tuple:
+    """(all_results, seen_urls): search results minus canonical duplicates, and their canonical URLs."""
+    all_results, seen_urls = [], set()
+    for r in search_results:
+        key = canonicalize_url(r.get("url"))
+        if key and key in seen_urls:
+            continue
+        seen_urls.add(key)
+        all_results.append(r)
+    return all_results, seen_urls
+
+def _merge_scout_items(scout_type: str, res: list, all_results: list, seen_urls: set, comp: dict, score_factors: dict, writes: ScanWriteBuffer) -> None:
+    """
+    Normalizes one scout's output into all_results (and caches a discovered blog hub).
+    seen_urls holds canonical URLs; items already present under any spelling are dropped.
+    """
+    for item in res:
+        # CACHING LOGIC: If we found the blog hub, save it
+        if scout_type == 'blog' and item.get('source') == 'direct_hub_capture':
+             found_blog_url = item.get('url')
+             if found_blog_url and score_factors.get('blog_url') != found_blog_url:
+                  print(f"      💾 [Cache] Saving new Blog URL: {found_blog_url}")
+                  writes.merge_score_factors({"blog_url": found_blog_url})
+
+        # Dedup on canonical URL (shorteners were resolved on the scout's thread; see _resolving_redirects)
+        url = item.get('url', '')
+        key = canonicalize_url(url)
+        if key and key in seen_urls:
+            continue
+        seen_urls.add(key)
+
+        # Normalize format based on source
+        if scout_type == 'blog':
+            all_results.append({
+                "url": item['url'],
+                "title": item['title'],
+                "description": item['text'][:200],
+                "is_scouted_blog": True
+            })
+        elif scout_type == 'social':
+            all_results.append({
+                "url": item['url'],
+                "title": item['title'],
+                "description": item['text'],
+                "is_scouted_social": True,
+                "person_name": item.get('person_name'),
+                "verification_status": item.get('verification_status', 'unknown')
+            })
+        elif scout_type == 'linkedin':
+            all_results.append({
+                "url": item['url'],
+                "title": item['title'],
+                "description": item.get('description', item.get('text', '')[:300]),
+                "is_scouted_social": True,
+                "person_name": item.get('person_name'),
+                "verification_status": "verified",  # Direct scrape = verified
+                "event_type": "LINKEDIN_ACTIVITY"
+            })
+        elif scout_type == 'hiring':
+            all_results.append({
+                "url": item.get('url', ''),
+                "title": item.get('title', ''),
+                "description": item.get('description', item.get('text', '')[:300]),
+                "is_scouted_hiring": True,
+                "verification_status": "verified",
+                "event_type": "HIRING_SIGNAL"
+            })
+        elif scout_type == 'webchange':
+            all_results.append({
+                "url": item.get('url', ''),
+                "title": item.get('title', ''),
+                "description": item.get('description', item.get('text', '')[:300]),
+                "is_scouted_webchange": True,
+                "verification_status": "verified",
+                "event_type": "WEB_CHANGE"
+            })
+
+def _log_relevance(analysis_log: list, news_item: dict, quick_analysis: dict) -> None:
+    # LOGGING: Record quick analysis
+    analysis_log.append({
+        "url": news_item.get('url'),
+        "title": news_item.get('title'),
+        "stage": "relevance",
+        "confidence": quick_analysis.get('confidence', 0),
+        "is_relevant": quick_analysis.get('is_relevant'),
+        "decision": "pass" if quick_analysis.get('is_relevant') else "rejected",
+        "model": "gpt-4o-mini",
+        "reasoning": quick_analysis.get("reasoning") or quick_analysis.get("rejection_reason") or "No reasoning provided",
+        "rank": quick_analysis.get("rank"),
+        "content_snippet": (news_item.get("description") or "")[:500]
+    })
+
+def _passes_date_precheck(article_text: str, strategy: dict, url: str = None) -> bool:
+    """
+    Date pre-check on the article. False means the article is too old to analyze.
+    A publish date read from the page's HTML metadata at fetch time wins over the body regex.
+    """
+    found = (published_date_for(url) if url else None) or get_date_extractor().extract(article_text)
+    
+    if found:
+        # Use strategy max_age for pre-check too
+        age_limit = int(strategy.get("max_age_days", 25))
+        if is_stale(found, age_limit, min_confidence=ARTICLE_DATE_MIN_CONFIDENCE):
+            print(f"      ⛔ EARLY REJECT: Article dated {found.date_str} ({found.source}) is older than {age_limit}-day cutoff")
+            return False
+        else:
+            print(f"      📅 Date verified: {found.date_str} ({found.source}, confidence {found.confidence:.2f})")
+    else:
+
+         # GHOST DATE PROTECTION - RELAXED
+         # If simple extractor fails, let the LLM try.
+         print(f"      ⚠️ No date found in pre-check. Proceeding to Deep Analysis (LLM) for verification.")
+         # continue  <-- REMOVED TO ALLOW LLM CHECK
+    return True
+
+def _drop_stale_candidates(candidates: list, strategy: dict, seen_outcomes: dict) -> list:
+    """
+    Pre-triage date filter on search/scout snippets (result `date` field + description).
+    Only confident dates reject, so undated items still reach triage.
+    """
+    age_limit = int(strategy.get("max_age_days", 25))
+    snippets = [f"{res.get('date') or ''} {res.get('description') or ''}" for res in candidates]
+    dates = get_date_extractor().extract_many(snippets, max_chars=400, snippet=True)
+    fresh = []
+    for res, found in zip(candidates, dates):
+        if is_stale(found, age_limit, min_confidence=SNIPPET_DATE_MIN_CONFIDENCE):
+            mark_seen(seen_outcomes, res, "stale")
+            continue
+        fresh.append(res)
+    dropped = len(candidates) - len(fresh)
+    if dropped:
+        print(f"      💨 EFFICIENCY: {dropped} stale results dropped before triage (>{age_limit} days)")
+    return fresh
+
+@traced("deep_analysis")
+def _run_deep_analysis(news_item: dict, article_text: str, comp: dict, client_context: str, openai_key: str, supabase, analysis_log: list, all_v6_classified_signals: list, budget: ScanBudget = None) -> dict:
+    """Deep (article-context) analysis of a single candidate, recorded in the analysis log."""
+    analysis = analyze_with_article_context(
+        news_item, article_text, comp['company'], client_context, openai_key,
+        account_id=comp.get('id'), supabase_client=supabase,
+        signal_collection_list=all_v6_classified_signals, budget=budget
+    )
+
+    # LOGGING: Deep analysis
+    analysis_log.append({
+        "url": news_item.get('url'),
+        "title": news_item.get('title'),
+        "stage": "deep_analysis",
+        "confidence": analysis.get('confidence', 0),
+        "is_relevant": analysis.get('is_relevant'),
+        "decision": "triggered" if analysis.get('is_relevant') else "rejected",
+        "model": "gpt-4o-mini",
+        "reasoning": analysis.get("reasoning", "No reasoning provided"),
+        "content_snippet": article_text[:500] if article_text else ""
+    })
+    return analysis
+
+def _already_triggered(supabase, comp: dict, url: str, dedup_filter: TriggerDedupFilter = None) -> bool:
+    """
+    trigger_dedup lookup on the normalized URL (other spellings too, see source_url_keys).
+    With the batch filter, only filter hits pay for the query.
+    """
+    keys = source_url_keys(url)
+    if dedup_filter is not None and not any(dedup_filter.might_contain(comp['id'], k) for k in keys):
+        return False
+    existing_dedup = supabase.table("trigger_dedup").select("id").eq("company_id", comp['id']).in_("source_url", keys or [url]).execute()
+    return bool(existing_dedup.data)
 
-            # 3. LinkedIn Activity Scout (Throttled: 4 Days)
+@traced("dedup")
+def _drop_already_triggered(candidates: list, comp: dict, dedup_filter: TriggerDedupFilter, supabase, seen_outcomes: dict = None) -> list:
+    """
+    Pre-extraction dedup: candidates the batch filter flags are confirmed against
+    trigger_dedup in one query and dropped. Without a filter this is a no-op and
+    dedup happens at trigger time, as before.
+    """
+    if dedup_filter is None or not candidates:
+        return candidates
+    keys_of = {id(res): source_url_keys(res.get('url')) for res in candidates}
+    hits = [res for res in candidates if any(dedup_filter.might_contain(comp['id'], k) for k in keys_of[id(res)])]
+    if not hits:
+        return candidates
+    keys = list({k for res in hits for k in keys_of[id(res)]})
+    try:
+        resp = supabase.table("trigger_dedup").select("source_url").eq("company_id", comp['id']).in_("source_url", keys).execute()
+        triggered = {normalize_url(row.get("source_url") or "") for row in (resp.data or [])}
+    except Exception as e:
+        print(f"      ⚠️ Dedup pre-check failed, deferring to trigger-time check: {e}")
+        return candidates
+    fresh = []
+    for res in candidates:
+        if any(normalize_url(k) in triggered for k in keys_of[id(res)]):
+            if seen_outcomes is not None:
+                mark_seen(seen_outcomes, res, "duplicate")
+            continue
+        fresh.append(res)
+    dropped = len(candidates) - len(fresh)
+    if dropped:
+        print(f"      ♻️ DEDUP: {dropped} already-triggered URLs skipped before extraction")
+    return fresh
+
+@traced("trigger")
+def _handle_confirmed_trigger(res: dict, analysis: dict, comp: dict, strategy: dict, client_context: str, apify_client, supabase, writes: ScanWriteBuffer, openai_key: str, dedup_filter: TriggerDedupFilter = None, llm_cache: LLMCacheSession = None):
+    """
+    Persists a confirmed trigger: dedup check, routing, signal intelligence,
+    contact enrichment and draft generation.
+    Returns the trigger type, or None if this URL already triggered before (dedup).
+    """
+    # DEDUP CHECK
+    if _already_triggered(supabase, comp, res.get('url'), dedup_filter):
+        print(f"      ♻️ DEDUP: Already triggered on this URL. Skipping.")
+        return None
+
+    # ROUTING: LinkedIn/Social -> Pending Review (No Auto-Draft)
+    if res.get('is_scouted_social'):
+        print(f"      📌 LINKEDIN SIGNAL: Routing to 'pending_review' (No Auto-Draft)")
+        writes.merge_score_factors({
+            "outcome_delta": analysis.get('outcome_delta'),
+            "buying_window": analysis.get('buying_window')
+        })
+        writes.update_company({
+            "event_type": "LINKEDIN_ACTIVITY",
+            "event_title": analysis['summary'],
+            "event_source_url": res.get('url'),
+            "last_monitored_at": "now()",
+            "monitoring_status": "pending_review"
+        })
+        
+        # Record Dedup
+        writes.insert("trigger_dedup", {
+            "company_id": comp['id'],
+            "source_url": normalize_url(res.get('url')),
+            "trigger_type": "LINKEDIN_ACTIVITY"
+        })
+        
+        return "LINKEDIN_ACTIVITY"
+
+    # DEFAULT ROUTING: Real-Time News -> Triggered (Auto-Draft)
+    writes.merge_score_factors({
+        "outcome_delta": analysis.get('outcome_delta'),
+        "buying_window": analysis.get('buying_window')
+    })
+    writes.update_company({
+        "event_type": "REAL_TIME_DETECTED",
+        "event_title": analysis['summary'],
+        "event_source_url": res.get('url'),
+        "last_monitored_at": "now()",
+        "monitoring_status": "triggered"
+    })
+    
+    # --- SIGNAL INTELLIGENCE LAYER ---
+    # Compute Deal Score & Context
+    sig_date = res.get('date') or datetime.now().isoformat()
+    deal_score = compute_deal_score(
+        confidence=analysis.get('confidence', 0),
+        signal_type="REAL_TIME_DETECTED",
+        signal_date_str=sig_date,
+        scoring_config=strategy.get("scoring_config")
+    )
+    
+    # Prepare Signal Context for Leads
+    signal_context = {
+        "signal_type": "REAL_TIME_DETECTED",
+        "confidence_score": analysis.get('confidence', 0),
+        "deal_score": deal_score,
+        "signal_date": str(sig_date)[:10],
+        "recency_days": (datetime.now() - datetime.strptime(str(sig_date)[:10], "%Y-%m-%d")).days,
+        "why_now": analysis.get('summary', '')[:300], # Trucate to 300 chars
+        "evidence_quote": analysis.get('evidence_excerpt', '') or analysis.get('description', ''),
+        "source_url": res.get('url')
+    }
+    print(f"      🧠 Signal Intelligence: Deal Score {deal_score}/100 | Conf {signal_context['confidence_score']}")
+
+    
+    # Record Dedup
+    writes.insert("trigger_dedup", {
+        "company_id": comp['id'],
+        "source_url": normalize_url(res.get('url')),
+        "trigger_type": "REAL_TIME_DETECTED"
+    })
+    
+    # Contact Enrichment Logic
+    leads_table = strategy.get("leads_table", "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS")
+    print(f"      Looking for contacts in: {leads_table}")
+    contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
+    contacts = contacts_resp.data
+    
+    if not contacts:
+        print(f"      ⚠️ No contacts found - triggering JIT enrichment...")
+        enrich_company_contacts(
+            company_id=comp['id'],
+            company_name=comp['company'],
+            existing_website=comp.get('website'),
+            client_context=client_context,
+            apify_client=apify_client,
+            supabase=supabase,
+            signal_context=signal_context
+        )
+        # Re-fetch
+        contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
+        contacts = contacts_resp.data
+    else:
+        # UPDATE EXISTING CONTACTS with new signal data (one update for all of them)
+        print(f"      🔄 Updating {len(contacts)} existing contacts with new signal data...")
+        writes.update_rows(leads_table, [c.get('id') for c in contacts], signal_context)
+        # Apply locally instead of re-fetching: memory matches what the flush will write
+        for c in contacts:
+            c.update(signal_context)
+
+    
+    # Generate Drafts
+    for contact in contacts:
+        contact_email = contact.get('email')
+        if contact_email:
+            contact_name = contact.get('name', 'there') or 'there'
+
+            # Heuristic prospect style extraction — no LLM call
+            prospect_style = extract_prospect_style(comp)
+            # Persist to triggered_companies.prospect_style for observability
+            writes.update_company({"prospect_style": prospect_style})
+
+            # V2 draft generation — passes intelligence_profile, tensions, and prospect style
+            draft_payload = generate_draft(
+                company_name=comp['company'],
+                trigger_type_matched=analysis.get('trigger_type', 'Growth Signal'),
+                primary_evidence_quote=analysis.get('evidence_excerpt', analysis.get('summary', '')),
+                contact_name=contact_name,
+                client_context=client_context,
+                openai_key=openai_key,
+                supabase=supabase,
+                buying_window=analysis.get('buying_window', 'Exploration'),
+                outcome_delta=analysis.get('outcome_delta'),
+                prospect_style=prospect_style,
+                client_profile=strategy,
+                llm_cache=llm_cache,
+            )
+
+            if draft_payload is None:
+                print(f"      ---> Draft skipped for {contact_email} (intelligence_profile empty or service_implication missing)")
+                continue
+
+            draft_body = draft_payload.get("body", "")
+            subjects = draft_payload.get("subject_options", [])
+            email_subject = subjects[0] if subjects else f"Observation regarding {comp['company']}"
+
+            # Phase 8: Determine Status (Approval Mode)
+            status = "draft"
+            if strategy.get('approval_mode'):
+                status = "pending_approval"
+
+            # Save Draft — enriched metadata includes sentence breakdown, constraint check, and profile score
+            writes.insert("pulsepoint_email_queue", {
+                "triggered_company_id": comp['id'],
+                "lead_id": contact.get('id'),
+                "email_to": contact_email,
+                "email_subject": email_subject,
+                "email_body": draft_body,
+                "metadata": {
+                    "subject_options": subjects,
+                    "sentence_breakdown": draft_payload.get("sentence_breakdown"),
+                    "constraint_check": draft_payload.get("constraint_check"),
+                    "profile_completeness": draft_payload.get("profile_completeness"),
+                    "prospect_style": prospect_style,
+                    "attempt_count": draft_payload.get("attempt_count", 1),
+                },
+                "status": status,
+                "source": "monitor_auto",
+                "user_id": comp.get('user_id')
+            })
+            print(f"      ---> Draft Created for {contact_email} (Status: {status})")
+
+    return "REAL_TIME_DETECTED"
+
+@traced("context_anchor")
+def _run_context_anchor_fallback(comp: dict, strategy: dict, client_context: str, apify_client, supabase, writes: ScanWriteBuffer, openai_key: str, scan_start: float, analysis_log: list, dedup_filter: TriggerDedupFilter = None, llm_cache: LLMCacheSession = None, budget: ScanBudget = None):
+    """
+    FALLBACK: CONTEXT ANCHOR (EVERGREEN)
+    Checks "Timeless" Portfolio/Testimonial signals when no recent news/social trigger was found,
+    BUT ONLY if we haven't contacted them about a context anchor in 90 days.
+    Returns "CONTEXT_ANCHOR" if an anchor was queued for review, else None.
+    """
+    # 0. TIME BUDGET GUARD: Skip deep scouts if wall-clock time is running low
+    if scan_start and (time.time() - scan_start) > 660:  # 11 min guard
+        print(f"      ⏱️ Skipping deep scouts (wall-clock: {int(time.time() - scan_start)}s)")
+    # 0b. COST BUDGET GUARD: two scouts plus at least one gpt-4o judgement must fit
+    elif budget is not None and not budget.can_afford(ANCHOR_MIN_COST_USD):
+        print(f"      🛑 Skipping Context Anchor check (cost budget: ${budget.remaining:.3f} left)")
+    # 1. Frequency Guardrail
+    elif check_recent_context_anchor(comp['id'], supabase):
+         print(f"      ⏳ Skipping Context Anchor check (Recently Contacted)")
+    else:
+        # 2. PROACTIVE COST GUARDRAIL: Deep Scout Throttling
+        # Only run strict/expensive portfolio crawls once every 30 days per company
+        should_run_deep_scout = True
+        score_factors = comp.get('score_factors', {}) or {}
+        last_deep_scout = score_factors.get('last_deep_scout_at')
+        
+        if last_deep_scout:
+            # datetime already imported at module level (line 5)
             try:
-                should_run_linkedin = True
-                score_factors = comp.get('score_factors', {}) or {}
-                linkedin_company_url = score_factors.get('linkedin_company_url')
-                last_linkedin_scout = score_factors.get('last_linkedin_scout_at')
+                last_date = datetime.fromisoformat(last_deep_scout)
+                # Simple 30-day check
+                if (datetime.now() - last_date).days < 30:
+                     print(f"      💰 Skipping Deep Scout (Throttled: Last ran {last_deep_scout[:10]})")
+                     should_run_deep_scout = False
+            except Exception as e:
+                print(f"      ⚠️ Date parse error ({last_deep_scout}): {e}. re-running.")
+        
+        if should_run_deep_scout:
+            # Record timestamp now to lock it in (flushed even if the scouts crash)
+            writes.merge_score_factors({"last_deep_scout_at": datetime.now().isoformat()})
+            if budget is not None:
+                budget.record_apify("scout:portfolio")
+                budget.record_apify("scout:testimonial")
+
+            try:
+                from scouts.portfolio_scout import scout_portfolio
+                from scouts.testimonial_scout import scout_testimonials
+            
+                print(f"      🎨 [Fallback] No news found. Running Context Anchor Scouts (Parallel)...")
+                
+                portfolio_signals = []
+                testimonial_signals = []
                 
-                # Check 4-Day Throttle
-                if last_linkedin_scout and not force_rescan:
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    fut_port = executor.submit(scout_portfolio, comp['company'], comp.get('website', ''), apify_client)
+                    fut_test = executor.submit(scout_testimonials, comp['company'], comp.get('website', ''), apify_client)
+                    
                     try:
-                        last_date = datetime.fromisoformat(last_linkedin_scout)
-                        if (datetime.now(timezone.utc) - last_date).days < 4:
-                            print(f"      💰 Skipping LinkedIn Scout (Throttled: Last ran {last_linkedin_scout[:10]})")
-                            should_run_linkedin = False
-                    except: pass
+                        portfolio_signals = fut_port.result(timeout=90)
+                    except Exception as e:
+                        print(f"      ⚠️ Portfolio scout failed: {e}")
+                        
+                    try:
+                        testimonial_signals = fut_test.result(timeout=90)
+                    except Exception as e:
+                        print(f"      ⚠️ Testimonial scout failed: {e}")
+            
+                # Merge signals; already-triggered anchors never reach the gpt-4o call
+                all_evergreen_signals = _drop_already_triggered(portfolio_signals + testimonial_signals, comp, dedup_filter, supabase)
+            
+                for sig in all_evergreen_signals:
+                    if budget is not None and not budget.can_afford(ANCHOR_JUDGEMENT_COST_USD):
+                        print(f"      🛑 Cost budget reached (${budget.spent:.3f}/${budget.limit:.3f}). Skipping remaining context signals.")
+                        break
+                    print(f"      ✨ Analyzing Context Signal: {sig['url']}...")
+
+                    # LOGGING: Record checking this anchor
+                    analysis_log.append({
+                        "url": sig.get('url'),
+                        "title": sig.get('title'),
+                        "stage": "context_anchor",
+                        "decision": "pending",
+                        "model": "gpt-4o"
+                    })
+                
+                    # Specialized Analysis for CONTEXT ANCHORS
+                    # Strictly enforces "Significance" over "Aesthetics"
+                
+                    sys_prompt = f"""
+                    {strategy.get('trigger_prompt')}
+                
+                    SPECIAL MODE: CONTEXT ANCHOR ANALYSIS ("Evergreen")
+                
+                    OBJECTIVE: Determine if this content provides a DEFENSIBLE, STRATEGIC reason for outreach.
+                    - We are looking for EVIDENCE of Scale, Complexity, or High-Stakes outcomes.
+                    - We are IGNORING "competence" (e.g. they designed a nice logo).
+                
+                    CRITERIA FOR RELEVANCE (Must meet ALL):
+                    1. **Client Magnitude:** The client is a recognizable Enterprise, Regulated Industry, or Global Brand (e.g. Nike, Sephora, Coca-Cola).
+                    2. **Outcome Significance:** The work involved "Scaling", "National Rollout", "Transformation", "Complex Integration", or "Rapid Growth".
+                    3. **Freshness Signal:** There MUST be evidence the case study was RECENTLY published or the work was RECENTLY completed.
+                       - Look for: dates in 2025/2026, "recently completed", "just launched", copyright year, metadata dates, blog post dates.
+                       - If no freshness signal exists, set is_relevant=false. Undated portfolio pages are NOT valid triggers.
+                    4. **Outreach Fit:** Would referencing this case study feel timely and natural in a cold email?
+                       - If a recipient would think "why are you emailing me about old work?", set is_relevant=false.
+                
+                    DISALLOWED (Do NOT Trigger):
+                    - "New Website" or "Rebranding" (unless accompanied by "Enterprise Scale" context).
+                    - "Logo Design", "Visual Identity".
+                    - Generic praise ("Great team to work with!").
+                    - Undated case studies or portfolio pages without clear recency signals.
+                    - Work completed more than 12 months ago.
                 
-                if should_run_linkedin:
-                    # Update timestamp
-                    merge_score_factors(supabase, comp['id'], {"last_linkedin_scout_at": datetime.now(timezone.utc).isoformat()})
+                    INSTRUCTIONS:
+                    - Extract the Client Name and the SPECIFIC Strategic Outcome.
+                    - Check for ANY date or recency signal. If none found, REJECT.
+                    - Set is_relevant=True ONLY if it passes BOTH the Significance Filter AND the Freshness Filter.
                     
-                    # Build lead LinkedIn URLs from contacts
-                    lead_linkedin_urls = [
-                        {"name": c.get("name"), "linkedin": c.get("linkedin_url")}
-                        for c in contacts if c.get("linkedin_url")
-                    ][:2]  # Max 2 executives
+                    Client Context: {client_context}
+
+                    OUTPUT JSON:
+                    {{
+                        "is_relevant": true/false,
+                        "confidence": 0-10,
+                        "summary": "1-sentence summary",
+                        "freshness_evidence": "What date or recency signal was found (or 'None found')",
+                        "outcome_delta": "The 2nd order implication (Risk/Upside). Must be specific.",
+                        "buying_window": "Typically 'Transition' or 'Execution' for these signals."
+                    }}
+                    """
+                
+                    analysis = call_openai_analysis(sig, sys_prompt, openai_key, model="gpt-4o", llm_cache=llm_cache)
                     
-                    futures[executor.submit(
-                        scout_linkedin_activity,
-                        comp['company'],
-                        linkedin_company_url,
-                        lead_linkedin_urls,
-                        apify_client,
-                        supabase,
-                        comp.get('id')
-                    )] = 'linkedin'
+                    # Log result
+                    analysis_log[-1].update({
+                        "confidence": analysis.get('confidence', 0),
+                        "is_relevant": analysis.get('is_relevant'),
+                        "decision": "triggered" if analysis.get('is_relevant') else "rejected"
+                    })
+                
+                    if analysis.get('is_relevant') and analysis.get('confidence', 0) >= 8: # Higher confidence bar
+                        freshness = analysis.get('freshness_evidence', 'None found')
+                        print(f"      ✅ CONTEXT ANCHOR: {analysis['summary']}")
+                        print(f"         Strategy: {analysis.get('buying_window')} | Delta: {analysis.get('outcome_delta')}")
+                        print(f"         Freshness: {freshness}")
                     
-            except Exception as e:
-                print(f"      ⚠️ LinkedIn Scout setup failed: {e}")
+                        # DEDUP CHECK (Context Anchor)
+                        if _already_triggered(supabase, comp, sig.get('url'), dedup_filter):
+                            print(f"      ♻️ DEDUP (Anchor): Already triggered on this URL. Skipping.")
+                            continue
 
-        # 4. HiringScout (V6 — Throttled: 7 Days)
-        if strategy.get("use_v6_pipeline", False) and comp.get('website'):
-            try:
-                last_hiring = score_factors.get('last_hiring_scout_at')
-                should_run_hiring = True
-                if last_hiring and not force_rescan:
-                    try:
-                        last_date = datetime.fromisoformat(last_hiring)
-                        if (datetime.now(timezone.utc) - last_date).days < 7:
-                            print(f"      💰 Skipping Hiring Scout (Throttled: Last ran {last_hiring[:10]})")
-                            should_run_hiring = False
-                    except: pass
-
-                if should_run_hiring:
-                    merge_score_factors(supabase, comp['id'], {"last_hiring_scout_at": datetime.now(timezone.utc).isoformat()})
-                    futures[executor.submit(
-                        scout_hiring_activity,
-                        comp['company'],
-                        comp['website'],
-                        apify_client,
-                        supabase,
-                        comp.get('id')
-                    )] = 'hiring'
-            except Exception as e:
-                print(f"      ⚠️ Hiring Scout setup failed: {e}")
+                        # CONTEXT_ANCHOR → pending_review (NOT auto-triggered)
+                        writes.merge_score_factors({
+                            "outcome_delta": analysis.get('outcome_delta'),
+                            "buying_window": analysis.get('buying_window'),
+                            "freshness_evidence": freshness
+                        })
+                        writes.update_company({
+                            "event_type": "CONTEXT_ANCHOR",
+                            "event_title": analysis['summary'],
+                            "event_source_url": sig['url'],
+                            "last_monitored_at": "now()",
+                            "monitoring_status": "pending_review"
+                        })
 
-        # 5. WebChangeScout (V6 — Throttled: 14 Days)
-        if strategy.get("use_v6_pipeline", False) and comp.get('website'):
-            try:
-                last_webchange = score_factors.get('last_webchange_scout_at')
-                should_run_webchange = True
-                if last_webchange and not force_rescan:
-                    try:
-                        last_date = datetime.fromisoformat(last_webchange)
-                        if (datetime.now(timezone.utc) - last_date).days < 14:
-                            print(f"      💰 Skipping WebChange Scout (Throttled: Last ran {last_webchange[:10]})")
-                            should_run_webchange = False
-                    except: pass
-
-                if should_run_webchange:
-                    merge_score_factors(supabase, comp['id'], {"last_webchange_scout_at": datetime.now(timezone.utc).isoformat()})
-                    futures[executor.submit(
-                        scout_website_changes,
-                        comp['company'],
-                        comp['website'],
-                        apify_client,
-                        supabase,
-                        comp.get('id')
-                    )] = 'webchange'
+                        # Record Dedup
+                        writes.insert("trigger_dedup", {
+                            "company_id": comp['id'],
+                            "source_url": normalize_url(sig['url']),
+                            "trigger_type": "CONTEXT_ANCHOR"
+                        })
+                    
+                        # NO auto-drafting for CONTEXT_ANCHOR.
+                        # User reviews in dashboard → approves → then drafts are generated.
+                        print(f"      📋 Context Anchor queued for review (no auto-draft)")
+                    
+                        return "CONTEXT_ANCHOR"
+                    
+            except ImportError:
+                print("      ⚠️ Scout modules not found (ImportError). skipping.")
             except Exception as e:
-                print(f"      ⚠️ WebChange Scout setup failed: {e}")
+                print(f"      ⚠️ Context Anchor Scout failed: {e}")
+
+    return None
+
+@traced("v6_post_scan")
+def _run_v6_post_scan(comp: dict, strategy: dict, client_context: str, supabase, writes: ScanWriteBuffer, all_v6_classified_signals: list, v6_velocity_ratio: float, trigger_found: bool):
+    """
+    V6 COMPOSITE + STAGE 2.5 SYNTHESIS.
+    Returns the escalation trigger type if synthesis/composite scoring escalated, else None.
+    """
+    trigger_type_found = None
+    # ── Stage 2.5: Cross-scout narrative synthesis (cost-gated) ──
+    synthesis_result = None
+    if all_v6_classified_signals:
+        print(f"      🔬 [V6 Stage 2.5] Running cross-scout synthesis for {comp.get('company')}...")
+        try:
+            synthesis_result = run_stage_2_5_synthesis(
+                account={
+                    "account_id": comp["id"],
+                    "company_name": comp.get("company", ""),
+                    "domain": comp.get("website", ""),
+                    "industry": comp.get("industry", "unknown"),
+                },
+                classified_signals=all_v6_classified_signals,
+                client_context=strategy,
+                velocity_ratio=v6_velocity_ratio,
+            )
+        except Exception as e:
+            print(f"      ⚠️ [Stage 2.5] Synthesis failed (non-fatal): {e}")
+
+    if synthesis_result and not synthesis_result.get("error"):
+        nc = synthesis_result.get("narrative_confidence", 0)
+        headline = synthesis_result.get("story_headline", "")
+        s_urgency = synthesis_result.get("composite_urgency", "MONITOR")
+        print(f"      🔬 [Stage 2.5] Confidence: {nc:.2f} | Urgency: {s_urgency} | '{headline}'")
+
+        # Synthesis-driven escalation
+        if synthesis_result.get("composite_escalate") and not trigger_found:
+            trigger_found = True
+            trigger_type_found = "STAGE_2_5_SYNTHESIS"
+            print(f"      🚀 [Stage 2.5] SYNTHESIS ESCALATION: Composite narrative triggered outreach!")
+
+        # Persist synthesis output to score_factors (top-level merge: only v6_synthesis changes)
+        try:
+            from datetime import datetime as _dt, timezone as _tz
+            writes.merge_score_factors({"v6_synthesis": {
+                "story_headline": synthesis_result.get("story_headline"),
+                "composite_brief": synthesis_result.get("composite_brief"),
+                "outreach_angle": synthesis_result.get("outreach_angle"),
+                "recommended_subject_lines": synthesis_result.get("recommended_subject_lines", []),
+                "primary_evidence_quote": synthesis_result.get("primary_evidence_quote"),
+                "window_closes_in_days": synthesis_result.get("window_closes_in_days"),
+                "urgency_label": synthesis_result.get("urgency_label"),
+                "narrative_confidence": nc,
+                "composite_escalate": synthesis_result.get("composite_escalate"),
+                "synthesized_at": _dt.now(_tz.utc).isoformat(),
+            }})
+        except Exception as e:
+            print(f"      ⚠️ [Stage 2.5] Failed to persist synthesis: {e}")
+    elif all_v6_classified_signals:
+        print(f"      🔬 [Stage 2.5] Gate not triggered (insufficient signal density)")
+
+    # ── Composite scoring (rule-based, seeded by synthesis if available) ──
+    # CHECKPOINT: the scorer reads company state, so land this scan's writes first
+    writes.flush()
+    print(f"      🔬 [V6] Running composite signal scoring for {comp.get('company')}...")
+    composite_result = run_composite_scoring(comp['id'], client_context, supabase, synthesis_result=synthesis_result)
+    if composite_result:
+        score = composite_result.get('composite_trigger_score', 0)
+        urgency = composite_result.get('composite_urgency', 'MONITOR')
+        signals = composite_result.get('signal_count', 0)
+        escalated = composite_result.get('escalated_from_context_only', False)
+        print(f"      🔬 [V6 Composite] Score: {score}, Urgency: {urgency}, Signals: {signals}, Escalated: {escalated}")
+        if escalated and not trigger_found:
+            trigger_found = True
+            trigger_type_found = "COMPOSITE_ESCALATION"
+            print(f"      🚀 [V6] COMPOSITE ESCALATION: CONTEXT_ONLY accumulation triggered outreach!")
+    else:
+        print(f"      🔬 [V6 Composite] No signals in analysis window — skipped.")
+
+    return trigger_type_found
+
+def _complete_scan(comp: dict, writes: ScanWriteBuffer, scan_log: ScanLog, trigger_found: bool, trigger_type_found: str, scan_counters: dict) -> None:
+    """OBSERVABILITY: Finalize scan log (and bump last_monitored_at when nothing triggered)."""
+    if not trigger_found:
+        writes.update_company({"last_monitored_at": "now()"})
+        print("      (No relevant triggers found)")
+    writes.flush()  # Before finalize, so the flush span is persisted with the others
+    if not trigger_found:
+        scan_log.finalize("success", counters=scan_counters)
+    else:
+        scan_log.finalize("success", trigger_found=True,
+                          trigger_type=trigger_type_found,
+                          counters=scan_counters)
+
+def _llm_cache_session(supabase, force_rescan: bool, budget: ScanBudget = None) -> LLMCacheSession:
+    """Per-scan LLM cache view: force_rescan bypasses reads (entries are still refreshed)."""
+    attach_remote_backend(supabase)
+    return get_llm_cache().session(bypass_cache=force_rescan, budget=budget)
+
+@traced("supabase:budget")
+def _scan_budget(supabase, comp: dict, strategy: dict) -> ScanBudget:
+    """
+    Dollar budget for one scan: the company ceiling, capped by what the client has
+    left of its daily budget (client_spend_today, migration 18).
+    """
+    ceiling = company_ceiling(strategy, DEFAULT_DAILY_SCAN_LIMIT)
+    remaining = None
+    try:
+        resp = supabase.rpc("client_spend_today", {"p_client_context": comp.get("client_context", "pulsepoint_strategic")}).execute()
+        remaining = client_daily_budget(strategy, DEFAULT_DAILY_SCAN_LIMIT) - float(resp.data or 0)
+    except Exception as e:
+        print(f"      ⚠️ Client spend lookup failed, using the company ceiling only: {e}")
+    budget = ScanBudget(ceiling, remaining)
+    print(f"      💵 Cost budget: ${budget.limit:.3f} (company ceiling ${ceiling:.3f}"
+          + (f", client has ${remaining:.2f} left today)" if remaining is not None else ")"))
+    return budget
+
+def _triage_cost_estimate(candidates: list) -> float:
+    n = min(len(candidates), MAX_TRIAGE_ITEMS)
+    return estimate_llm_cost("gpt-4o-mini", 2500 + n * (TRIAGE_DESCRIPTION_CHARS + 200), completion_tokens=80 * n)
+
+def _deep_analysis_cost_estimate(strategy: dict) -> float:
+    """One shortlisted candidate: worst-case Apify fetch plus the deep analysis call(s)."""
+    if strategy.get("use_v6_pipeline", False):
+        llm = estimate_llm_cost("gpt-4o-mini", MAX_LLM_CHARS + 3000) + estimate_llm_cost("gpt-4o", 4000)
+    else:
+        llm = estimate_llm_cost("gpt-4o-mini", MAX_LLM_CHARS + 4000)
+    return APIFY_PRICES["apify/website-content-crawler"] + llm
+
+def _budget_shortlist_limit(budget: ScanBudget, strategy: dict) -> int:
+    limit = min(MAX_FETCHED_PAGES_TOTAL, budget.affordable_count(_deep_analysis_cost_estimate(strategy)))
+    print(f"      💵 ${budget.remaining:.3f} left: up to {limit} deep analyses")
+    return limit
+
+def _news_item(res: dict) -> dict:
+    return {
+        "title": res.get("title", ""),
+        "description": res.get("description", ""),
+        "url": res.get("url", "")
+    }
+
+
+def process_company_scan(comp: dict, apify_client, supabase, openai_key: str, force_rescan: bool = False, scan_start: float = None, scan_batch_id: str = None, dedup_filter: TriggerDedupFilter = None, search_broker: SearchBroker = None):
+    """
+    Orchestrates the monitoring process for a single company.
+    1. Identify Client Strategy
+    2. Build Search Queries
+    3. Execute Search (Apify)
+    4. Fingerprint Check (Efficiency)
+    5. AI Analysis (OpenAI)
+    6. Database Updates
+    With a search_broker, the Google search and the blog scout's discovery queries
+    share batched actor runs with the container's other scans.
+    """
+    attach_breaker_state(supabase, GLOBAL_LLM_BREAKER, GLOBAL_APIFY_BREAKER)
+    # Write-behind: the scan's Supabase writes are coalesced and land in one flush at the end
+    writes = ScanWriteBuffer(supabase, comp.get('id'))
+    with SpanRecorder().activate():
+        try:
+            return _process_company_scan(comp, apify_client, supabase, writes, openai_key, force_rescan, scan_start, scan_batch_id, dedup_filter, search_broker)
+        finally:
+            writes.flush()
+
+
+def _process_company_scan(comp: dict, apify_client, supabase, writes: ScanWriteBuffer, openai_key: str, force_rescan: bool, scan_start: float, scan_batch_id: str, dedup_filter: TriggerDedupFilter, search_broker: SearchBroker = None):
+    # OBSERVABILITY: Create scan log entry
+    scan_log = ScanLog(supabase, comp, scan_batch_id)
+    analysis_log = scan_log.analysis_log
+    _finalize_scan_log = scan_log.finalize
+    
+    # TIME BUDGET GUARD: Skip if we're running low on wall-clock time
+    if scan_start and (time.time() - scan_start) > 780:  # 13 min guard (out of 15 min worker limit)
+        print(f"⏱️ TIME BUDGET EXHAUSTED: Skipping {comp.get('company')} (elapsed: {int(time.time() - scan_start)}s)")
+        _finalize_scan_log("skipped_budget")
+        return
+
+    print(f"🏢 Scanning: {comp.get('company')} (Strategy: {comp.get('client_context')})")
+    
+    strategy_slug = comp.get("client_context", "pulsepoint_strategic")
+    client_context = strategy_slug  # Alias used throughout this function
+    strategy = CLIENT_STRATEGIES.get(strategy_slug, CLIENT_STRATEGIES.get("pulsepoint_strategic"))
+    
+    if not strategy:
+        print(f"❌ CRITICAL ERROR: Strategy '{strategy_slug}' not found and fallback 'pulsepoint_strategic' missing.")
+        print(f"   Available strategies: {list(CLIENT_STRATEGIES.keys())}")
+        _finalize_scan_log("failed_no_strategy")
+        return
+
+    v6_velocity_ratio = _fetch_velocity_ratio(comp, strategy, supabase)
+
+    # COST BUDGET: dollars, not call counts (company ceiling capped by the client's daily spend)
+    budget = _scan_budget(supabase, comp, strategy)
+    if not budget.can_afford(APIFY_PRICES["apify/google-search-scraper"]):
+        print(f"      🛑 Client daily cost budget exhausted. Skipping {comp.get('company')}.")
+        _finalize_scan_log("skipped_budget", error="Client daily cost budget exhausted")
+        return
+
+    # Buffer for Stage 2.5: collects all classified signals from this scan pass
+    all_v6_classified_signals = []
+    llm_cache = _llm_cache_session(supabase, force_rescan, budget)
+
+    # 1. Build Queries and Search
+    search_results = _run_google_search(comp, strategy, apify_client, budget, search_broker)
+    if search_results is None:
+        _finalize_scan_log("failed_search", error="Apify search failed after retry")
+        return
+            
+    # ==================== EFFICIENCY: FINGERPRINT CHECK ====================
+    unchanged, new_hash = _check_search_fingerprint(comp, search_results, writes, force_rescan)
+    if unchanged:
+        _finalize_scan_log("skipped_fingerprint", counters={"apify_calls": 1, **budget.counters()})
+        return
+    
+    # Initialize merged result list and dedup set from Google search results
+    all_results, seen_urls = _dedup_search_results(search_results)
+    
+    print(f"      ✨ New Content Detected (Hash: {new_hash[:8]}). Analyzing {len(search_results)} items...")
+    
+    # ==================== DEEP SCOUTS (Async Phase 7) ====================
+    # Run Blog, Social, and LinkedIn scouts in parallel
+    score_factors = comp.get('score_factors', {}) or {}  # Always define (fixes crash when no website)
+    scout_jobs = _build_scout_jobs(comp, strategy, apify_client, supabase, writes, force_rescan, score_factors, search_broker)
+    for scout_type, _, _ in scout_jobs:
+        budget.record_apify(f"scout:{scout_type}")
+
+    with span("scouts"), ThreadPoolExecutor(max_workers=6) as executor:
+        futures = {executor.submit(scan_log.spans.wrap(f"scout:{scout_type}", func), *args): scout_type for scout_type, func, args in scout_jobs}
 
         # Collect results
         try:
@@ -1809,66 +2833,7 @@ def process_company_scan(comp: dict, apify_client, supabase, openai_key: str, fo
                 try:
                     res = future.result()
                     if res:
-                        # Enrich and Dedup
-                        for item in res:
-                            if item['url'] not in seen_urls:
-                                seen_urls.add(item['url'])
-                            
-                            # Normalize format based on source
-                            if scout_type == 'blog':
-                                # CACHING LOGIC: If we found the hub, save it
-                                if item.get('source') == 'direct_hub_capture':
-                                     found_blog_url = item.get('url')
-                                     if found_blog_url and score_factors.get('blog_url') != found_blog_url:
-                                          print(f"      💾 [Cache] Saving new Blog URL: {found_blog_url}")
-                                          try:
-                                              merge_score_factors(supabase, comp['id'], {"blog_url": found_blog_url})
-                                          except Exception as e:
-                                              print(f"      ⚠️ Failed to cache blog URL: {e}")
-
-                                all_results.append({
-                                    "url": item['url'],
-                                    "title": item['title'],
-                                    "description": item['text'][:200],
-                                    "is_scouted_blog": True
-                                })
-                            elif scout_type == 'social':
-                                all_results.append({
-                                    "url": item['url'],
-                                    "title": item['title'],
-                                    "description": item['text'],
-                                    "is_scouted_social": True,
-                                    "person_name": item.get('person_name'),
-                                    "verification_status": item.get('verification_status', 'unknown')
-                                })
-                            elif scout_type == 'linkedin':
-                                all_results.append({
-                                    "url": item['url'],
-                                    "title": item['title'],
-                                    "description": item.get('description', item.get('text', '')[:300]),
-                                    "is_scouted_social": True,
-                                    "person_name": item.get('person_name'),
-                                    "verification_status": "verified",  # Direct scrape = verified
-                                    "event_type": "LINKEDIN_ACTIVITY"
-                                })
-                            elif scout_type == 'hiring':
-                                all_results.append({
-                                    "url": item.get('url', ''),
-                                    "title": item.get('title', ''),
-                                    "description": item.get('description', item.get('text', '')[:300]),
-                                    "is_scouted_hiring": True,
-                                    "verification_status": "verified",
-                                    "event_type": "HIRING_SIGNAL"
-                                })
-                            elif scout_type == 'webchange':
-                                all_results.append({
-                                    "url": item.get('url', ''),
-                                    "title": item.get('title', ''),
-                                    "description": item.get('description', item.get('text', '')[:300]),
-                                    "is_scouted_webchange": True,
-                                    "verification_status": "verified",
-                                    "event_type": "WEB_CHANGE"
-                                })
+                        _merge_scout_items(scout_type, res, all_results, seen_urls, comp, score_factors, writes)
                 except Exception as e:
                     print(f"      ⚠️ {scout_type} scout failed: {e}")
         except TimeoutError:
@@ -1883,643 +2848,645 @@ def process_company_scan(comp: dict, apify_client, supabase, openai_key: str, fo
     # BUDGET TRACKING
     pages_fetched = 0
     apify_fallback_count = 0
+    article_cache_stats = {"article_cache_hits": 0, "article_cache_misses": 0}
     llm_calls = 0
     
-    print(f"      🏁 Starting analysis (Budget: {MAX_FETCHED_PAGES_TOTAL} pages, {MAX_LLM_CALLS} LLM calls)...")
+    print(f"      🏁 Starting analysis (Budget: ${budget.remaining:.3f} of ${budget.limit:.3f} left)...")
     
+    # 0. URL Validation
+    candidates = []
     for res in all_results:
-        # BUDGET CHECK: LLM
-        if llm_calls >= MAX_LLM_CALLS:
-             print(f"      🛑 LLM Budget Reached ({llm_calls}/{MAX_LLM_CALLS}). Stopping scan.")
-             break
-             
-        news_item = {
-            "title": res.get("title", ""),
-            "description": res.get("description", ""),
-            "url": res.get("url", "")
-        }
-        
-        # 0. URL Validation
-        url_valid, url_rejection = is_valid_article_url(news_item['url'], comp['company'])
+        url_valid, url_rejection = is_valid_article_url(res.get('url', ''), comp['company'])
         if not url_valid:
             print(f"      ⛔ URL REJECTED: {url_rejection}")
             continue
+        candidates.append(res)
+
+    # 0b. Incremental change detection: only URLs we have never judged go forward
+    candidates = filter_unseen(candidates, load_seen_urls(supabase, comp, force_rescan))
+    seen_outcomes = {}
+    candidates = _drop_already_triggered(candidates, comp, dedup_filter, supabase, seen_outcomes)
+
+    # 0c. Stale results (dated in the snippet) never reach the LLM
+    candidates = _drop_stale_candidates(candidates, strategy, seen_outcomes)
+
+    # 1. Batched Triage: one gpt-4o-mini call ranks every candidate.
+    # The rest of the cost budget goes to deep analysis of the top-ranked items.
+    # Free-tier article downloads for the top candidates overlap the triage call.
+    shortlist = []
+    prefetcher = ArticlePrefetcher(functools.partial(_extract_article_free, cache_stats=article_cache_stats), MAX_FETCHED_PAGES_TOTAL)
+    if candidates and not budget.can_afford(_triage_cost_estimate(candidates)):
+        print(f"      🛑 Cost budget reached before triage (${budget.spent:.3f}/${budget.limit:.3f}). Skipping analysis.")
+        candidates = []
+    if candidates:
+        prefetcher.start([r['url'] for r in candidates[:PREFETCH_TOP_K]])
+        print(f"      🔍 Triaging {len(candidates)} candidates in one call...")
+        verdicts = triage_relevance_batch([_news_item(r) for r in candidates], comp['company'], client_context, openai_key, llm_cache)
+        llm_calls += 1
+        for res, quick_analysis in zip(candidates, verdicts):
+            _log_relevance(analysis_log, _news_item(res), quick_analysis)
+            if quick_analysis.get('judged') and not (quick_analysis.get('is_relevant') and quick_analysis.get('confidence', 0) >= 6):
+                mark_seen(seen_outcomes, res, "triage_rejected", quick_analysis.get('confidence', 0))
+        shortlist = shortlist_triaged(candidates, verdicts, _budget_shortlist_limit(budget, strategy))
+    # Triage-rejected prefetches are dropped; the rest of the shortlist downloads behind the loop
+    prefetcher.keep([res['url'] for res, _ in shortlist])
+
+    deep_cost = _deep_analysis_cost_estimate(strategy)
+    for res, quick_analysis in shortlist:
+        news_item = _news_item(res)
+
+        # BUDGET CHECK: fetch + deep analysis must still fit (actual spend so far, not estimates)
+        if not budget.can_afford(deep_cost):
+             print(f"      🛑 Cost budget reached (${budget.spent:.3f}/${budget.limit:.3f}). Stopping scan.")
+             break
 
-        # 1. Quick Semantic Analysis (Is this relevant?)
-        # NOTE: WE COUNT THIS AS AN LLM CALL if it uses the AI model. 
-        # But analyze_event_relevance is lighter. We should probably count it as 0.5 or track separately?
-        # For now, let's treat it as a full call to be safe, OR we assume it's cheap enough.
-        # User defined MAX_LLM_CALLS=2. If we use 1 here, we only get 2 articles.
-        # Let's assume the user meant "Deep Analysis Limit".
-        # But analyze_event_relevance IS an LLM call.
-        # Compromise: We will increment llm_calls here.
-        
-        print(f"      🔍 Analyzing relevance: {news_item['title'][:50]}...")
-        quick_analysis = analyze_event_relevance(news_item, comp['company'], client_context, openai_key)
+        print(f"      📄 Extracting article (rank {quick_analysis['rank']}): {news_item['url'][:50]}...")
+
+        # Full article extraction (free tier prefetched; the paid fallback only runs here)
+        prefetched = prefetcher.take(news_item['url'])
+        if prefetched is None:
+             print(f"      🛑 Page Fetch Budget Reached ({prefetcher.pages}/{MAX_FETCHED_PAGES_TOTAL}). Stopping scan.")
+             break
+        article_text, used_apify = extract_article_content(news_item['url'], apify_client, budget=budget, prefetched=prefetched)
+        pages_fetched = prefetcher.pages
+        if used_apify: apify_fallback_count += 1
+
+        if not _passes_date_precheck(article_text, strategy, url=res.get('url')):
+            mark_seen(seen_outcomes, res, "stale", quick_analysis.get('confidence', 0))
+            continue
+
+        # Deep Analysis
+        analysis = _run_deep_analysis(news_item, article_text, comp, client_context, openai_key, supabase, analysis_log, all_v6_classified_signals, budget)
         llm_calls += 1
-        
-        # LOGGING: Record quick analysis
-        analysis_log.append({
-            "url": news_item.get('url'),
-            "title": news_item.get('title'),
-            "stage": "relevance",
-            "confidence": quick_analysis.get('confidence', 0),
-            "is_relevant": quick_analysis.get('is_relevant'),
-            "decision": "pass" if quick_analysis.get('is_relevant') else "rejected",
-            "model": "gpt-4o-mini",
-            "reasoning": quick_analysis.get("reasoning", "No reasoning provided"),
-            "content_snippet": news_item.get("description", "")[:500]
-        })
-        
-        if quick_analysis.get('is_relevant') and quick_analysis.get('confidence', 0) >= 6:
-            
-            # BUDGET CHECK: Fetch
-            if pages_fetched >= MAX_FETCHED_PAGES_TOTAL:
-                 print(f"      🛑 Page Fetch Budget Reached ({pages_fetched}/{MAX_FETCHED_PAGES_TOTAL}). Stopping scan.")
-                 break
-            
-            print(f"      📄 Extracting article: {news_item['url'][:50]}...")
-            
-            # Full article extraction
-            article_text, used_apify = extract_article_content(news_item['url'], apify_client)
-            pages_fetched += 1
-            if used_apify: apify_fallback_count += 1
-            
-            # Pre-check Date
-            # datetime and timedelta already imported at module level (line 5)
-            pre_check_date, pre_check_date_str = extract_date_from_text(article_text)
-            
-            if pre_check_date:
-                # Use strategy max_age for pre-check too
-                age_limit = int(strategy.get("max_age_days", 25))
-                cutoff = datetime.now() - timedelta(days=age_limit)
-                if pre_check_date < cutoff:
-                    print(f"      ⛔ EARLY REJECT: Article dated {pre_check_date_str} is older than {age_limit}-day cutoff")
-                    continue
-                else:
-                    print(f"      📅 Date verified: {pre_check_date_str}")
-            else:
 
-                 # GHOST DATE PROTECTION - RELAXED
-                 # If simple extractor fails, let the LLM try.
-                 print(f"      ⚠️ No date found in pre-check. Proceeding to Deep Analysis (LLM) for verification.")
-                 # continue  <-- REMOVED TO ALLOW LLM CHECK
-            
-            # Deep Analysis
-            # Double check LLM budget before 2nd call
-            if llm_calls >= MAX_LLM_CALLS:
-                 print(f"      🛑 LLM Budget Reached ({llm_calls}/{MAX_LLM_CALLS}) before deep analysis. Skipping.")
-                 break
-                 
-            analysis = analyze_with_article_context(
-                news_item, article_text, comp['company'], client_context, openai_key,
-                account_id=comp.get('id'), supabase_client=supabase,
-                signal_collection_list=all_v6_classified_signals
-            )
-            llm_calls += 1
-
-            # LOGGING: Deep analysis
-            analysis_log.append({
-                "url": news_item.get('url'),
-                "title": news_item.get('title'),
-                "stage": "deep_analysis",
-                "confidence": analysis.get('confidence', 0),
-                "is_relevant": analysis.get('is_relevant'),
-                "decision": "triggered" if analysis.get('is_relevant') else "rejected",
-                "model": "gpt-4o-mini",
-                "reasoning": analysis.get("reasoning", "No reasoning provided"),
-                "content_snippet": article_text[:500] if article_text else ""
-            })
-            
-            if analysis.get('is_relevant'):
-                # Double Check Confidence (Threshold 7/10)
-                if analysis.get('confidence', 0) < 7:
-                    print(f"      ⚠️ Relevance too low ({analysis.get('confidence', 0)}/10). Skipping.")
-                    continue
-
-                event_date = analysis.get('event_date', 'Unknown date')
-                print(f"      ✅ TRIGGER CONFIRMED: {analysis['summary']} (Date: {event_date})")
-                print(f"         Strategy: {analysis.get('buying_window')} | Delta: {analysis.get('outcome_delta')}")
-
-                # DEDUP CHECK
-                existing_dedup = supabase.table("trigger_dedup").select("id").eq("company_id", comp['id']).eq("source_url", res.get('url')).execute()
-                if existing_dedup.data:
-                    print(f"      ♻️ DEDUP: Already triggered on this URL. Skipping.")
-                    _finalize_scan_log("success", counters={"apify_calls": 1 + pages_fetched, "llm_calls": llm_calls, "pages_fetched": pages_fetched})
-                    continue
-
-                # ROUTING: LinkedIn/Social -> Pending Review (No Auto-Draft)
-                if res.get('is_scouted_social'):
-                    print(f"      📌 LINKEDIN SIGNAL: Routing to 'pending_review' (No Auto-Draft)")
-                    merge_score_factors(supabase, comp['id'], {
-                        "outcome_delta": analysis.get('outcome_delta'),
-                        "buying_window": analysis.get('buying_window')
-                    })
-                    supabase.table("triggered_companies").update({
-                        "event_type": "LINKEDIN_ACTIVITY",
-                        "event_title": analysis['summary'],
-                        "event_source_url": res.get('url'),
-                        "last_monitored_at": "now()",
-                        "monitoring_status": "pending_review"
-                    }).eq("id", comp['id']).execute()
-                    
-                    # Record Dedup
-                    try:
-                        supabase.table("trigger_dedup").insert({
-                            "company_id": comp['id'],
-                            "source_url": res.get('url'),
-                            "trigger_type": "LINKEDIN_ACTIVITY"
-                        }).execute()
-                    except Exception as e:
-                        print(f"      ⚠️ Dedup insert failed: {e}")
-                    
-                    trigger_found = True
-                    trigger_type_found = "LINKEDIN_ACTIVITY"
-                    break
-
-                # DEFAULT ROUTING: Real-Time News -> Triggered (Auto-Draft)
-                merge_score_factors(supabase, comp['id'], {
-                    "outcome_delta": analysis.get('outcome_delta'),
-                    "buying_window": analysis.get('buying_window')
-                })
-                supabase.table("triggered_companies").update({
-                    "event_type": "REAL_TIME_DETECTED",
-                    "event_title": analysis['summary'],
-                    "event_source_url": res.get('url'),
-                    "last_monitored_at": "now()",
-                    "monitoring_status": "triggered"
-                }).eq("id", comp['id']).execute()
-                
-                # --- SIGNAL INTELLIGENCE LAYER ---
-                # Compute Deal Score & Context
-                sig_date = res.get('date') or datetime.now().isoformat()
-                deal_score = compute_deal_score(
-                    confidence=analysis.get('confidence', 0),
-                    signal_type="REAL_TIME_DETECTED",
-                    signal_date_str=sig_date,
-                    scoring_config=strategy.get("scoring_config")
-                )
-                
-                # Prepare Signal Context for Leads
-                signal_context = {
-                    "signal_type": "REAL_TIME_DETECTED",
-                    "confidence_score": analysis.get('confidence', 0),
-                    "deal_score": deal_score,
-                    "signal_date": str(sig_date)[:10],
-                    "recency_days": (datetime.now() - datetime.strptime(str(sig_date)[:10], "%Y-%m-%d")).days,
-                    "why_now": analysis.get('summary', '')[:300], # Trucate to 300 chars
-                    "evidence_quote": analysis.get('evidence_excerpt', '') or analysis.get('description', ''),
-                    "source_url": res.get('url')
-                }
-                print(f"      🧠 Signal Intelligence: Deal Score {deal_score}/100 | Conf {signal_context['confidence_score']}")
+        if not analysis.get('is_relevant'):
+            mark_seen(seen_outcomes, res, "deep_rejected", analysis.get('confidence', 0))
 
-                
-                # Record Dedup
-                try:
-                    supabase.table("trigger_dedup").insert({
-                        "company_id": comp['id'],
-                        "source_url": res.get('url'),
-                        "trigger_type": "REAL_TIME_DETECTED"
-                    }).execute()
-                except Exception as e:
-                    print(f"      ⚠️ Dedup insert failed: {e}")
-                
-                # Contact Enrichment Logic
-                leads_table = strategy.get("leads_table", "PULSEPOINT_STRATEGIC_TRIGGERED_LEADS")
-                print(f"      Looking for contacts in: {leads_table}")
-                contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
-                contacts = contacts_resp.data
-                
-                if not contacts:
-                    print(f"      ⚠️ No contacts found - triggering JIT enrichment...")
-                    enrich_company_contacts(
-                        company_id=comp['id'],
-                        company_name=comp['company'],
-                        existing_website=comp.get('website'),
-                        client_context=client_context,
-                        apify_client=apify_client,
-                        supabase=supabase,
-                        signal_context=signal_context
-                    )
-                    # Re-fetch
-                    contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
-                    contacts = contacts_resp.data
-                else:
-                    # UPDATE EXISTING CONTACTS with new signal data
-                    print(f"      🔄 Updating {len(contacts)} existing contacts with new signal data...")
-                    for c in contacts:
-                        try:
-                            supabase.table(leads_table).update(signal_context).eq("id", c['id']).execute()
-                        except Exception as e:
-                            print(f"      ⚠️ Failed to update contact signal: {e}")
-                    # Re-fetch to have latest data in memory
-                    contacts_resp = supabase.table(leads_table).select("*").eq("triggered_company_id", comp['id']).execute()
-                    contacts = contacts_resp.data
+        if analysis.get('is_relevant'):
+            # Double Check Confidence (Threshold 7/10)
+            if analysis.get('confidence', 0) < 7:
+                print(f"      ⚠️ Relevance too low ({analysis.get('confidence', 0)}/10). Skipping.")
+                mark_seen(seen_outcomes, res, "low_confidence", analysis.get('confidence', 0))
+                continue
 
-                
-                # Generate Drafts
-                for contact in contacts:
-                    contact_email = contact.get('email')
-                    if contact_email:
-                        contact_name = contact.get('name', 'there') or 'there'
-
-                        # Heuristic prospect style extraction — no LLM call
-                        prospect_style = extract_prospect_style(comp)
-                        # Persist to triggered_companies.prospect_style for observability
-                        try:
-                            supabase.table("triggered_companies").update(
-                                {"prospect_style": prospect_style}
-                            ).eq("id", comp["id"]).execute()
-                        except Exception as ps_err:
-                            print(f"      ⚠️ Failed to persist prospect_style: {ps_err}")
-
-                        # V2 draft generation — passes intelligence_profile, tensions, and prospect style
-                        draft_payload = generate_draft(
-                            company_name=comp['company'],
-                            trigger_type_matched=analysis.get('trigger_type', 'Growth Signal'),
-                            primary_evidence_quote=analysis.get('evidence_excerpt', analysis.get('summary', '')),
-                            contact_name=contact_name,
-                            client_context=client_context,
-                            openai_key=openai_key,
-                            supabase=supabase,
-                            buying_window=analysis.get('buying_window', 'Exploration'),
-                            outcome_delta=analysis.get('outcome_delta'),
-                            prospect_style=prospect_style,
-                            client_profile=strategy,
-                        )
-
-                        if draft_payload is None:
-                            print(f"      ---> Draft skipped for {contact_email} (intelligence_profile empty or service_implication missing)")
-                            continue
+            trigger_type = _handle_confirmed_trigger(res, analysis, comp, strategy, client_context, apify_client, supabase, writes, openai_key, dedup_filter, llm_cache)
+            if not trigger_type:
+                mark_seen(seen_outcomes, res, "duplicate", analysis.get('confidence', 0))
+                _finalize_scan_log("success", counters={"apify_calls": 1 + pages_fetched, "llm_calls": llm_calls, "pages_fetched": pages_fetched})
+                continue
 
-                        draft_body = draft_payload.get("body", "")
-                        subjects = draft_payload.get("subject_options", [])
-                        email_subject = subjects[0] if subjects else f"Observation regarding {comp['company']}"
-
-                        # Phase 8: Determine Status (Approval Mode)
-                        status = "draft"
-                        if strategy.get('approval_mode'):
-                            status = "pending_approval"
-
-                        # Save Draft — enriched metadata includes sentence breakdown, constraint check, and profile score
-                        supabase.table("pulsepoint_email_queue").insert({
-                            "triggered_company_id": comp['id'],
-                            "lead_id": contact.get('id'),
-                            "email_to": contact_email,
-                            "email_subject": email_subject,
-                            "email_body": draft_body,
-                            "metadata": {
-                                "subject_options": subjects,
-                                "sentence_breakdown": draft_payload.get("sentence_breakdown"),
-                                "constraint_check": draft_payload.get("constraint_check"),
-                                "profile_completeness": draft_payload.get("profile_completeness"),
-                                "prospect_style": prospect_style,
-                                "attempt_count": draft_payload.get("attempt_count", 1),
-                            },
-                            "status": status,
-                            "source": "monitor_auto",
-                            "user_id": comp.get('user_id')
-                        }).execute()
-                        print(f"      ---> Draft Created for {contact_email} (Status: {status})")
-
-                # Exit loop if found a trigger
-                trigger_found = True
-                trigger_type_found = "REAL_TIME_DETECTED"
-                break
+            # Exit loop if found a trigger
+            mark_seen(seen_outcomes, res, "triggered", analysis.get('confidence', 0))
+            trigger_found = True
+            trigger_type_found = trigger_type
+            break
+
+    prefetcher.close()
+    pages_fetched = prefetcher.pages
+    record_seen_urls(supabase, comp, seen_outcomes)
     
     # ==================== FALLBACK: CONTEXT ANCHOR (EVERGREEN) ====================
-    # If no recent news/social triggers found, check for "Timeless" Portfolio/Testimonial signals
-    # BUT ONLY if we haven't contacted them about a context anchor in 90 days.
-    
     if not trigger_found and strategy.get('trigger_prompt'): 
-        
-        # 0. TIME BUDGET GUARD: Skip deep scouts if wall-clock time is running low
-        if scan_start and (time.time() - scan_start) > 660:  # 11 min guard
-            print(f"      ⏱️ Skipping deep scouts (wall-clock: {int(time.time() - scan_start)}s)")
-        # 1. Frequency Guardrail
-        elif check_recent_context_anchor(comp['id'], supabase):
-             print(f"      ⏳ Skipping Context Anchor check (Recently Contacted)")
-        else:
-            # 2. PROACTIVE COST GUARDRAIL: Deep Scout Throttling
-            # Only run strict/expensive portfolio crawls once every 30 days per company
-            should_run_deep_scout = True
-            score_factors = comp.get('score_factors', {}) or {}
-            last_deep_scout = score_factors.get('last_deep_scout_at')
-            
-            if last_deep_scout:
-                # datetime already imported at module level (line 5)
-                try:
-                    last_date = datetime.fromisoformat(last_deep_scout)
-                    # Simple 30-day check
-                    if (datetime.now() - last_date).days < 30:
-                         print(f"      💰 Skipping Deep Scout (Throttled: Last ran {last_deep_scout[:10]})")
-                         should_run_deep_scout = False
-                except Exception as e:
-                    print(f"      ⚠️ Date parse error ({last_deep_scout}): {e}. re-running.")
-            
-            if should_run_deep_scout:
-                # Update timestamp IMMEDIATELY to lock it in
-                try:
-                    merge_score_factors(supabase, comp['id'], {"last_deep_scout_at": datetime.now().isoformat()})
-                except Exception as e:
-                     print(f"      ⚠️ Failed to update deep scout timestamp: {e}")
-
-                try:
-                    from scouts.portfolio_scout import scout_portfolio
-                    from scouts.testimonial_scout import scout_testimonials
-                
-                    print(f"      🎨 [Fallback] No news found. Running Context Anchor Scouts (Parallel)...")
-                    
-                    portfolio_signals = []
-                    testimonial_signals = []
-                    
-                    with ThreadPoolExecutor(max_workers=2) as executor:
-                        fut_port = executor.submit(scout_portfolio, comp['company'], comp.get('website', ''), apify_client)
-                        fut_test = executor.submit(scout_testimonials, comp['company'], comp.get('website', ''), apify_client)
-                        
-                        try:
-                            portfolio_signals = fut_port.result(timeout=90)
-                        except Exception as e:
-                            print(f"      ⚠️ Portfolio scout failed: {e}")
-                            
-                        try:
-                            testimonial_signals = fut_test.result(timeout=90)
-                        except Exception as e:
-                            print(f"      ⚠️ Testimonial scout failed: {e}")
-                
-                    # Merge signals
-                    all_evergreen_signals = portfolio_signals + testimonial_signals
-                
-                    for sig in all_evergreen_signals:
-                        print(f"      ✨ Analyzing Context Signal: {sig['url']}...")
-
-                        # LOGGING: Record checking this anchor
-                        analysis_log.append({
-                            "url": sig.get('url'),
-                            "title": sig.get('title'),
-                            "stage": "context_anchor",
-                            "decision": "pending",
-                            "model": "gpt-4o"
-                        })
-                    
-                        # Specialized Analysis for CONTEXT ANCHORS
-                        # Strictly enforces "Significance" over "Aesthetics"
-                    
-                        sys_prompt = f"""
-                        {strategy.get('trigger_prompt')}
-                    
-                        SPECIAL MODE: CONTEXT ANCHOR ANALYSIS ("Evergreen")
-                    
-                        OBJECTIVE: Determine if this content provides a DEFENSIBLE, STRATEGIC reason for outreach.
-                        - We are looking for EVIDENCE of Scale, Complexity, or High-Stakes outcomes.
-                        - We are IGNORING "competence" (e.g. they designed a nice logo).
-                    
-                        CRITERIA FOR RELEVANCE (Must meet ALL):
-                        1. **Client Magnitude:** The client is a recognizable Enterprise, Regulated Industry, or Global Brand (e.g. Nike, Sephora, Coca-Cola).
-                        2. **Outcome Significance:** The work involved "Scaling", "National Rollout", "Transformation", "Complex Integration", or "Rapid Growth".
-                        3. **Freshness Signal:** There MUST be evidence the case study was RECENTLY published or the work was RECENTLY completed.
-                           - Look for: dates in 2025/2026, "recently completed", "just launched", copyright year, metadata dates, blog post dates.
-                           - If no freshness signal exists, set is_relevant=false. Undated portfolio pages are NOT valid triggers.
-                        4. **Outreach Fit:** Would referencing this case study feel timely and natural in a cold email?
-                           - If a recipient would think "why are you emailing me about old work?", set is_relevant=false.
-                    
-                        DISALLOWED (Do NOT Trigger):
-                        - "New Website" or "Rebranding" (unless accompanied by "Enterprise Scale" context).
-                        - "Logo Design", "Visual Identity".
-                        - Generic praise ("Great team to work with!").
-                        - Undated case studies or portfolio pages without clear recency signals.
-                        - Work completed more than 12 months ago.
-                    
-                        INSTRUCTIONS:
-                        - Extract the Client Name and the SPECIFIC Strategic Outcome.
-                        - Check for ANY date or recency signal. If none found, REJECT.
-                        - Set is_relevant=True ONLY if it passes BOTH the Significance Filter AND the Freshness Filter.
-                        
-                        Client Context: {client_context}
-
-                        OUTPUT JSON:
-                        {{
-                            "is_relevant": true/false,
-                            "confidence": 0-10,
-                            "summary": "1-sentence summary",
-                            "freshness_evidence": "What date or recency signal was found (or 'None found')",
-                            "outcome_delta": "The 2nd order implication (Risk/Upside). Must be specific.",
-                            "buying_window": "Typically 'Transition' or 'Execution' for these signals."
-                        }}
-                        """
-                    
-                        analysis = call_openai_analysis(sig, sys_prompt, openai_key, model="gpt-4o")
-                        
-                        # Log result
-                        analysis_log[-1].update({
-                            "confidence": analysis.get('confidence', 0),
-                            "is_relevant": analysis.get('is_relevant'),
-                            "decision": "triggered" if analysis.get('is_relevant') else "rejected"
-                        })
-                    
-                        if analysis.get('is_relevant') and analysis.get('confidence', 0) >= 8: # Higher confidence bar
-                            freshness = analysis.get('freshness_evidence', 'None found')
-                            print(f"      ✅ CONTEXT ANCHOR: {analysis['summary']}")
-                            print(f"         Strategy: {analysis.get('buying_window')} | Delta: {analysis.get('outcome_delta')}")
-                            print(f"         Freshness: {freshness}")
-                        
-                            # DEDUP CHECK (Context Anchor)
-                            existing_dedup = supabase.table("trigger_dedup").select("id").eq("company_id", comp['id']).eq("source_url", sig.get('url')).execute()
-                            if existing_dedup.data:
-                                print(f"      ♻️ DEDUP (Anchor): Already triggered on this URL. Skipping.")
-                                continue
-
-                            # CONTEXT_ANCHOR → pending_review (NOT auto-triggered)
-                            merge_score_factors(supabase, comp['id'], {
-                                "outcome_delta": analysis.get('outcome_delta'),
-                                "buying_window": analysis.get('buying_window'),
-                                "freshness_evidence": freshness
-                            })
-                            supabase.table("triggered_companies").update({
-                                "event_type": "CONTEXT_ANCHOR",
-                                "event_title": analysis['summary'],
-                                "event_source_url": sig['url'],
-                                "last_monitored_at": "now()",
-                                "monitoring_status": "pending_review"
-                            }).eq("id", comp['id']).execute()
-
-                            # Record Dedup
-                            try:
-                                supabase.table("trigger_dedup").insert({
-                                    "company_id": comp['id'],
-                                    "source_url": sig['url'],
-                                    "trigger_type": "CONTEXT_ANCHOR"
-                                }).execute()
-                            except Exception as e:
-                                print(f"      ⚠️ Dedup insert failed: {e}")
-                        
-                            # NO auto-drafting for CONTEXT_ANCHOR.
-                            # User reviews in dashboard → approves → then drafts are generated.
-                            print(f"      📋 Context Anchor queued for review (no auto-draft)")
-                        
-                            trigger_found = True
-                            trigger_type_found = "CONTEXT_ANCHOR"
-                            break
-                        
-                except ImportError:
-                    print("      ⚠️ Scout modules not found (ImportError). skipping.")
-                except Exception as e:
-                    print(f"      ⚠️ Context Anchor Scout failed: {e}")
+        anchor_type = _run_context_anchor_fallback(comp, strategy, client_context, apify_client, supabase, writes, openai_key, scan_start, analysis_log, dedup_filter, llm_cache, budget)
+        if anchor_type:
+            trigger_found = True
+            trigger_type_found = anchor_type
 
     # ==================== V6 COMPOSITE + STAGE 2.5 SYNTHESIS ====================
     if strategy.get("use_v6_pipeline", False):
+        v6_trigger_type = _run_v6_post_scan(comp, strategy, client_context, supabase, writes, all_v6_classified_signals, v6_velocity_ratio, trigger_found)
+        if v6_trigger_type:
+            trigger_found = True
+            trigger_type_found = v6_trigger_type
 
-        # ── Stage 2.5: Cross-scout narrative synthesis (cost-gated) ──
-        synthesis_result = None
-        if all_v6_classified_signals:
-            print(f"      🔬 [V6 Stage 2.5] Running cross-scout synthesis for {comp.get('company')}...")
-            try:
-                synthesis_result = run_stage_2_5_synthesis(
-                    account={
-                        "account_id": comp["id"],
-                        "company_name": comp.get("company", ""),
-                        "domain": comp.get("website", ""),
-                        "industry": comp.get("industry", "unknown"),
-                    },
-                    classified_signals=all_v6_classified_signals,
-                    client_context=strategy,
-                    velocity_ratio=v6_velocity_ratio,
-                )
-            except Exception as e:
-                print(f"      ⚠️ [Stage 2.5] Synthesis failed (non-fatal): {e}")
+    # OBSERVABILITY: Finalize scan log
+    scan_counters = {
+        "apify_calls": 1 + apify_fallback_count,  # 1 for initial search + fallback fetches
+        "llm_calls": llm_calls,
+        "pages_fetched": pages_fetched,
+        **article_cache_stats,
+        **llm_cache.counters(),
+        **budget.counters(),
+        **prefetcher.counters()
+    }
+    _complete_scan(comp, writes, scan_log, trigger_found, trigger_type_found, scan_counters)
+    
+    # Rate limiting
+    time.sleep(2)
+
+
+async def process_company_scan_async(comp: dict, apify_client, supabase, openai_key: str, engine: ScanEngine, force_rescan: bool = False, scan_start: float = None, scan_batch_id: str = None, dedup_filter: TriggerDedupFilter = None, search_broker: SearchBroker = None, apify_runner: ApifyRunner = None):
+    """
+    Asyncio flavour of process_company_scan: same stages, same budgets, same DB writes.
+    Every blocking call is awaited through `engine`, gated on the semaphore of the
+    resource it hits, so one event loop can interleave many company scans.
+
+    Differences from the threaded path:
+    - Scouts are awaited concurrently on the 'apify' gate (no per-company thread pool).
+    - Article fetches for the triage shortlist run concurrently on the 'fetch' gate.
+      Deep analysis stays in rank order so the best confirmed trigger still wins.
+    - With a search_broker, the Google search and the blog scout's discovery queries
+      share batched actor runs with the other scans on this loop.
+    - With an apify_runner, the primary search and crawler fallback runs are started
+      and polled (apify_runner.py) instead of holding an 'apify' thread for the run.
+    """
+    attach_breaker_state(supabase, GLOBAL_LLM_BREAKER, GLOBAL_APIFY_BREAKER)
+    writes = ScanWriteBuffer(supabase, comp.get('id'))
+    with SpanRecorder().activate():  # This task's context: engine calls copy it onto their threads
+        try:
+            return await _process_company_scan_async(comp, apify_client, supabase, writes, openai_key, engine, force_rescan, scan_start, scan_batch_id, dedup_filter, search_broker, apify_runner)
+        finally:
+            await engine.run("supabase", writes.flush)
+
+
+async def _process_company_scan_async(comp: dict, apify_client, supabase, writes: ScanWriteBuffer, openai_key: str, engine: ScanEngine, force_rescan: bool, scan_start: float, scan_batch_id: str, dedup_filter: TriggerDedupFilter, search_broker: SearchBroker = None, apify_runner: ApifyRunner = None):
+    # OBSERVABILITY: Create scan log entry
+    scan_log = await engine.run("supabase", ScanLog, supabase, comp, scan_batch_id)
+    analysis_log = scan_log.analysis_log
+
+    async def _finalize_scan_log(*args, **kwargs):
+        await engine.run("supabase", scan_log.finalize, *args, **kwargs)
+
+    # TIME BUDGET GUARD: Skip if we're running low on wall-clock time
+    if scan_start and (time.time() - scan_start) > 780:
+        print(f"⏱️ TIME BUDGET EXHAUSTED: Skipping {comp.get('company')} (elapsed: {int(time.time() - scan_start)}s)")
+        await _finalize_scan_log("skipped_budget")
+        return
+
+    print(f"🏢 Scanning: {comp.get('company')} (Strategy: {comp.get('client_context')}) [async]")
+
+    client_context = comp.get("client_context", "pulsepoint_strategic")
+    strategy = CLIENT_STRATEGIES.get(client_context, CLIENT_STRATEGIES.get("pulsepoint_strategic"))
 
-        if synthesis_result and not synthesis_result.get("error"):
-            nc = synthesis_result.get("narrative_confidence", 0)
-            headline = synthesis_result.get("story_headline", "")
-            s_urgency = synthesis_result.get("composite_urgency", "MONITOR")
-            print(f"      🔬 [Stage 2.5] Confidence: {nc:.2f} | Urgency: {s_urgency} | '{headline}'")
+    if not strategy:
+        print(f"❌ CRITICAL ERROR: Strategy '{client_context}' not found and fallback 'pulsepoint_strategic' missing.")
+        await _finalize_scan_log("failed_no_strategy")
+        return
 
-            # Synthesis-driven escalation
-            if synthesis_result.get("composite_escalate") and not trigger_found:
-                trigger_found = True
-                trigger_type_found = "STAGE_2_5_SYNTHESIS"
-                print(f"      🚀 [Stage 2.5] SYNTHESIS ESCALATION: Composite narrative triggered outreach!")
+    v6_velocity_ratio = await engine.run("supabase", _fetch_velocity_ratio, comp, strategy, supabase)
+    budget = await engine.run("supabase", _scan_budget, supabase, comp, strategy)
+    if not budget.can_afford(APIFY_PRICES["apify/google-search-scraper"]):
+        print(f"      🛑 Client daily cost budget exhausted. Skipping {comp.get('company')}.")
+        await _finalize_scan_log("skipped_budget", error="Client daily cost budget exhausted")
+        return
+    all_v6_classified_signals = []
+    llm_cache = _llm_cache_session(supabase, force_rescan, budget)
 
-            # Persist synthesis output to score_factors
+    # 1. Search (batched: waiting on the broker holds no 'apify' slot)
+    search_results = None
+    if search_broker is not None:
+        print(f"      🔎 Searching Google News (Last 7 Days) [batched]...")
+        try:
+            with span("search", batched=1):
+                hit = await asyncio.wrap_future(search_broker.submit(_google_search_query(comp, strategy), **GOOGLE_NEWS_SEARCH_INPUT))
+            search_results = _brokered_results(hit, budget)
+        except Exception as e:
+            print(f"      ⚠️ Batched search failed ({e}). Running it directly...")
+    if search_results is None and apify_runner is not None:
+        search_results = await _run_google_search_async(comp, strategy, apify_client, apify_runner, engine, budget)
+    elif search_results is None:
+        search_results = await engine.run("apify", _run_google_search, comp, strategy, apify_client, budget)
+    if search_results is None:
+        await _finalize_scan_log("failed_search", error="Apify search failed after retry")
+        return
+
+    # 2. Fingerprint
+    unchanged, new_hash = _check_search_fingerprint(comp, search_results, writes, force_rescan)
+    if unchanged:
+        await _finalize_scan_log("skipped_fingerprint", counters={"apify_calls": 1, **budget.counters()})
+        return
+
+    all_results, seen_urls = _dedup_search_results(search_results)
+    print(f"      ✨ New Content Detected (Hash: {new_hash[:8]}). Analyzing {len(search_results)} items...")
+
+    # 3. Deep scouts — one task per scout on the shared 'apify' gate
+    score_factors = comp.get('score_factors', {}) or {}
+    scout_jobs = await engine.run("supabase", _build_scout_jobs, comp, strategy, apify_client, supabase, writes, force_rescan, score_factors, search_broker)
+    for scout_type, _, _ in scout_jobs:
+        budget.record_apify(f"scout:{scout_type}")
+    scout_tasks = [
+        (scout_type, asyncio.ensure_future(engine.run("apify", scan_log.spans.wrap(f"scout:{scout_type}", func), *args)))
+        for scout_type, func, args in scout_jobs
+    ]
+    if scout_tasks:
+        _, pending = await asyncio.wait([task for _, task in scout_tasks], timeout=180)
+        if pending:
+            print(f"      ⚠️ Scouts Timed Out (180s). {len(pending)} still running; moving to analysis with partial results.")
+            for task in pending:
+                task.cancel()
+        for scout_type, task in scout_tasks:
+            if task in pending:
+                continue
             try:
-                existing_resp = (
-                    supabase.table("triggered_companies")
-                    .select("score_factors")
-                    .eq("id", comp["id"])
-                    .execute()
-                )
-                sf = {}
-                if existing_resp.data:
-                    sf = existing_resp.data[0].get("score_factors", {}) or {}
-                if not isinstance(sf, dict):
-                    sf = {}
-                from datetime import datetime as _dt, timezone as _tz
-                sf["v6_synthesis"] = {
-                    "story_headline": synthesis_result.get("story_headline"),
-                    "composite_brief": synthesis_result.get("composite_brief"),
-                    "outreach_angle": synthesis_result.get("outreach_angle"),
-                    "recommended_subject_lines": synthesis_result.get("recommended_subject_lines", []),
-                    "primary_evidence_quote": synthesis_result.get("primary_evidence_quote"),
-                    "window_closes_in_days": synthesis_result.get("window_closes_in_days"),
-                    "urgency_label": synthesis_result.get("urgency_label"),
-                    "narrative_confidence": nc,
-                    "composite_escalate": synthesis_result.get("composite_escalate"),
-                    "synthesized_at": _dt.now(_tz.utc).isoformat(),
-                }
-                supabase.table("triggered_companies").update({"score_factors": sf}).eq("id", comp["id"]).execute()
+                res = task.result()
+                if res:
+                    _merge_scout_items(scout_type, res, all_results, seen_urls, comp, score_factors, writes)
             except Exception as e:
-                print(f"      ⚠️ [Stage 2.5] Failed to persist synthesis: {e}")
-        elif all_v6_classified_signals:
-            print(f"      🔬 [Stage 2.5] Gate not triggered (insufficient signal density)")
-
-        # ── Composite scoring (rule-based, seeded by synthesis if available) ──
-        print(f"      🔬 [V6] Running composite signal scoring for {comp.get('company')}...")
-        composite_result = run_composite_scoring(comp['id'], client_context, supabase, synthesis_result=synthesis_result)
-        if composite_result:
-            score = composite_result.get('composite_trigger_score', 0)
-            urgency = composite_result.get('composite_urgency', 'MONITOR')
-            signals = composite_result.get('signal_count', 0)
-            escalated = composite_result.get('escalated_from_context_only', False)
-            print(f"      🔬 [V6 Composite] Score: {score}, Urgency: {urgency}, Signals: {signals}, Escalated: {escalated}")
-            if escalated and not trigger_found:
-                trigger_found = True
-                trigger_type_found = "COMPOSITE_ESCALATION"
-                print(f"      🚀 [V6] COMPOSITE ESCALATION: CONTEXT_ONLY accumulation triggered outreach!")
+                print(f"      ⚠️ {scout_type} scout failed: {e}")
+
+    # 4. Analysis
+    trigger_found = False
+    trigger_type_found = None
+    pages_fetched = 0
+    apify_fallback_count = 0
+    article_cache_stats = {"article_cache_hits": 0, "article_cache_misses": 0}
+    llm_calls = 0
+
+    print(f"      🏁 Starting analysis (Budget: ${budget.remaining:.3f} of ${budget.limit:.3f} left)...")
+
+    candidates = []
+    for res in all_results:
+        url_valid, url_rejection = is_valid_article_url(res.get("url", ""), comp['company'])
+        if not url_valid:
+            print(f"      ⛔ URL REJECTED: {url_rejection}")
+            continue
+        candidates.append(res)
+
+    seen_index = await engine.run("supabase", load_seen_urls, supabase, comp, force_rescan)
+    candidates = filter_unseen(candidates, seen_index)
+    seen_outcomes = {}
+    candidates = await engine.run("supabase", _drop_already_triggered, candidates, comp, dedup_filter, supabase, seen_outcomes)
+    candidates = _drop_stale_candidates(candidates, strategy, seen_outcomes)
+
+    # Batched triage: one call ranks every candidate; deep analysis gets the rest of the budget.
+    # Free-tier article downloads for the top candidates overlap the triage call.
+    shortlist = []
+    prefetcher = AsyncArticlePrefetcher(engine, functools.partial(_extract_article_free, cache_stats=article_cache_stats), MAX_FETCHED_PAGES_TOTAL)
+    if candidates and not budget.can_afford(_triage_cost_estimate(candidates)):
+        print(f"      🛑 Cost budget reached before triage (${budget.spent:.3f}/${budget.limit:.3f}). Skipping analysis.")
+        candidates = []
+    if candidates:
+        prefetcher.start([r['url'] for r in candidates[:PREFETCH_TOP_K]])
+        print(f"      🔍 Triaging {len(candidates)} candidates in one call...")
+        verdicts = await engine.run(
+            "openai", triage_relevance_batch, [_news_item(r) for r in candidates],
+            comp['company'], client_context, openai_key, llm_cache
+        )
+        llm_calls += 1
+        for res, quick_analysis in zip(candidates, verdicts):
+            _log_relevance(analysis_log, _news_item(res), quick_analysis)
+            if quick_analysis.get('judged') and not (quick_analysis.get('is_relevant') and quick_analysis.get('confidence', 0) >= 6):
+                mark_seen(seen_outcomes, res, "triage_rejected", quick_analysis.get('confidence', 0))
+        shortlist = shortlist_triaged(candidates, verdicts, _budget_shortlist_limit(budget, strategy))
+
+    # The (budget-sized) shortlist downloads concurrently; deep analysis consumes it in rank order
+    prefetcher.keep([res['url'] for res, _ in shortlist])
+    deep_cost = _deep_analysis_cost_estimate(strategy)
+
+    for res, quick_analysis in shortlist:
+        prefetched = await prefetcher.take(res['url'])
+        if prefetched is None:
+            print(f"      🛑 Page Fetch Budget Reached ({prefetcher.pages}/{MAX_FETCHED_PAGES_TOTAL}). Stopping scan.")
+            break
+        # Paid Apify fallback only for shortlisted items the loop actually reaches
+        if apify_runner is not None:
+            article_text, used_apify = await extract_article_content_async(res['url'], apify_client, apify_runner, engine, budget=budget, prefetched=prefetched)
         else:
-            print(f"      🔬 [V6 Composite] No signals in analysis window — skipped.")
+            article_text, used_apify = await engine.run("fetch", extract_article_content, res['url'], apify_client, budget=budget, prefetched=prefetched)
+        if used_apify: apify_fallback_count += 1
+        if not _passes_date_precheck(article_text, strategy, url=res.get('url')):
+            mark_seen(seen_outcomes, res, "stale", quick_analysis.get('confidence', 0))
+            continue
+        if not budget.can_afford(deep_cost - APIFY_PRICES["apify/website-content-crawler"]):
+            print(f"      🛑 Cost budget reached (${budget.spent:.3f}/${budget.limit:.3f}) before deep analysis. Skipping.")
+            break
+
+        news_item = _news_item(res)
+        analysis = await engine.run(
+            "openai", _run_deep_analysis, news_item, article_text, comp, client_context,
+            openai_key, supabase, analysis_log, all_v6_classified_signals, budget
+        )
+        llm_calls += 1
+
+        if not analysis.get('is_relevant'):
+            mark_seen(seen_outcomes, res, "deep_rejected", analysis.get('confidence', 0))
+            continue
+        if analysis.get('confidence', 0) < 7:
+            print(f"      ⚠️ Relevance too low ({analysis.get('confidence', 0)}/10). Skipping.")
+            mark_seen(seen_outcomes, res, "low_confidence", analysis.get('confidence', 0))
+            continue
+
+        trigger_type = await engine.run(
+            "supabase", _handle_confirmed_trigger, res, analysis, comp, strategy,
+            client_context, apify_client, supabase, writes, openai_key, dedup_filter, llm_cache
+        )
+        if not trigger_type:
+            mark_seen(seen_outcomes, res, "duplicate", analysis.get('confidence', 0))
+            continue
+        mark_seen(seen_outcomes, res, "triggered", analysis.get('confidence', 0))
+        trigger_found = True
+        trigger_type_found = trigger_type
+        break
+
+    prefetcher.close()
+    pages_fetched = prefetcher.pages
+    await engine.run("supabase", record_seen_urls, supabase, comp, seen_outcomes)
+
+    # 5. Fallbacks — these stages are dominated by Apify/LLM waits, so they hold an apify slot
+    if not trigger_found and strategy.get('trigger_prompt'):
+        anchor_type = await engine.run(
+            "apify", _run_context_anchor_fallback, comp, strategy, client_context,
+            apify_client, supabase, writes, openai_key, scan_start, analysis_log, dedup_filter, llm_cache, budget
+        )
+        if anchor_type:
+            trigger_found = True
+            trigger_type_found = anchor_type
+
+    if strategy.get("use_v6_pipeline", False):
+        v6_trigger_type = await engine.run(
+            "openai", _run_v6_post_scan, comp, strategy, client_context, supabase, writes,
+            all_v6_classified_signals, v6_velocity_ratio, trigger_found
+        )
+        if v6_trigger_type:
+            trigger_found = True
+            trigger_type_found = v6_trigger_type
 
-    # OBSERVABILITY: Finalize scan log
     scan_counters = {
-        "apify_calls": 1 + apify_fallback_count,  # 1 for initial search + fallback fetches
+        "apify_calls": 1 + apify_fallback_count,
         "llm_calls": llm_calls,
-        "pages_fetched": pages_fetched
+        "pages_fetched": pages_fetched,
+        **article_cache_stats,
+        **llm_cache.counters(),
+        **budget.counters(),
+        **prefetcher.counters()
     }
-    
-    if not trigger_found:
-        try:
-            supabase.table("triggered_companies").update({"last_monitored_at": "now()"}).eq("id", comp['id']).execute()
-        except Exception as e:
-            print(f"      ⚠️ Failed to update timestamp: {e}")
-        print("      (No relevant triggers found)")
-        _finalize_scan_log("success", counters=scan_counters)
-    else:
-        _finalize_scan_log("success", trigger_found=True,
-                          trigger_type=trigger_type_found,
-                          counters=scan_counters)
-    
-    # Rate limiting
-    time.sleep(2)
+    await engine.run("supabase", _complete_scan, comp, writes, scan_log, trigger_found, trigger_type_found, scan_counters)
+
 
+def _mark_scan_crashed(supabase, comp: dict, scan_batch_id: str, error_msg: str) -> None:
+    """Finalize a crashed scan's 'running' scan_log row so it never stays open forever."""
+    try:
+        supabase.table("monitor_scan_log").update({
+            "status": "crashed",
+            "error": error_msg[:500],
+            "completed_at": "now()"
+        }).eq("company_id", comp.get('id')).eq("scan_batch_id", scan_batch_id).eq("status", "running").execute()
+    except Exception as log_err:
+        print(f"    ⚠️ Could not finalize crash log: {log_err}")
+
+def _commit_article_cache() -> None:
+    """Persist this container's article cache writes so other workers see them."""
+    try:
+        article_cache_volume.commit()
+    except Exception as e:
+        print(f"   ⚠️ Article cache commit failed: {e}")
 
+def _release_scan_claim(supabase, comp: dict) -> None:
+    try:
+        supabase.table("triggered_companies").update({"scan_claimed_at": None}).eq("id", comp["id"]).execute()
+    except Exception:
+        pass
 
-@app.function(
-    image=image,
-    secrets=[modal.Secret.from_dotenv()],
-    timeout=300 # 5 mins per company (relaxed from 180s to allow for retries/deep scouts)
-)
-def scan_single_company(comp: dict, force_rescan: bool = False, scan_batch_id: str = None):
+async def scan_companies_async(companies: list, apify_client, supabase, openai_key: str, force_rescan: bool = False, scan_batch_id: str = None, max_concurrent_scans: int = 25, engine: ScanEngine = None, dedup_filter: TriggerDedupFilter = None):
+    """
+    Scans many companies concurrently on the current event loop.
+    Each company gets the same safety net as scan_single_company: crashes finalize
+    the scan_log row, and the scan claim is always released.
+    Google searches from all scans go through one SearchBroker (batched actor runs), and
+    search / crawler runs are polled by one ApifyRunner instead of parking a thread each.
     """
-    Isolated worker for scanning a single company.
+    import traceback
+
+    owns_engine = engine is None
+    engine = engine or ScanEngine()
+    apify_runner = ApifyRunner(apify_client, limiter=get_rate_limiter("apify"))
+    search_broker = SearchBroker(apify_client, breaker=GLOBAL_APIFY_BREAKER, runner=apify_runner)
+    company_slots = asyncio.Semaphore(max(1, max_concurrent_scans))
+    scan_start = time.time()
+
+    async def _scan_one(comp):
+        async with company_slots:
+            try:
+                await process_company_scan_async(comp, apify_client, supabase, openai_key, engine,
+                                                 force_rescan=force_rescan, scan_start=scan_start,
+                                                 scan_batch_id=scan_batch_id, dedup_filter=dedup_filter,
+                                                 search_broker=search_broker, apify_runner=apify_runner)
+            except Exception as e:
+                error_msg = f"{type(e).__name__}: {str(e)}"
+                print(f"💥 CRASH in scan for {comp.get('company')}: {error_msg}")
+                print(f"    Traceback: {traceback.format_exc()[-500:]}")
+                await engine.run("supabase", _mark_scan_crashed, supabase, comp, scan_batch_id, error_msg)
+            finally:
+                await engine.run("supabase", _release_scan_claim, supabase, comp)
+
+    try:
+        await asyncio.gather(*(_scan_one(comp) for comp in companies))
+    finally:
+        search_broker.close()
+        if search_broker.runs:
+            print(f"🔎 Search broker: {search_broker.queries} queries in {search_broker.runs} actor runs")
+        apify_runner.close()
+        if apify_runner.started:
+            print(f"📡 Apify runner: {apify_runner.started} runs polled (peak {apify_runner.peak_in_flight} in flight)")
+        if owns_engine:
+            engine.close()
+
+
+
+def _scan_company(comp: dict, apify_client, supabase, openai_key: str, force_rescan: bool = False, scan_batch_id: str = None, dedup_filter: bytes = None, search_broker: SearchBroker = None):
+    """
+    One company, start to finish, on clients the caller owns.
     Safety net: ANY crash finalizes the scan_log so rows never stay 'running' forever.
+    Returns {"rate_limited", "elapsed_seconds"} for the orchestrator's spawn controller.
     """
-    import time, traceback
-    
-    # Instantiate clients locally since they can't be pickled easily
-    supabase = get_supabase()
-    apify_token = os.environ.get("APIFY_API_KEY")
-    openai_key = os.environ.get("OPENAI_API_KEY")
-    
-    if not apify_token or not openai_key:
-        print(f"❌ Missing API Keys for {comp.get('company')}")
-        return
+    import traceback
+    started = time.time()
+    rate_limits_before = rate_limit_count()
 
-    apify_client = ApifyClient(apify_token)
-    
-    # Ensure strategies are loaded in this worker (Global state is not shared)
+    # Strategies are cached per container: this is a version check, reloading only when they changed
     fetch_client_strategies(supabase)
-    
+
     # SAFETY NET: Wrap entire scan in try/except so scan_log ALWAYS gets finalized; finally clear claim
     try:
-        process_company_scan(comp, apify_client, supabase, openai_key, force_rescan=force_rescan, scan_start=time.time(), scan_batch_id=scan_batch_id)
+        process_company_scan(comp, apify_client, supabase, openai_key, force_rescan=force_rescan, scan_start=time.time(),
+                             scan_batch_id=scan_batch_id, dedup_filter=_unpack_dedup_filter(dedup_filter), search_broker=search_broker)
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)}"
         tb = traceback.format_exc()
         print(f"💥 CRASH in scan for {comp.get('company')}: {error_msg}")
         print(f"    Traceback: {tb[-500:]}")
         # Attempt to finalize the scan_log row as 'crashed'
-        try:
-            supabase.table("monitor_scan_log").update({
-                "status": "crashed",
-                "error": error_msg[:500],
-                "completed_at": "now()"
-            }).eq("company_id", comp.get('id')).eq("scan_batch_id", scan_batch_id).eq("status", "running").execute()
-        except Exception as log_err:
-            print(f"    ⚠️ Could not finalize crash log: {log_err}")
+        _mark_scan_crashed(supabase, comp, scan_batch_id, error_msg)
+    finally:
+        _release_scan_claim(supabase, comp)
+    return {"rate_limited": rate_limit_count() - rate_limits_before, "elapsed_seconds": round(time.time() - started, 1)}
+
+
+@app.function(
+    image=image,
+    secrets=[modal.Secret.from_dotenv()],
+    volumes={"/cache": article_cache_volume},
+    timeout=300 # 5 mins per company (relaxed from 180s to allow for retries/deep scouts)
+)
+def scan_single_company(comp: dict, force_rescan: bool = False, scan_batch_id: str = None, dedup_filter: bytes = None):
+    """
+    Isolated worker for scanning a single company (ad-hoc runs; the orchestrator uses ScanWorker).
+    dedup_filter is the orchestrator's TriggerDedupFilter for this company, as bytes.
+    """
+    supabase, apify_client, openai_key = _container_clients()
+    if not apify_client or not openai_key:
+        print(f"❌ Missing API Keys for {comp.get('company')}")
+        return None
+    try:
+        return _scan_company(comp, apify_client, supabase, openai_key, force_rescan=force_rescan,
+                             scan_batch_id=scan_batch_id, dedup_filter=dedup_filter)
     finally:
+        _commit_article_cache()
+
+
+# ==================== SCAN WORKER ====================
+# A per-invocation function pays for a cold start, three new API clients and a
+# strategy reload for every company. ScanWorker containers set that up once and
+# then take scans until they go idle:
+#
+#   enter       Supabase / Apify / OpenAI clients, client strategies, caches, and one
+#               SearchBroker so concurrent scans share batched Google search runs
+#   scan        one company per input; up to SCAN_WORKER_MAX_INPUTS run at once in
+#               the container (threads), further spawns go to more containers
+#   idle        containers stay warm SCAN_WORKER_IDLE_SECS between spawn waves
+#
+# The article cache volume is committed at most every CACHE_COMMIT_INTERVAL_SECS
+# and on container exit, instead of after every scan.
+
+SCAN_WORKER_MAX_INPUTS = int(os.environ.get("SCAN_WORKER_MAX_INPUTS", "8"))
+SCAN_WORKER_IDLE_SECS = int(os.environ.get("SCAN_WORKER_IDLE_SECS", "120"))
+CACHE_COMMIT_INTERVAL_SECS = float(os.environ.get("CACHE_COMMIT_INTERVAL_SECS", "30"))
+
+
+@app.cls(
+    image=image,
+    secrets=[modal.Secret.from_dotenv()],
+    volumes={"/cache": article_cache_volume},
+    timeout=300,  # Per scan, as scan_single_company
+    scaledown_window=SCAN_WORKER_IDLE_SECS
+)
+@modal.concurrent(max_inputs=SCAN_WORKER_MAX_INPUTS)
+class ScanWorker:
+    """
+    Container-lifetime scan worker. Concurrent scans share the container's clients,
+    caches and breakers; rate_limited in a scan's result counts every 429 the
+    container saw during that scan, so the spawn controller errs toward backing off.
+    """
+
+    @modal.enter()
+    def start(self):
+        self.supabase, self.apify_client, self.openai_key = _container_clients()
+        fetch_client_strategies(self.supabase)
+        self.scans = 0
+        self._cache_commits = CommitThrottle(article_cache_volume.commit, CACHE_COMMIT_INTERVAL_SECS)
+        self.search_broker = SearchBroker(self.apify_client, breaker=GLOBAL_APIFY_BREAKER) if self.apify_client else None
+        print(f"🧰 Scan worker ready (up to {SCAN_WORKER_MAX_INPUTS} concurrent scans)")
+
+    @modal.method()
+    def scan(self, comp: dict, force_rescan: bool = False, scan_batch_id: str = None, dedup_filter: bytes = None):
+        if not self.apify_client or not self.openai_key:
+            print(f"❌ Missing API Keys for {comp.get('company')}")
+            return None
         try:
-            supabase.table("triggered_companies").update({"scan_claimed_at": None}).eq("id", comp["id"]).execute()
-        except Exception:
-            pass
+            return _scan_company(comp, self.apify_client, self.supabase, self.openai_key, force_rescan=force_rescan,
+                                 scan_batch_id=scan_batch_id, dedup_filter=dedup_filter, search_broker=self.search_broker)
+        finally:
+            self.scans += 1
+            self._cache_commits.maybe_commit()
+
+    @modal.exit()
+    def stop(self):
+        self._cache_commits.maybe_commit(force=True)
+        if self.search_broker is not None:
+            self.search_broker.close()
+            if self.search_broker.runs:
+                print(f"🔎 Search broker: {self.search_broker.queries} queries in {self.search_broker.runs} actor runs")
+        print(f"🧰 Scan worker exiting after {self.scans} scans")
+
+
+@app.function(
+    image=image,
+    secrets=[modal.Secret.from_dotenv()],
+    volumes={"/cache": article_cache_volume},
+    timeout=1200 # Same envelope as the orchestrator: one container works a whole slice
+)
+def scan_company_batch(companies: list, force_rescan: bool = False, scan_batch_id: str = None, apify_limit: int = None, dedup_filter: bytes = None):
+    """
+    Asyncio worker: scans a slice of already-claimed companies concurrently in one container.
+    apify_limit is this container's share of the account-wide Apify concurrency.
+    """
+    supabase, apify_client, openai_key = _container_clients()
+
+    if not apify_client or not openai_key:
+        print(f"❌ Missing API Keys for batch of {len(companies)} companies")
+        for comp in companies:
+            _release_scan_claim(supabase, comp)
+        return
+
+    fetch_client_strategies(supabase)
+
+    engine = ScanEngine({"apify": apify_limit} if apify_limit else None)
+    print(f"⚡ Async batch: {len(companies)} companies (limits: {engine.limits})")
+    try:
+        asyncio.run(scan_companies_async(
+            companies, apify_client, supabase, openai_key,
+            force_rescan=force_rescan, scan_batch_id=scan_batch_id,
+            max_concurrent_scans=len(companies), engine=engine,
+            dedup_filter=_unpack_dedup_filter(dedup_filter)
+        ))
+    finally:
+        engine.close()
+        _commit_article_cache()
+
+
+def _load_dedup_index(supabase, companies: list):
+    """Batch-wide trigger_dedup index (one load per run); None means workers check per URL as before."""
+    try:
+        index = load_trigger_dedup_index(supabase, [comp.get('id') for comp in companies])
+        print(f"♻️ Dedup filter: {len(index)} prior triggers across {len(companies)} companies")
+        return index
+    except Exception as e:
+        print(f"⚠️ Dedup filter unavailable, workers will check per URL: {e}")
+        return None
+
+def _dedup_filter_bytes(dedup_index, companies: list):
+    """This worker's slice of the dedup index, in spawn-argument form."""
+    if dedup_index is None:
+        return None
+    return dedup_index.filter_for([comp.get('id') for comp in companies]).to_bytes()
+
+def _unpack_dedup_filter(data: bytes):
+    if not data:
+        return None
+    try:
+        return TriggerDedupFilter.from_bytes(data)
+    except Exception as e:
+        print(f"   ⚠️ Ignoring unreadable dedup filter: {e}")
+        return None
+
+def _poll_scan(call):
+    """(done, result) for a spawned scan, without blocking."""
+    try:
+        return True, call.get(timeout=0)
+    except modal.exception.FunctionTimeoutError as e:
+        return True, {"error": f"FunctionTimeoutError: {e}"}
+    except TimeoutError:
+        return False, None
+    except Exception as e:  # Worker crashed outside its own safety net: finished as far as scheduling goes
+        return True, {"error": f"{type(e).__name__}: {e}"}
+
+def _apify_usage(apify_client):
+    """(running actor jobs, account concurrency limit) for the spawn controller; None if unavailable."""
+    limits = apify_client.user().limits()
+    if not limits:
+        return None
+    return limits["current"]["activeActorJobCount"], limits["limits"]["maxConcurrentActorJobs"]
+
+def _claim_company(supabase, comp: dict, claim_cutoff: str) -> bool:
+    """Claim-before-spawn so overlapping runs never scan the same company twice."""
+    try:
+        claim_resp = supabase.rpc("claim_company_for_scan", {"p_company_id": comp["id"], "p_cutoff": claim_cutoff}).execute()
+        if claim_resp.data and len(claim_resp.data) > 0 and claim_resp.data[0].get("claimed"):
+            return True
+        print(f"   ⏭️ Skipping {comp.get('company', 'unknown')} (already claimed)")
+    except Exception as e:
+        print(f"   ⚠️ Claim failed for {comp.get('company', 'unknown')}: {e}")
+    return False
 
 
 # MODAL FUNCTION
@@ -2557,6 +3524,7 @@ def run_monitoring_scan(company_id: str = None, force_rescan: bool = False):
         target_companies = get_due_companies(supabase)
     
     print(f"📋 Processing {len(target_companies)} companies")
+    dedup_index = _load_dedup_index(supabase, target_companies)
     
     # STALE CLEANUP: Mark any 'running' scan_log rows from >20 min ago as 'stale_timeout'
     # This prevents orphaned rows from accumulating when functions crash without finalizing.
@@ -2573,37 +3541,59 @@ def run_monitoring_scan(company_id: str = None, force_rescan: bool = False):
             print(f"🧹 Cleaned up {stale_count} stale 'running' scan logs")
     except Exception as e:
         print(f"⚠️ Stale cleanup failed: {e}")
+
+    # SPAN ROLLUP: daily p50/p90/p99 per scan stage for yesterday (all of its scans have finished)
+    try:
+        rolled = supabase.rpc("rollup_scan_spans", {"p_day": (datetime.utcnow() - timedelta(days=1)).date().isoformat()}).execute()
+        print(f"⏱️ Span rollup: {rolled.data or 0} stage rows for yesterday")
+    except Exception as e:
+        print(f"⚠️ Span rollup failed: {e}")
     
-    # BATCHED SPAWNING: Process in waves with claim-before-spawn to prevent duplicate scans
+    # ADAPTIVE SPAWNING: keep a feedback-driven number of scans in flight, claim-before-spawn
     APIFY_MAX_CONCURRENT = int(os.environ.get("APIFY_MAX_CONCURRENT", "20"))
-    BATCH_SIZE = max(1, min(10, APIFY_MAX_CONCURRENT // 6))
-    WAVE_DELAY_SECS = int(os.environ.get("SCAN_WAVE_DELAY_SECS", "60"))
+    INITIAL_IN_FLIGHT = max(1, min(10, APIFY_MAX_CONCURRENT // 6))  # ~6 Apify runs per scan at peak
+    SPAWN_WINDOW_SECS = int(os.environ.get("SCAN_SPAWN_WINDOW_SECS", "1020"))  # Leaves headroom in the 1200s timeout
+    SCAN_ENGINE = os.environ.get("SCAN_ENGINE", "threads")  # threads | asyncio
 
     from datetime import timezone
     CLAIM_WINDOW_MINUTES = 25
     claim_cutoff = (datetime.now(timezone.utc) - timedelta(minutes=CLAIM_WINDOW_MINUTES)).isoformat()
 
     total_spawned = 0
-    for i in range(0, len(target_companies), BATCH_SIZE):
-        wave = target_companies[i:i + BATCH_SIZE]
-        for comp in wave:
-            try:
-                claim_resp = supabase.rpc("claim_company_for_scan", {"p_company_id": comp["id"], "p_cutoff": claim_cutoff}).execute()
-                if claim_resp.data and len(claim_resp.data) > 0 and claim_resp.data[0].get("claimed"):
-                    scan_single_company.spawn(comp, force_rescan=force_rescan, scan_batch_id=scan_batch_id)
-                    total_spawned += 1
-                else:
-                    print(f"   ⏭️ Skipping {comp.get('company', 'unknown')} (already claimed)")
-            except Exception as e:
-                print(f"   ⚠️ Claim failed for {comp.get('company', 'unknown')}: {e}")
-        
-        wave_num = (i // BATCH_SIZE) + 1
-        total_waves = (len(target_companies) + BATCH_SIZE - 1) // BATCH_SIZE
-        print(f"🚀 Wave {wave_num}/{total_waves}: Spawned {len(wave)} scans (total: {total_spawned}/{len(target_companies)})")
-        
-        # Delay between waves (except after the last one)
-        if i + BATCH_SIZE < len(target_companies):
-            time.sleep(WAVE_DELAY_SECS)
+    if SCAN_ENGINE == "asyncio":
+        # ASYNC ENGINE: claim up front, then hand each container a slice to scan concurrently.
+        # No wave sleeps — each container's ScanEngine gates Apify to its share of the account limit.
+        claimed = [comp for comp in target_companies if _claim_company(supabase, comp, claim_cutoff)]
+        per_container = max(1, int(os.environ.get("ASYNC_COMPANIES_PER_CONTAINER", "25")))
+        slices = [claimed[i:i + per_container] for i in range(0, len(claimed), per_container)]
+        apify_limit = max(1, APIFY_MAX_CONCURRENT // max(1, len(slices)))
+        for chunk in slices:
+            scan_company_batch.spawn(chunk, force_rescan=force_rescan, scan_batch_id=scan_batch_id, apify_limit=apify_limit,
+                                     dedup_filter=_dedup_filter_bytes(dedup_index, chunk))
+        total_spawned = len(claimed)
+        print(f"⚡ Async engine: {total_spawned} companies across {len(slices)} containers (Apify {apify_limit}/container)")
+    else:
+        # A new scan starts as soon as one finishes; the target ramps on clean completions and
+        # backs off on 429s / Apify saturation (spawn_controller.py). Unclaimed companies stay due.
+        # Scans go to warm ScanWorker containers, several per container.
+        worker = ScanWorker()
+        def _launch(comp):
+            if not _claim_company(supabase, comp, claim_cutoff):
+                return None
+            return worker.scan.spawn(comp, force_rescan=force_rescan, scan_batch_id=scan_batch_id,
+                                     dedup_filter=_dedup_filter_bytes(dedup_index, [comp]))
+
+        controller = AdaptiveConcurrency(initial=INITIAL_IN_FLIGHT)
+        stats = SpawnScheduler(controller).run(
+            target_companies, launch=_launch, poll=_poll_scan,
+            deadline=time.monotonic() + max(0, SPAWN_WINDOW_SECS - (time.time() - scan_start)),
+            apify_usage=lambda: _apify_usage(apify_client)
+        )
+        total_spawned = stats["launched"]
+        print(f"📈 Spawn controller: peak target {stats['peak_target']}, {stats['backoffs']} backoffs, "
+              f"{stats['rate_limited']}/{stats['completed']} finished scans rate-limited, {stats['in_flight']} still running")
+        if stats["unlaunched"]:
+            print(f"⏭️ Spawn window closed: {stats['unlaunched']} companies left unclaimed for the next run")
     
     elapsed = int(time.time() - scan_start)
     print(f"✅ Spawning complete in {elapsed}s — {total_spawned} tasks launched (batch: {scan_batch_id[:8]})")
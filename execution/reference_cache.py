@@ -0,0 +1,119 @@
+"""
+Reference Data Cache — versioned, in-process, one per container.
+
+Client strategies (+ profiles), email templates and V6 velocity baselines change
+a few times a day at most, but every scan used to re-query them. Entries are
+kept in process memory and stamped with the versions of the tables they were
+built from. Validity is checked with one cheap query:
+
+    SELECT name, version FROM reference_data_versions
+
+at most every REFERENCE_CHECK_SECONDS. Statement-level triggers bump a table's
+version on any INSERT/UPDATE/DELETE (migration 15), so an entry is reloaded only
+when one of its source tables actually changed.
+
+Without the versions table (migration not applied, or the check fails) every
+table's version rolls over each REFERENCE_FALLBACK_TTL_SECONDS, i.e. a plain TTL.
+
+Entries with no depends_on always use that plain TTL. That is for small per-row
+reads from tables written too often to version (account_signal_baselines): a
+version bump per write would reload them as often as the table changes.
+
+Usage:
+    strategies = get_reference_cache().get(
+        supabase, "client_strategies", loader, depends_on=("client_strategies", "client_profiles"))
+    ratio = get_reference_cache().get(supabase, ("velocity_baseline", client, account), loader)  # TTL only
+"""
+import os
+import threading
+import time
+
+
+REFERENCE_CHECK_SECONDS = float(os.environ.get("REFERENCE_CHECK_SECONDS", "60"))
+REFERENCE_FALLBACK_TTL_SECONDS = float(os.environ.get("REFERENCE_FALLBACK_TTL_SECONDS", "600"))
+
+
+class ReferenceCache:
+    """
+    Thread-safe versioned memo. Loaders run outside the lock (two threads may
+    load the same key once; the last write wins). A loader that raises caches
+    nothing, so the next call retries.
+    """
+    def __init__(self, check_seconds: float = None, fallback_ttl_seconds: float = None):
+        self.check_seconds = REFERENCE_CHECK_SECONDS if check_seconds is None else check_seconds
+        self.fallback_ttl = REFERENCE_FALLBACK_TTL_SECONDS if fallback_ttl_seconds is None else fallback_ttl_seconds
+        self._versions = {}
+        self._versions_ok = False
+        self._checked_at = 0.0
+        self._entries = {}  # key -> (version snapshot, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def _refresh_versions(self, supabase) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._checked_at < self.check_seconds:
+                return
+            self._checked_at = now
+        try:
+            resp = supabase.table("reference_data_versions").select("name, version").execute()
+            versions = {row["name"]: row.get("version") for row in (resp.data or [])}
+            ok = True
+        except Exception as e:
+            print(f"   ⚠️ Reference version check failed, using {int(self.fallback_ttl)}s TTL: {e}")
+            versions, ok = {}, False
+        with self._lock:
+            self._versions, self._versions_ok = versions, ok
+
+    def _snapshot(self, depends_on: tuple) -> tuple:
+        if not depends_on:
+            return (("ttl", self._ttl_epoch()),)
+        if self._versions_ok:
+            return tuple(self._versions.get(name) for name in depends_on)
+        epoch = self._ttl_epoch()
+        return tuple(("ttl", epoch) for _ in depends_on)
+
+    def _ttl_epoch(self):
+        return int(time.time() // self.fallback_ttl) if self.fallback_ttl > 0 else time.time()
+
+    def get(self, supabase, key, loader, depends_on: tuple = ()):
+        """
+        Cached loader() result for `key`, reloaded when any `depends_on` table version
+        changes; without depends_on, once per fallback TTL.
+        """
+        if depends_on:
+            self._refresh_versions(supabase)
+        with self._lock:
+            snapshot = self._snapshot(depends_on)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == snapshot:
+                self.hits += 1
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (snapshot, value)
+            self.loads += 1
+        return value
+
+    def invalidate(self, key=None) -> None:
+        """Drop one entry (or all) and force a version check on the next get."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._checked_at = 0.0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_reference_cache() -> ReferenceCache:
+    """Process-wide cache instance (one per container, shared by every scan in it)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReferenceCache()
+        return _cache
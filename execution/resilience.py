@@ -1,10 +1,33 @@
-import time
+import asyncio
 import functools
+import json
+import os
 import random
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import SimpleNamespace
+
+
+_rate_limit_events = 0
+_rate_limit_lock = threading.Lock()
+
+
+def _status_code(exc: Exception):
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
 
 
 def _is_rate_limit_error(exc: Exception) -> bool:
     """Detect 429 / rate-limit errors to apply extended backoff."""
+    if _status_code(exc) == 429:
+        return True
     s = str(exc).lower()
     if "429" in s or "rate limit" in s or "rate_limit" in s or "too many requests" in s:
         return True
@@ -13,8 +36,299 @@ def _is_rate_limit_error(exc: Exception) -> bool:
     return False
 
 
+def _record_rate_limit(exc: Exception) -> bool:
+    """Count a rate-limit error for this process; returns whether exc was one."""
+    global _rate_limit_events
+    if not _is_rate_limit_error(exc):
+        return False
+    with _rate_limit_lock:
+        _rate_limit_events += 1
+    return True
+
+
+def rate_limit_count() -> int:
+    """Rate-limit errors seen by retry_with_backoff / CircuitBreaker in this process (monotonic)."""
+    return _rate_limit_events
+
+
+# ==================== RATE LIMITS ====================
+# Calls wait for capacity up front instead of discovering the ceiling with 429s:
+#
+#   TokenBucket    requests (or tokens) per minute; a caller reserves its share and is
+#                  told how long to wait, so threads and asyncio tasks queue fairly on
+#                  one bucket (time.sleep / asyncio.sleep outside the lock)
+#   RateLimiter    a requests/min bucket and an optional tokens/min bucket for one
+#                  provider + model; learns the real ceiling from x-ratelimit-* headers
+#                  and pauses everyone for Retry-After / an exhausted window
+#   RetryBudget    retries may add at most RETRY_BUDGET_RATIO of recent first attempts
+#                  (plus a small floor), so retries can't amplify an outage
+#
+# Limits are per process: set RATE_LIMITS to this container's share of the account, e.g.
+#   RATE_LIMITS='{"openai:gpt-4o": [500, 150000], "apify": [1200, null]}'
+
+RATE_LIMITS = {  # key -> (requests/min, tokens/min)
+    "openai:gpt-4o": (500, 150_000),
+    "openai:gpt-4o-mini": (1000, 1_000_000),
+    "openai": (500, 150_000),
+    "apify": (1200, None),
+}
+RATE_LIMITS.update({k: tuple(v) for k, v in json.loads(os.environ.get("RATE_LIMITS", "{}")).items()})
+RATE_LIMIT_BURST_SECS = float(os.environ.get("RATE_LIMIT_BURST_SECS", "5"))  # Bucket depth, in seconds of rate
+RETRY_BUDGET_RATIO = float(os.environ.get("RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN = int(os.environ.get("RETRY_BUDGET_MIN", "10"))
+RETRY_BUDGET_WINDOW_SECS = float(os.environ.get("RETRY_BUDGET_WINDOW_SECS", "60"))
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def _parse_duration(value: str):
+    """OpenAI reset durations: "1s", "6m0s", "20ms", or plain seconds."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    parts = _DURATION_PART.findall(str(value))
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+
+def _headers(source) -> dict:
+    """Lower-cased response headers from an exception, a response or a mapping."""
+    if source is None:
+        return {}
+    headers = source if isinstance(source, dict) else getattr(source, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(source, "response", None), "headers", None)
+    try:
+        return {str(k).lower(): v for k, v in (headers or {}).items()}
+    except AttributeError:
+        return {}
+
+
+def retry_after_seconds(source):
+    """Seconds the provider asked us to wait (Retry-After / retry-after-ms, or an exhausted x-ratelimit window)."""
+    headers = _headers(source)
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    if "retry-after" in headers:
+        value = headers["retry-after"]
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    waits = [_parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+             for kind in ("requests", "tokens") if str(headers.get(f"x-ratelimit-remaining-{kind}")) == "0"]
+    waits = [w for w in waits if w is not None]
+    return max(waits) if waits else None
+
+
+class TokenBucket:
+    """Thread-safe. reserve() takes tokens now (the balance may go negative: a queue) and returns the wait."""
+    def __init__(self, rate_per_min: float, burst_secs: float = None, clock=time.monotonic):
+        self.clock = clock
+        self.burst_secs = RATE_LIMIT_BURST_SECS if burst_secs is None else burst_secs
+        self._lock = threading.Lock()
+        self.set_rate(rate_per_min)
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def set_rate(self, rate_per_min: float) -> None:
+        self.rate = max(rate_per_min, 1e-9) / 60
+        self.capacity = max(1.0, self.rate * self.burst_secs)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, n: float = 1) -> float:
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= min(n, self.capacity)  # An oversized request takes the whole bucket, not forever
+            return max(0.0, -self.tokens / self.rate, self.paused_until - now)
+
+    def adjust(self, n: float) -> None:
+        """Return (n > 0) or charge (n < 0) tokens after the fact, e.g. actual vs estimated usage."""
+        with self._lock:
+            self._refill(self.clock())
+            self.tokens = min(self.capacity, self.tokens + n)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class RateLimiter:
+    """Requests/min (+ tokens/min) for one provider / model, shared by every thread and task in the process."""
+    def __init__(self, name: str, requests_per_min: float = None, tokens_per_min: float = None, clock=time.monotonic):
+        self.name = name
+        self.requests = TokenBucket(requests_per_min, clock=clock) if requests_per_min else None
+        self.tokens = TokenBucket(tokens_per_min, clock=clock) if tokens_per_min else None
+        self.waits = 0
+        self.waited_secs = 0.0
+        self.pauses = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 0) -> float:
+        wait = self.requests.reserve(1) if self.requests else 0.0
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            with self._lock:
+                self.waits += 1
+                self.waited_secs += wait
+        return wait
+
+    def acquire(self, tokens: float = 0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if self.tokens is not None and actual is not None:
+            self.tokens.adjust(estimated - actual)
+
+    def observe(self, source) -> float:
+        """Adopt x-ratelimit-limit-* ceilings and pause for Retry-After; returns the pause (0 if none)."""
+        headers = _headers(source)
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            if bucket is not None and limit:
+                try:
+                    bucket.set_rate(float(limit))
+                except ValueError:
+                    pass
+        wait = retry_after_seconds(headers)
+        if wait:
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.pause(wait)
+            with self._lock:
+                self.pauses += 1
+            print(f"      ⏳ [RateLimiter] {self.name}: provider asked for {wait:.1f}s, pausing all callers")
+        return wait or 0.0
+
+    def counters(self) -> dict:
+        with self._lock:
+            return {"waits": self.waits, "waited_secs": round(self.waited_secs, 2), "pauses": self.pauses}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str = None) -> RateLimiter:
+    """Process-wide limiter for provider (+ model); limits from RATE_LIMITS, falling back to the provider's."""
+    key = f"{provider}:{model}" if model else provider
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm, tpm = RATE_LIMITS.get(key) or RATE_LIMITS.get(provider) or (None, None)
+            limiter = _limiters[key] = RateLimiter(key, rpm, tpm)
+        return limiter
+
+
+class RetryBudget:
+    """Sliding-window cap on retries: at most min_retries + ratio x first attempts per window."""
+    def __init__(self, ratio: float = None, min_retries: int = None, window_secs: float = None, clock=time.monotonic):
+        self.ratio = RETRY_BUDGET_RATIO if ratio is None else ratio
+        self.min_retries = RETRY_BUDGET_MIN if min_retries is None else min_retries
+        self.window = RETRY_BUDGET_WINDOW_SECS if window_secs is None else window_secs
+        self.clock = clock
+        self._attempts = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def _prune(self, now: float) -> None:
+        for q in (self._attempts, self._retries):
+            while q and now - q[0] > self.window:
+                q.popleft()
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            self._attempts.append(now)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._attempts):
+                self.denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+
+RETRY_BUDGET = RetryBudget()
+
+
+class RateLimitedOpenAI:
+    """
+    OpenAI client whose chat.completions.create waits on the model's limiter:
+    the request is charged its estimated tokens (prompt chars / 4 + max_tokens),
+    corrected with the real usage, and response headers (when the SDK exposes
+    them) keep the limiter at the account's actual ceiling.
+    """
+    DEFAULT_COMPLETION_TOKENS = 1000
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    @classmethod
+    def estimate_tokens(cls, request: dict) -> int:
+        chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+        return chars // 4 + (request.get("max_tokens") or cls.DEFAULT_COMPLETION_TOKENS)
+
+    def _create(self, **request):
+        limiter = get_rate_limiter("openai", request.get("model"))
+        estimated = self.estimate_tokens(request)
+        limiter.acquire(estimated)
+        completions = self._client.chat.completions
+        try:
+            raw = getattr(completions, "with_raw_response", None)
+            if raw is not None:
+                response = raw.create(**request)
+                limiter.observe(response.headers)
+                completion = response.parse()
+            else:
+                completion = completions.create(**request)
+        except Exception as e:
+            limiter.observe(e)
+            raise
+        usage = getattr(completion, "usage", None)
+        limiter.settle(estimated, getattr(usage, "total_tokens", None))
+        return completion
+
+
 def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2,
-                       rate_limit_initial=15, rate_limit_factor=3, exceptions=(Exception,)):
+                       rate_limit_initial=15, rate_limit_factor=3, exceptions=(Exception,),
+                       limiter=None, retry_budget=None):
     """
     Decorator to retry a function call with exponential backoff.
     
@@ -23,72 +337,326 @@ def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2,
         initial_delay (float): Initial delay in seconds.
         backoff_factor (float): Multiplier for delay after each failure.
         exceptions (tuple): Tuple of exceptions to catch and retry.
+        limiter (RateLimiter): Acquired before every attempt; told about Retry-After.
+        retry_budget (RetryBudget): Process-wide cap on retries (default RETRY_BUDGET).
+
+    A Retry-After (or exhausted x-ratelimit window) on the error replaces the guessed
+    delay; without one, rate limits back off rate_limit_initial * rate_limit_factor**attempt.
     """
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            budget = retry_budget or RETRY_BUDGET
             delay = initial_delay
             last_exception = None
+            budget.record_attempt()
             
             for attempt in range(max_retries + 1):
+                if limiter is not None:
+                    limiter.acquire()
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
                     last_exception = e
+                    _record_rate_limit(e)
+                    hinted = limiter.observe(e) if limiter is not None else retry_after_seconds(e)
                     if attempt == max_retries:
                         print(f"      ❌ [Resilience] {func.__name__} failed after {max_retries} retries. Error: {e}")
                         raise last_exception
+                    if not budget.try_spend():
+                        print(f"      ❌ [Resilience] Retry budget exhausted; not retrying {func.__name__}. Error: {e}")
+                        raise last_exception
 
-                    if _is_rate_limit_error(e):
-                        delay = rate_limit_initial * (rate_limit_factor ** attempt)
-                        print(f"      ⚠️ [Resilience] Rate limit (429). Backing off {delay:.0f}s...")
+                    if hinted:
+                        wait = hinted
+                        print(f"      ⚠️ [Resilience] Rate limit: provider asked for {wait:.1f}s (Retry-After)...")
+                    elif _is_rate_limit_error(e):
+                        wait = rate_limit_initial * (rate_limit_factor ** attempt)
+                        print(f"      ⚠️ [Resilience] Rate limit (429). Backing off {wait:.0f}s...")
                     else:
+                        wait = delay
                         print(f"      ⚠️ [Resilience] {func.__name__} failed (Attempt {attempt + 1}/{max_retries}). Retrying in {delay}s... Error: {e}")
-
-                    sleep_time = delay + random.uniform(0, 0.5)
-                    time.sleep(sleep_time)
-
-                    if not _is_rate_limit_error(e):
                         delay *= backoff_factor
+
+                    time.sleep(wait + random.uniform(0, 0.5))
             
             return None # Should not be reached
         return wrapper
     return decorator
 
+
+# ==================== CIRCUIT BREAKER STATE ====================
+# A breaker's state lives in a store so the fleet can share it: every spawned
+# container used to start CLOSED and pay failure_threshold doomed calls of its own
+# during an outage. Stores apply the same transitions atomically:
+#
+#   record_failure   count the failure (inside failure_window, when set); open at the
+#                    threshold, or at once when it was the half-open probe
+#   acquire_probe    after reset_timeout, exactly one caller wins the half-open probe;
+#                    the others keep skipping until it reports (or its lease expires)
+#   record_success   the probe succeeded: close and forget the failures
+#
+#   MemoryBreakerState    this process only (the default, as before)
+#   SQLiteBreakerState    every process sharing a file (local runs, tests)
+#   SupabaseBreakerState  the whole fleet: circuit_breakers + RPCs (migration 22)
+#
+# BREAKER_STATE=supabase|sqlite selects the shared store (attach_breaker_state).
+
+BREAKER_STATE = os.environ.get("BREAKER_STATE", "")  # "" | supabase | sqlite
+BREAKER_STATE_PATH = os.environ.get("BREAKER_STATE_PATH", "/tmp/pulsepoint_breakers.sqlite")
+BREAKER_SYNC_SECONDS = float(os.environ.get("BREAKER_SYNC_SECONDS", "5"))  # Max staleness of a shared state read
+BREAKER_FAILURE_WINDOW_SECS = float(os.environ.get("BREAKER_FAILURE_WINDOW_SECS", "600"))
+BREAKER_PROBE_LEASE_SECS = float(os.environ.get("BREAKER_PROBE_LEASE_SECS", "120"))
+
+
+def _closed_row() -> dict:
+    return {"state": "CLOSED", "failures": 0, "window_start": 0.0, "opened_at": 0.0, "probe_until": 0.0}
+
+
+def _apply_failure(row: dict, threshold: int, window: float, now: float) -> bool:
+    """Updates row in place; True when this failure opened the circuit."""
+    if window and now - row["window_start"] > window:
+        row["failures"], row["window_start"] = 0, now
+    row["failures"] += 1
+    opened = row["state"] == "HALF_OPEN" or (row["state"] == "CLOSED" and row["failures"] >= threshold)
+    if opened:
+        row["state"], row["opened_at"], row["probe_until"] = "OPEN", now, 0.0
+    return opened
+
+
+def _apply_probe(row: dict, reset_timeout: float, lease: float, now: float) -> bool:
+    if row["state"] == "CLOSED" or now - row["opened_at"] <= reset_timeout or row["probe_until"] > now:
+        return False
+    row["state"], row["probe_until"] = "HALF_OPEN", now + lease
+    return True
+
+
+class MemoryBreakerState:
+    """Process-local store."""
+    shared = False
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def _row(self, name: str) -> dict:
+        return self._rows.setdefault(name, _closed_row())
+
+    def load(self, name: str) -> dict:
+        with self._lock:
+            return dict(self._row(name))
+
+    def record_failure(self, name: str, threshold: int, window: float, now: float) -> dict:
+        with self._lock:
+            row = self._row(name)
+            opened = _apply_failure(row, threshold, window, now)
+            return {**row, "opened": opened}
+
+    def acquire_probe(self, name: str, reset_timeout: float, lease: float, now: float) -> bool:
+        with self._lock:
+            return _apply_probe(self._row(name), reset_timeout, lease, now)
+
+    def record_success(self, name: str) -> None:
+        with self._lock:
+            self._rows[name] = _closed_row()
+
+
+class SQLiteBreakerState:
+    """File-backed store: one IMMEDIATE transaction per transition, so processes on the same file agree."""
+    shared = True
+
+    def __init__(self, path: str = None):
+        self.path = path or BREAKER_STATE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS circuit_breakers ("
+                " name TEXT PRIMARY KEY, state TEXT NOT NULL, failures INTEGER NOT NULL,"
+                " window_start REAL NOT NULL, opened_at REAL NOT NULL, probe_until REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return _SQLiteTransaction(conn)
+
+    @staticmethod
+    def _select(conn, name: str) -> dict:
+        row = conn.execute(
+            "SELECT state, failures, window_start, opened_at, probe_until FROM circuit_breakers WHERE name = ?", (name,)
+        ).fetchone()
+        return dict(zip(("state", "failures", "window_start", "opened_at", "probe_until"), row)) if row else _closed_row()
+
+    def _update(self, name: str, transition):
+        with self._connect() as conn:
+            row = self._select(conn, name)
+            result = transition(row)
+            conn.execute(
+                "INSERT OR REPLACE INTO circuit_breakers (name, state, failures, window_start, opened_at, probe_until)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (name, row["state"], row["failures"], row["window_start"], row["opened_at"], row["probe_until"]),
+            )
+            return row, result
+
+    def load(self, name: str) -> dict:
+        with self._connect() as conn:
+            return self._select(conn, name)
+
+    def record_failure(self, name: str, threshold: int, window: float, now: float) -> dict:
+        row, opened = self._update(name, lambda row: _apply_failure(row, threshold, window, now))
+        return {**row, "opened": opened}
+
+    def acquire_probe(self, name: str, reset_timeout: float, lease: float, now: float) -> bool:
+        return self._update(name, lambda row: _apply_probe(row, reset_timeout, lease, now))[1]
+
+    def record_success(self, name: str) -> None:
+        self._update(name, lambda row: row.update(_closed_row()))
+
+
+class _SQLiteTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        self.conn.close()
+
+
+class SupabaseBreakerState:
+    """Fleet-wide store: transitions run in Postgres (migration 22), timed by the database clock."""
+    shared = True
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    @staticmethod
+    def _row(data) -> dict:
+        row = (data[0] if isinstance(data, list) else data) if data else None
+        row = row or {}
+        return {**_closed_row(), **{k: v for k, v in row.items() if k in _closed_row()}, "opened": bool(row.get("opened"))}
+
+    def load(self, name: str) -> dict:
+        resp = self.supabase.table("circuit_breakers").select("*").eq("name", name).limit(1).execute()
+        return self._row(resp.data)
+
+    def record_failure(self, name: str, threshold: int, window: float, now: float) -> dict:
+        return self._row(self.supabase.rpc("breaker_record_failure", {
+            "p_name": name, "p_threshold": threshold, "p_window_secs": window or 0,
+        }).execute().data)
+
+    def acquire_probe(self, name: str, reset_timeout: float, lease: float, now: float) -> bool:
+        return bool(self.supabase.rpc("breaker_acquire_probe", {
+            "p_name": name, "p_reset_secs": reset_timeout, "p_lease_secs": lease,
+        }).execute().data)
+
+    def record_success(self, name: str) -> None:
+        self.supabase.rpc("breaker_record_success", {"p_name": name}).execute()
+
+
 class CircuitBreaker:
     """
-    Simple in-memory circuit breaker.
-    If 'failures' exceeds 'threshold', matches are blocked for 'reset_timeout'.
+    Circuit breaker over a (possibly shared) state store.
+    After failure_threshold failures (within failure_window, when set) calls are
+    skipped (None) for reset_timeout; then one caller probes and closes it again.
+    A shared store is read at most every sync_seconds; a store that errors
+    degrades to this process's own state.
     """
-    def __init__(self, failure_threshold=3, reset_timeout=3600):
+    def __init__(self, failure_threshold=3, reset_timeout=3600, name: str = None, store=None,
+                 failure_window: float = None, probe_lease: float = None, sync_seconds: float = None, clock=time.time):
         self.failure_threshold = failure_threshold
         self.reset_timeout = reset_timeout
-        self.failures = 0
-        self.last_failure_time = 0
-        self.state = "CLOSED" # CLOSED, OPEN
-        
+        self.name = name or f"breaker-{id(self):x}"
+        self.failure_window = failure_window
+        self.probe_lease = BREAKER_PROBE_LEASE_SECS if probe_lease is None else probe_lease
+        self.sync_seconds = BREAKER_SYNC_SECONDS if sync_seconds is None else sync_seconds
+        self.clock = clock
+        self._local = MemoryBreakerState()
+        self.store = store or self._local
+        self._view = _closed_row()
+        self._synced_at = None
+        self.skipped = 0
+
+    def attach(self, store) -> None:
+        """Move onto a shared store (idempotent: the first attached store is kept)."""
+        if self.store is self._local and store is not None:
+            self.store = store
+            self._synced_at = None
+
+    def _store_op(self, op: str, *args):
+        try:
+            return getattr(self.store, op)(self.name, *args)
+        except Exception as e:
+            if self.store is self._local:
+                raise
+            print(f"      ⚠️ [CircuitBreaker] Shared state {op} failed, using local state: {e}")
+            return getattr(self._local, op)(self.name, *args)
+
+    def _current(self) -> dict:
+        now = self.clock()
+        if not self.store.shared or self._synced_at is None or now - self._synced_at >= self.sync_seconds:
+            self._view, self._synced_at = self._store_op("load"), now
+        return self._view
+
+    @property
+    def state(self) -> str:
+        return self._current()["state"]
+
+    @property
+    def failures(self) -> int:
+        return self._current()["failures"]
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being skipped (OPEN, or HALF_OPEN with another caller probing)."""
+        view = self._current()
+        return view["state"] != "CLOSED" and not (
+            self.clock() - view["opened_at"] > self.reset_timeout and view["probe_until"] <= self.clock())
+
     def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > self.reset_timeout:
-                print(f"      🔄 [CircuitBreaker] Reset timeout expired. Half-opening...")
-                self.state = "HALF_OPEN"
-            else:
-                print(f"      ⛔ [CircuitBreaker] Circuit is OPEN. Skipping call.")
+        probing = False
+        if self._current()["state"] != "CLOSED":
+            probing = self._store_op("acquire_probe", self.reset_timeout, self.probe_lease, self.clock())
+            if not probing:
+                self.skipped += 1
+                print(f"      ⛔ [CircuitBreaker] Circuit {self.name} is OPEN. Skipping call.")
                 return None
-                
+            print(f"      🔄 [CircuitBreaker] Reset timeout expired. Half-opening {self.name} (this caller probes)...")
+
         try:
             result = func(*args, **kwargs)
-            if self.state == "HALF_OPEN":
-                self.state = "CLOSED"
-                self.failures = 0
-            return result
         except Exception as e:
-            self.failures += 1
-            self.last_failure_time = time.time()
-            print(f"      ⚠️ [CircuitBreaker] Call failed ({self.failures}/{self.failure_threshold}). Error: {e}")
-            
-            if self.failures >= self.failure_threshold:
-                self.state = "OPEN"
-                print(f"      🔌 [CircuitBreaker] Threshold reached. Circuit OPEN for {self.reset_timeout}s.")
-            
+            _record_rate_limit(e)
+            self._view = self._store_op("record_failure", self.failure_threshold, self.failure_window, self.clock())
+            self._synced_at = self.clock()
+            print(f"      ⚠️ [CircuitBreaker] Call failed ({self._view['failures']}/{self.failure_threshold}). Error: {e}")
+            if self._view.get("opened"):
+                print(f"      🔌 [CircuitBreaker] Threshold reached. Circuit {self.name} OPEN for {self.reset_timeout}s.")
             raise e
+
+        if probing:
+            self._store_op("record_success")
+            self._view, self._synced_at = _closed_row(), self.clock()
+        return result
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def attach_breaker_state(supabase, *breakers) -> None:
+    """Put breakers on the fleet-wide store selected by BREAKER_STATE (idempotent; no-op when unset)."""
+    global _shared_store
+    if BREAKER_STATE not in ("supabase", "sqlite"):
+        return
+    with _shared_store_lock:
+        if _shared_store is None:
+            if BREAKER_STATE == "sqlite":
+                _shared_store = SQLiteBreakerState()
+            elif supabase is not None:
+                _shared_store = SupabaseBreakerState(supabase)
+    for breaker in breakers:
+        breaker.attach(_shared_store)
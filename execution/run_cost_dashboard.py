@@ -39,29 +39,68 @@ def generate_cost_report(days=7):
     total_llm = sum(l.get('llm_calls', 0) or 0 for l in logs)
     total_triggers = sum(1 for l in logs if l.get('trigger_found'))
     
-    # Cost Assumptions
+    # Cost Assumptions (only for scans logged before per-scan cost tracking, migration 18)
     COST_PER_APIFY_CALL = 0.03 # Avg cost for SERP + Crawl
     COST_PER_LLM_CALL = 0.04   # GPT-4o Input + Output avg
     
-    est_apify_cost = total_apify * COST_PER_APIFY_CALL
-    est_llm_cost = total_llm * COST_PER_LLM_CALL
-    total_cost = est_apify_cost + est_llm_cost
+    def _scan_costs(l):
+        """(apify_usd, llm_usd, estimated) for one scan log row."""
+        if l.get('cost_usd') is not None:
+            return float(l.get('apify_cost_usd') or 0), float(l.get('llm_cost_usd') or 0), False
+        return (l.get('apify_calls', 0) or 0) * COST_PER_APIFY_CALL, (l.get('llm_calls', 0) or 0) * COST_PER_LLM_CALL, True
+    
+    costs = [_scan_costs(l) for l in logs]
+    apify_cost = sum(c[0] for c in costs)
+    llm_cost = sum(c[1] for c in costs)
+    estimated_scans = sum(1 for c in costs if c[2])
+    total_cost = apify_cost + llm_cost
+    total_tokens_in = sum(l.get('llm_tokens_in', 0) or 0 for l in logs)
+    total_tokens_out = sum(l.get('llm_tokens_out', 0) or 0 for l in logs)
     
     avg_cost_per_scan = total_cost / total_scans if total_scans else 0
+    cost_per_trigger = total_cost / total_triggers if total_triggers else 0
     
     data = [
         ["Total Scans", total_scans],
         ["Triggers Found", total_triggers],
         ["Apify Calls", total_apify],
         ["LLM Calls", total_llm],
-        ["Est. Apify Cost", f"${est_apify_cost:.2f}"],
-        ["Est. LLM Cost", f"${est_llm_cost:.2f}"],
+        ["LLM Tokens (in / out)", f"{total_tokens_in:,} / {total_tokens_out:,}"],
+        ["Apify Cost", f"${apify_cost:.2f}"],
+        ["LLM Cost", f"${llm_cost:.2f}"],
         ["TOTAL COST", f"${total_cost:.2f}"],
-        ["Avg Cost / Scan", f"${avg_cost_per_scan:.2f}"]
+        ["Avg Cost / Scan", f"${avg_cost_per_scan:.3f}"],
+        ["Cost / Trigger", f"${cost_per_trigger:.2f}"],
+        ["Scans Estimated (no cost_usd)", estimated_scans]
     ]
     
     print(tabulate(data, headers=["Metric", "Value"], tablefmt="grid"))
     
+    # Breakdown by Client
+    clients = {}
+    for l, (apify_usd, llm_usd, _) in zip(logs, costs):
+        row = clients.setdefault(l.get('client_context') or 'unknown', [0, 0, 0.0])
+        row[0] += 1
+        row[1] += 1 if l.get('trigger_found') else 0
+        row[2] += apify_usd + llm_usd
+    print("\n🏢 Cost by Client:")
+    print(tabulate(
+        [[c, n, t, f"${usd:.2f}", f"${usd / n:.3f}"] for c, (n, t, usd) in sorted(clients.items(), key=lambda kv: -kv[1][2])],
+        headers=["Client", "Scans", "Triggers", "Cost", "Avg / Scan"], tablefmt="grid"
+    ))
+    
+    # Breakdown by Call Site / Actor (tracked scans only)
+    sites = {}
+    for l in logs:
+        for site, usd in (l.get('cost_breakdown') or {}).items():
+            sites[site] = sites.get(site, 0.0) + float(usd or 0)
+    if sites:
+        print("\n🔎 Cost by Call Site:")
+        print(tabulate(
+            [[site, f"${usd:.2f}", f"{usd / total_cost * 100:.1f}%" if total_cost else "-"] for site, usd in sorted(sites.items(), key=lambda kv: -kv[1])],
+            headers=["Site", "Cost", "Share"], tablefmt="grid"
+        ))
+    
     # Breakdown by Status
     status_counts = {}
     for l in logs:
@@ -0,0 +1,151 @@
+"""
+Record real company scans into cassettes, then replay them offline as a benchmark.
+
+    # 1. Record: real scans (spends Apify / OpenAI credit, writes scan results as usual)
+    python execution/run_scan_replay.py record --limit 50 --out .tmp/cassettes
+
+    # 2. Replay: 50 recordings x 20 copies = 1,000 scans, no network, no credit
+    python execution/run_scan_replay.py replay .tmp/cassettes --copies 20 --workers 16 --latency realistic
+
+Replay runs the unmodified process_company_scan against scan_cassette proxies and
+reports throughput, p50 / p95 per-company latency and call counts per kind (plus
+cassette misses, which mean the code path changed since recording). Every copy has
+its own cassette, so copies of a company replay independently. LLM cache reads are
+bypassed (force_rescan) and the article cache is disabled so each scan pays for the
+same calls it made when recorded; --pacing keeps the monitor's time.sleep pauses.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import article_cache
+import llm_cache
+import monitor_companies_job as monitor
+from article_cache import ArticleCache
+from llm_cache import LLMCache, SQLiteCacheBackend
+from scan_cassette import LATENCY_PROFILES, Cassette, install_replay_patches
+
+
+def _cassette_path(out_dir: str, comp: dict) -> str:
+    return os.path.join(out_dir, f"{comp['id']}.jsonl")
+
+
+def record(args) -> None:
+    from dotenv import load_dotenv
+    from apify_client import ApifyClient
+    load_dotenv()
+
+    supabase = monitor.get_supabase()
+    apify_client = ApifyClient(os.environ.get("APIFY_API_KEY"))
+    openai_key = os.environ.get("OPENAI_API_KEY")
+    monitor.fetch_client_strategies(supabase)
+    install_replay_patches(monitor, record=True)
+
+    query = supabase.table("triggered_companies").select("*").order("last_monitored_at", desc=False)
+    if args.client:
+        query = query.eq("client_context", args.client)
+    companies = query.limit(args.limit).execute().data or []
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "companies.json"), "w") as f:
+        json.dump({"strategies": monitor.CLIENT_STRATEGIES, "companies": companies}, f, default=str)
+
+    print(f"🎙️ Recording {len(companies)} scans into {args.out}")
+    for i, comp in enumerate(companies, 1):
+        cassette = Cassette(_cassette_path(args.out, comp), mode="record", real_apify=apify_client, real_supabase=supabase)
+        try:
+            with cassette.activate():
+                monitor.process_company_scan(comp, cassette.apify(), cassette.supabase(), openai_key, force_rescan=True)
+        except Exception as e:
+            print(f"   ⚠️ {comp.get('company')}: {e}")
+        finally:
+            cassette.close()
+        print(f"   [{i}/{len(companies)}] {comp.get('company')}")
+
+
+def _replay_one(path: str, comp: dict, latency: dict, seed: int) -> tuple:
+    cassette = Cassette(path, latency=latency, seed=seed)
+    start = time.perf_counter()
+    with cassette.activate():
+        try:
+            monitor.process_company_scan(dict(comp), cassette.apify(), cassette.supabase(), "replay", force_rescan=True)
+        except Exception as e:
+            print(f"   ⚠️ {comp.get('company')}: {e}")
+    return time.perf_counter() - start, cassette.counters()
+
+
+def replay(args) -> dict:
+    with open(os.path.join(args.dir, "companies.json")) as f:
+        recorded = json.load(f)
+    monitor.CLIENT_STRATEGIES.update(recorded["strategies"])
+    install_replay_patches(monitor)
+    if not args.pacing:
+        monitor.time = SimpleNamespace(**{n: getattr(time, n) for n in dir(time) if not n.startswith("_")}, sleep=lambda secs: None)
+
+    scratch = tempfile.mkdtemp(prefix="scan-replay-")
+    article_cache._cache = ArticleCache(root=os.path.join(scratch, "articles"))
+    article_cache._cache.enabled = False
+    llm_cache._cache = LLMCache(local=SQLiteCacheBackend(os.path.join(scratch, "llm.sqlite")))
+
+    latency = LATENCY_PROFILES[args.latency]
+    jobs = [(_cassette_path(args.dir, comp), comp)
+            for comp in recorded["companies"] if os.path.exists(_cassette_path(args.dir, comp))]
+    jobs = [job for _ in range(args.copies) for job in jobs]
+    print(f"▶️ Replaying {len(jobs)} scans ({args.workers} workers, latency={args.latency})")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(lambda ij: _replay_one(*ij[1], latency, ij[0]), enumerate(jobs)))
+    wall = time.perf_counter() - start
+
+    durations = sorted(d for d, _ in results)
+    calls, misses = Counter(), Counter()
+    for _, counters in results:
+        calls.update(counters["calls"])
+        misses.update(counters["misses"])
+    report = {
+        "scans": len(results),
+        "wall_s": round(wall, 2),
+        "throughput_per_min": round(len(results) / wall * 60, 1) if wall else None,
+        "p50_s": round(statistics.median(durations), 3) if durations else None,
+        "p95_s": round(durations[int(0.95 * (len(durations) - 1))], 3) if durations else None,
+        "calls": dict(calls),
+        "misses": dict(misses),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Run real scans and record their traffic")
+    rec.add_argument("--limit", type=int, default=50)
+    rec.add_argument("--client", help="Only companies of this client_context")
+    rec.add_argument("--out", default=".tmp/cassettes")
+
+    rep = sub.add_parser("replay", help="Replay recorded scans offline")
+    rep.add_argument("dir")
+    rep.add_argument("--copies", type=int, default=1, help="Replay every recording this many times")
+    rep.add_argument("--workers", type=int, default=8)
+    rep.add_argument("--latency", choices=sorted(LATENCY_PROFILES), default="realistic")
+    rep.add_argument("--pacing", action="store_true", help="Keep the monitor's time.sleep pauses")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        replay(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Load-test the monitor's database path against LocalSupabase (no live project).
+
+    python execution/run_supabase_load.py --companies 2000 20000 --latency-ms 4 --workers 32
+
+For each universe size: seeds synthetic companies / leads / scan history, then runs
+the orchestrator's database work with the monitor's own functions —
+
+    orchestrate   fetch_client_strategies, get_due_companies (get_prioritized_due_companies
+                  RPC, keyset-paged), the batch dedup index, stale cleanup, span rollup
+    scan          per due company, on `workers` threads: claim_company_for_scan, ScanLog
+                  insert, client_spend_today budget, seen-URL load, a scout's score_factors
+                  merge through ScanWriteBuffer, and _complete_scan (flush + finalize)
+
+and reports wall time, throughput and database round-trips (per scan and per
+statement). --latency-ms sleeps that long per round-trip to model the network hop;
+--no-rpc drops the due-selection RPC to measure the Python fallback.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import monitor_companies_job as monitor
+from local_supabase import LocalSupabase, seed_synthetic
+from scan_writes import ScanWriteBuffer
+
+
+def _scan_lifecycle(db, comp: dict, claim_cutoff: str, scan_batch_id: str) -> bool:
+    if not monitor._claim_company(db, comp, claim_cutoff):
+        return False
+    strategy = monitor.CLIENT_STRATEGIES.get(comp.get("client_context"), {})
+    scan_log = monitor.ScanLog(db, comp, scan_batch_id)
+    budget = monitor._scan_budget(db, comp, strategy)
+    monitor.load_seen_urls(db, comp)
+    writes = ScanWriteBuffer(db, comp["id"])
+    writes.merge_score_factors({"last_blog_scout": datetime.now(timezone.utc).isoformat()})
+    monitor._complete_scan(comp, writes, scan_log, False, None, budget.counters())
+    return True
+
+
+def run(companies: int, latency_ms: float, workers: int, rpc: bool = True, seed: int = 0) -> dict:
+    db = LocalSupabase(latency=latency_ms / 1000)
+    seeded = seed_synthetic(db, companies=companies, seed=seed)
+    if not rpc:
+        db.register_rpc("get_prioritized_due_companies", None)
+    monitor.CLIENT_STRATEGIES.clear()
+    monitor.get_reference_cache().invalidate()
+
+    start = time.perf_counter()
+    monitor.fetch_client_strategies(db)
+    due = monitor.get_due_companies(db)
+    monitor._load_dedup_index(db, due)
+    stale_cutoff = (datetime.utcnow() - timedelta(minutes=20)).isoformat()
+    db.table("monitor_scan_log").update({"status": "stale_timeout", "completed_at": "now()"}) \
+        .eq("status", "running").lt("started_at", stale_cutoff).execute()
+    db.rpc("rollup_scan_spans", {"p_day": (datetime.utcnow() - timedelta(days=1)).date().isoformat()}).execute()
+    orchestrate_s = time.perf_counter() - start
+    orchestrate_trips = db.round_trips
+
+    db.reset_counters()
+    claim_cutoff = (datetime.now(timezone.utc) - timedelta(minutes=25)).isoformat()
+    scan_batch_id = str(uuid.uuid4())
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scanned = sum(pool.map(lambda comp: _scan_lifecycle(db, comp, claim_cutoff, scan_batch_id), due))
+    scan_s = time.perf_counter() - start
+
+    return {
+        **seeded,
+        "due": len(due),
+        "orchestrate_s": round(orchestrate_s, 3),
+        "orchestrate_round_trips": orchestrate_trips,
+        "scanned": scanned,
+        "scan_s": round(scan_s, 3),
+        "scans_per_s": round(scanned / scan_s, 1) if scan_s else None,
+        "round_trips_per_scan": round(db.round_trips / scanned, 2) if scanned else None,
+        "by_statement": dict(db.calls.most_common()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--latency-ms", type=float, default=4.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--no-rpc", action="store_true", help="Select due companies with the Python fallback")
+    args = parser.parse_args()
+
+    for companies in args.companies:
+        report = run(companies, args.latency_ms, args.workers, rpc=not args.no_rpc)
+        print(f"\n📊 {companies} companies ({report['scan_logs']} history rows): {report['due']} due")
+        print(f"   orchestrate: {report['orchestrate_s']}s, {report['orchestrate_round_trips']} round-trips")
+        print(f"   scans: {report['scanned']} in {report['scan_s']}s ({report['scans_per_s']}/s), "
+              f"{report['round_trips_per_scan']} round-trips per scan")
+        for statement, n in report["by_statement"].items():
+            print(f"      {statement:<45} {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Scan Budget — dollar-denominated spend control for one company scan.
+
+MAX_LLM_CALLS / MAX_FETCHED_PAGES_TOTAL counted a gpt-4o-mini triage call the
+same as a gpt-4o context-anchor call, and never counted Apify at all. ScanBudget
+prices what a scan actually spends:
+
+    LLM     completion.usage (prompt / completion tokens) x LLM_PRICES[model]
+            (character estimate when usage is unavailable, e.g. the V6 pipeline)
+    Apify   run["usageTotalUsd"] from the run object when present,
+            else APIFY_PRICES[actor] (scouts: per run, they only return items)
+
+and gates the optional stages (triage, deep analysis, context anchors) on
+
+    limit = min(company ceiling, client's remaining daily budget)
+
+Company ceiling: strategy["scan_budget_usd"], else COMPANY_SCAN_BUDGET_USD scaled
+by daily_scan_limit / DEFAULT_DAILY_SCAN_LIMIT (clients who buy a higher limit
+get deeper scans). Client daily budget: strategy["daily_budget_usd"], else
+daily_scan_limit x company ceiling; today's spend comes from monitor_scan_log
+(client_spend_today, migration 18). counters() is persisted per scan.
+"""
+import os
+import threading
+
+
+# USD per 1M tokens: (input, output)
+LLM_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+# USD per run, used when the run object carries no usageTotalUsd
+APIFY_PRICES = {
+    "apify/google-search-scraper": 0.004,
+    "apify/website-content-crawler": 0.006,
+    "scout": 0.010,
+}
+CHARS_PER_TOKEN = 4
+COMPANY_SCAN_BUDGET_USD = float(os.environ.get("COMPANY_SCAN_BUDGET_USD", "0.15"))
+DEFAULT_COMPLETION_TOKENS = 600
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = LLM_PRICES.get(model, LLM_PRICES["gpt-4o"])  # Unknown models priced high
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def estimate_llm_cost(model: str, prompt_chars: int, completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> float:
+    return llm_cost(model, prompt_chars // CHARS_PER_TOKEN, completion_tokens)
+
+
+def _usage_tokens(usage) -> tuple:
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+class ScanBudget:
+    """Spend ledger + ceiling for one scan. Thread-safe (scouts record from worker threads)."""
+    def __init__(self, ceiling_usd: float = None, client_remaining_usd: float = None):
+        self.ceiling = COMPANY_SCAN_BUDGET_USD if ceiling_usd is None else ceiling_usd
+        self.client_remaining = client_remaining_usd
+        self.llm_usd = 0.0
+        self.apify_usd = 0.0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.breakdown = {}  # site / actor -> usd
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> float:
+        if self.client_remaining is None:
+            return self.ceiling
+        return max(0.0, min(self.ceiling, self.client_remaining))
+
+    @property
+    def spent(self) -> float:
+        return self.llm_usd + self.apify_usd
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.limit - self.spent)
+
+    def can_afford(self, cost_usd: float) -> bool:
+        return self.spent + cost_usd <= self.limit + 1e-9  # Float slack: an exact fit is affordable
+
+    def affordable_count(self, unit_cost_usd: float) -> int:
+        """How many more units of this cost fit in the budget."""
+        if unit_cost_usd <= 0:
+            return 1 << 30
+        return int((self.remaining + 1e-9) // unit_cost_usd)
+
+    # ---------------- recording ----------------
+
+    def _add(self, site: str, cost: float, llm: bool) -> float:
+        with self._lock:
+            if llm:
+                self.llm_usd += cost
+            else:
+                self.apify_usd += cost
+            self.breakdown[site] = self.breakdown.get(site, 0.0) + cost
+        return cost
+
+    def record_llm(self, site: str, model: str, usage=None, prompt_chars: int = 0,
+                   completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> float:
+        """Actual cost from completion.usage; character estimate when usage is None."""
+        tokens = _usage_tokens(usage)
+        if tokens is None:
+            tokens = (prompt_chars // CHARS_PER_TOKEN, completion_tokens)
+        with self._lock:
+            self.tokens_in += tokens[0]
+            self.tokens_out += tokens[1]
+        return self._add(site, llm_cost(model, *tokens), llm=True)
+
+    def record_apify(self, actor: str, run: dict = None) -> float:
+        """Run's own usageTotalUsd when Apify reports it, else the price table."""
+        cost = None
+        if isinstance(run, dict):
+            cost = run.get("usageTotalUsd")
+        if cost is None:
+            cost = APIFY_PRICES.get(actor, APIFY_PRICES["scout"])
+        return self._add(actor, float(cost), llm=False)
+
+    def counters(self) -> dict:
+        """monitor_scan_log columns (migration 18)."""
+        with self._lock:
+            return {
+                "cost_usd": round(self.spent, 6),
+                "llm_cost_usd": round(self.llm_usd, 6),
+                "apify_cost_usd": round(self.apify_usd, 6),
+                "llm_tokens_in": self.tokens_in,
+                "llm_tokens_out": self.tokens_out,
+                "cost_breakdown": {k: round(v, 6) for k, v in self.breakdown.items()},
+            }
+
+
+def company_ceiling(strategy: dict, default_daily_limit: int) -> float:
+    if strategy.get("scan_budget_usd") is not None:
+        return float(strategy["scan_budget_usd"])
+    depth = max(1.0, (strategy.get("daily_scan_limit") or default_daily_limit) / max(1, default_daily_limit))
+    return COMPANY_SCAN_BUDGET_USD * depth
+
+
+def client_daily_budget(strategy: dict, default_daily_limit: int) -> float:
+    if strategy.get("daily_budget_usd") is not None:
+        return float(strategy["daily_budget_usd"])
+    return (strategy.get("daily_scan_limit") or default_daily_limit) * company_ceiling(strategy, default_daily_limit)
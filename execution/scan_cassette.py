@@ -0,0 +1,450 @@
+"""
+Scan Cassettes — record real provider traffic for a company scan, replay it offline.
+
+process_company_scan talks straight to ApifyClient, OpenAI, Supabase and the web,
+so it could not be benchmarked without spending Apify / OpenAI credit. A Cassette
+sits in front of all four:
+
+    record   proxies wrap the real clients and append every response to a JSONL
+             cassette (one file per company)
+    replay   the same proxies serve the recorded responses, sleeping the injected
+             latency for each call kind; nothing leaves the process
+
+    kind            recorded as                               matched on
+    apify.run       finished run dict (+ all dataset items)   actor + run_input
+    openai          message content + token usage             the request
+    supabase        {data, count}                             table / rpc + call chain
+    http            status, url, headers, text                method + url
+
+Requests that embed the date (prompts, cutoffs) would never match on replay, so
+every interaction is also indexed under a loose key with digits masked; repeated
+identical requests are served in recorded order (the last response repeats).
+Supabase writes match on table + operation only (payloads carry timestamps / ids).
+Misses raise CassetteMiss for apify / openai; supabase misses return no rows and
+http misses a 404, all counted in Cassette.misses.
+
+Apify and Supabase proxies are passed in place of the real clients; OpenAI and
+HTTP traffic is created inside the scanner, so install_replay_patches() routes it
+to the cassette active in the current context (Cassette.activate(); ScanEngine,
+ArticlePrefetcher and scout jobs carry the context onto their threads).
+
+Usage (see run_scan_replay.py):
+    cassette = Cassette("cassettes/acme.jsonl", latency=LATENCY_PROFILES["realistic"])
+    with cassette.activate():
+        process_company_scan(comp, cassette.apify(), cassette.supabase(), openai_key="replay")
+"""
+import contextvars
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+
+# Seconds injected per call on replay: a number or a [low, high] uniform range
+LATENCY_PROFILES = {
+    "none": {},
+    "realistic": {
+        "apify.run": [8.0, 25.0],
+        "apify.dataset": [0.1, 0.3],
+        "openai": [0.8, 4.0],
+        "supabase": [0.02, 0.08],
+        "http": [0.1, 0.8],
+    },
+    "fast": {
+        "apify.run": [0.05, 0.2],
+        "apify.dataset": 0.005,
+        "openai": [0.01, 0.05],
+        "supabase": 0.002,
+        "http": [0.005, 0.02],
+    },
+}
+WRITE_OPERATIONS = frozenset({"insert", "update", "upsert", "delete"})
+
+_active = contextvars.ContextVar("scan_cassette", default=None)
+_installed = False
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, default=str)
+
+
+def _key(obj) -> str:
+    return hashlib.sha1(_canonical(obj).encode()).hexdigest()[:20]
+
+
+def _loose_key(obj) -> str:
+    return hashlib.sha1(re.sub(r"\d", "#", _canonical(obj)).encode()).hexdigest()[:20]
+
+
+class Cassette:
+    """One company's recorded traffic. mode="record" needs the real clients."""
+    def __init__(self, path: str, mode: str = "replay", latency: dict = None, seed: int = 0,
+                 real_apify=None, real_supabase=None, real_openai=None):
+        self.path = path
+        self.mode = mode
+        self.latency = latency or {}
+        self.rng = random.Random(seed)
+        self.real_apify = real_apify
+        self.real_supabase = real_supabase
+        self.real_openai = real_openai
+        self.calls = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.waited = defaultdict(float)
+        self._exact = defaultdict(deque)
+        self._loose = defaultdict(deque)
+        self._datasets = {}
+        self._runs = {}
+        self._lock = threading.Lock()
+        self._out = None
+        if mode == "replay":
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._out = open(path, "w")
+
+    # ---------------- storage ----------------
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["kind"] == "apify.dataset":
+                    self._datasets[entry["key"]] = entry["response"]
+                    continue
+                if entry["kind"] == "apify.run":
+                    self._runs[entry["response"]["id"]] = entry["response"]
+                self._exact[(entry["kind"], entry["key"])].append(entry["response"])
+                self._loose[(entry["kind"], entry["loose"])].append(entry["response"])
+
+    def record(self, kind: str, request, response) -> None:
+        entry = {"kind": kind, "key": _key(request), "loose": _loose_key(request), "response": response}
+        with self._lock:
+            self._out.write(json.dumps(entry, default=str) + "\n")
+
+    def record_dataset(self, dataset_id: str, items: list) -> None:
+        with self._lock:
+            self._out.write(json.dumps({"kind": "apify.dataset", "key": dataset_id, "response": items}, default=str) + "\n")
+
+    def replay(self, kind: str, request, default=CassetteMiss):
+        self.calls[kind] += 1
+        with self._lock:
+            queue = self._exact.get((kind, _key(request))) or self._loose.get((kind, _loose_key(request)))
+            response = (queue.popleft() if len(queue) > 1 else queue[0]) if queue else None
+        if response is None:
+            self.misses[kind] += 1
+            if default is CassetteMiss:
+                raise CassetteMiss(f"{kind}: no recorded response for {_canonical(request)[:160]}")
+            return default
+        self.wait(kind)
+        return response
+
+    def wait(self, kind: str) -> None:
+        latency = self.latency.get(kind)
+        if not latency:
+            return
+        with self._lock:
+            secs = self.rng.uniform(*latency) if isinstance(latency, (list, tuple)) else latency
+        self.waited[kind] += secs
+        time.sleep(secs)
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    # ---------------- clients ----------------
+
+    def apify(self) -> "ApifyCassette":
+        return ApifyCassette(self)
+
+    def supabase(self) -> "SupabaseCassette":
+        return SupabaseCassette(self, self.real_supabase)
+
+    def activate(self):
+        return _Activation(self)
+
+    def counters(self) -> dict:
+        return {"calls": dict(self.calls), "misses": dict(self.misses),
+                "injected_latency_s": {k: round(v, 3) for k, v in self.waited.items()}}
+
+
+class _Activation:
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def __enter__(self):
+        self._token = _active.set(self.cassette)
+        return self.cassette
+
+    def __exit__(self, *exc):
+        _active.reset(self._token)
+
+
+def current() -> Cassette:
+    cassette = _active.get()
+    if cassette is None:
+        raise RuntimeError("No active cassette in this context")
+    return cassette
+
+
+# ---------------- Apify ----------------
+
+class ApifyCassette:
+    """ApifyClient surface the scanner uses: actor().call/start, run().get, dataset().list_items/iterate_items."""
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._pending = {}  # run id -> request (record mode, started runs)
+
+    def actor(self, actor_id: str):
+        return _ActorCassette(self, actor_id)
+
+    def run(self, run_id: str):
+        return _RunCassette(self, run_id)
+
+    def dataset(self, dataset_id: str):
+        return _DatasetCassette(self.cassette, dataset_id)
+
+    def _finished(self, request: dict, run: dict) -> dict:
+        """Record mode: keep the final run and its whole dataset."""
+        cassette = self.cassette
+        if run and run.get("defaultDatasetId"):
+            items = list(cassette.real_apify.dataset(run["defaultDatasetId"]).iterate_items())
+            cassette.record_dataset(run["defaultDatasetId"], items)
+        cassette.record("apify.run", request, run)
+        return run
+
+
+class _ActorCassette:
+    def __init__(self, client: ApifyCassette, actor_id: str):
+        self.client = client
+        self.actor_id = actor_id
+
+    def _request(self, run_input):
+        return {"actor": self.actor_id, "run_input": run_input}
+
+    def call(self, run_input=None, timeout_secs=None, **kwargs):
+        cassette = self.client.cassette
+        request = self._request(run_input)
+        if cassette.mode == "record":
+            run = cassette.real_apify.actor(self.actor_id).call(run_input=run_input, timeout_secs=timeout_secs, **kwargs)
+            return self.client._finished(request, run)
+        return cassette.replay("apify.run", request)
+
+    def start(self, run_input=None, timeout_secs=None, **kwargs):
+        cassette = self.client.cassette
+        request = self._request(run_input)
+        if cassette.mode == "record":
+            run = cassette.real_apify.actor(self.actor_id).start(run_input=run_input, timeout_secs=timeout_secs, **kwargs)
+            self.client._pending[run["id"]] = request
+            return run
+        return cassette.replay("apify.run", request)  # Already finished: the runner's first poll resolves it
+
+
+class _RunCassette:
+    def __init__(self, client: ApifyCassette, run_id: str):
+        self.client = client
+        self.run_id = run_id
+
+    def get(self):
+        cassette = self.client.cassette
+        if cassette.mode == "record":
+            run = cassette.real_apify.run(self.run_id).get()
+            if run and run.get("status") not in (None, "READY", "RUNNING") and self.run_id in self.client._pending:
+                self.client._finished(self.client._pending.pop(self.run_id), run)
+            return run
+        return cassette._runs.get(self.run_id)
+
+
+class _DatasetCassette:
+    def __init__(self, cassette: Cassette, dataset_id: str):
+        self.cassette = cassette
+        self.dataset_id = dataset_id
+
+    def _items(self) -> list:
+        self.cassette.calls["apify.dataset"] += 1
+        items = self.cassette._datasets.get(self.dataset_id)
+        if items is None:
+            self.cassette.misses["apify.dataset"] += 1
+            return []
+        self.cassette.wait("apify.dataset")
+        return items
+
+    def list_items(self, offset: int = 0, limit: int = None, **kwargs):
+        if self.cassette.mode == "record":
+            return self.cassette.real_apify.dataset(self.dataset_id).list_items(offset=offset, limit=limit, **kwargs)
+        items = self._items()
+        return SimpleNamespace(items=items[offset:offset + limit if limit else None], total=len(items))
+
+    def iterate_items(self, **kwargs):
+        if self.cassette.mode == "record":
+            return self.cassette.real_apify.dataset(self.dataset_id).iterate_items(**kwargs)
+        return iter(self._items())
+
+
+# ---------------- OpenAI ----------------
+
+class OpenAICassette:
+    """Drop-in for OpenAI(api_key=...): chat.completions.create on the active cassette."""
+    real_class = None  # The real OpenAI class, for record mode (install_replay_patches)
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self._real_args = dict(kwargs, api_key=api_key)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        cassette = current()
+        if cassette.mode == "record":
+            real = (cassette.real_openai or self.real_class)(**self._real_args)
+            completion = real.chat.completions.create(**request)
+            usage = getattr(completion, "usage", None)
+            cassette.record("openai", request, {
+                "content": completion.choices[0].message.content,
+                "model": getattr(completion, "model", request.get("model")),
+                "usage": {"prompt_tokens": getattr(usage, "prompt_tokens", 0), "completion_tokens": getattr(usage, "completion_tokens", 0)},
+            })
+            return completion
+        recorded = cassette.replay("openai", request)
+        return SimpleNamespace(
+            model=recorded.get("model"),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=recorded["content"]), finish_reason="stop")],
+            usage=SimpleNamespace(**recorded.get("usage", {})),
+        )
+
+
+# ---------------- Supabase ----------------
+
+class SupabaseCassette:
+    """supabase-py Client surface: any builder chain ending in .execute()."""
+    def __init__(self, cassette: Cassette, real=None, chain: tuple = ()):
+        self._cassette = cassette
+        self._real = real
+        self._chain = chain
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        real_attr = getattr(self._real, name) if self._real is not None else None
+
+        def _call(*args, **kwargs):
+            real_next = real_attr(*args, **kwargs) if real_attr is not None else None
+            return SupabaseCassette(self._cassette, real_next, self._chain + ((name, args, kwargs),))
+        return _call
+
+    def _request(self) -> dict:
+        ops = [op for op, _, _ in self._chain]
+        if WRITE_OPERATIONS.intersection(ops):
+            return {"chain": [(op, args[:1] if op in ("table", "from_", "rpc") else ()) for op, args, _ in self._chain if op in WRITE_OPERATIONS or op in ("table", "from_", "rpc")]}
+        return {"chain": [(op, args, kwargs) for op, args, kwargs in self._chain]}
+
+    def execute(self):
+        cassette = self._cassette
+        if cassette.mode == "record":
+            resp = self._real.execute()
+            cassette.record("supabase", self._request(), {"data": getattr(resp, "data", None), "count": getattr(resp, "count", None)})
+            return resp
+        recorded = cassette.replay("supabase", self._request(), default={"data": [], "count": 0})
+        return SimpleNamespace(data=recorded.get("data"), count=recorded.get("count"))
+
+
+# ---------------- HTTP ----------------
+
+class _Response:
+    def __init__(self, recorded: dict):
+        self.status_code = recorded.get("status_code", 404)
+        self.url = recorded.get("url")
+        self.headers = recorded.get("headers") or {}
+        self.text = recorded.get("text", "")
+        self.content = self.text.encode()
+        self.ok = self.status_code < 400
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code} for {self.url} (replayed)")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _http(method: str, url: str, real_call=None):
+    cassette = current()
+    request = {"method": method.upper(), "url": str(url)}
+    if cassette.mode == "record":
+        resp = real_call()
+        cassette.record("http", request, {
+            "status_code": resp.status_code, "url": str(resp.url),
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() in ("content-type", "location")},
+            "text": resp.text if method.upper() != "HEAD" else "",
+        })
+        return resp
+    return _Response(cassette.replay("http", request, default={"status_code": 404, "url": str(url)}))
+
+
+class HttpCassette:
+    """HttpPool surface (http_pool.py): install as the process-wide pool."""
+    def __init__(self, real=None):
+        self.real = real
+
+    def request(self, method: str, url: str, **kwargs):
+        return _http(method, url, lambda: self.real.request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def download_html(self, url: str, timeout: float = None) -> str:
+        resp = self.get(url, timeout=timeout)
+        resp.raise_for_status()
+        return resp.text
+
+    async def arequest(self, method: str, url: str, **kwargs):
+        return self.request(method, url, **kwargs)
+
+    async def aget(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    async def ahead(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    async def aclose(self):
+        pass
+
+    def close(self):
+        if self.real is not None:
+            self.real.close()
+
+
+def install_replay_patches(monitor_module, record: bool = False) -> None:
+    """
+    Route the traffic the scanner creates itself (OpenAI clients, the shared HTTP
+    pool, bare requests.* calls) to the active cassette. Record mode keeps the real
+    clients behind the proxies.
+    """
+    import requests
+    import http_pool
+
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    if monitor_module.OpenAI is not OpenAICassette:
+        OpenAICassette.real_class = monitor_module.OpenAI
+    real_pool = http_pool.get_http_client() if record else None
+    monitor_module.OpenAI = OpenAICassette
+    http_pool._client = HttpCassette(real_pool)
+    for method in ("get", "head", "post"):
+        real = getattr(requests, method)
+        setattr(requests, method, lambda url, _m=method, _real=real, **kw: _http(_m, url, lambda: _real(url, **kw)))
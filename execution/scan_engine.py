@@ -0,0 +1,73 @@
+"""
+Asyncio Scan Engine — one event loop, many company scans.
+
+The SDKs the monitor depends on (ApifyClient, OpenAI, newspaper4k, supabase-py)
+are all blocking. The engine turns each call into an awaitable that runs on a
+dedicated thread pool, gated by a per-resource semaphore, so dozens of company
+scans can interleave their network waits inside one container without
+exceeding provider concurrency.
+
+Resources:
+    apify     actor runs + dataset reads (shared APIFY_MAX_CONCURRENT account limit)
+    openai    chat completions
+    fetch     direct article / page downloads (newspaper4k, requests)
+    supabase  PostgREST round-trips
+
+Usage:
+    engine = ScanEngine({"apify": 4})
+    run = await engine.run("apify", apify_client.actor(...).call, run_input=...)
+    engine.close()
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_RESOURCE_LIMITS = {
+    "apify": int(os.environ.get("APIFY_MAX_CONCURRENT", "20")),
+    "openai": int(os.environ.get("OPENAI_MAX_CONCURRENT", "8")),
+    "fetch": int(os.environ.get("FETCH_MAX_CONCURRENT", "16")),
+    "supabase": int(os.environ.get("SUPABASE_MAX_CONCURRENT", "10")),
+}
+
+
+class ScanEngine:
+    """
+    Per-resource concurrency gates for blocking calls awaited from asyncio.
+    Semaphores are created lazily so they bind to the loop that first uses them.
+    """
+    def __init__(self, limits: dict = None):
+        self.limits = dict(DEFAULT_RESOURCE_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.in_flight = {resource: 0 for resource in self.limits}
+        self._semaphores = {}
+        # One worker per gate slot: no call ever queues on the pool, only on its semaphore
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, sum(self.limits.values())),
+            thread_name_prefix="scan-engine"
+        )
+
+    def semaphore(self, resource: str) -> asyncio.Semaphore:
+        if resource not in self._semaphores:
+            self.limits.setdefault(resource, 1)
+            self.in_flight.setdefault(resource, 0)
+            self._semaphores[resource] = asyncio.Semaphore(self.limits[resource])
+        return self._semaphores[resource]
+
+    async def run(self, resource: str, func, *args, **kwargs):
+        """Await a blocking call once a slot for `resource` is free."""
+        async with self.semaphore(resource):
+            self.in_flight[resource] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                # The caller's context (its scan's SpanRecorder) follows the call onto the worker
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(self._executor, functools.partial(context.run, func, *args, **kwargs))
+            finally:
+                self.in_flight[resource] -= 1
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,159 @@
+"""
+Scan Spans — per-stage timing for one company scan, persisted with its scan log.
+
+monitor_scan_log only had elapsed_seconds and call counters, so a 4-minute scan
+could not be pinned on the search, a scout, newspaper4k, the Apify fallback or an
+LLM call. Each scan now carries a SpanRecorder (owned by ScanLog) and every stage
+records a span into it:
+
+    {"n": "llm:triage", "t": 5120, "ms": 1840, "st": "ok", "ti": 2310, "to": 412, "hit": 0}
+
+    n    span name: stage ("search", "scouts", "deep_analysis"), "scout:<type>",
+         "llm:<call site>", "apify:<actor>", "supabase:<op>", "fetch:article"
+    t    start, ms since the scan began          ms   duration
+    st   "ok" / "error" (exception escaped the span) / any status the caller sets
+    b / c / ti / to / hit   bytes, item count, tokens in / out, cache hit — only when known
+
+The recorder is found through a context variable, so library code (LLMCacheSession,
+ScanWriteBuffer) records spans without a parameter. Context does not follow work
+onto threads by itself: SpanRecorder.wrap() carries it into executor jobs, and
+ScanEngine / ArticlePrefetcher copy the caller's context into their workers.
+
+Spans are written to monitor_scan_log.spans (capped at MAX_SCAN_SPANS, the rest
+counted in a "_dropped" entry) with per-name totals in span_ms; the
+rollup_scan_spans RPC (migration 21) keeps daily p50 / p90 / p99 per span name.
+
+Usage:
+    with scan_log.spans.activate():
+        with span("search") as s:
+            results = run_search()
+            s["b"] = len(results)
+
+    @traced("fingerprint")
+    def _check_search_fingerprint(...): ...
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+MAX_SCAN_SPANS = int(os.environ.get("MAX_SCAN_SPANS", "400"))
+
+_current = contextvars.ContextVar("scan_spans", default=None)
+
+
+class SpanRecorder:
+    """Thread-safe span list for one scan."""
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.t0 = clock()
+        self._spans = []
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def record(self, name: str, start: float, duration: float, status: str = "ok", **attrs) -> None:
+        entry = {"n": name, "t": round((start - self.t0) * 1000), "ms": round(duration * 1000), "st": status}
+        entry.update({k: v for k, v in attrs.items() if v is not None})
+        with self._lock:
+            if len(self._spans) < MAX_SCAN_SPANS:
+                self._spans.append(entry)
+            else:
+                self.dropped += 1
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Times the block; the yielded dict takes extra attributes ("b", "ti", "to", "hit", "st")."""
+        attrs = dict(attrs)
+        start = self.clock()
+        try:
+            yield attrs
+        except BaseException:
+            attrs["st"] = "error"
+            raise
+        finally:
+            status = attrs.pop("st", "ok")
+            self.record(name, start, self.clock() - start, status, **attrs)
+
+    @contextmanager
+    def activate(self):
+        """Makes this the current recorder for the block (this thread / task)."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def wrap(self, name: str, func):
+        """func as a callable for another thread: runs in the caller's context, as the current recorder, inside a span."""
+        context = contextvars.copy_context()
+
+        def _call(*args, **kwargs):
+            with self.activate(), self.span(name):
+                return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        def _run(*args, **kwargs):
+            return context.copy().run(_call, *args, **kwargs)
+        return _run
+
+    def to_list(self) -> list:
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["t"])
+            if self.dropped:
+                spans.append({"n": "_dropped", "c": self.dropped})
+        return spans
+
+    def totals(self) -> dict:
+        """{span name: total ms}: the span_ms column."""
+        totals = {}
+        with self._lock:
+            for s in self._spans:
+                totals[s["n"]] = totals.get(s["n"], 0) + s["ms"]
+        return totals
+
+    def counters(self) -> dict:
+        """monitor_scan_log columns (migration 21)."""
+        return {"spans": self.to_list(), "span_ms": self.totals()}
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Span on the current recorder; a no-op (still yields a dict) outside a scan."""
+    recorder = _current.get()
+    if recorder is None:
+        yield dict(attrs)
+        return
+    with recorder.span(name, **attrs) as s:
+        yield s
+
+
+def traced(name: str, result_attrs=None):
+    """Decorator: the whole call is one span (sync or async); result_attrs(result) -> extra attributes."""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def _async(*args, **kwargs):
+                with span(name) as s:
+                    result = await func(*args, **kwargs)
+                    if result_attrs is not None:
+                        s.update(result_attrs(result))
+                    return result
+            return _async
+
+        @functools.wraps(func)
+        def _sync(*args, **kwargs):
+            with span(name) as s:
+                result = func(*args, **kwargs)
+                if result_attrs is not None:
+                    s.update(result_attrs(result))
+                return result
+        return _sync
+    return decorate
@@ -0,0 +1,118 @@
+"""
+Scan Write Buffer — one unit of work per company scan.
+
+A triggered scan used to issue a Supabase round-trip per write: several
+triggered_companies updates, a merge_score_factors RPC per scout throttle
+stamp, one leads update per contact, one prospect_style update per contact
+and one pulsepoint_email_queue insert per draft. ScanWriteBuffer records them
+in memory and coalesces them:
+
+    score_factors deltas      shallow-merged -> one merge_score_factors RPC
+    triggered_companies patch key-merged (last write wins) -> one update
+    row updates               rows sharing a patch -> one update ... in_("id", ids)
+    inserts                   one bulk insert per table (row-by-row retry on failure,
+                              so one duplicate key can't drop the rest)
+
+process_company_scan flushes once in a `finally` (so crashes still persist
+throttle stamps) and at checkpoints where another component reads what the scan
+wrote. Write failures are logged, never raised: they were all best-effort
+bookkeeping on the scan path.
+"""
+import json
+import threading
+
+from scan_spans import span
+
+
+class ScanWriteBuffer:
+    """
+    Pending writes for one company scan. Thread-safe (scouts and the async
+    engine record from worker threads); flush() is idempotent.
+    """
+    def __init__(self, supabase, company_id: str):
+        self.supabase = supabase
+        self.company_id = company_id
+        self._score_factors = {}
+        self._company_patch = {}
+        self._row_updates = {}  # (table, patch json) -> (patch, [ids])
+        self._inserts = {}      # table -> [rows]
+        self._lock = threading.Lock()
+        self.buffered = 0
+        self.round_trips = 0
+
+    # ---------------- recording ----------------
+
+    def merge_score_factors(self, delta: dict) -> None:
+        """Same semantics as the merge_score_factors RPC (top-level `||`), applied at flush."""
+        with self._lock:
+            self._score_factors.update(delta)
+            self.buffered += 1
+
+    def update_company(self, patch: dict) -> None:
+        with self._lock:
+            self._company_patch.update(patch)
+            self.buffered += 1
+
+    def update_rows(self, table: str, ids: list, patch: dict) -> None:
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return
+        key = (table, json.dumps(patch, sort_keys=True, default=str))
+        with self._lock:
+            _, pending_ids = self._row_updates.setdefault(key, (patch, []))
+            pending_ids.extend(ids)
+            self.buffered += len(ids)
+
+    def insert(self, table: str, row: dict) -> None:
+        with self._lock:
+            self._inserts.setdefault(table, []).append(row)
+            self.buffered += 1
+
+    @property
+    def pending(self) -> bool:
+        with self._lock:
+            return bool(self._score_factors or self._company_patch or self._row_updates or self._inserts)
+
+    # ---------------- flushing ----------------
+
+    def _run(self, label: str, fn) -> bool:
+        self.round_trips += 1
+        try:
+            fn()
+            return True
+        except Exception as e:
+            print(f"      ⚠️ Write-behind {label} failed: {e}")
+            return False
+
+    def flush(self) -> None:
+        with self._lock:
+            score_factors, self._score_factors = self._score_factors, {}
+            company_patch, self._company_patch = self._company_patch, {}
+            row_updates, self._row_updates = self._row_updates, {}
+            inserts, self._inserts = self._inserts, {}
+        if not (score_factors or company_patch or row_updates or inserts):
+            return
+        with span("supabase:flush") as s:
+            self._flush(score_factors, company_patch, row_updates, inserts)
+            s["c"] = self.buffered
+        self.buffered = 0
+
+    def _flush(self, score_factors: dict, company_patch: dict, row_updates: dict, inserts: dict) -> None:
+        start = self.round_trips
+        sb = self.supabase
+
+        if score_factors and self.company_id:
+            self._run("score_factors merge", lambda: sb.rpc(
+                "merge_score_factors", {"p_company_id": self.company_id, "p_delta": score_factors}
+            ).execute())
+        if company_patch and self.company_id:
+            self._run("company update", lambda: sb.table("triggered_companies").update(company_patch).eq("id", self.company_id).execute())
+        for (table, _), (patch, ids) in row_updates.items():
+            self._run(f"{table} update", lambda: sb.table(table).update(patch).in_("id", ids).execute())
+        for table, rows in inserts.items():
+            if self._run(f"{table} insert", lambda: sb.table(table).insert(rows).execute()) or len(rows) == 1:
+                continue
+            for row in rows:  # Isolate the failing row (usually a duplicate key)
+                self._run(f"{table} insert", lambda: sb.table(table).insert(row).execute())
+
+        print(f"      💾 Write-behind: {self.buffered} writes flushed in {self.round_trips - start} round-trips")
@@ -1,6 +1,5 @@
 import os
 import sys
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from newspaper import Article
@@ -10,8 +9,10 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 try:
     from resilience import retry_with_backoff
+    from http_pool import get_http_client
 except ImportError:
     from execution.resilience import retry_with_backoff
+    from execution.http_pool import get_http_client
 
 def find_sitemaps(base_url):
     """Stage 1: Discover sitemaps via common paths and robots.txt."""
@@ -23,14 +24,14 @@ def find_sitemaps(base_url):
     for path in paths:
         target = urljoin(base_url, path)
         try:
-            r = requests.head(target, timeout=5, allow_redirects=True)
+            r = get_http_client().head(target, timeout=5, allow_redirects=True)
             if r.status_code == 200:
                 sitemaps.append(target)
         except: continue
         
     # 2. robots.txt
     try:
-        r = requests.get(urljoin(base_url, "/robots.txt"), timeout=5)
+        r = get_http_client().get(urljoin(base_url, "/robots.txt"), timeout=5)
         if r.status_code == 200:
             matches = re.findall(r'^Sitemap:\s*(.+)$', r.text, re.IGNORECASE | re.MULTILINE)
             for m in matches:
@@ -47,14 +48,14 @@ def find_feeds(blog_url):
     for path in paths:
         target = urljoin(blog_url, path)
         try:
-            r = requests.head(target, timeout=5, allow_redirects=True)
+            r = get_http_client().head(target, timeout=5, allow_redirects=True)
             if r.status_code == 200:
                 feeds.append(target)
         except: continue
         
     # Link tags
     try:
-        r = requests.get(blog_url, timeout=10)
+        r = get_http_client().get(blog_url, timeout=10)
         soup = BeautifulSoup(r.text, 'html.parser')
         for link in soup.find_all('link', rel=['alternate', 'sitemap']):
             href = link.get('href')
@@ -65,7 +66,20 @@ def find_feeds(blog_url):
     
     return list(set(feeds))
 
-def find_blog_url_via_apify(company_name, domain, apify_client, widen=False):
+def _search_organic(queries, run_input, apify_client, search_broker=None):
+    """organicResults for all queries: one batched broker run when available, else a direct run."""
+    if search_broker is not None:
+        futures = [search_broker.submit(q, **run_input) for q in queries]
+        return [res for f in futures for res in f.result()["organic"]]
+
+    @retry_with_backoff(max_retries=1, initial_delay=3)
+    def _search():
+        return apify_client.actor("apify/google-search-scraper").call(run_input={**run_input, "queries": "\n".join(queries)}, timeout_secs=45)
+    run = _search()
+    return [res for item in apify_client.dataset(run["defaultDatasetId"]).iterate_items()
+            for res in item.get("organicResults", [])]
+
+def find_blog_url_via_apify(company_name, domain, apify_client, widen=False, search_broker=None):
     """Stage 3: Multi-pattern Google Search with auto-widening."""
     
     # OPTIMIZATION: Check common paths first to save Apify calls
@@ -76,7 +90,7 @@ def find_blog_url_via_apify(company_name, domain, apify_client, widen=False):
         for path in common_paths:
             try:
                 target = urljoin(base, path)
-                r = requests.head(target, timeout=3, allow_redirects=True)
+                r = get_http_client().head(target, timeout=3, allow_redirects=True)
                 if r.status_code == 200:
                     print(f"      ✅ Found blog path: {target}")
                     return target
@@ -99,33 +113,26 @@ def find_blog_url_via_apify(company_name, domain, apify_client, widen=False):
     
     try:
         run_input = {
-            "queries": "\n".join(queries),
             "maxPagesPerQuery": 1,
             "resultsPerPage": 5
         }
-        @retry_with_backoff(max_retries=1, initial_delay=3)
-        def _search():
-            return apify_client.actor("apify/google-search-scraper").call(run_input=run_input, timeout_secs=45)
-        run = _search()
-        
         results = []
-        for item in apify_client.dataset(run["defaultDatasetId"]).iterate_items():
-            for res in item.get("organicResults", []):
-                url = res.get("url", "").lower()
-                if any(kw in url for kw in ['blog', 'insight', 'news', 'perspective', 'article', 'resource', 'category', 'tag']):
-                    if not any(bad in url for bad in ['linkedin', 'facebook', 'twitter', 'instagram', 'youtube']):
-                        results.append(res.get("url"))
+        for res in _search_organic(queries, run_input, apify_client, search_broker):
+            url = res.get("url", "").lower()
+            if any(kw in url for kw in ['blog', 'insight', 'news', 'perspective', 'article', 'resource', 'category', 'tag']):
+                if not any(bad in url for bad in ['linkedin', 'facebook', 'twitter', 'instagram', 'youtube']):
+                    results.append(res.get("url"))
         
         if not widen and len(results) < 3:
             print(f"      ⚠️ Insufficient results ({len(results)}). Widening search...")
-            return find_blog_url_via_apify(company_name, domain, apify_client, widen=True)
+            return find_blog_url_via_apify(company_name, domain, apify_client, widen=True, search_broker=search_broker)
             
         return results[0] if results else None
     except Exception as e:
         print(f"      [BlogScout] Search failed: {e}")
         return None
 
-def scout_latest_blog_posts(company_name, company_website, apify_client, cached_blog_url=None):
+def scout_latest_blog_posts(company_name, company_website, apify_client, cached_blog_url=None, search_broker=None):
     """
     Refined BlogScout:
     1. Sitemap/RSS Priority.
@@ -143,7 +150,7 @@ def scout_latest_blog_posts(company_name, company_website, apify_client, cached_
     if blog_url:
         print(f"      💾 [BlogScout] Using cached blog URL: {blog_url}")
     else:
-        blog_url = find_blog_url_via_apify(company_name, domain, apify_client)
+        blog_url = find_blog_url_via_apify(company_name, domain, apify_client, search_broker=search_broker)
     if not blog_url:
         blog_url = urljoin(base_url, "/blog")
         print(f"      ⚠️ No blog found, using fallback: {blog_url}")
@@ -154,7 +161,7 @@ def scout_latest_blog_posts(company_name, company_website, apify_client, cached_
     
     try:
         hub_article = Article(blog_url)
-        hub_article.download()
+        hub_article.download(input_html=get_http_client().download_html(blog_url))
         hub_article.parse()
         if len(hub_article.text) > 500: # Significant content on page
              found_triggers.append({
@@ -173,7 +180,7 @@ def scout_latest_blog_posts(company_name, company_website, apify_client, cached_
     sitemaps = find_sitemaps(base_url)
     for sm in sitemaps:
         try:
-            r = requests.get(sm, timeout=10)
+            r = get_http_client().get(sm, timeout=10)
             soup = BeautifulSoup(r.text, 'xml')
             for loc in soup.find_all('loc'):
                 url = loc.text.strip()
@@ -187,7 +194,7 @@ def scout_latest_blog_posts(company_name, company_website, apify_client, cached_
         feeds = find_feeds(blog_url)
         for feed in feeds:
             try:
-                r = requests.get(feed, timeout=10)
+                r = get_http_client().get(feed, timeout=10)
                 soup = BeautifulSoup(r.text, 'xml')
                 for item in soup.find_all(['item', 'entry']):
                     link = item.find(['link', 'id'])
@@ -226,7 +233,7 @@ def scout_latest_blog_posts(company_name, company_website, apify_client, cached_
         
         try:
             art = Article(url)
-            art.download()
+            art.download(input_html=get_http_client().download_html(url))
             art.parse()
             
             pub_date = art.publish_date
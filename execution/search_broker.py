@@ -0,0 +1,159 @@
+"""
+Search Broker — batches Google searches from concurrent scans into one actor run.
+
+Every scan started its own apify/google-search-scraper run for a single query, and
+the blog scout started another; actor start-up (container boot, proxy warm-up)
+dominates a one-query run. The actor takes newline-separated queries, so the
+broker collects queries for BATCH_WINDOW_SECS (or until SEARCH_BATCH_MAX are
+waiting), submits them as one run and hands each caller the organicResults whose
+searchQuery.term matches its query.
+
+    batching     queries are grouped by run input (resultsPerPage, timeRange, ...):
+                 only queries with identical options share a run
+    coalescing   the same query submitted twice in one window is searched once
+    cost         the run's usageTotalUsd is split evenly across its queries
+    failures     a failed run fails every future in it; callers fall back to a
+                 direct run (see _run_google_search)
+    runner       with an ApifyRunner, batch runs are started and polled instead of
+                 parking the flushing thread for the whole run
+
+Usage:
+    broker = SearchBroker(apify_client)
+    future = broker.submit(query, resultsPerPage=15, timeRange="week")   # concurrent.futures.Future
+    hit = future.result()                          # {"organic": [...], "cost_usd": 0.0008, "batch_size": 5}
+    hit = await asyncio.wrap_future(broker.submit(query))                 # asyncio callers
+    broker.close()                                 # flush what is still waiting
+"""
+import os
+import threading
+from concurrent.futures import Future
+
+from apify_runner import iter_dataset_items
+
+ACTOR = "apify/google-search-scraper"
+BATCH_WINDOW_SECS = float(os.environ.get("SEARCH_BATCH_WINDOW_SECS", "0.5"))
+SEARCH_BATCH_MAX = int(os.environ.get("SEARCH_BATCH_MAX", "25"))
+SEARCH_RUN_TIMEOUT_SECS = int(os.environ.get("SEARCH_RUN_TIMEOUT_SECS", "90"))
+
+
+def _term(item: dict) -> str:
+    query = item.get("searchQuery") or {}
+    return (query.get("term") if isinstance(query, dict) else query or "").strip()
+
+
+class _Batch:
+    def __init__(self, options: dict):
+        self.options = options
+        self.futures = {}  # query -> [Future]
+        self.timer = None
+
+
+class SearchBroker:
+    """Thread-safe: submit() from any thread or event loop; runs start on the batch's timer thread, or a flush thread once it is full."""
+    def __init__(self, apify_client, window_secs: float = None, max_batch: int = None, breaker=None, actor: str = ACTOR, runner=None):
+        self.apify_client = apify_client
+        self.runner = runner
+        self.window_secs = BATCH_WINDOW_SECS if window_secs is None else window_secs
+        self.max_batch = max(1, max_batch or SEARCH_BATCH_MAX)
+        self.breaker = breaker
+        self.actor = actor
+        self._pending = {}  # options key -> _Batch
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.queries = 0
+
+    def submit(self, query: str, **options) -> Future:
+        query = query.strip()
+        future = Future()
+        key = tuple(sorted(options.items()))
+        full = None
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(options)
+                batch.timer = threading.Timer(self.window_secs, self._flush, (key, batch))
+                batch.timer.daemon = True
+                batch.timer.start()
+            batch.futures.setdefault(query, []).append(future)
+            if len(batch.futures) >= self.max_batch:
+                full = self._pending.pop(key)
+        if full is not None:
+            full.timer.cancel()
+            # Not on the submitter's thread: it may be an event loop, and starting a run
+            # goes through the breaker, the rate limiter and Apify's API
+            threading.Thread(target=self._run, args=(full,), daemon=True, name="search-batch").start()
+        return future
+
+    def search(self, query: str, timeout: float = None, **options) -> dict:
+        """Blocking submit()."""
+        return self.submit(query, **options).result(timeout=timeout)
+
+    def _flush(self, key, batch: _Batch) -> None:
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                return  # Already flushed as a full batch
+            del self._pending[key]
+        self._run(batch)
+
+    def _start_actor(self, queries: list, options: dict) -> Future:
+        """Future of the finished run: polled by the runner, or a blocking call() when there is none."""
+        run_input = {**options, "queries": "\n".join(queries)}
+        if self.runner is not None:
+            def _call():
+                return self.runner.start(self.actor, run_input, timeout_secs=SEARCH_RUN_TIMEOUT_SECS)
+        else:
+            def _call():
+                done = Future()
+                done.set_result(self.apify_client.actor(self.actor).call(run_input=run_input, timeout_secs=SEARCH_RUN_TIMEOUT_SECS))
+                return done
+        started = self.breaker.call(_call) if self.breaker is not None else _call()
+        if not started:
+            raise RuntimeError(f"{self.actor} run could not start for a batch of {len(queries)} queries")
+        return started
+
+    def _run(self, batch: _Batch) -> None:
+        queries = list(batch.futures)
+        try:
+            started = self._start_actor(queries, batch.options)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        started.add_done_callback(lambda done: self._finish(batch, queries, done))
+
+    def _fail(self, batch: _Batch, error: Exception) -> None:
+        for futures in batch.futures.values():
+            for future in futures:
+                future.set_exception(error)
+
+    def _finish(self, batch: _Batch, queries: list, done: Future) -> None:
+        try:
+            run = done.result()
+            if not run or run.get("status", "SUCCEEDED") != "SUCCEEDED":
+                raise RuntimeError(f"{self.actor} batch run ended {run.get('status') if run else 'without a run'}")
+            organic = {query: [] for query in queries}
+            for item in iter_dataset_items(self.apify_client, run["defaultDatasetId"]):
+                term = _term(item)
+                if term in organic:
+                    organic[term].extend(item.get("organicResults", []))
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        with self._lock:
+            self.runs += 1
+            self.queries += len(queries)
+        usage = run.get("usageTotalUsd")
+        share = usage / len(queries) if usage is not None else None
+        print(f"      🔎 Search batch: {len(queries)} queries in one {self.actor} run")
+        for query, futures in batch.futures.items():
+            for future in futures:
+                future.set_result({"organic": organic[query], "cost_usd": share, "batch_size": len(queries)})
+
+    def close(self) -> None:
+        """Run every batch still waiting for its window."""
+        with self._lock:
+            batches = list(self._pending.values())
+            self._pending.clear()
+        for batch in batches:
+            batch.timer.cancel()
+            self._run(batch)
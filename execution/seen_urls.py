@@ -0,0 +1,84 @@
+"""
+Seen-URL index — skip search results a company's earlier scans already judged.
+
+Daily scans of the same company return mostly the same articles. Every verdict
+(triage_rejected, stale, duplicate, triggered, ...) is upserted into
+company_seen_urls keyed on (company_id, url_canonical), and the next scan drops
+candidates already in the index before paying for triage or article fetches.
+
+url_canonical is url_canon.normalize_url, never canonicalize_url: the redirect
+memo differs between containers, and the key has to match whichever container
+scans the company next.
+
+Per scan:
+    seen_index = load_seen_urls(supabase, comp)          # one round-trip
+    candidates = filter_unseen(candidates, seen_index)
+    seen_outcomes = {}
+    mark_seen(seen_outcomes, res, "triage_rejected", 3)  # as verdicts come in
+    record_seen_urls(supabase, comp, seen_outcomes)      # one upsert at the end
+"""
+from datetime import datetime, timedelta, timezone
+
+from scan_spans import traced
+from url_canon import normalize_url
+
+
+SEEN_URL_TTL_DAYS = 30  # Verdicts older than this are forgotten and the URL is judged again
+SEEN_URL_LOAD_LIMIT = 2000
+
+
+@traced("supabase:seen_urls")
+def load_seen_urls(supabase, comp: dict, force_rescan: bool = False) -> dict:
+    """
+    Per-company seen-URL index: normalized URL -> verdict for every URL already
+    judged in the last SEEN_URL_TTL_DAYS, most recent SEEN_URL_LOAD_LIMIT first.
+    Empty when force_rescan is set.
+    """
+    if force_rescan:
+        return {}
+    try:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=SEEN_URL_TTL_DAYS)).isoformat()
+        resp = supabase.table("company_seen_urls").select("url_canonical, verdict") \
+            .eq("company_id", comp['id']).gte("last_seen_at", cutoff) \
+            .order("last_seen_at", desc=True).limit(SEEN_URL_LOAD_LIMIT).execute()
+        return {row["url_canonical"]: row.get("verdict") for row in (resp.data or [])}
+    except Exception as e:
+        print(f"      ⚠️ Seen-URL index unavailable, analyzing everything: {e}")
+        return {}
+
+
+def filter_unseen(candidates: list, seen_index: dict) -> list:
+    """Drop candidates whose normalized URL already has a verdict."""
+    if not seen_index:
+        return candidates
+    unseen = [res for res in candidates if normalize_url(res.get('url', '')) not in seen_index]
+    skipped = len(candidates) - len(unseen)
+    if skipped:
+        print(f"      💨 EFFICIENCY: {skipped} already-judged URLs skipped, {len(unseen)} unseen")
+    return unseen
+
+
+def mark_seen(seen_outcomes: dict, res: dict, verdict: str, confidence=0) -> None:
+    seen_outcomes[normalize_url(res.get('url', ''))] = {"verdict": verdict, "confidence": confidence}
+
+
+@traced("supabase:record_seen")
+def record_seen_urls(supabase, comp: dict, seen_outcomes: dict) -> None:
+    """Upsert this scan's verdicts into the seen-URL index (one round-trip)."""
+    if not seen_outcomes:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {
+            "company_id": comp['id'],
+            "url_canonical": url,
+            "verdict": outcome["verdict"],
+            "confidence": outcome.get("confidence") or 0,
+            "last_seen_at": now
+        }
+        for url, outcome in seen_outcomes.items()
+    ]
+    try:
+        supabase.table("company_seen_urls").upsert(rows, on_conflict="company_id,url_canonical").execute()
+    except Exception as e:
+        print(f"      ⚠️ Seen-URL index update failed: {e}")
@@ -1,7 +1,10 @@
 
 import os
-import requests
 import json
+try:
+    from http_pool import get_http_client
+except ImportError:
+    from execution.http_pool import get_http_client
 
 class EnrichmentClient:
     """
@@ -16,7 +19,7 @@ class EnrichmentClient:
         self.hunter_key = os.environ.get("HUNTER_API_KEY")
         self.apollo_key = os.environ.get("APOLLO_API_KEY")
         
-        self.session = requests.Session()
+        self.session = get_http_client()  # Shared keep-alive pool (http_pool.py)
 
     def find_email(self, full_name: str, domain: str, company_name: str = None) -> tuple[str | None, str | None]:
         """
@@ -0,0 +1,150 @@
+"""
+Adaptive Spawn Controller — keeps a target number of company scans in flight.
+
+run_monitoring_scan used to spawn fixed waves of APIFY_MAX_CONCURRENT // 6 scans and
+sleep SCAN_WAVE_DELAY_SECS between waves whether or not the previous wave had
+finished, so most of the orchestrator's 20-minute window went to sleeping. The
+scheduler instead launches a new scan as soon as one finishes, and moves the
+in-flight target with feedback:
+
+    ramp up     +1 per clean completion until the first back-off (slow start), then
+                +1 after `target` consecutive clean completions (additive increase)
+    back off    x BACKOFF_FACTOR when a finished scan reports rate limiting (429s),
+                once per window: scans launched before the last back-off are old news
+                (they report minutes late), plus a BACKOFF_COOLDOWN_SECS floor
+    hold        no ramp while the account's running Apify actors are above
+                APIFY_HIGH_WATERMARK of its concurrency limit; -1 when at the limit
+
+Signals:
+    completions   poll(handle) -> (done, result); result may carry {"rate_limited": n}
+    Apify usage   apify_usage() -> (active_actor_jobs, max_concurrent_jobs), sampled
+                  every APIFY_SAMPLE_SECS (None / errors: signal ignored)
+
+The scheduler does not wait for the last scans to drain: once every item is
+launched (or the deadline passes) it returns, and unlaunched items are left for
+the next run.
+
+Usage:
+    scheduler = SpawnScheduler(AdaptiveConcurrency(initial=3, maximum=40))
+    stats = scheduler.run(companies, launch=spawn_fn, poll=poll_fn, deadline=time.monotonic() + 900)
+"""
+import os
+import time
+from collections import deque
+
+
+SCAN_MAX_IN_FLIGHT = int(os.environ.get("SCAN_MAX_IN_FLIGHT", "40"))
+BACKOFF_FACTOR = float(os.environ.get("SCAN_BACKOFF_FACTOR", "0.5"))
+BACKOFF_COOLDOWN_SECS = float(os.environ.get("SCAN_BACKOFF_COOLDOWN_SECS", "30"))
+APIFY_HIGH_WATERMARK = float(os.environ.get("APIFY_HIGH_WATERMARK", "0.85"))
+APIFY_SAMPLE_SECS = float(os.environ.get("APIFY_SAMPLE_SECS", "15"))
+POLL_INTERVAL_SECS = float(os.environ.get("SCAN_POLL_INTERVAL_SECS", "2"))
+PROGRESS_EVERY = 25  # Launches between progress lines
+
+
+class AdaptiveConcurrency:
+    """AIMD in-flight target. Pure state: the caller feeds events and the clock."""
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or SCAN_MAX_IN_FLIGHT)
+        self.target = min(self.maximum, max(self.minimum, initial))
+        self.apify_saturated = False
+        self.slow_start = True
+        self._clean_streak = 0
+        self._last_backoff = float("-inf")
+        self.backoffs = 0
+        self.peak = self.target
+
+    def on_completion(self, rate_limited: int = 0, now: float = None, launched_at: float = None) -> None:
+        now = time.monotonic() if now is None else now
+        if rate_limited:
+            self._clean_streak = 0
+            stale = launched_at is not None and launched_at < self._last_backoff
+            if not stale and now - self._last_backoff >= BACKOFF_COOLDOWN_SECS:
+                self.slow_start = False
+                self.target = max(self.minimum, int(self.target * BACKOFF_FACTOR))
+                self._last_backoff = now
+                self.backoffs += 1
+            return
+        self._clean_streak += 1
+        if (self.slow_start or self._clean_streak >= self.target) and not self.apify_saturated:
+            self._clean_streak = 0
+            self.target = min(self.maximum, self.target + 1)
+            self.peak = max(self.peak, self.target)
+
+    def on_apify_usage(self, active: int, limit: int) -> None:
+        if not limit:
+            return
+        self.apify_saturated = active >= limit * APIFY_HIGH_WATERMARK
+        if active >= limit:
+            self.slow_start = False
+            self.target = max(self.minimum, self.target - 1)
+
+
+class SpawnScheduler:
+    def __init__(self, controller: AdaptiveConcurrency, poll_interval: float = None,
+                 sleep=time.sleep, clock=time.monotonic):
+        self.controller = controller
+        self.poll_interval = POLL_INTERVAL_SECS if poll_interval is None else poll_interval
+        self.sleep = sleep
+        self.clock = clock
+
+    def run(self, items, launch, poll, deadline: float = None, apify_usage=None) -> dict:
+        """
+        launch(item) -> handle, or None when the item was skipped (e.g. claim lost).
+        poll(handle) -> (done, result). Returns launch / completion / backoff stats.
+        """
+        queue = deque(items)
+        in_flight = []
+        stats = {"launched": 0, "skipped": 0, "completed": 0, "rate_limited": 0, "unlaunched": 0}
+        next_sample = self.clock()
+        last_target = self.controller.target
+
+        while queue:
+            now = self.clock()
+            if deadline is not None and now >= deadline:
+                break
+
+            still_running = []
+            for handle, launched_at in in_flight:
+                done, result = poll(handle)
+                if not done:
+                    still_running.append((handle, launched_at))
+                    continue
+                rate_limited = result.get("rate_limited", 0) if isinstance(result, dict) else 0
+                stats["completed"] += 1
+                stats["rate_limited"] += 1 if rate_limited else 0
+                self.controller.on_completion(rate_limited, now, launched_at)
+            in_flight = still_running
+
+            if apify_usage is not None and now >= next_sample:
+                next_sample = now + APIFY_SAMPLE_SECS
+                try:
+                    usage = apify_usage()
+                    if usage:
+                        self.controller.on_apify_usage(*usage)
+                except Exception as e:
+                    print(f"   ⚠️ Apify usage sample failed: {e}")
+
+            while queue and len(in_flight) < self.controller.target:
+                handle = launch(queue.popleft())
+                if handle is None:
+                    stats["skipped"] += 1
+                    continue
+                in_flight.append((handle, now))
+                stats["launched"] += 1
+                if stats["launched"] % PROGRESS_EVERY == 0:
+                    print(f"🚀 Launched {stats['launched']} (in flight {len(in_flight)}/{self.controller.target}, "
+                          f"done {stats['completed']}, queued {len(queue)})")
+
+            if self.controller.target != last_target:
+                print(f"   🎚️ Scan concurrency target {last_target} -> {self.controller.target}")
+                last_target = self.controller.target
+            if queue:
+                self.sleep(self.poll_interval)
+
+        stats["unlaunched"] = len(queue)
+        stats["in_flight"] = len(in_flight)
+        stats["peak_target"] = self.controller.peak
+        stats["backoffs"] = self.controller.backoffs
+        return stats
@@ -0,0 +1,86 @@
+import threading
+import unittest
+
+from apify_runner import ApifyRunner, iter_dataset_items
+from local_apify import LocalApify, google_search_results
+from search_broker import ACTOR, SearchBroker
+
+RUNS = 48
+
+
+class TestApifyRunner(unittest.TestCase):
+    def runner(self, apify, poll_interval=0.02):
+        runner = ApifyRunner(apify, poll_interval=poll_interval)
+        self.addCleanup(runner.close)
+        return runner
+
+    def test_one_poller_serves_every_run(self):
+        threads_before = threading.active_count()
+        runner = self.runner(LocalApify(run_secs=0.2))
+        futures = [runner.start("x", {}, timeout_secs=60) for _ in range(RUNS)]
+        added_threads = threading.active_count() - threads_before
+        runs = [f.result(timeout=10) for f in futures]
+        self.assertTrue(all(run["status"] == "SUCCEEDED" for run in runs))
+        self.assertEqual(runner.peak_in_flight, RUNS)
+        self.assertLessEqual(added_threads, 2)  # Poller (+ at most one callback worker so far), not one thread per run
+
+    def test_start_returns_before_the_run_finishes(self):
+        apify = LocalApify(run_secs=60)
+        runner = self.runner(apify)
+        future = runner.start("x", {}, timeout_secs=120)
+        self.assertFalse(future.done())
+        self.assertEqual(runner.in_flight, 1)
+        self.assertEqual(apify.calls["actor.start"], 1)
+
+    def test_poll_errors_and_failed_runs_are_returned(self):
+        runner = self.runner(LocalApify(run_secs=0.05, poll_errors=3, status="FAILED"))
+        runs = [f.result(timeout=10) for f in [runner.start("x", {}, timeout_secs=60) for _ in range(4)]]
+        self.assertEqual([run["status"] for run in runs], ["FAILED"] * 4)  # Like call(): the run, whatever its status
+
+    def test_deadline_and_close(self):
+        runner = ApifyRunner(LocalApify(run_secs=60), poll_interval=0.01)
+        late = runner.start("x", {}, timeout_secs=-30)  # Deadline already passed (grace is 30s)
+        with self.assertRaises(TimeoutError):
+            late.result(timeout=5)
+        pending = runner.start("x", {}, timeout_secs=60)
+        runner.close()
+        with self.assertRaises(RuntimeError):
+            pending.result(timeout=5)
+        with self.assertRaises(RuntimeError):
+            runner.start("x", {})
+
+    def test_start_after_close_launches_no_run(self):
+        apify = LocalApify(run_secs=60)
+        runner = ApifyRunner(apify)
+        runner.close()
+        with self.assertRaises(RuntimeError):
+            runner.start("x", {}, timeout_secs=60)
+        self.assertEqual(apify.calls["actor.start"], 0)
+
+    def test_search_broker_batches_through_the_runner(self):
+        apify = LocalApify(run_secs=0.05)
+        apify.register_actor(ACTOR, google_search_results())
+        broker = SearchBroker(apify, window_secs=0.01, runner=self.runner(apify))
+        futures = [broker.submit(f"q{i}") for i in range(5)]
+        hits = [f.result(timeout=5) for f in futures]
+        self.assertEqual([len(hit["organic"]) for hit in hits], [3] * 5)
+        self.assertEqual(len(apify.runs), 1)
+
+
+class TestIterDatasetItems(unittest.TestCase):
+    def setUp(self):
+        self.apify = LocalApify()
+        self.apify.register_actor("x", lambda run_input: [{"n": i} for i in range(250)])
+        self.dataset_id = self.apify.actor("x").call(run_input={})["defaultDatasetId"]
+
+    def test_reads_page_by_page(self):
+        self.assertEqual(len(list(iter_dataset_items(self.apify, self.dataset_id, page_size=100))), 250)
+        self.assertEqual(self.apify.list_calls, 3)
+
+    def test_first_item_only_reads_one_page(self):
+        self.assertEqual(next(iter_dataset_items(self.apify, self.dataset_id, page_size=1)), {"n": 0})
+        self.assertEqual(self.apify.list_calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
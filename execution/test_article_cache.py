@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zlib
+from unittest import mock
+
+import article_cache
+from article_cache import ArticleCache, CommitThrottle
+
+URL = "https://www.prnewswire.com/news-releases/acme-raises-series-b-301.html"
+
+
+class TestArticleCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.now = 1_000_000.0
+        patcher = mock.patch("article_cache.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ArticleCache(self.root, ttl_hours=168, negative_ttl_hours=24)
+
+    def test_positive_round_trip(self):
+        published = {"date": "2026-10-01", "confidence": 0.95}
+        self.cache.put(URL, "Acme raised a Series B.", used_apify=True, published=published)
+        entry = self.cache.get(URL)
+        self.assertEqual(entry["status"], "ok")
+        self.assertEqual(entry["text"], "Acme raised a Series B.")
+        self.assertTrue(entry["used_apify"])
+        self.assertEqual(entry["published"], published)
+        self.assertEqual(entry["url"], "https://prnewswire.com/news-releases/acme-raises-series-b-301.html")
+
+    def test_url_variants_share_an_entry(self):
+        self.cache.put(URL, "text", used_apify=False)
+        self.assertIsNotNone(self.cache.get("http://prnewswire.com/news-releases/acme-raises-series-b-301.html/?utm_source=x"))
+        self.assertIsNone(self.cache.get("https://www.prnewswire.com/news-releases/other-302.html"))
+
+    def test_positive_ttl(self):
+        self.cache.put(URL, "text", used_apify=False)
+        self.now += 168 * 3600
+        self.assertIsNotNone(self.cache.get(URL))
+        self.now += 1
+        self.assertIsNone(self.cache.get(URL))
+
+    def test_negative_entries_expire_sooner(self):
+        self.cache.put_negative(URL, "paywalled")
+        entry = self.cache.get(URL)
+        self.assertEqual((entry["status"], entry["reason"]), ("negative", "paywalled"))
+        self.assertNotIn("text", entry)
+        self.now += 24 * 3600 + 1
+        self.assertIsNone(self.cache.get(URL))
+
+    def test_positive_entry_replaces_negative(self):
+        self.cache.put_negative(URL, "thin")
+        self.cache.put(URL, "full text", used_apify=True)
+        self.assertEqual(self.cache.get(URL)["status"], "ok")
+
+    def test_codec_byte_prefixes_every_file(self):
+        self.cache.put(URL, "text", used_apify=False)
+        with open(self.cache._path(URL), "rb") as f:
+            blob = f.read()
+        self.assertEqual(blob[:1], b"Z" if article_cache.zstandard is not None else b"L")
+        self.assertEqual(ArticleCache._decode(blob)["text"], "text")
+
+    def test_zlib_entries_read_without_zstandard(self):
+        with mock.patch("article_cache.zstandard", None):
+            self.cache.put(URL, "text", used_apify=False)
+            with open(self.cache._path(URL), "rb") as f:
+                self.assertEqual(f.read(1), b"L")
+            self.assertEqual(self.cache.get(URL)["text"], "text")
+
+    def test_zstd_entry_is_a_miss_without_zstandard(self):
+        blob = b"Z" + zlib.compress(b"{}")  # Body is irrelevant: the codec byte decides
+        with mock.patch("article_cache.zstandard", None):
+            self.assertIsNone(ArticleCache._decode(blob))
+
+    def test_unknown_codec_or_corrupt_file_is_a_miss(self):
+        self.assertIsNone(ArticleCache._decode(b"Xgarbage"))
+        path = self.cache._path(URL)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"Lnot-zlib")
+        self.assertIsNone(self.cache.get(URL))
+
+    def test_files_are_sharded_by_digest(self):
+        path = self.cache._path(URL)
+        digest = os.path.basename(path)[:-len(".art")]
+        self.assertEqual(os.path.basename(os.path.dirname(path)), digest[:2])
+
+    def test_disabled_cache_is_inert(self):
+        self.cache.enabled = False
+        self.cache.put(URL, "text", used_apify=False)
+        self.assertIsNone(self.cache.get(URL))
+        self.assertFalse(os.path.exists(self.cache._path(URL)))
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCommitThrottle(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.committed = []
+        self.throttle = CommitThrottle(lambda: self.committed.append(self.clock.now), 30, clock=self.clock)
+
+    def test_at_most_one_commit_per_interval(self):
+        for _ in range(5):
+            self.assertFalse(self.throttle.maybe_commit())  # Scans finishing inside the first interval
+            self.clock.now += 5
+        self.clock.now += 5
+        self.assertTrue(self.throttle.maybe_commit())
+        self.assertFalse(self.throttle.maybe_commit())
+        self.clock.now += 30
+        self.assertTrue(self.throttle.maybe_commit())
+        self.assertEqual(self.committed, [130.0, 160.0])
+
+    def test_force_commits_on_exit(self):
+        self.assertTrue(self.throttle.maybe_commit(force=True))
+        self.assertEqual(self.committed, [100.0])
+        self.clock.now += 10
+        self.assertFalse(self.throttle.maybe_commit())  # The forced commit restarted the interval
+
+    def test_concurrent_scans_commit_once(self):
+        self.clock.now += 31
+        barrier = threading.Barrier(8)
+
+        def finish_scan():
+            barrier.wait()
+            self.throttle.maybe_commit()
+
+        threads = [threading.Thread(target=finish_scan) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual((len(self.committed), self.throttle.commits), (1, 1))
+
+    def test_failed_commit_is_not_raised(self):
+        def fail():
+            raise RuntimeError("volume busy")
+        throttle = CommitThrottle(fail, 30, clock=self.clock)
+        self.assertTrue(throttle.maybe_commit(force=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import unittest
+
+from article_prefetch import ArticlePrefetcher, AsyncArticlePrefetcher, FAILED_FETCH
+from scan_engine import ScanEngine
+
+URLS = [f"https://news.example.com/story-{i}" for i in range(10)]
+
+
+class Fetch:
+    """Free-tier fetch stand-in. Blocks while `gate` is clear, so tests control what is in flight."""
+    def __init__(self, fail=()):
+        self.fetched = []
+        self.fail = set(fail)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Semaphore(0)
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        self.started.release()
+        self.gate.wait(5)
+        with self._lock:
+            self.fetched.append(url)
+        if url in self.fail:
+            raise IOError("connection reset")
+        return f"body of {url}", True
+
+
+class TestArticlePrefetcher(unittest.TestCase):
+    def test_fetches_start_before_triage_returns(self):
+        fetch = Fetch()
+        p = ArticlePrefetcher(fetch, max_pages=25, max_workers=2)
+        self.addCleanup(p.close)
+        p.start(URLS[:2])
+        self.assertTrue(fetch.started.acquire(timeout=5))  # Downloading while triage is in flight
+        p.keep(URLS[:2])
+        self.assertEqual(p.take(URLS[1]), (f"body of {URLS[1]}", True))
+
+    def test_shortlist_is_served_and_rejects_are_dropped(self):
+        fetch = Fetch()
+        fetch.gate.clear()
+        p = ArticlePrefetcher(fetch, max_pages=25, max_workers=1)
+        p.start(URLS[:6])
+        self.assertTrue(fetch.started.acquire(timeout=5))  # URLS[0] running, the rest queued
+        p.keep([URLS[4], URLS[8]])
+        fetch.gate.set()
+        self.assertEqual(p.take(URLS[4]), (f"body of {URLS[4]}", True))
+        self.assertEqual(p.take(URLS[8]), (f"body of {URLS[8]}", True))
+        p.close()
+        self.assertEqual(sorted(fetch.fetched), sorted([URLS[0], URLS[4], URLS[8]]))
+        self.assertEqual(p.counters(), {"prefetch_started": 3, "prefetch_used": 2, "prefetch_discarded": 1})
+
+    def test_page_cap_counts_speculative_fetches(self):
+        fetch = Fetch()
+        fetch.gate.clear()
+        p = ArticlePrefetcher(fetch, max_pages=3, max_workers=3)
+        p.start(URLS[:3])
+        for _ in range(3):
+            self.assertTrue(fetch.started.acquire(timeout=5))
+        p.keep(URLS[5:8])  # Running rejects still used their pages
+        self.assertEqual(p.pages, 3)
+        self.assertIsNone(p.take(URLS[5]))  # Never started: the loop fetches it itself
+        fetch.gate.set()
+        p.close()
+
+    def test_start_skips_duplicates_and_blanks(self):
+        p = ArticlePrefetcher(Fetch(), max_pages=25, max_workers=1)
+        self.addCleanup(p.close)
+        p.start([URLS[0], "", None, URLS[0], URLS[1]])
+        self.assertEqual(p.pages, 2)
+
+    def test_failed_free_tier_defers_to_paid_fallback(self):
+        p = ArticlePrefetcher(Fetch(fail={URLS[0]}), max_pages=5)
+        self.addCleanup(p.close)
+        p.start(URLS[:1])
+        self.assertEqual(p.take(URLS[0]), FAILED_FETCH)
+
+
+class TestAsyncArticlePrefetcher(unittest.TestCase):
+    def test_prefetch_through_engine_fetch_slots(self):
+        fetch = Fetch()
+        engine = ScanEngine({"fetch": 2})
+        self.addCleanup(engine.close)
+
+        async def scan():
+            p = AsyncArticlePrefetcher(engine, fetch, max_pages=25)
+            p.start(URLS[:6])
+            await asyncio.sleep(0)  # Triage in flight
+            p.keep([URLS[0], URLS[7]])
+            bodies = [await p.take(URLS[0]), await p.take(URLS[7])]
+            p.close()
+            return p, bodies
+
+        p, bodies = asyncio.run(scan())
+        self.assertEqual(bodies, [(f"body of {URLS[0]}", True), (f"body of {URLS[7]}", True)])
+        self.assertEqual(p.counters()["prefetch_used"], 2)
+        self.assertLessEqual(p.pages, 2 + 1)  # Only fetches that reached a slot keep their page
+
+    def test_failure_is_failed_fetch(self):
+        engine = ScanEngine({"fetch": 1})
+        self.addCleanup(engine.close)
+
+        async def scan():
+            p = AsyncArticlePrefetcher(engine, Fetch(fail={URLS[0]}), max_pages=5)
+            p.start(URLS[:1])
+            return await p.take(URLS[0])
+
+        self.assertEqual(asyncio.run(scan()), FAILED_FETCH)
+
+
+if __name__ == '__main__':
+    unittest.main()
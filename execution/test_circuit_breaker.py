@@ -0,0 +1,180 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from local_supabase import LocalSupabase
+from resilience import CircuitBreaker, MemoryBreakerState, SQLiteBreakerState, SupabaseBreakerState
+
+CONTAINERS = 50
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError("503 Service Unavailable")
+
+
+def breaker(store=None, clock=None, **kwargs):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=60, name="apify", store=store,
+                          sync_seconds=0, clock=clock or Clock(), **kwargs)
+
+
+class BreakerCase(unittest.TestCase):
+    def trip(self, breaker, n=3):
+        for _ in range(n):
+            with self.assertRaises(RuntimeError):
+                breaker.call(fail)
+
+
+class TestCircuitBreaker(BreakerCase):
+    def test_opens_skips_and_recovers(self):
+        clock = Clock()
+        b = breaker(clock=clock)
+        self.trip(b)
+        self.assertEqual(b.state, "OPEN")
+        self.assertTrue(b.is_open)
+        self.assertIsNone(b.call(lambda: "ok"))
+        self.assertEqual(b.skipped, 1)
+
+        clock.now += 61
+        self.assertFalse(b.is_open)
+        self.assertEqual(b.call(lambda: "ok"), "ok")
+        self.assertEqual((b.state, b.failures), ("CLOSED", 0))
+
+    def test_failed_probe_reopens_for_another_timeout(self):
+        clock = Clock()
+        b = breaker(clock=clock)
+        self.trip(b)
+        clock.now += 61
+        self.trip(b, n=1)
+        self.assertEqual(b.state, "OPEN")
+        clock.now += 30
+        self.assertIsNone(b.call(lambda: "ok"))
+
+    def test_failure_window_forgets_old_failures(self):
+        clock = Clock()
+        b = breaker(clock=clock, failure_window=300)
+        self.trip(b, n=2)
+        clock.now += 301
+        self.trip(b, n=2)
+        self.assertEqual((b.state, b.failures), ("CLOSED", 2))
+
+    def test_store_errors_degrade_to_local_state(self):
+        class Broken:
+            shared = True
+
+            def __getattr__(self, name):
+                def _raise(*args):
+                    raise ConnectionError("supabase unreachable")
+                return _raise
+
+        b = breaker(store=Broken())
+        self.assertEqual(b.call(lambda: "ok"), "ok")
+        self.trip(b)
+        self.assertIsNone(b.call(lambda: "ok"))
+
+
+class SharedStoreCases:
+    """Each store() call is another container on the same shared breaker state."""
+    def store(self, clock):
+        raise NotImplementedError
+
+    def test_open_circuit_short_circuits_other_workers(self):
+        clock = Clock()
+        a, b = breaker(self.store(clock), clock), breaker(self.store(clock), clock)
+        self.trip(a)
+        calls = []
+        self.assertIsNone(b.call(lambda: calls.append(1)))
+        self.assertEqual(calls, [])
+        self.assertTrue(b.is_open)
+
+    def test_exactly_one_worker_probes_recovery(self):
+        clock = Clock()
+        workers = [breaker(self.store(clock), clock) for _ in range(8)]
+        self.trip(workers[0])
+        clock.now += 61
+
+        probes, release = [], threading.Event()
+
+        def probe():
+            probes.append(1)
+            release.wait(5)
+            return "recovered"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(w.call, probe) for w in workers]
+            while sum(f.done() for f in futures) < 7:  # Everyone but the prober returns while the probe runs
+                threading.Event().wait(0.001)
+            release.set()
+            results = [f.result() for f in futures]
+        self.assertEqual(len(probes), 1)
+        self.assertEqual((results.count("recovered"), results.count(None)), (1, 7))
+        self.assertEqual(workers[3].state, "CLOSED")
+
+    def test_expired_probe_lease_lets_another_worker_probe(self):
+        clock = Clock()
+        a = breaker(self.store(clock), clock, probe_lease=30)
+        b = breaker(self.store(clock), clock, probe_lease=30)
+        self.trip(a)
+        clock.now += 61
+        self.assertTrue(a._store_op("acquire_probe", 60, 30, clock()))  # a wins the probe and dies
+        self.assertIsNone(b.call(lambda: "ok"))
+        clock.now += 31
+        self.assertEqual(b.call(lambda: "ok"), "ok")
+
+
+class TestSQLiteBreakerState(SharedStoreCases, BreakerCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.path = f"{root}/breakers.sqlite"
+
+    def store(self, clock):
+        return SQLiteBreakerState(self.path)
+
+
+class TestSupabaseBreakerState(SharedStoreCases, BreakerCase):
+    def setUp(self):
+        self.db = LocalSupabase()
+
+    def store(self, clock):
+        self.db.clock = lambda: datetime.fromtimestamp(clock(), timezone.utc)
+        return SupabaseBreakerState(self.db)
+
+
+class TestFleetOutage(unittest.TestCase):
+    def outage(self, shared, scans_per_container=6):
+        """Every container scans during a full outage; returns the doomed calls made."""
+        clock = Clock()
+        memory = MemoryBreakerState()
+        doomed = []
+
+        def container(_):
+            store = memory if shared else MemoryBreakerState()
+            b = CircuitBreaker(failure_threshold=5, reset_timeout=3600, name="apify", store=store, sync_seconds=0, clock=clock)
+            for _ in range(scans_per_container):
+                try:
+                    b.call(lambda: doomed.append(1) or fail())
+                except RuntimeError:
+                    pass
+
+        with ThreadPoolExecutor(max_workers=CONTAINERS) as pool:
+            list(pool.map(container, range(CONTAINERS)))
+        return len(doomed)
+
+    def test_shared_state_caps_doomed_calls_fleet_wide(self):
+        self.assertEqual(self.outage(shared=False), CONTAINERS * 5)
+        self.assertLessEqual(self.outage(shared=True), 5 + CONTAINERS)  # Threshold plus at most one in-flight call each
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import random
+import unittest
+from datetime import datetime
+
+from date_extractor import DateExtractor, DateMatch, is_stale
+
+NOW = datetime(2026, 3, 10, 9, 30)
+
+
+def legacy_extract_date_from_text(text: str, max_chars: int = 800, today: datetime = None) -> tuple:
+    """The original extract_date_from_text, frozen so the agreement check stays meaningful."""
+    import re
+    from datetime import datetime
+
+    start_idx = 200 if len(text) > 300 else 0
+    text_to_scan = text[start_idx:max_chars+start_idx] if text else ""
+
+    today = today or datetime.now()
+    found_dates = []
+
+    months = {
+        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
+        'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+    }
+
+    def matches_today(d):
+        return d.year == today.year and d.month == today.month and d.day == today.day
+
+    for match in re.finditer(r'\b(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2}),?\s+(\d{4})\b', text_to_scan, re.IGNORECASE):
+        month_str, day, year = match.groups()
+        try:
+            month = months.get(month_str.lower())
+            if month:
+                d = datetime(int(year), month, int(day))
+                if not matches_today(d): return (d, d.strftime("%Y-%m-%d"))
+                found_dates.append(d)
+        except: pass
+
+    for match in re.finditer(r'\b(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{4})\b', text_to_scan, re.IGNORECASE):
+        day, month_str, year = match.groups()
+        try:
+            month = months.get(month_str.lower())
+            if month:
+                d = datetime(int(year), month, int(day))
+                if not matches_today(d): return (d, d.strftime("%Y-%m-%d"))
+                found_dates.append(d)
+        except: pass
+
+    for match in re.finditer(r'\b(\d{4})-(\d{2})-(\d{2})\b', text_to_scan):
+        year, month, day = match.groups()
+        try:
+            d = datetime(int(year), int(month), int(day))
+            if not matches_today(d): return (d, d.strftime("%Y-%m-%d"))
+            found_dates.append(d)
+        except: pass
+
+    if found_dates:
+        return (found_dates[0], found_dates[0].strftime("%Y-%m-%d"))
+
+    return (None, None)
+
+
+NAV = "Home | News | Tuesday, March 10, 2026 | Subscribe | Sign in | Markets | Tech | " * 3
+FILLER = ("The agency said the partnership would expand its work across retail and consumer brands, "
+          "adding strategy, creative and media teams over the coming quarter. ")
+
+# (kwargs for extract, expected date_str or None, expected source or None)
+FIXTURES = [
+    ({"text": NAV + "Published January 15, 2026. " + FILLER * 4}, "2026-01-15", "month_name"),
+    ({"text": NAV + "By Jane Doe, 3 Feb 2026 — " + FILLER * 4}, "2026-02-03", "month_name"),
+    ({"text": NAV + "Sept. 21st, 2025 | " + FILLER * 4}, "2025-09-21", "month_name"),
+    ({"text": NAV + "Posted 2025-11-30T08:00:00Z " + FILLER * 4}, "2025-11-30", "iso"),
+    ({"text": NAV + "Updated 01/22/2026 " + FILLER * 4}, "2026-01-22", "numeric"),
+    ({"text": NAV + "Updated 22/01/2026 " + FILLER * 4}, "2026-01-22", "numeric"),
+    # Nav-bar date only: used as a last resort, at reduced confidence
+    ({"text": "Tuesday, March 10, 2026 " + FILLER * 4, "snippet": True}, "2026-03-10", "month_name"),
+    # Today's date in the header is passed over for the real dateline
+    ({"text": "March 10, 2026 breaking: February 27, 2026 " + FILLER, "snippet": True}, "2026-02-27", "month_name"),
+    # Snippets: relative dates are trusted and scanned from the start
+    ({"text": "3 days ago — Acme names new CMO", "snippet": True}, "2026-03-07", "relative"),
+    ({"text": "2 months ago ... Acme opens London office", "snippet": True}, "2026-01-09", "relative"),
+    ({"text": "Yesterday: Acme wins Cannes Lion", "snippet": True}, "2026-03-09", "relative"),
+    # Bodies: "N years ago" loses to any absolute date
+    ({"text": NAV + "Acme, founded 12 years ago, said on March 2, 2026 " + FILLER * 3}, "2026-03-02", "month_name"),
+    # HTML metadata wins over body text
+    ({"text": NAV + "January 15, 2026 " + FILLER,
+      "html": '<head><meta property="article:published_time" content="2026-03-01T10:00:00+00:00"></head>'},
+     "2026-03-01", "meta"),
+    ({"text": "", "html": '<script type="application/ld+json">{"@type":"NewsArticle","datePublished":"2025-12-24"}</script>'},
+     "2025-12-24", "meta"),
+    ({"text": "", "html": '<article><time class="pub" datetime="2026-02-14T12:00">Feb 14</time></article>'},
+     "2026-02-14", "time_tag"),
+    # Rejects
+    ({"text": NAV + "Call 555-1234 or visit 12/45/2026 " + FILLER * 4}, None, None),
+    ({"text": NAV + "Since 1850, February 30, 2026 " + FILLER * 4}, None, None),
+    ({"text": ""}, None, None),
+]
+
+SNIPPET_TEMPLATES = [
+    "{d:%b} {d.day}, {d.year} ... Acme announces {w}",
+    "{d.day} {d:%B} {d.year} — {w} at Acme",
+    "{d:%Y-%m-%d} {w}",
+    "{d.month:02d}/{d.day:02d}/{d.year} {w}",
+    "{n} days ago — {w}",
+    "{w} with no date at all",
+]
+WORDS = ["new CEO", "Series B", "London office", "rebrand", "agency review", "acquisition of Beta Inc"]
+
+
+def build_corpus(n: int, seed: int = 11) -> list:
+    """n article-like texts: nav header, dateline in one of the supported formats, body filler."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        d = datetime(rng.randint(2023, 2026), rng.randint(1, 12), rng.randint(1, 28))
+        line = rng.choice(SNIPPET_TEMPLATES).format(d=d, n=rng.randint(1, 90), w=rng.choice(WORDS))
+        header = NAV if rng.random() < 0.7 else ""
+        corpus.append(header + line + " " + FILLER * rng.randint(1, 8))
+    return corpus
+
+
+class TestDateExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = DateExtractor(now=NOW)
+
+    def test_fixtures(self):
+        for i, (kwargs, expected, source) in enumerate(FIXTURES):
+            with self.subTest(fixture=i, expected=expected):
+                found = self.extractor.extract(**kwargs)
+                if expected is None:
+                    self.assertIsNone(found)
+                else:
+                    self.assertEqual((found.date_str, found.source), (expected, source))
+
+    def test_confidence_ordering(self):
+        nav_only = self.extractor.extract("Tuesday, March 10, 2026 " + FILLER, snippet=True)
+        body_relative = self.extractor.extract(NAV + "acquired 2 years ago " + FILLER * 4)
+        dateline = self.extractor.extract(NAV + "January 15, 2026 " + FILLER * 4)
+        meta = self.extractor.extract_html('<meta name="pubdate" content="2026-01-15">')
+        self.assertGreater(meta.confidence, dateline.confidence)
+        self.assertGreater(dateline.confidence, nav_only.confidence)
+        self.assertLess(body_relative.confidence, 0.5)
+
+    def test_agrees_with_legacy_on_legacy_formats(self):
+        # Where the legacy function finds a non-today date, the engine finds the same one
+        for text in build_corpus(5000):
+            legacy_date, legacy_str = legacy_extract_date_from_text(text, today=NOW)
+            if legacy_date is None or legacy_date.date() == NOW.date():
+                continue
+            self.assertEqual(self.extractor.extract(text).date_str, legacy_str, text[200:320])
+
+    def test_extract_many_matches_extract(self):
+        corpus = build_corpus(500)
+        self.assertEqual(self.extractor.extract_many(corpus), [self.extractor.extract(t) for t in corpus])
+
+
+class TestDateMatch(unittest.TestCase):
+    def test_is_stale(self):
+        old = DateMatch(datetime(2025, 12, 1), "2025-12-01", 0.75, "month_name")
+        self.assertTrue(is_stale(old, 25, now=NOW))
+        self.assertFalse(is_stale(old, 25, min_confidence=0.8, now=NOW))
+        self.assertFalse(is_stale(None, 25, now=NOW))
+        self.assertFalse(is_stale(DateMatch(datetime(2026, 3, 1), "2026-03-01", 0.75, "month_name"), 25, now=NOW))
+
+    def test_record_round_trip(self):
+        match = DateExtractor(now=NOW).extract("3 days ago", snippet=True)
+        self.assertEqual(DateMatch.from_record(match.to_record()).date_str, match.date_str)
+        self.assertIsNone(DateMatch.from_record({"date": "garbage"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
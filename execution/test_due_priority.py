@@ -0,0 +1,112 @@
+import math
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from due_priority import (
+    MAX_SCAN_INTERVAL_DAYS, PRIOR_SCANS, PRIOR_TRIGGERS, days_since, expected_cost, priority,
+    priority_sort_key, trigger_rate,
+)
+from local_supabase import LocalSupabase, seed_synthetic
+
+NOW = datetime(2026, 3, 10, 9, 0, tzinfo=timezone.utc)
+
+
+def iso(dt: datetime) -> str:
+    return dt.isoformat().replace('+00:00', 'Z')
+
+
+class TestPriority(unittest.TestCase):
+    def test_prior_for_new_companies(self):
+        self.assertEqual(trigger_rate(0, 0), PRIOR_TRIGGERS / PRIOR_SCANS)
+        self.assertGreater(trigger_rate(20, 10), trigger_rate(20, 0))
+        self.assertEqual(days_since(None, NOW), math.inf)
+
+    def test_cost_tracks_skip_rate(self):
+        self.assertEqual(expected_cost(10, 10, full_cost=0.08, skip_cost=0.002), 0.002)
+        self.assertEqual(expected_cost(10, 0, full_cost=0.08, skip_cost=0.002), 0.08)
+        self.assertGreater(expected_cost(0, 0), expected_cost(10, 9))  # No history: assume a full scan
+
+    def test_velocity_is_clamped(self):
+        base = priority({}, 1.0, 6, "weekly")
+        self.assertAlmostEqual(priority({}, 100.0, 6, "weekly"), 3 * base)
+        self.assertAlmostEqual(priority({}, 0.0, 6, "weekly"), base)  # Missing velocity counts as 1
+        self.assertAlmostEqual(priority({}, 0.1, 6, "weekly"), 0.5 * base)
+
+    def test_starved_companies_sort_first(self):
+        comps = [
+            {"id": "hot", "last_monitored_at": iso(NOW - timedelta(days=7))},
+            {"id": "never", "last_monitored_at": None},
+            {"id": "starved", "last_monitored_at": iso(NOW - timedelta(days=MAX_SCAN_INTERVAL_DAYS + 1))},
+        ]
+        hot = {"scans": 30, "triggers": 20}
+        comps.sort(key=lambda c: priority_sort_key(c, NOW, history=hot if c["id"] == "hot" else None))
+        self.assertEqual([c["id"] for c in comps], ["never", "starved", "hot"])
+
+
+class TestDailySelection(unittest.TestCase):
+    """Day-by-day selection on a universe where 5% of companies trigger often and the rest rarely."""
+    COMPANIES, DAILY_LIMIT, DAYS = 400, 40, 60
+
+    def simulate(self, strategy: str, seed: int = 11) -> dict:
+        rng = random.Random(seed)
+        universe = []
+        for i in range(self.COMPANIES):
+            p = 0.4 if i % 20 == 0 else rng.uniform(0.0, 0.05)
+            universe.append({"id": f"c{i:04d}", "p": p, "monitoring_frequency": "weekly",
+                             "last_monitored_at": iso(NOW - timedelta(days=rng.uniform(6, 14))),
+                             "history": {"scans": 0, "triggers": 0}})
+        expected, max_gap = 0.0, 0.0
+        for day in range(self.DAYS):
+            now = NOW + timedelta(days=day)
+            due = [c for c in universe if days_since(c["last_monitored_at"], now) >= 6]
+            if strategy == "oldest":
+                due.sort(key=lambda c: c["last_monitored_at"])
+            else:
+                due.sort(key=lambda c: priority_sort_key(c, now, history=c["history"]))
+            for comp in due[:self.DAILY_LIMIT]:
+                expected += comp["p"]
+                comp["history"]["scans"] += 1
+                comp["history"]["triggers"] += rng.random() < comp["p"]
+                comp["last_monitored_at"] = iso(now)
+            if day >= MAX_SCAN_INTERVAL_DAYS:
+                max_gap = max(max_gap, max(days_since(c["last_monitored_at"], now) for c in universe))
+        return {"expected_triggers": expected, "max_gap_days": max_gap}
+
+    def test_priority_finds_more_triggers_than_oldest_first(self):
+        oldest, ranked = self.simulate("oldest"), self.simulate("priority")
+        self.assertGreater(ranked["expected_triggers"], 1.15 * oldest["expected_triggers"])
+        self.assertLessEqual(ranked["max_gap_days"], MAX_SCAN_INTERVAL_DAYS + 1)  # Starvation guarantee
+
+
+class TestPrioritizedDueCompaniesRPC(unittest.TestCase):
+    def setUp(self):
+        self.db = LocalSupabase(clock=lambda: NOW)
+        seed_synthetic(self.db, companies=120, seed=3)
+
+    def due(self, **params):
+        return self.db.rpc("get_prioritized_due_companies", {"p_client_limits": {}, "p_default_limit": 50, **params}).execute().data
+
+    def test_each_client_is_filled_starved_first_then_by_priority(self):
+        rows = self.due(p_client_limits={"pulsepoint_strategic": 5})
+        by_client = {}
+        for row in rows:
+            by_client.setdefault(row["client_key"], []).append(row)
+        self.assertLessEqual(len(by_client["pulsepoint_strategic"]), 5)
+        for ranked in by_client.values():
+            self.assertEqual([r["due_rank"] for r in ranked], list(range(1, len(ranked) + 1)))
+            starved = [r["starved"] for r in ranked]
+            self.assertEqual(starved, sorted(starved, reverse=True))
+            scores = [r["priority"] for r in ranked if not r["starved"]]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_pages_resume_after_the_last_row(self):
+        full = self.due()
+        page = self.due(p_page_size=7)
+        last = page[-1]
+        rest = self.due(p_after_client=last["client_key"], p_after_rank=last["due_rank"])
+        self.assertEqual([r["id"] for r in page + rest], [r["id"] for r in full])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import random
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from local_supabase import LocalSupabase
+
+NOW = datetime(2026, 3, 10, 9, 0, tzinfo=timezone.utc)
+DEFAULT_DAILY_SCAN_LIMIT = 50
+CLIENT_LIMITS = {"pulsepoint_strategic": 50, "mike_ecker": 30, "sourcepass": 75, "quantifire": 40}
+RPC_COLUMNS = {
+    "id", "company", "client_context", "website", "industry", "event_title", "user_id",
+    "score_factors", "last_monitored_at", "monitoring_frequency", "last_search_hash",
+}
+
+
+def legacy_due(companies: list, now: datetime) -> list:
+    """The due rules of the original select("*") + Python get_due_companies."""
+    due = []
+    for comp in companies:
+        last_run_str = comp.get("last_monitored_at")
+        if not last_run_str:
+            due.append(comp)
+            continue
+        freq = comp.get("monitoring_frequency", "weekly")
+        if freq == "daily":
+            threshold = now - timedelta(hours=20)
+        elif freq == "biweekly":
+            threshold = now - timedelta(days=3)
+        else:
+            threshold = now - timedelta(days=6)
+        if datetime.fromisoformat(last_run_str.replace('Z', '+00:00')) < threshold:
+            due.append(comp)
+    return due
+
+
+def build_universe(n: int, seed: int = 3) -> list:
+    """n triggered_companies rows with realistic JSONB weight (score_factors, events_history)."""
+    rng = random.Random(seed)
+    clients = list(CLIENT_LIMITS) + ["unknown_client"]
+    rows = []
+    for i in range(n):
+        never = rng.random() < 0.05
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "company": f"Company {i}",
+            "client_context": rng.choice(clients),
+            "website": f"https://company{i}.com",
+            "industry": rng.choice(["marketing agency", "saas", "consulting", "retail"]),
+            "event_title": "Named new CMO" if rng.random() < 0.3 else None,
+            "user_id": None,
+            "score_factors": {"blog_url": f"https://company{i}.com/blog", "icp": rng.randint(1, 10)},
+            "events_history": [
+                {"title": f"Event {j}", "summary": "x" * 400, "url": f"https://news.example/{i}/{j}"}
+                for j in range(rng.randint(0, 12))
+            ],
+            "contact_info": {"raw": "name,email\n" * rng.randint(0, 20)},
+            "last_monitored_at": None if never else (NOW - timedelta(seconds=rng.randint(3600, 14 * 86400))).isoformat(),
+            "monitoring_frequency": rng.choice(["daily", "weekly", "biweekly", None]),
+            "monitoring_status": "active" if rng.random() < 0.9 else "paused",
+            "last_search_hash": f"{rng.getrandbits(64):016x}",
+        })
+    return rows
+
+
+class TestDueSelectionRPC(unittest.TestCase):
+    def setUp(self):
+        self.db = LocalSupabase(clock=lambda: NOW)
+        self.universe = build_universe(4000)
+        self.db.tables["triggered_companies"].extend(self.universe)  # Seeded directly, like seed_synthetic
+        self.active = [r for r in self.universe if r["monitoring_status"] == "active"]
+
+    def due(self, client_limits: dict, page_size: int = 500) -> list:
+        rows, after = [], (None, 0)
+        while True:
+            page = self.db.rpc("get_prioritized_due_companies", {
+                "p_client_limits": client_limits, "p_default_limit": DEFAULT_DAILY_SCAN_LIMIT,
+                "p_page_size": page_size, "p_after_client": after[0], "p_after_rank": after[1],
+            }).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            after = (page[-1]["client_key"], page[-1]["due_rank"])
+
+    def test_due_rules_match_the_legacy_selection(self):
+        unlimited = {client: len(self.universe) for client in [*CLIENT_LIMITS, "unknown_client"]}
+        self.assertEqual({r["id"] for r in self.due(unlimited)}, {r["id"] for r in legacy_due(self.active, NOW)})
+
+    def test_each_client_is_cut_to_its_limit(self):
+        due_by_client = {}
+        for comp in legacy_due(self.active, NOW):
+            due_by_client[comp["client_context"]] = due_by_client.get(comp["client_context"], 0) + 1
+        rows = self.due(CLIENT_LIMITS)
+        for client, due_total in due_by_client.items():
+            selected = [r for r in rows if r["client_context"] == client]
+            self.assertEqual(len(selected), min(due_total, CLIENT_LIMITS.get(client, DEFAULT_DAILY_SCAN_LIMIT)))
+            self.assertTrue(all(r["due_total"] == due_total for r in selected))
+
+    def test_rows_carry_only_the_scanner_columns(self):
+        rows = self.due(CLIENT_LIMITS)
+        scanner_rows = [{c: r[c] for c in RPC_COLUMNS} for r in rows]
+        self.assertFalse({"events_history", "contact_info"} & set(rows[0]))
+        select_all = self.db.table("triggered_companies").select("*").eq("monitoring_status", "active").execute().data
+        self.assertLess(len(json.dumps(scanner_rows)) * 20, len(json.dumps(select_all)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from http_pool import DNSCache, HttpPool
+
+PROBES = ["/sitemap.xml", "/post-sitemap.xml", "/sitemap_index.xml", "/blog/sitemap.xml", "/robots.txt",
+          "/feed", "/rss", "/rss.xml", "/blog/feed", "/blog/rss", "/blog", "/insights", "/news", "/press"]
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 site that records connections and peak concurrent requests."""
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    active = 0
+    peak = 0
+    hold_secs = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.connections, cls.peak, cls.hold_secs = set(), 0, 0
+
+    def setup(self):
+        super().setup()
+        with Handler.lock:
+            Handler.connections.add(self.client_address)
+
+    def _respond(self, body: bytes):
+        with Handler.lock:
+            Handler.active += 1
+            Handler.peak = max(Handler.peak, Handler.active)
+        if Handler.hold_secs:
+            time.sleep(Handler.hold_secs)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        with Handler.lock:
+            Handler.active -= 1
+
+    def do_GET(self):
+        self._respond(b"<html><body><p>post</p></body></html>")
+
+    def do_HEAD(self):
+        self._respond(b"<html></html>")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.reset()
+
+    def test_probe_burst_reuses_one_connection(self):
+        pool = HttpPool()
+        self.addCleanup(pool.close)
+        for path in PROBES:
+            self.assertEqual(pool.head(self.base + path, timeout=5, allow_redirects=True).status_code, 200)
+        self.assertIn("post", pool.download_html(self.base + "/blog/post-1"))
+        self.assertEqual(len(Handler.connections), 1)
+
+    def test_per_host_cap(self):
+        Handler.hold_secs = 0.03
+        pool = HttpPool(per_host=2)
+        self.addCleanup(pool.close)
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(ex.map(lambda p: pool.get(self.base + p), PROBES[:8]))
+        self.assertLessEqual(Handler.peak, 2)
+
+    def test_async_client_per_loop(self):
+        pool = HttpPool(per_host=3)
+        self.addCleanup(pool.close)
+
+        async def burst():
+            responses = await asyncio.gather(*(pool.ahead(self.base + p) for p in PROBES))
+            await pool.aclose()
+            return responses
+
+        self.assertTrue(all(r.status_code == 200 for r in asyncio.run(burst())))
+        self.assertLessEqual(len(Handler.connections), 3)
+
+
+class TestDNSCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def resolver(self, host, port, *args):
+        self.calls.append(host)
+        if host == "bad.invalid":
+            raise OSError("no such host")
+        return [("addr", host)]
+
+    def test_hits_within_ttl(self):
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        for _ in range(5):
+            self.assertEqual(cache.getaddrinfo("acme.example", 443), [("addr", "acme.example")])
+        self.assertEqual(self.calls, ["acme.example"])
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+
+    def test_failures_are_not_cached(self):
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                cache.getaddrinfo("bad.invalid", 443)
+        self.assertEqual(self.calls.count("bad.invalid"), 2)
+
+    def test_entries_expire(self):
+        now = [100.0]
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        with mock.patch("http_pool.time.monotonic", lambda: now[0]):
+            cache.getaddrinfo("acme.example", 443)
+            now[0] += 59
+            cache.getaddrinfo("acme.example", 443)
+            now[0] += 2
+            cache.getaddrinfo("acme.example", 443)
+        self.assertEqual(self.calls, ["acme.example"] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
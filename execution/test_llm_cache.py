@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from llm_cache import LLMCache, SQLiteCacheBackend, SupabaseCacheBackend, cache_key
+from local_supabase import LocalAPIError, LocalSupabase
+
+
+def request(prompt: str, model: str = "gpt-4o-mini") -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+    }
+
+
+class Model:
+    """Completion stand-in: model(payload) is the `call` argument of fetch()."""
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, payload: dict):
+        def _call():
+            self.calls += 1
+            return json.dumps(payload)
+        return _call
+
+
+class TestCacheKey(unittest.TestCase):
+    def test_key_separates_model_format_and_variant(self):
+        req = request("p")
+        self.assertNotEqual(cache_key(req), cache_key(request("p", "gpt-4o")))
+        self.assertNotEqual(cache_key(req), cache_key({**req, "response_format": None}))
+        self.assertNotEqual(cache_key(req, variant=1), cache_key(req, variant=2))
+        self.assertEqual(cache_key(req), cache_key(json.loads(json.dumps(req))))
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        self.now = time.time()  # The remote tier compares against wall-clock expires_at
+        patcher = mock.patch("llm_cache.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = self.make_cache("llm.sqlite")
+
+    def make_cache(self, name, remote=None, max_entries=None):
+        local = SQLiteCacheBackend(os.path.join(self.dir, name), max_entries=max_entries)
+        return LLMCache(local=local, remote=remote, ttl_hours=1)
+
+    def test_hit_skips_model_and_counts_per_site(self):
+        model = Model()
+        session = self.cache.session()
+        req = request("Is this a trigger?")
+        self.assertEqual(session.fetch("triage_relevance_batch", req, model({"verdicts": []})), {"verdicts": []})
+        self.assertEqual(session.fetch("triage_relevance_batch", req, model({"verdicts": ["other"]})), {"verdicts": []})
+        session.fetch("generate_draft", request("Draft", "gpt-4o"), model({"body": "x"}), variant=1)
+        self.assertEqual(model.calls, 2)
+        counters = session.counters()
+        self.assertEqual((counters["llm_cache_hits"], counters["llm_cache_misses"]), (1, 2))
+        self.assertEqual(counters["llm_cache_sites"]["triage_relevance_batch"], {"hits": 1, "misses": 1})
+
+    def test_bypass_refreshes_without_reading(self):
+        model = Model()
+        req = request("p")
+        self.cache.session().fetch("s", req, model({"v": 1}))
+        self.assertEqual(self.cache.session(bypass_cache=True).fetch("s", req, model({"v": 2})), {"v": 2})
+        self.assertEqual(self.cache.session().fetch("s", req, model({"v": 3})), {"v": 2})
+        self.assertEqual(model.calls, 2)
+
+    def test_unparseable_and_missing_completions_are_not_stored(self):
+        session = self.cache.session()
+        req = request("p")
+        with self.assertRaises(json.JSONDecodeError):
+            session.fetch("s", req, lambda: "not json")
+        self.assertIsNone(session.fetch("s", req, lambda: None))
+        self.assertEqual(len(self.cache.local), 0)
+
+    def test_ttl_expiry(self):
+        model = Model()
+        self.cache.session().fetch("s", request("p"), model({}))
+        self.now += 3599
+        self.cache.session().fetch("s", request("p"), model({}))
+        self.assertEqual(model.calls, 1)
+        self.now += 2
+        self.cache.session().fetch("s", request("p"), model({}))
+        self.assertEqual(model.calls, 2)
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = self.make_cache("lru.sqlite", max_entries=50)
+        session = cache.session()
+        session.fetch("s", request("keep"), lambda: "{}")
+        for i in range(SQLiteCacheBackend.EVICT_EVERY - 1):
+            self.now += 1
+            session.fetch("s", request(f"p{i}"), lambda: "{}")
+            if i % 10 == 0:
+                session.fetch("s", request("keep"), lambda: "{}")  # Touch
+        self.assertEqual(len(cache.local), 50)
+        self.assertIsNotNone(cache.local.get(cache_key(request("keep"))))
+        self.assertIsNone(cache.local.get(cache_key(request("p0"))))
+
+    def test_remote_tier_promotes_to_local(self):
+        db = LocalSupabase()
+        writer = self.make_cache("a.sqlite", remote=SupabaseCacheBackend(db))
+        writer.session().fetch("s", request("p"), lambda: '{"v": 1}')
+        self.assertEqual(len(db.rows("llm_response_cache")), 1)
+
+        reader = self.make_cache("b.sqlite", remote=SupabaseCacheBackend(db))
+        self.assertEqual(reader.session().fetch("s", request("p"), lambda: '{"v": 2}'), {"v": 1})
+        self.assertEqual(reader.local.get(cache_key(request("p"))), '{"v": 1}')
+        db.reset_counters()
+        reader.session().fetch("s", request("p"), lambda: '{"v": 2}')
+        self.assertEqual(db.round_trips, 0)  # Served by the local tier now
+
+    def test_remote_failure_degrades_to_local(self):
+        db = LocalSupabase()
+
+        def broken(name):
+            raise LocalAPIError('relation "llm_response_cache" does not exist', code="42P01")
+        db.table = broken
+        cache = self.make_cache("c.sqlite", remote=SupabaseCacheBackend(db))
+        model = Model()
+        self.assertEqual(cache.session().fetch("s", request("p"), model({"v": 1})), {"v": 1})
+        self.assertEqual(cache.session().fetch("s", request("p"), model({"v": 2})), {"v": 1})
+        self.assertEqual(model.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from due_priority import priority_sort_key
+from local_supabase import LocalAPIError, LocalSupabase, seed_synthetic
+from scan_writes import ScanWriteBuffer
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def ago(days):
+    return (NOW - timedelta(days=days)).isoformat()
+
+
+def due_pages(db, limits, page_size):
+    rows, after = [], (None, 0)
+    while True:
+        page = db.rpc("get_prioritized_due_companies", {
+            "p_client_limits": limits, "p_page_size": page_size, "p_after_client": after[0], "p_after_rank": after[1],
+        }).execute().data
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        after = (page[-1]["client_key"], page[-1]["due_rank"])
+
+
+class TestLocalSupabase(unittest.TestCase):
+    def setUp(self):
+        self.db = LocalSupabase(clock=lambda: NOW)
+
+    def ids(self, query):
+        return [r["id"] for r in query.execute().data]
+
+    def test_builder_filters_order_and_paging(self):
+        self.db.table("triggered_companies").insert([
+            {"id": f"c{i}", "company": name, "client_context": "a" if i % 2 else "b", "last_monitored_at": ago(i) if i else None}
+            for i, name in enumerate(["Acme", "acme labs", "Globex", "Initech", "Umbrella"])
+        ]).execute()
+        t = lambda: self.db.table("triggered_companies").select("id")
+
+        self.assertEqual(self.ids(t().ilike("company", "acme%")), ["c0", "c1"])
+        self.assertEqual(self.ids(t().in_("id", ["c3", "c4", "zz"])), ["c3", "c4"])
+        self.assertEqual(self.ids(t().is_("last_monitored_at", "null")), ["c0"])
+        self.assertEqual(self.ids(t().lt("last_monitored_at", ago(2.5))), ["c3", "c4"])
+        self.assertEqual(self.ids(t().order("last_monitored_at", desc=False)), ["c4", "c3", "c2", "c1", "c0"])  # NULLs last
+        page = (self.db.table("triggered_companies").select("id, company", count="exact")
+                .eq("client_context", "a").order("id").range(1, 1).execute())
+        self.assertEqual((page.data, page.count), ([{"id": "c3", "company": "Initech"}], 2))
+
+    def test_writes_generate_ids_and_resolve_now(self):
+        log = self.db.table("monitor_scan_log").insert({"company_id": "c1", "status": "running"}).execute().data[0]
+        self.assertTrue(log["id"])
+        self.assertEqual(log["started_at"], NOW.isoformat())
+        done = self.db.table("monitor_scan_log").update({"status": "success", "completed_at": "now()"}).eq("id", log["id"]).execute()
+        self.assertEqual(done.data[0]["completed_at"], NOW.isoformat())
+
+    def test_unique_keys_upsert_and_reject_duplicates(self):
+        seen = lambda **r: {"company_id": "c1", "url_canonical": "https://a.example/x", **r}
+        table = lambda: self.db.table("company_seen_urls")
+        table().upsert(seen(verdict="rejected"), on_conflict="company_id,url_canonical").execute()
+        table().upsert(seen(verdict="triggered"), on_conflict="company_id,url_canonical").execute()
+        self.assertEqual([r["verdict"] for r in self.db.rows("company_seen_urls")], ["triggered"])
+        with self.assertRaises(LocalAPIError) as e:
+            table().insert([seen(url_canonical="https://a.example/y"), seen()]).execute()
+        self.assertEqual(e.exception.code, "23505")
+        self.assertEqual(len(self.db.rows("company_seen_urls")), 1)  # The failed statement inserted nothing
+
+    def test_embedded_select_joins_profiles_to_strategies(self):
+        seed_synthetic(self.db, companies=4)
+        rows = self.db.table("client_strategies").select("*, client_profiles(*)").execute().data
+        self.assertEqual({r["slug"] for r in rows}, {"pulsepoint_strategic", "quantifire"})
+        for r in rows:
+            self.assertEqual([p["strategy_id"] for p in r["client_profiles"]], [r["id"]])
+
+    def test_missing_rpc_raises_like_an_unapplied_migration(self):
+        self.db.register_rpc("get_prioritized_due_companies", None)
+        with self.assertRaises(LocalAPIError) as e:
+            self.db.rpc("get_prioritized_due_companies", {}).execute()
+        self.assertEqual(e.exception.code, "PGRST202")
+
+
+class TestLocalSupabaseRPCs(unittest.TestCase):
+    def setUp(self):
+        self.db = LocalSupabase(clock=lambda: NOW)
+
+    def test_claim_is_atomic_across_threads(self):
+        self.db.table("triggered_companies").insert({"id": "c1", "scan_claimed_at": None}).execute()
+        claim = lambda _: self.db.rpc("claim_company_for_scan", {"p_company_id": "c1", "p_cutoff": ago(1)}).execute().data[0]["claimed"]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            self.assertEqual(sum(pool.map(claim, range(64))), 1)
+
+    def test_concurrent_score_factor_merges_all_land(self):
+        db = LocalSupabase(latency=0.001, clock=lambda: NOW)
+        db.table("triggered_companies").insert({"id": "c1", "score_factors": {"kept": 1}}).execute()
+        merge = lambda i: db.rpc("merge_score_factors", {"p_company_id": "c1", "p_delta": {f"scout_{i}": i}}).execute()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(merge, range(32)))
+        self.assertEqual(db.rows("triggered_companies")[0]["score_factors"], {"kept": 1, **{f"scout_{i}": i for i in range(32)}})
+
+    def test_due_selection_without_history_matches_the_python_fallback(self):
+        seed_synthetic(self.db, companies=200, seed=4, scans_per_company=0)
+        self.db.tables["account_signal_baselines"].clear()
+        due = due_pages(self.db, {"pulsepoint_strategic": 1000, "quantifire": 1000}, page_size=1000)
+        comps = {c["id"]: c for c in self.db.rows("triggered_companies")}
+        for client in ("pulsepoint_strategic", "quantifire"):
+            ids = [r["id"] for r in due if r["client_context"] == client]
+            self.assertEqual(ids, sorted(ids, key=lambda i: priority_sort_key(comps[i], NOW)))
+
+    def test_due_selection_round_trips_are_one_per_page(self):
+        seed_synthetic(self.db, companies=600, seed=3)
+        self.db.reset_counters()
+        due = due_pages(self.db, {"pulsepoint_strategic": 60, "quantifire": 60}, page_size=50)
+        self.assertEqual(len(due), 120)
+        self.assertEqual(self.db.round_trips, 3)  # 120 rows in 50-row pages; the short last page ends it
+
+    def test_spend_and_span_rollup(self):
+        self.db.table("monitor_scan_log").insert([
+            {"client_context": "a", "cost_usd": 0.05, "started_at": NOW.isoformat(),
+             "spans": [{"n": "search", "ms": 100, "st": "ok"}, {"n": "llm:triage", "ms": 900, "st": "error", "ti": 50}]},
+            {"client_context": "a", "cost_usd": 0.07, "started_at": ago(0.1),
+             "spans": [{"n": "search", "ms": 300, "st": "ok"}]},
+            {"client_context": "a", "cost_usd": 9.0, "started_at": ago(2)},
+        ]).execute()
+        self.assertAlmostEqual(self.db.rpc("client_spend_today", {"p_client_context": "a"}).execute().data, 0.12)
+        self.assertEqual(self.db.rpc("rollup_scan_spans", {"p_day": NOW.date().isoformat()}).execute().data, 2)
+        search = next(r for r in self.db.rows("scan_span_daily") if r["span"] == "search")
+        self.assertEqual((search["calls"], search["p50_ms"], search["scans"]), (2, 200, 2))
+
+    def test_write_buffer_round_trips_match_the_database(self):
+        self.db.table("triggered_companies").insert({"id": "c1", "score_factors": {}}).execute()
+        self.db.reset_counters()
+        writes = ScanWriteBuffer(self.db, "c1")
+        for i in range(5):
+            writes.merge_score_factors({f"scout_{i}": NOW.isoformat()})
+        writes.update_company({"last_monitored_at": "now()"})
+        writes.insert("pulsepoint_email_queue", {"lead_id": "l1"})
+        writes.insert("pulsepoint_email_queue", {"lead_id": "l2"})
+        writes.flush()
+        self.assertEqual((writes.round_trips, self.db.round_trips), (3, 3))
+        self.assertEqual(self.db.rows("triggered_companies")[0]["last_monitored_at"], NOW.isoformat())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest import mock
+
+import resilience
+from resilience import (
+    RateLimitedOpenAI, RateLimiter, RetryBudget, TokenBucket, _parse_duration, retry_after_seconds, retry_with_backoff,
+)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitError(Exception):
+    def __init__(self, headers=None):
+        super().__init__("Error code: 429 - rate_limit_exceeded")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers=headers or {})
+
+
+def simulate(limited, callers=20, seconds=60, provider_rpm=600):
+    """
+    Callers each send as fast as they get answers (50 ms) to a provider that
+    enforces provider_rpm with a one-second bucket; returns {"ok", "rejected"}.
+    A limited caller reserves a slot and sends when it comes up.
+    """
+    clock = Clock(0.0)
+    provider = TokenBucket(provider_rpm, burst_secs=1, clock=clock)
+    limiter = RateLimiter("sim", clock=clock)
+    limiter.requests = TokenBucket(provider_rpm, burst_secs=0.5, clock=clock)
+    served = {"ok": 0, "rejected": 0}
+    next_at = [0.0] * callers
+    reserved = [False] * callers
+    while clock.now < seconds:
+        for i in range(callers):
+            if next_at[i] > clock.now:
+                continue
+            if limited and not reserved[i]:
+                wait = limiter.reserve()
+                if wait > 0:
+                    next_at[i], reserved[i] = clock.now + wait, True
+                    continue
+            reserved[i] = False
+            if provider.reserve() > 0:
+                provider.adjust(1)  # A 429 doesn't consume quota
+                served["rejected"] += 1
+            else:
+                served["ok"] += 1
+            next_at[i] = clock.now + 0.05
+        clock.now = round(clock.now + 0.001, 6)
+    return served
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_allows_burst_then_paces_at_the_rate(self):
+        clock = Clock()
+        bucket = TokenBucket(600, burst_secs=1, clock=clock)  # 10/s, 10 deep
+        waits = [bucket.reserve() for _ in range(15)]
+        self.assertEqual(waits[:10], [0] * 10)
+        for wait, expected in zip(waits[10:], [0.1, 0.2, 0.3, 0.4, 0.5]):  # A queue, one slot per 100 ms
+            self.assertAlmostEqual(wait, expected)
+        clock.now += 0.3  # Refills 3 of the 5 queued slots
+        self.assertAlmostEqual(bucket.reserve(), 0.3)
+
+    def test_fair_across_threads(self):
+        bucket = TokenBucket(600, burst_secs=1, clock=Clock())
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            waits = sorted(pool.map(lambda _: bucket.reserve(), range(110)))
+        self.assertAlmostEqual(waits[-1], 10.0)  # 100 queued slots behind the 10-token burst
+        self.assertEqual(len({round(w, 6) for w in waits[10:]}), 100)  # No two callers got the same slot
+
+    def test_limited_callers_run_at_the_ceiling_without_429s(self):
+        unlimited, limited = simulate(limited=False), simulate(limited=True)
+        self.assertGreater(unlimited["rejected"], 10 * unlimited["ok"])
+        self.assertEqual(limited["rejected"], 0)
+        self.assertGreaterEqual(limited["ok"], 0.95 * unlimited["ok"])  # Same useful throughput, no wasted requests
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_async_and_thread_callers_share_one_limiter(self):
+        clock = Clock()
+        limiter = RateLimiter("openai:test", clock=clock)
+        limiter.requests = TokenBucket(600, burst_secs=0.5, clock=clock)  # 10/s, 5 deep
+
+        async def tasks():
+            return await asyncio.gather(*(limiter.aacquire() for _ in range(5)))
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            threaded = list(pool.map(lambda _: limiter.acquire(), range(5)))
+        awaited = asyncio.run(tasks())
+        self.assertEqual(threaded, [0] * 5)  # The burst
+        for wait, expected in zip(sorted(awaited), [0.1, 0.2, 0.3, 0.4, 0.5]):
+            self.assertAlmostEqual(wait, expected)
+        self.assertEqual(limiter.counters()["waits"], 5)
+
+    def test_token_bucket_settles_on_actual_usage(self):
+        limiter = RateLimiter("openai:test", requests_per_min=1000, tokens_per_min=60_000, clock=Clock())  # 1000 tokens/s
+        limiter.tokens.tokens = 0
+        self.assertAlmostEqual(limiter.reserve(2000), 2.0)
+        limiter.settle(estimated=2000, actual=500)  # The call used far less than estimated
+        self.assertEqual(limiter.reserve(0), 0)
+        self.assertAlmostEqual(limiter.tokens.tokens, -500)
+
+    def test_observe_adopts_real_ceiling_and_pauses_everyone(self):
+        clock = Clock()
+        limiter = RateLimiter("openai:gpt-4o", requests_per_min=500, tokens_per_min=30_000, clock=clock)
+        limiter.observe({"x-ratelimit-limit-requests": "10000", "x-ratelimit-limit-tokens": "2000000"})
+        self.assertAlmostEqual(limiter.requests.rate, 10000 / 60)
+        self.assertAlmostEqual(limiter.tokens.rate, 2_000_000 / 60)
+
+        self.assertEqual(limiter.observe(RateLimitError({"retry-after": "20"})), 20)
+        self.assertAlmostEqual(limiter.reserve(10), 20)
+        clock.now += 20
+        self.assertEqual(limiter.reserve(10), 0)
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_parse_openai_durations(self):
+        for value, seconds in [("1s", 1), ("6m0s", 360), ("20ms", 0.02), ("1h2m3.5s", 3723.5), ("7", 7)]:
+            with self.subTest(value=value):
+                self.assertAlmostEqual(_parse_duration(value), seconds)
+
+    def test_retry_after_sources(self):
+        self.assertEqual(retry_after_seconds(RateLimitError({"Retry-After": "12"})), 12)
+        self.assertEqual(retry_after_seconds(RateLimitError({"retry-after-ms": "250", "retry-after": "9"})), 0.25)
+        http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertTrue(28 <= retry_after_seconds({"retry-after": http_date}) <= 30)
+        exhausted = {"x-ratelimit-remaining-requests": "4", "x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "6m0s"}
+        self.assertEqual(retry_after_seconds(exhausted), 360)
+        self.assertIsNone(retry_after_seconds(RuntimeError("boom")))
+
+
+class TestRetryWithBackoff(unittest.TestCase):
+    def setUp(self):
+        self.slept = []
+        for patcher in (mock.patch("resilience.time.sleep", self.slept.append),
+                        mock.patch("resilience.random.uniform", lambda a, b: 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_honors_retry_after_instead_of_guessing(self):
+        calls = []
+
+        @retry_with_backoff(max_retries=2, initial_delay=1, retry_budget=RetryBudget(min_retries=10))
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RateLimitError({"retry-after": "2"})
+            return "ok"
+
+        self.assertEqual(flaky(), "ok")
+        self.assertEqual(self.slept, [2, 2])  # Not rate_limit_initial * factor**attempt (15s, 45s)
+
+    def test_without_hint_keeps_rate_limit_backoff(self):
+        @retry_with_backoff(max_retries=1, retry_budget=RetryBudget(min_retries=10))
+        def limited():
+            raise RuntimeError("429 Too Many Requests")
+
+        with self.assertRaises(RuntimeError):
+            limited()
+        self.assertEqual(self.slept, [15])
+
+    def test_retry_budget_caps_retries_fleet_wide(self):
+        clock = Clock()
+        budget = RetryBudget(ratio=0.1, min_retries=2, window_secs=60, clock=clock)
+        attempts = []
+
+        @retry_with_backoff(max_retries=3, retry_budget=budget)
+        def down():
+            attempts.append(1)
+            raise ConnectionError("503")
+
+        for _ in range(20):
+            with self.assertRaises(ConnectionError):
+                down()
+        self.assertEqual(len(attempts), 20 + 4)  # 2 + 10% of 20 first attempts, not 20 x 3 retries
+        self.assertEqual(budget.denied, 19)  # Once the budget ran out, calls fail on their first error
+
+        clock.now += 61
+        self.assertTrue(budget.try_spend())
+
+
+class TestRateLimitedOpenAI(unittest.TestCase):
+    def test_charges_estimate_and_reads_headers(self):
+        headers = {"x-ratelimit-limit-requests": "5000", "x-ratelimit-limit-tokens": "800000"}
+        completion = SimpleNamespace(usage=SimpleNamespace(total_tokens=120))
+
+        class Raw:
+            def create(self, **request):
+                return SimpleNamespace(headers=headers, parse=lambda: completion)
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=Raw())), api_key="k")
+        wrapped = RateLimitedOpenAI(client)
+        limiter = resilience.get_rate_limiter("openai", "gpt-test-model")
+        before = limiter.tokens.tokens
+        request = {"model": "gpt-test-model", "messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+        self.assertEqual(RateLimitedOpenAI.estimate_tokens(request), 200)
+        self.assertIs(wrapped.chat.completions.create(**request), completion)
+        self.assertEqual(wrapped.api_key, "k")
+        self.assertAlmostEqual(limiter.requests.rate, 5000 / 60)
+        self.assertAlmostEqual(limiter.tokens.tokens, min(limiter.tokens.capacity, before) - 120, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+
+from local_supabase import LocalAPIError, LocalSupabase
+from reference_cache import ReferenceCache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"load": self.calls}
+
+
+class TestReferenceCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1_000_000.0
+        patcher = mock.patch("reference_cache.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = LocalSupabase()
+        self.db.table("reference_data_versions").insert([
+            {"name": "client_strategies", "version": 1},
+            {"name": "client_profiles", "version": 1},
+        ]).execute()
+        self.cache = ReferenceCache(check_seconds=60, fallback_ttl_seconds=600)
+
+    def _bump(self, name):
+        row = next(r for r in self.db.rows("reference_data_versions") if r["name"] == name)
+        row["version"] += 1
+
+    def _get(self, loader):
+        return self.cache.get(self.db, "client_strategies", loader, depends_on=("client_strategies", "client_profiles"))
+
+    def test_served_from_memory_until_a_source_table_changes(self):
+        loader = Loader()
+        self.assertEqual(self._get(loader), {"load": 1})
+        self.now += 3600
+        self.assertEqual(self._get(loader), {"load": 1})
+        self._bump("client_profiles")
+        self.assertEqual(self._get(loader), {"load": 1})  # Not re-checked within check_seconds
+        self.now += 61
+        self.assertEqual(self._get(loader), {"load": 2})
+        self.assertEqual((self.cache.loads, self.cache.hits), (2, 2))
+
+    def test_version_check_is_one_query_per_interval(self):
+        loader = Loader()
+        self.db.reset_counters()
+        for _ in range(10):
+            self._get(loader)
+        self.assertEqual(self.db.calls["reference_data_versions.select"], 1)
+
+    def test_falls_back_to_ttl_without_versions_table(self):
+        def broken(name):
+            raise LocalAPIError('relation "reference_data_versions" does not exist', code="42P01")
+        self.db.table = broken
+        loader = Loader()
+        self._get(loader)
+        self.now += 599 - self.now % 600  # Same TTL epoch
+        self._get(loader)
+        self.assertEqual(loader.calls, 1)
+        self.now += 1
+        self._get(loader)
+        self.assertEqual(loader.calls, 2)
+
+    def test_entries_without_depends_on_use_the_plain_ttl(self):
+        loader = Loader()
+        self.db.reset_counters()
+        key = ("velocity_baseline", "pulsepoint_strategic", "acct-1")
+        self.cache.get(self.db, key, loader)
+        self._bump("client_strategies")
+        self.now += 61
+        self.cache.get(self.db, key, loader)
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(self.db.round_trips, 0)  # No version check for TTL-only entries
+        self.now += 600
+        self.cache.get(self.db, key, loader)
+        self.assertEqual(loader.calls, 2)
+
+    def test_failed_loader_caches_nothing(self):
+        def failing():
+            raise RuntimeError("timeout")
+        with self.assertRaises(RuntimeError):
+            self._get(failing)
+        self.assertEqual(self._get(Loader()), {"load": 1})
+
+    def test_invalidate(self):
+        loader = Loader()
+        self._get(loader)
+        self.cache.invalidate("client_strategies")
+        self._get(loader)
+        self.assertEqual(loader.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+from llm_cache import LLMCache, SQLiteCacheBackend
+from scan_budget import (
+    APIFY_PRICES, COMPANY_SCAN_BUDGET_USD, ScanBudget, client_daily_budget,
+    company_ceiling, estimate_llm_cost, llm_cost,
+)
+
+
+def completion(text: str, prompt_tokens: int, completion_tokens: int):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+class TestPricing(unittest.TestCase):
+    def test_llm_pricing_by_model(self):
+        self.assertAlmostEqual(llm_cost("gpt-4o-mini", 1_000_000, 0), 0.15)
+        self.assertAlmostEqual(llm_cost("gpt-4o", 0, 1_000_000), 10.0)
+        # gpt-4o is ~16x gpt-4o-mini for the same tokens: a call count can't express that
+        self.assertGreater(llm_cost("gpt-4o", 4000, 600) / llm_cost("gpt-4o-mini", 4000, 600), 15)
+        self.assertEqual(estimate_llm_cost("gpt-4o-mini", 4000, 100), llm_cost("gpt-4o-mini", 1000, 100))
+
+    def test_ceilings_from_strategy(self):
+        self.assertEqual(company_ceiling({}, 50), COMPANY_SCAN_BUDGET_USD)
+        self.assertAlmostEqual(company_ceiling({"daily_scan_limit": 100}, 50), 2 * COMPANY_SCAN_BUDGET_USD)
+        self.assertEqual(company_ceiling({"daily_scan_limit": 10}, 50), COMPANY_SCAN_BUDGET_USD)
+        self.assertEqual(company_ceiling({"scan_budget_usd": 0.4}, 50), 0.4)
+        self.assertEqual(client_daily_budget({"daily_budget_usd": 12}, 50), 12.0)
+        self.assertAlmostEqual(client_daily_budget({"daily_scan_limit": 20, "scan_budget_usd": 0.1}, 50), 2.0)
+
+
+class TestScanBudget(unittest.TestCase):
+    def test_usage_beats_estimate_and_tokens_are_counted(self):
+        budget = ScanBudget(1.0)
+        budget.record_llm("triage", "gpt-4o-mini", {"prompt_tokens": 2000, "completion_tokens": 300})
+        budget.record_llm("v6_stage2", "gpt-4o", prompt_chars=4000, completion_tokens=600)
+        c = budget.counters()
+        self.assertEqual((c["llm_tokens_in"], c["llm_tokens_out"]), (3000, 900))
+        self.assertAlmostEqual(c["cost_breakdown"]["triage"], llm_cost("gpt-4o-mini", 2000, 300), places=6)
+        self.assertAlmostEqual(c["llm_cost_usd"], llm_cost("gpt-4o-mini", 2000, 300) + llm_cost("gpt-4o", 1000, 600), places=6)
+
+    def test_apify_run_cost_then_price_table(self):
+        budget = ScanBudget(1.0)
+        budget.record_apify("apify/google-search-scraper", {"usageTotalUsd": 0.0123})
+        budget.record_apify("apify/website-content-crawler", {"id": "run"})
+        budget.record_apify("scout:press")
+        c = budget.counters()
+        expected = 0.0123 + APIFY_PRICES["apify/website-content-crawler"] + APIFY_PRICES["scout"]
+        self.assertAlmostEqual(c["apify_cost_usd"], expected)
+        self.assertEqual(c["cost_usd"], c["apify_cost_usd"])
+
+    def test_limit_is_min_of_ceiling_and_client_remaining(self):
+        self.assertEqual(ScanBudget(0.15, 0.05).limit, 0.05)
+        self.assertEqual(ScanBudget(0.15, -2.0).limit, 0.0)
+        self.assertEqual(ScanBudget(0.15, None).limit, 0.15)
+        budget = ScanBudget(0.10)
+        budget.record_apify("scout:x", {"usageTotalUsd": 0.07})
+        self.assertTrue(budget.can_afford(0.03))
+        self.assertFalse(budget.can_afford(0.031))
+        self.assertEqual(budget.affordable_count(0.01), 3)
+
+    def test_thread_safe_recording(self):
+        budget = ScanBudget(100.0)
+
+        def work():
+            for _ in range(1000):
+                budget.record_apify("scout:x", {"usageTotalUsd": 0.001})
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertAlmostEqual(budget.spent, 8.0)
+
+    def test_cache_session_records_misses_only(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        cache = LLMCache(local=SQLiteCacheBackend(f"{root}/llm.sqlite"), ttl_hours=1)
+        budget = ScanBudget(1.0)
+        request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "p"}]}
+        call = lambda: completion(json.dumps({"ok": True}), 1200, 80)
+        self.assertEqual(cache.session(budget=budget).fetch("triage", request, call), {"ok": True})
+        self.assertEqual(cache.session(budget=budget).fetch("triage", request, call), {"ok": True})
+        self.assertEqual(budget.tokens_in, 1200)  # The hit was free
+        breakdown = budget.counters()["cost_breakdown"]
+        self.assertEqual(list(breakdown), ["triage"])
+        self.assertAlmostEqual(breakdown["triage"], llm_cost("gpt-4o-mini", 1200, 80), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
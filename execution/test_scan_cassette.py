@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import scan_cassette
+from apify_runner import ApifyRunner, iter_dataset_items
+from local_apify import LocalApify
+from local_supabase import LocalSupabase
+from scan_cassette import Cassette, CassetteMiss, HttpCassette, OpenAICassette
+from scan_spans import SpanRecorder
+
+
+class OpenAIStub:
+    """OpenAI(api_key=...) stand-in: every completion is the same small JSON answer."""
+    def __init__(self, api_key=None):
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+        message = SimpleNamespace(content='{"trigger": true}')
+        completion = SimpleNamespace(model="gpt-4o-mini", usage=usage, choices=[SimpleNamespace(message=message)])
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=lambda **request: completion))
+
+
+class HttpStub:
+    def request(self, method, url, **kwargs):
+        return SimpleNamespace(status_code=200, url=url, headers={"content-type": "text/html", "set-cookie": "x"},
+                               text=f"<html>{url}</html>")
+
+
+def scan(cassette, prompt_date="2026-10-18"):
+    """The calls one company scan makes, in scan order."""
+    apify = cassette.apify()
+    run = apify.actor("apify/google-search-scraper").call(run_input={"queries": "acme news"}, timeout_secs=60)
+    organic = list(iter_dataset_items(apify, run["defaultDatasetId"], page_size=2))
+    completion = OpenAICassette(api_key="k").chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": f"Today is {prompt_date}. Triage: acme"}])
+    supabase = cassette.supabase()
+    company = supabase.table("triggered_companies").select("id, company").eq("id", "c1").execute()
+    supabase.table("triggered_companies").update({"last_monitored_at": prompt_date}).eq("id", "c1").execute()
+    page = HttpCassette(HttpStub() if cassette.mode == "record" else None).get("https://acme.com/blog")
+    return {
+        "organic": organic, "content": completion.choices[0].message.content,
+        "tokens": completion.usage.prompt_tokens, "company": company.data, "page": page.text,
+    }
+
+
+class TestScanCassette(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        self.path = os.path.join(self.dir, "acme.jsonl")
+
+        apify = LocalApify()
+        apify.register_actor("apify/google-search-scraper", lambda run_input: [{"title": f"t{i}"} for i in range(5)])
+        self.db = LocalSupabase()
+        self.db.table("triggered_companies").insert({"id": "c1", "company": "Acme"}).execute()
+        cassette = Cassette(self.path, mode="record", real_apify=apify, real_supabase=self.db, real_openai=OpenAIStub)
+        with cassette.activate():
+            self.live = scan(cassette)
+        cassette.close()
+
+    def test_recording_hits_the_real_clients(self):
+        self.assertEqual(self.live["company"], [{"id": "c1", "company": "Acme"}])
+        self.assertEqual(self.db.rows("triggered_companies")[0]["last_monitored_at"], "2026-10-18")
+        self.assertEqual(len(self.live["organic"]), 5)
+
+    def test_replay_matches_recording(self):
+        cassette = Cassette(self.path)
+        self.db.reset_counters()
+        with cassette.activate():
+            self.assertEqual(scan(cassette), self.live)
+        self.assertFalse(cassette.misses)
+        self.assertEqual((cassette.calls["apify.run"], cassette.calls["openai"], cassette.calls["supabase"]), (1, 1, 2))
+        self.assertEqual(self.db.round_trips, 0)
+
+    def test_loose_key_matches_requests_that_embed_the_date(self):
+        cassette = Cassette(self.path)
+        with cassette.activate():
+            self.assertEqual(scan(cassette, prompt_date="2026-11-02"), self.live)
+        self.assertFalse(cassette.misses)
+
+    def test_misses_raise_for_providers_and_degrade_for_reads_and_http(self):
+        cassette = Cassette(self.path)
+        with cassette.activate():
+            with self.assertRaises(CassetteMiss):
+                cassette.apify().actor("apify/website-content-crawler").call(run_input={"startUrls": []})
+            with self.assertRaises(CassetteMiss):
+                OpenAICassette().chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "other"}])
+            self.assertEqual(cassette.supabase().table("client_strategies").select("*").execute().data, [])
+            self.assertEqual(HttpCassette().get("https://unknown.example").status_code, 404)
+        self.assertEqual(cassette.misses, {"apify.run": 1, "openai": 1, "supabase": 1, "http": 1})
+
+    def test_started_runs_resolve_through_the_runner(self):
+        path = os.path.join(self.dir, "runner.jsonl")
+        real = LocalApify(run_secs=0.02)
+        real.register_actor("apify/website-content-crawler", lambda run_input: [{"text": "article body"}])
+        request = {"startUrls": [{"url": "https://acme.com/a"}]}
+        cassette = Cassette(path, mode="record", real_apify=real)
+        runner = ApifyRunner(cassette.apify(), poll_interval=0.01)
+        run = runner.call("apify/website-content-crawler", request, timeout_secs=60)
+        runner.close()
+        cassette.close()
+
+        apify = Cassette(path).apify()
+        runner = ApifyRunner(apify, poll_interval=0.01)
+        replayed = runner.call("apify/website-content-crawler", request, timeout_secs=60)
+        runner.close()
+        self.assertEqual(replayed, run)
+        self.assertEqual(replayed["status"], "SUCCEEDED")
+        self.assertEqual(list(iter_dataset_items(apify, replayed["defaultDatasetId"])), [{"text": "article body"}])
+
+    def test_wrapped_jobs_see_the_cassette_on_worker_threads(self):
+        cassette = Cassette(self.path)
+        with cassette.activate():
+            job = SpanRecorder().wrap("scout:blog", lambda: OpenAICassette().chat.completions.create(
+                model="gpt-4o-mini", messages=[{"role": "user", "content": "Today is 2026-10-18. Triage: acme"}]))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self.assertEqual(pool.submit(job).result().choices[0].message.content, self.live["content"])
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.submit(scan_cassette.current).result()
+
+    def test_injected_latency_is_seeded_and_accounted(self):
+        latency = {"apify.run": [0.01, 0.02], "openai": 0.005}
+        waits = []
+        for _ in range(2):
+            cassette = Cassette(self.path, latency=latency, seed=7)
+            with cassette.activate():
+                scan(cassette)
+            waits.append(cassette.counters()["injected_latency_s"])
+        self.assertEqual(waits[0], waits[1])
+        self.assertTrue(0.01 <= waits[0]["apify.run"] <= 0.02)
+        self.assertEqual(waits[0]["openai"], 0.005)
+
+    def test_concurrent_replays_are_offline_and_complete(self):
+        def replay(seed):
+            cassette = Cassette(self.path, latency={"apify.run": 0.001, "openai": 0.001}, seed=seed)
+            with cassette.activate():
+                result = scan(cassette)
+            return result, cassette
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(replay, range(100)))
+        self.assertTrue(all(result == self.live for result, _ in results))
+        self.assertEqual(sum(c.calls["openai"] for _, c in results), 100)
+        self.assertEqual(sum(sum(c.misses.values()) for _, c in results), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+import threading
+import time
+import unittest
+
+from scan_engine import ScanEngine
+
+current_scan = contextvars.ContextVar("current_scan", default=None)
+
+
+class Gauge:
+    """Blocking call that records how many copies run at once."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def __call__(self, value, delay=0.02):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(delay)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+class TestScanEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = ScanEngine({"apify": 2, "openai": 3})
+        self.addCleanup(self.engine.close)
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_gate_caps_concurrency_per_resource(self):
+        gauge = Gauge()
+
+        async def scan():
+            return await asyncio.gather(*(self.engine.run("apify", gauge, i) for i in range(8)))
+
+        self.assertEqual(self.run_async(scan()), list(range(8)))
+        self.assertEqual(gauge.peak, 2)
+        self.assertEqual(self.engine.in_flight["apify"], 0)
+
+    def test_resources_do_not_share_slots(self):
+        apify, openai = Gauge(), Gauge()
+
+        async def scan():
+            await asyncio.gather(
+                *(self.engine.run("apify", apify, i, delay=0.05) for i in range(4)),
+                *(self.engine.run("openai", openai, i, delay=0.05) for i in range(6)),
+            )
+
+        self.run_async(scan())
+        self.assertEqual((apify.peak, openai.peak), (2, 3))
+
+    def test_unknown_resource_gets_a_single_slot(self):
+        gauge = Gauge()
+
+        async def scan():
+            await asyncio.gather(*(self.engine.run("ocr", gauge, i) for i in range(3)))
+
+        self.run_async(scan())
+        self.assertEqual(gauge.peak, 1)
+        self.assertEqual(self.engine.limits["ocr"], 1)
+
+    def test_kwargs_and_exceptions_reach_the_caller(self):
+        def fail(message=""):
+            raise ValueError(message)
+
+        async def scan():
+            await self.engine.run("openai", fail, message="bad request")
+
+        with self.assertRaisesRegex(ValueError, "bad request"):
+            self.run_async(scan())
+        self.assertEqual(self.engine.in_flight["openai"], 0)
+
+    def test_caller_context_follows_the_call_onto_the_worker(self):
+        async def company_scan(name):
+            current_scan.set(name)
+            await asyncio.sleep(0)
+            return await self.engine.run("apify", current_scan.get)
+
+        async def scan():
+            return await asyncio.gather(*(company_scan(f"company-{i}") for i in range(6)))
+
+        self.assertEqual(self.run_async(scan()), [f"company-{i}" for i in range(6)])
+        self.assertIsNone(current_scan.get())
+
+    def test_worker_writes_do_not_leak_into_the_caller(self):
+        async def scan():
+            current_scan.set("caller")
+            await self.engine.run("apify", current_scan.set, "worker")
+            return current_scan.get()
+
+        self.assertEqual(self.run_async(scan()), "caller")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+import scan_spans
+from article_prefetch import ArticlePrefetcher
+from llm_cache import LLMCache, SQLiteCacheBackend
+from local_supabase import LocalSupabase
+from scan_engine import ScanEngine
+from scan_spans import SpanRecorder, span, traced
+from scan_writes import ScanWriteBuffer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def names(recorder):
+    return [s["n"] for s in recorder.to_list()]
+
+
+class TestSpanRecorder(unittest.TestCase):
+    def test_span_records_offset_duration_status_and_attrs(self):
+        clock = Clock()
+        rec = SpanRecorder(clock=clock)
+        clock.now += 0.5
+        with rec.span("search") as s:
+            clock.now += 1.25
+            s["b"] = 2048
+        with self.assertRaises(ValueError):
+            with rec.span("llm:triage", ti=None):
+                clock.now += 0.1
+                raise ValueError("boom")
+        self.assertEqual(rec.to_list(), [
+            {"n": "search", "t": 500, "ms": 1250, "st": "ok", "b": 2048},
+            {"n": "llm:triage", "t": 1750, "ms": 100, "st": "error"},
+        ])
+        self.assertEqual(rec.totals(), {"search": 1250, "llm:triage": 100})
+
+    def test_noop_outside_a_scan(self):
+        with span("orphan") as s:
+            s["b"] = 1  # No recorder: nothing recorded, nothing raised
+        self.assertIsNone(scan_spans.current())
+
+    def test_cap_collapses_the_overflow(self):
+        rec = SpanRecorder()
+        with mock.patch("scan_spans.MAX_SCAN_SPANS", 3), rec.activate():
+            for _ in range(5):
+                with span("fetch:article"):
+                    pass
+        self.assertEqual(names(rec), ["fetch:article"] * 3 + ["_dropped"])
+        self.assertEqual(rec.to_list()[-1]["c"], 2)
+
+    def test_traced_sync_async_and_result_attrs(self):
+        @traced("fetch:article", result_attrs=lambda r: {"b": len(r[0])})
+        def fetch():
+            return "x" * 42, True
+
+        @traced("search")
+        async def search():
+            await asyncio.sleep(0)
+            return []
+
+        rec = SpanRecorder()
+        with rec.activate():
+            fetch()
+            asyncio.run(search())
+        self.assertEqual(rec.to_list()[0]["b"], 42)
+        self.assertEqual(names(rec), ["fetch:article", "search"])
+
+
+class TestSpansFollowTheScan(unittest.TestCase):
+    def test_spans_follow_work_onto_threads(self):
+        rec = SpanRecorder()
+
+        def scout():
+            with span("apify:google-search-scraper"):
+                return 1
+
+        with rec.activate():
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                ex.submit(rec.wrap("scout:blog", scout)).result()
+            prefetcher = ArticlePrefetcher(traced("fetch:article")(lambda url: ("text", True)), max_pages=2, max_workers=2)
+            prefetcher.start(["https://a.example/1"])
+            prefetcher.take("https://a.example/1")
+            prefetcher.close()
+        self.assertEqual(sorted(names(rec)), ["apify:google-search-scraper", "fetch:article", "scout:blog"])
+
+    def test_engine_calls_record_into_their_own_scan(self):
+        engine = ScanEngine({"supabase": 4})
+        self.addCleanup(engine.close)
+        recorders = {}
+
+        def read(name):
+            with span(f"supabase:{name}"):
+                time.sleep(0.01)
+
+        async def scan(name):
+            with SpanRecorder().activate() as rec:
+                recorders[name] = rec
+                await engine.run("supabase", read, name)
+
+        async def main():
+            await asyncio.gather(scan("a"), scan("b"))
+
+        asyncio.run(main())
+        self.assertEqual(names(recorders["a"]), ["supabase:a"])
+        self.assertEqual(names(recorders["b"]), ["supabase:b"])
+
+    def test_llm_session_records_tokens_and_hits(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        cache = LLMCache(local=SQLiteCacheBackend(f"{root}/llm.sqlite"), ttl_hours=1)
+        usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=80)
+        completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"ok": 1})))], usage=usage)
+        request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "p"}]}
+        rec = SpanRecorder()
+        with rec.activate():
+            cache.session().fetch("triage", request, lambda: completion)
+            cache.session().fetch("triage", request, lambda: completion)
+        miss, hit = rec.to_list()
+        self.assertEqual((miss["n"], miss["hit"], miss["ti"], miss["to"]), ("llm:triage", 0, 1200, 80))
+        self.assertEqual((hit["hit"], "ti" in hit), (1, False))
+
+    def test_write_buffer_flush_is_one_span(self):
+        db = LocalSupabase()
+        db.table("triggered_companies").insert({"id": "c1"}).execute()
+        writes = ScanWriteBuffer(db, "c1")
+        rec = SpanRecorder()
+        with rec.activate():
+            writes.update_company({"monitoring_status": "active"})
+            writes.insert("trigger_dedup", {"company_id": "c1", "source_url": "https://a.example/1"})
+            writes.flush()
+        flush, = rec.to_list()
+        self.assertEqual((flush["n"], flush["c"]), ("supabase:flush", 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+from local_supabase import LocalSupabase
+from scan_writes import ScanWriteBuffer
+
+CONTACTS = [f"lead-{i}" for i in range(5)]
+SCOUT_STAMPS = ("last_social_scout_at", "last_linkedin_scout_at", "last_hiring_scout_at", "blog_url")
+
+
+def seeded_db():
+    db = LocalSupabase()
+    db.table("triggered_companies").insert({"id": "c1", "company": "Acme", "score_factors": {"seed": 1}}).execute()
+    db.table("LEADS").insert([{"id": c, "signal": None} for c in CONTACTS]).execute()
+    db.reset_counters()
+    return db
+
+
+def immediate_triggered_scan(sb, company_id: str, contacts: list) -> None:
+    """A triggered scan's writes issued one round-trip per call (the pre-buffer pattern)."""
+    sb.table("triggered_companies").update({"last_search_hash": "h"}).eq("id", company_id).execute()
+    for key in SCOUT_STAMPS:
+        sb.rpc("merge_score_factors", {"p_company_id": company_id, "p_delta": {key: "x"}}).execute()
+    sb.rpc("merge_score_factors", {"p_company_id": company_id, "p_delta": {"outcome_delta": "x"}}).execute()
+    sb.table("triggered_companies").update({"monitoring_status": "triggered"}).eq("id", company_id).execute()
+    sb.table("trigger_dedup").insert({"company_id": company_id, "source_url": "https://acme.com/news"}).execute()
+    for c in contacts:
+        sb.table("LEADS").update({"signal": "s"}).eq("id", c).execute()
+    for c in contacts:
+        sb.table("triggered_companies").update({"prospect_style": "p"}).eq("id", company_id).execute()
+        sb.table("pulsepoint_email_queue").insert({"lead_id": c}).execute()
+
+
+def buffered_triggered_scan(sb, company_id: str, contacts: list) -> ScanWriteBuffer:
+    writes = ScanWriteBuffer(sb, company_id)
+    writes.update_company({"last_search_hash": "h"})
+    for key in SCOUT_STAMPS:
+        writes.merge_score_factors({key: "x"})
+    writes.merge_score_factors({"outcome_delta": "x"})
+    writes.update_company({"monitoring_status": "triggered"})
+    writes.insert("trigger_dedup", {"company_id": company_id, "source_url": "https://acme.com/news"})
+    writes.update_rows("LEADS", contacts, {"signal": "s"})
+    for c in contacts:
+        writes.update_company({"prospect_style": "p"})
+        writes.insert("pulsepoint_email_queue", {"lead_id": c})
+    writes.flush()
+    return writes
+
+
+def state(db):
+    company = {k: v for k, v in db.rows("triggered_companies")[0].items() if k != "created_at"}
+    leads = sorted((r["id"], r["signal"]) for r in db.rows("LEADS"))
+    queue = sorted(r["lead_id"] for r in db.rows("pulsepoint_email_queue"))
+    dedup = [r["source_url"] for r in db.rows("trigger_dedup")]
+    return company, leads, queue, dedup
+
+
+class TestScanWriteBuffer(unittest.TestCase):
+    def test_same_end_state_in_fewer_round_trips(self):
+        immediate, buffered = seeded_db(), seeded_db()
+        immediate_triggered_scan(immediate, "c1", CONTACTS)
+        writes = buffered_triggered_scan(buffered, "c1", CONTACTS)
+        self.assertEqual(state(buffered), state(immediate))
+        self.assertEqual(immediate.round_trips, 23)
+        # score_factors RPC, company update, leads update, dedup insert, queue insert
+        self.assertEqual(buffered.round_trips, 5)
+        self.assertEqual(writes.round_trips, 5)
+
+    def test_score_factors_merge_into_existing(self):
+        db = seeded_db()
+        buffered_triggered_scan(db, "c1", CONTACTS)
+        factors = db.rows("triggered_companies")[0]["score_factors"]
+        self.assertEqual(factors["seed"], 1)
+        self.assertEqual(set(factors), {"seed", "outcome_delta", *SCOUT_STAMPS})
+
+    def test_company_patch_last_write_wins_and_flush_is_idempotent(self):
+        db = seeded_db()
+        writes = ScanWriteBuffer(db, "c1")
+        writes.update_company({"last_monitored_at": "2026-10-18", "monitoring_status": "active"})
+        writes.update_company({"monitoring_status": "triggered"})
+        writes.flush()
+        writes.flush()
+        self.assertEqual(db.calls, {"triggered_companies.update": 1})
+        company = db.rows("triggered_companies")[0]
+        self.assertEqual((company["last_monitored_at"], company["monitoring_status"]), ("2026-10-18", "triggered"))
+        self.assertFalse(writes.pending)
+
+    def test_duplicate_key_does_not_drop_the_rest_of_the_insert(self):
+        db = seeded_db()
+        db.table("trigger_dedup").insert({"company_id": "c1", "source_url": "a"}).execute()
+        db.reset_counters()
+        writes = ScanWriteBuffer(db, "c1")
+        for url in ("a", "b", "c"):
+            writes.insert("trigger_dedup", {"company_id": "c1", "source_url": url})
+        writes.flush()
+        self.assertEqual(sorted(r["source_url"] for r in db.rows("trigger_dedup")), ["a", "b", "c"])
+        self.assertEqual(db.round_trips, 1 + 3)  # Failed bulk insert, then row by row
+
+    def test_row_updates_group_by_patch(self):
+        db = seeded_db()
+        writes = ScanWriteBuffer(db, "c1")
+        writes.update_rows("LEADS", ["lead-0", "lead-1"], {"signal": "a"})
+        writes.update_rows("LEADS", ["lead-2"], {"signal": "a"})
+        writes.update_rows("LEADS", ["lead-3"], {"signal": "b"})
+        writes.update_rows("LEADS", [None], {"signal": "c"})
+        writes.flush()
+        self.assertEqual(db.round_trips, 2)
+        signals = {r["id"]: r["signal"] for r in db.rows("LEADS")}
+        self.assertEqual(signals, {"lead-0": "a", "lead-1": "a", "lead-2": "a", "lead-3": "b", "lead-4": None})
+
+    def test_failures_are_logged_not_raised(self):
+        db = seeded_db()
+        db.register_rpc("merge_score_factors", None)  # Migration 09 not applied
+        writes = ScanWriteBuffer(db, "c1")
+        writes.merge_score_factors({"k": 1})
+        writes.update_company({"monitoring_status": "active"})
+        writes.flush()
+        self.assertEqual(db.rows("triggered_companies")[0]["monitoring_status"], "active")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from local_apify import RUN_COST_USD, LocalApify, google_search_results
+from search_broker import ACTOR, SearchBroker
+
+QUERIES = [f"company-{i} news" for i in range(40)]
+
+
+def local_apify(**kwargs):
+    apify = LocalApify(**kwargs)
+    apify.register_actor(ACTOR, google_search_results())
+    return apify
+
+
+def search_all(broker, queries):
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        return list(ex.map(lambda q: broker.search(q, resultsPerPage=15), queries))
+
+
+class TestSearchBroker(unittest.TestCase):
+    def test_concurrent_searches_share_one_run(self):
+        apify = local_apify()
+        hits = search_all(SearchBroker(apify, window_secs=0.05, max_batch=100), QUERIES)
+        self.assertEqual(len(apify.runs), 1)
+        for q, hit in zip(QUERIES, hits):
+            self.assertEqual([r["url"] for r in hit["organic"]], [f"https://news.example/{q}/{i}" for i in range(3)])
+            self.assertEqual(hit["batch_size"], len(QUERIES))
+            self.assertAlmostEqual(hit["cost_usd"], RUN_COST_USD / len(QUERIES))
+
+    def test_max_batch_flushes_without_waiting_for_the_window(self):
+        apify = local_apify()
+        t0 = time.perf_counter()
+        search_all(SearchBroker(apify, window_secs=5, max_batch=10), QUERIES)
+        self.assertLess(time.perf_counter() - t0, 2)
+        self.assertEqual(len(apify.runs), 4)
+
+    def test_full_batch_runs_off_the_submitting_thread(self):
+        apify = local_apify(run_secs=1)  # No runner: the flushing thread is parked for the whole run
+        broker = SearchBroker(apify, window_secs=60, max_batch=2)
+        t0 = time.perf_counter()
+        futures = [broker.submit("a"), broker.submit("b")]
+        self.assertLess(time.perf_counter() - t0, 0.5)
+        self.assertTrue(all(f.result(timeout=5)["organic"] for f in futures))
+        self.assertEqual(len(apify.runs), 1)
+
+    def test_options_split_batches_and_duplicates_coalesce(self):
+        apify = local_apify()
+        broker = SearchBroker(apify, window_secs=0.05)
+        futures = [broker.submit("a", timeRange="week"), broker.submit("b", timeRange="day"), broker.submit("a", timeRange="week")]
+        self.assertTrue(all(f.result(timeout=5)["organic"] for f in futures))
+        self.assertEqual(sorted(run_input["queries"] for _, run_input in apify.runs), ["a", "b"])
+
+    def test_failed_run_fails_every_caller(self):
+        broker = SearchBroker(local_apify(status="FAILED"), window_secs=0.01)
+        futures = [broker.submit(q) for q in QUERIES[:3]]
+        for f in futures:
+            with self.assertRaises(RuntimeError):
+                f.result(timeout=5)
+
+    def test_asyncio_callers_and_close(self):
+        apify = local_apify()
+        broker = SearchBroker(apify, window_secs=60)
+
+        async def burst():
+            futures = [asyncio.wrap_future(broker.submit(q)) for q in QUERIES[:5]]
+            await asyncio.sleep(0)
+            broker.close()  # Flushes without waiting out the window
+            return await asyncio.gather(*futures)
+
+        hits = asyncio.run(burst())
+        self.assertEqual((len(hits), len(apify.runs)), (5, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
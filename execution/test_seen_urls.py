@@ -0,0 +1,101 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import url_canon
+from local_supabase import LocalAPIError, LocalSupabase
+from seen_urls import SEEN_URL_TTL_DAYS, filter_unseen, load_seen_urls, mark_seen, record_seen_urls
+from url_canon import remember_redirect
+
+COMP = {"id": "c-1", "company": "Acme"}
+
+
+def result(url):
+    return {"url": url, "title": url.rsplit("/", 1)[-1]}
+
+
+class TestSeenUrls(unittest.TestCase):
+    def setUp(self):
+        url_canon._redirect_memo.clear()
+        self.addCleanup(url_canon._redirect_memo.clear)
+        self.db = LocalSupabase()
+
+    def test_verdicts_round_trip_and_filter_variants(self):
+        outcomes = {}
+        mark_seen(outcomes, result("https://www.acme.com/news/launch?utm_source=x"), "triage_rejected", 3)
+        mark_seen(outcomes, result("https://acme.com/news/award"), "triggered", 9)
+        record_seen_urls(self.db, COMP, outcomes)
+
+        index = load_seen_urls(self.db, COMP)
+        self.assertEqual(index, {"https://acme.com/news/launch": "triage_rejected", "https://acme.com/news/award": "triggered"})
+        candidates = [result("http://acme.com/news/launch/"), result("https://acme.com/news/new-plant")]
+        self.assertEqual(filter_unseen(candidates, index), [candidates[1]])
+
+    def test_upsert_keeps_one_row_per_url(self):
+        record_seen_urls(self.db, COMP, {"https://acme.com/a": {"verdict": "stale", "confidence": 0}})
+        record_seen_urls(self.db, COMP, {"https://acme.com/a": {"verdict": "triggered", "confidence": 8}})
+        rows = self.db.rows("company_seen_urls")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["verdict"], rows[0]["confidence"]), ("triggered", 8))
+
+    def test_index_is_per_company(self):
+        record_seen_urls(self.db, {"id": "c-2"}, {"https://acme.com/a": {"verdict": "stale"}})
+        self.assertEqual(load_seen_urls(self.db, COMP), {})
+
+    def test_expired_verdicts_are_judged_again(self):
+        old = (datetime.now(timezone.utc) - timedelta(days=SEEN_URL_TTL_DAYS + 1)).isoformat()
+        self.db.table("company_seen_urls").insert(
+            {"company_id": COMP["id"], "url_canonical": "https://acme.com/old", "verdict": "stale", "last_seen_at": old}
+        ).execute()
+        self.assertEqual(load_seen_urls(self.db, COMP), {})
+
+    def test_over_the_limit_keeps_the_most_recent_verdicts(self):
+        now = datetime.now(timezone.utc)
+        self.db.tables["company_seen_urls"].extend(
+            {"company_id": COMP["id"], "url_canonical": f"https://acme.com/{age}", "verdict": "stale",
+             "last_seen_at": (now - timedelta(days=age)).isoformat()}
+            for age in (5, 1, 4, 0, 3, 2)
+        )
+        with mock.patch("seen_urls.SEEN_URL_LOAD_LIMIT", 3):
+            index = load_seen_urls(self.db, COMP)
+        self.assertEqual(set(index), {"https://acme.com/0", "https://acme.com/1", "https://acme.com/2"})
+
+    def test_force_rescan_skips_the_query(self):
+        record_seen_urls(self.db, COMP, {"https://acme.com/a": {"verdict": "stale"}})
+        self.db.reset_counters()
+        self.assertEqual(load_seen_urls(self.db, COMP, force_rescan=True), {})
+        self.assertEqual(self.db.round_trips, 0)
+
+    def test_one_round_trip_each_way(self):
+        outcomes = {}
+        for i in range(20):
+            mark_seen(outcomes, result(f"https://acme.com/news/{i}"), "deep_rejected", 4)
+        self.db.reset_counters()
+        record_seen_urls(self.db, COMP, outcomes)
+        load_seen_urls(self.db, COMP)
+        self.assertEqual(self.db.round_trips, 2)
+        record_seen_urls(self.db, COMP, {})
+        self.assertEqual(self.db.round_trips, 2)
+
+    def test_keys_ignore_the_redirect_memo(self):
+        url = "https://bit.ly/3abc"
+        outcomes = {}
+        remember_redirect(url, "https://acme.com/news/series-b")  # Warm container
+        mark_seen(outcomes, result(url), "triggered", 9)
+        record_seen_urls(self.db, COMP, outcomes)
+
+        url_canon._redirect_memo.clear()  # The next scan runs in a fresh container
+        self.assertEqual(filter_unseen([result(url)], load_seen_urls(self.db, COMP)), [])
+
+    def test_unavailable_index_analyzes_everything(self):
+        def broken(name):
+            raise LocalAPIError('relation "company_seen_urls" does not exist', code="42P01")
+        self.db.table = broken
+        self.assertEqual(load_seen_urls(self.db, COMP), {})
+        record_seen_urls(self.db, COMP, {"https://acme.com/a": {"verdict": "stale"}})  # Logged, not raised
+        candidates = [result("https://acme.com/a")]
+        self.assertIs(filter_unseen(candidates, {}), candidates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from spawn_controller import AdaptiveConcurrency, SpawnScheduler
+
+WINDOW_SECS = 1020
+COMPANIES = [f"company-{i}" for i in range(500)]
+
+
+class SimulatedFleet:
+    """Virtual clock + workers: a scan finishes after 60-240s, rate-limited when over capacity."""
+    def __init__(self, seed: int = 7, capacity: int = 18):
+        self.now = 0.0
+        self.rng = random.Random(seed)
+        self.capacity = capacity
+        self.running = {}  # handle -> (finish_at, rate_limited)
+        self.peak = 0
+        self._next = 0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.now += secs
+
+    def launch(self, comp):
+        self._next += 1
+        over = len(self.running) >= self.capacity
+        self.running[self._next] = (self.now + self.rng.uniform(60, 240), over)
+        self.peak = max(self.peak, len(self.running))
+        return self._next
+
+    def poll(self, handle):
+        finish_at, rate_limited = self.running[handle]
+        if self.now < finish_at:
+            return False, None
+        del self.running[handle]
+        return True, {"rate_limited": 3 if rate_limited else 0}
+
+    def scheduler(self, initial=3, maximum=40, poll_interval=2):
+        return SpawnScheduler(AdaptiveConcurrency(initial=initial, maximum=maximum), poll_interval=poll_interval,
+                              sleep=self.sleep, clock=self.clock)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_aimd_rules(self):
+        c = AdaptiveConcurrency(initial=4, maximum=20)
+        for _ in range(4):
+            c.on_completion(0, now=0)
+        self.assertEqual(c.target, 8)  # Slow start: +1 per clean completion
+        c.on_completion(2, now=100)
+        self.assertEqual(c.target, 4)
+        c.on_completion(2, now=101)  # Inside the cooldown: one burst halves once
+        self.assertEqual(c.target, 4)
+        for _ in range(3):
+            c.on_completion(0, now=200)
+        self.assertEqual(c.target, 4)  # Additive increase: +1 per `target` clean completions
+        c.on_completion(0, now=200)
+        self.assertEqual(c.target, 5)
+        for t in range(500):
+            c.on_completion(0, now=300 + t)
+        self.assertEqual(c.target, 20)
+
+    def test_apify_saturation_holds_and_trims(self):
+        c = AdaptiveConcurrency(initial=5)
+        c.on_apify_usage(active=30, limit=32)
+        for _ in range(20):
+            c.on_completion(0, now=0)
+        self.assertEqual(c.target, 5)
+        c.on_apify_usage(active=32, limit=32)
+        self.assertEqual(c.target, 4)
+        c.on_apify_usage(active=3, limit=32)
+        for _ in range(4):
+            c.on_completion(0, now=0)
+        self.assertEqual(c.target, 5)  # At the limit once: out of slow start
+
+
+class TestSpawnScheduler(unittest.TestCase):
+    def test_ramps_up_and_accounts_for_every_company(self):
+        fleet = SimulatedFleet(capacity=100)
+        stats = fleet.scheduler().run(COMPANIES, launch=fleet.launch, poll=fleet.poll, deadline=WINDOW_SECS)
+        self.assertGreater(stats["peak_target"], 3 * 3)
+        self.assertEqual(stats["backoffs"], 0)
+        self.assertGreater(stats["launched"], 1.5 * WINDOW_SECS / 60 * 3)  # The fixed 3-per-60s waves it replaced
+        self.assertEqual(stats["launched"] + stats["unlaunched"] + stats["skipped"], len(COMPANIES))
+        self.assertLessEqual(fleet.peak, 40)
+
+    def test_backs_off_on_rate_limits(self):
+        fleet = SimulatedFleet(capacity=6)
+        stats = fleet.scheduler().run(COMPANIES, launch=fleet.launch, poll=fleet.poll, deadline=WINDOW_SECS)
+        self.assertGreaterEqual(stats["backoffs"], 1)
+        self.assertLess(fleet.peak, 40)
+
+    def test_skipped_claims_and_deadline(self):
+        fleet = SimulatedFleet()
+        scheduler = fleet.scheduler(initial=2, poll_interval=1)
+        stats = scheduler.run(range(10), launch=lambda i: None if i % 2 else fleet.launch(i), poll=fleet.poll, deadline=0.5)
+        self.assertEqual((stats["skipped"], stats["launched"]), (1, 2))  # Claim lost, then the window closed
+        self.assertEqual(stats["unlaunched"], 7)
+
+    def test_apify_sample_errors_are_ignored(self):
+        fleet = SimulatedFleet()
+
+        def broken():
+            raise RuntimeError("apify down")
+
+        stats = fleet.scheduler().run(COMPANIES[:20], launch=fleet.launch, poll=fleet.poll, deadline=WINDOW_SECS,
+                                      apify_usage=broken)
+        self.assertEqual(stats["launched"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from triage import rejected_verdict, shortlist_triaged, verdicts_from_response
+
+
+def verdict(index, relevant=True, confidence=8, **extra):
+    return {"index": index, "is_relevant": relevant, "confidence": confidence, **extra}
+
+
+class TestVerdictsFromResponse(unittest.TestCase):
+    def test_one_verdict_per_item_in_input_order(self):
+        raw = [verdict(2, confidence=7), verdict(0, relevant=False, confidence=3)]
+        verdicts = verdicts_from_response(raw, 3, 3)
+        self.assertEqual(len(verdicts), 3)
+        self.assertEqual([v["judged"] for v in verdicts], [True, False, True])
+        self.assertFalse(verdicts[0]["is_relevant"])
+        self.assertEqual(verdicts[1]["rejection_reason"], "Not judged by triage")
+        self.assertEqual(verdicts[2]["rank"], 1)
+
+    def test_ranks_by_confidence_with_ties_in_search_order(self):
+        raw = [verdict(0, confidence=7), verdict(1, confidence=9), verdict(2, confidence=7), verdict(3, relevant=False, confidence=10)]
+        ranks = [v["rank"] for v in verdicts_from_response(raw, 4, 4)]
+        self.assertEqual(ranks, [2, 1, 3, None])
+
+    def test_coerces_types(self):
+        raw = [{"index": "1", "is_relevant": "True", "confidence": "8.5"}, {"index": 0, "is_relevant": True, "confidence": None}]
+        verdicts = verdicts_from_response(raw, 2, 2)
+        self.assertEqual(verdicts[1]["confidence"], 8.5)
+        self.assertIs(verdicts[1]["is_relevant"], True)
+        self.assertEqual(verdicts[0]["confidence"], 0.0)
+
+    def test_only_true_counts_as_relevant(self):
+        for value in ("false", "False", "no", "0", "", 1, None):
+            with self.subTest(is_relevant=value):
+                verdicts = verdicts_from_response([verdict(0, relevant=value)], 1, 1)
+                self.assertIs(verdicts[0]["is_relevant"], False)
+                self.assertIsNone(verdicts[0]["rank"])
+
+    def test_malformed_entries_are_dropped(self):
+        raw = ["nonsense", None, {"index": "x", "is_relevant": True}, {"index": 0, "confidence": "high", "is_relevant": True}, {"is_relevant": True}]
+        verdicts = verdicts_from_response(raw, 1, 1)
+        self.assertFalse(verdicts[0]["judged"])
+        self.assertIsNone(verdicts[0]["rank"])
+
+    def test_indices_outside_the_batch_stay_rejected(self):
+        raw = [verdict(-1), verdict(2), verdict(5)]
+        verdicts = verdicts_from_response(raw, 4, 2)  # Items 2 and 3 were cut at MAX_TRIAGE_ITEMS
+        self.assertFalse(any(v["judged"] for v in verdicts))
+        self.assertFalse(any(v["is_relevant"] for v in verdicts))
+
+    def test_empty_or_missing_answer(self):
+        self.assertEqual(verdicts_from_response(None, 2, 2), [rejected_verdict("Not judged by triage")] * 2)
+        self.assertEqual(verdicts_from_response([], 0, 0), [])
+
+
+class TestShortlistTriaged(unittest.TestCase):
+    def setUp(self):
+        self.results = ["a", "b", "c", "d"]
+        raw = [verdict(0, confidence=6), verdict(1, confidence=9), verdict(2, confidence=5), verdict(3, relevant=False, confidence=9)]
+        self.verdicts = verdicts_from_response(raw, 4, 4)
+
+    def test_best_rank_first_above_min_confidence(self):
+        shortlist = shortlist_triaged(self.results, self.verdicts, limit=5)
+        self.assertEqual([res for res, _ in shortlist], ["b", "a"])
+
+    def test_limit(self):
+        self.assertEqual([res for res, _ in shortlist_triaged(self.results, self.verdicts, limit=1)], ["b"])
+        self.assertEqual(shortlist_triaged(self.results, self.verdicts, limit=0), [])
+        self.assertEqual(shortlist_triaged(self.results, self.verdicts, limit=-2), [])
+
+    def test_min_confidence(self):
+        shortlist = shortlist_triaged(self.results, self.verdicts, limit=5, min_confidence=5)
+        self.assertEqual([res for res, _ in shortlist], ["b", "a", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
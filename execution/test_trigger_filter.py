@@ -0,0 +1,94 @@
+import unittest
+import uuid
+from unittest import mock
+
+import url_canon
+from local_supabase import LocalSupabase
+from trigger_filter import TriggerDedupFilter, TriggerDedupIndex, load_trigger_dedup_index, source_url_keys
+from url_canon import normalize_url, remember_redirect
+
+COMPANIES = [str(uuid.UUID(int=i + 1)) for i in range(50)]
+
+
+def build_index(triggers_per_company=5):
+    index = TriggerDedupIndex()
+    for cid in COMPANIES:
+        for j in range(triggers_per_company):
+            index.add(cid, f"https://news.example.com/{cid[-6:]}/story-{j}?utm_source=x")
+    return index
+
+
+class TestTriggerDedupFilter(unittest.TestCase):
+    def test_url_variants_hit(self):
+        cid = COMPANIES[0]
+        f = build_index().filter_for([cid])
+        self.assertTrue(f.might_contain(cid, f"http://www.news.example.com/{cid[-6:]}/story-3/"))
+        self.assertFalse(f.might_contain(cid, f"https://news.example.com/{cid[-6:]}/story-99"))
+
+    def test_other_companies_are_unknown_not_clean(self):
+        f = build_index().filter_for([COMPANIES[0]])
+        self.assertTrue(f.might_contain(COMPANIES[1], "https://anything.example.com/x"))
+
+    def test_covered_company_without_triggers_is_clean(self):
+        f = TriggerDedupIndex().filter_for(["c-new"])
+        self.assertTrue(f.covers("c-new"))
+        self.assertFalse(f.might_contain("c-new", "https://a.example.com/story"))
+
+    def test_bytes_round_trip(self):
+        f = build_index().filter_for(COMPANIES[:25])
+        g = TriggerDedupFilter.from_bytes(f.to_bytes())
+        self.assertEqual(len(g), 25 * 5)
+        self.assertEqual(g.company_ids, f.company_ids)
+        cid = COMPANIES[7]
+        self.assertTrue(g.might_contain(cid, f"https://news.example.com/{cid[-6:]}/story-0"))
+        self.assertFalse(g.might_contain(cid, f"https://news.example.com/{cid[-6:]}/story-9"))
+
+
+class TestWarmWorkerAgreesWithOrchestrator(unittest.TestCase):
+    """The orchestrator builds the filter with an empty redirect memo; a warm worker has one."""
+    def setUp(self):
+        url_canon._redirect_memo.clear()
+
+    def tearDown(self):
+        url_canon._redirect_memo.clear()
+
+    def test_filter_hit_survives_a_learned_redirect(self):
+        cid, url = COMPANIES[0], "https://feedproxy.google.com/~r/acme/launch"
+        index = TriggerDedupIndex()
+        index.add(cid, normalize_url(url))  # trigger_dedup.source_url as written
+        shipped = index.filter_for([cid]).to_bytes()
+
+        remember_redirect(url, "https://acme.com/press/launch")  # Warm worker
+        f = TriggerDedupFilter.from_bytes(shipped)
+        self.assertTrue(f.might_contain(cid, url))
+
+    def test_query_keys_include_the_stored_spelling(self):
+        url = "https://bit.ly/3abc?utm_source=li"
+        remember_redirect(url, "https://acme.com/news/series-b")
+        self.assertEqual(source_url_keys(url), [normalize_url(url), url])  # Raw rows from before normalization
+
+    def test_stored_row_is_found_by_a_warm_worker(self):
+        db = LocalSupabase()
+        cid, url = COMPANIES[0], "https://bit.ly/3abc"
+        db.table("trigger_dedup").insert({"company_id": cid, "source_url": normalize_url(url)}).execute()
+        remember_redirect(url, "https://acme.com/news/series-b")
+        rows = db.table("trigger_dedup").select("id").eq("company_id", cid).in_("source_url", source_url_keys(url)).execute().data
+        self.assertEqual(len(rows), 1)
+
+
+class TestLoader(unittest.TestCase):
+    def test_loader_chunks_and_pages(self):
+        db = LocalSupabase()
+        rows = [{"company_id": cid, "source_url": f"https://x.example.com/{cid}/{j}"} for cid in COMPANIES for j in range(4)]
+        db.table("trigger_dedup").insert(rows).execute()
+        db.reset_counters()
+        with mock.patch("trigger_filter.DEDUP_LOAD_CHUNK", 40), mock.patch("trigger_filter.DEDUP_LOAD_PAGE", 64):
+            index = load_trigger_dedup_index(db, COMPANIES)
+        self.assertEqual(len(index), len(rows))
+        self.assertEqual(db.round_trips, 3 + 1)  # 160 rows in 64-row pages, then the 40 rows of the second chunk
+        cid = COMPANIES[45]
+        self.assertTrue(index.filter_for([cid]).might_contain(cid, f"https://x.example.com/{cid}/3"))
+
+
+if __name__ == '__main__':
+    unittest.main()
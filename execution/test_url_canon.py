@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import url_canon
+from article_cache import ArticleCache
+from date_extractor import DateMatch, published_date_for, remember_published_date
+from url_canon import canonicalize_url, is_redirect_host, normalize_url, remember_redirect, resolve_redirect
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_variants_collapse(self):
+        expected = "https://example.com/news/story"
+        for variant in (
+            "http://www.example.com/news/story/",
+            "https://m.example.com/news/story?utm_source=x&utm_medium=y",
+            "example.com/news/story#comments",
+            "https://example.com/news/amp/story",
+            "https://www.google.com/amp/s/example.com/news/story",
+            "https://example-com.cdn.ampproject.org/c/s/example.com/news/story",
+            "https://example.com//news/story?fbclid=abc",
+        ):
+            self.assertEqual(normalize_url(variant), expected, variant)
+
+    def test_meaningful_query_is_kept_and_sorted(self):
+        self.assertEqual(normalize_url("https://example.com/a?id=2&page=1&gclid=z"), "https://example.com/a?id=2&page=1")
+        self.assertEqual(normalize_url("https://example.com/a?page=1&id=2"), "https://example.com/a?id=2&page=1")
+
+    def test_amp_html_and_ports(self):
+        self.assertEqual(normalize_url("https://example.com/story.amp.html"), "https://example.com/story.html")
+        self.assertEqual(normalize_url("http://example.com:8080/a"), "https://example.com:8080/a")
+
+    def test_non_web_and_empty(self):
+        self.assertEqual(normalize_url(""), "")
+        self.assertEqual(normalize_url(None), "")
+
+    def test_redirect_hosts(self):
+        self.assertTrue(is_redirect_host("https://bit.ly/abc"))
+        self.assertFalse(is_redirect_host("https://example.com/abc"))
+
+
+class TestRedirectMemo(unittest.TestCase):
+    def setUp(self):
+        url_canon._redirect_memo.clear()
+
+    def tearDown(self):
+        url_canon._redirect_memo.clear()
+
+    def test_canonicalize_follows_memo_but_normalize_does_not(self):
+        remember_redirect("https://bit.ly/abc", "https://www.example.com/news/story?utm_source=t")
+        self.assertEqual(canonicalize_url("http://bit.ly/abc/"), "https://example.com/news/story")
+        self.assertEqual(normalize_url("http://bit.ly/abc/"), "https://bit.ly/abc")
+
+    def test_redirect_to_homepage_is_ignored(self):
+        remember_redirect("https://example.com/gone", "https://example.com/")
+        self.assertEqual(canonicalize_url("https://example.com/gone"), "https://example.com/gone")
+
+    def test_resolve_redirect_uses_the_pooled_client(self):
+        heads = []
+
+        def head(url, **kwargs):
+            heads.append(url)
+            return SimpleNamespace(url="https://www.example.com/news/story")
+
+        with mock.patch("http_pool.get_http_client", lambda: SimpleNamespace(head=head)):
+            self.assertEqual(resolve_redirect("https://bit.ly/abc"), "https://example.com/news/story")
+            self.assertEqual(resolve_redirect("https://example.com/other"), "https://example.com/other")
+        self.assertEqual(heads, ["https://bit.ly/abc"])  # Non-redirect hosts make no request
+        self.assertEqual(canonicalize_url("https://bit.ly/abc"), "https://example.com/news/story")
+
+
+class TestStoredKeysIgnoreMemo(unittest.TestCase):
+    """Keys written by a warm container must be found by a fresh one (empty memo)."""
+    def setUp(self):
+        url_canon._redirect_memo.clear()
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        url_canon._redirect_memo.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_article_cache_round_trip_across_containers(self):
+        url = "https://feedproxy.google.com/~r/acme/news/123"
+        # Warm container: the fetch learned the redirect before caching, as _extract_article_free does
+        remember_redirect(url, "https://acme.com/news/acme-raises-series-b")
+        ArticleCache(self.root).put(url, "Acme raised a Series B.", used_apify=True)
+
+        url_canon._redirect_memo.clear()  # Fresh container
+        entry = ArticleCache(self.root).get(url)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry["text"], "Acme raised a Series B.")
+
+    def test_published_date_memo_ignores_redirects(self):
+        from datetime import datetime
+        url = "https://bit.ly/xyz"
+        match = DateMatch(datetime(2026, 10, 1), "2026-10-01", 0.95, "meta")
+        remember_redirect(url, "https://acme.com/press/launch")
+        remember_published_date(url, match)
+        url_canon._redirect_memo.clear()
+        self.assertEqual(published_date_for(url), match)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Triage verdicts — the pure half of triage_relevance_batch.
+
+The monitor sends every candidate for a company to one gpt-4o-mini call and gets
+back {"verdicts": [{"index", "is_relevant", "confidence", ...}]}. This module
+turns that answer into one verdict per input item and picks the shortlist that
+goes on to deep analysis:
+
+    verdicts_from_response  validate indices/confidence, reject anything not judged,
+                            rank approved items by confidence (ties keep search order)
+    shortlist_triaged       top `limit` approved pairs above min_confidence
+
+Kept free of the OpenAI / Supabase imports so it can be tested on its own.
+"""
+
+
+def rejected_verdict(reason: str) -> dict:
+    """Verdict for an item the model never looked at (judged=False)."""
+    return {"is_relevant": False, "confidence": 0, "rejection_reason": reason, "rank": None, "judged": False}
+
+
+def verdicts_from_response(raw: list, n_items: int, batch_size: int) -> list:
+    """
+    One verdict per input item, in input order, from the model's raw verdict list.
+    Entries with a bad index or confidence are dropped; indices at or beyond
+    batch_size (items that were never sent) stay rejected.
+    """
+    verdicts = [rejected_verdict("Not judged by triage") for _ in range(n_items)]
+    for v in raw or []:
+        if not isinstance(v, dict):
+            continue
+        try:
+            idx = int(v.get("index"))
+            confidence = float(v.get("confidence") or 0)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < min(batch_size, n_items):
+            v["confidence"] = confidence
+            relevant = v.get("is_relevant")
+            v["is_relevant"] = relevant is True or (isinstance(relevant, str) and relevant.strip().lower() == "true")
+            v["rank"] = None
+            v["judged"] = True
+            verdicts[idx] = v
+
+    # Rank approved items by confidence (stable: ties keep search order)
+    approved = sorted(
+        (i for i, v in enumerate(verdicts) if v.get("is_relevant")),
+        key=lambda i: -verdicts[i].get("confidence", 0)
+    )
+    for rank, i in enumerate(approved, start=1):
+        verdicts[i]["rank"] = rank
+    return verdicts
+
+
+def shortlist_triaged(results: list, verdicts: list, limit: int, min_confidence: int = 6) -> list:
+    """Top `limit` (result, verdict) pairs that passed triage, best rank first."""
+    passed = [
+        (res, v) for res, v in zip(results, verdicts)
+        if v.get("is_relevant") and v.get("confidence", 0) >= min_confidence
+    ]
+    passed.sort(key=lambda pair: pair[1]["rank"])
+    return passed[:max(0, limit)]
@@ -0,0 +1,134 @@
+"""
+Trigger Dedup Filter — batch-wide membership over trigger_dedup.
+
+Every confirmed trigger (and every context-anchor signal) used to ask Supabase
+whether (company_id, source_url) had already triggered, and only after the
+article was fetched and deep-analyzed. run_monitoring_scan now loads the
+batch's trigger_dedup rows once and builds a sorted array of 64-bit keys:
+
+    key = blake2b(company_id + "\\n" + normalize_url(source_url), 8 bytes)
+
+normalize_url is memo-free, so the orchestrator and every warm worker compute the
+same key for the same URL (trigger_dedup.source_url is written the same way).
+
+Lookups are a bisect (8 bytes per row, ~80 KB for 10k triggers). The filter
+ships to each spawned worker as bytes (only that worker's companies), so
+already-triggered candidates are dropped before extraction and triage. A hit is
+only a hint: the trigger_dedup query stays the authoritative confirmation. A miss
+is definitive for everything triggered before the batch started (companies are
+claimed, so no other scan adds rows for them mid-batch).
+"""
+import hashlib
+from array import array
+from bisect import bisect_left
+
+from url_canon import normalize_url
+
+
+DEDUP_LOAD_CHUNK = 200   # company ids per IN (...) query
+DEDUP_LOAD_PAGE = 1000   # PostgREST row cap per request
+
+
+def source_url_keys(url: str) -> list:
+    """
+    source_url spellings a trigger_dedup row for `url` may carry: the normalized URL
+    (what is written now) and the raw URL (rows written before normalization).
+    """
+    return [k for k in dict.fromkeys((normalize_url(url), url)) if k]
+
+
+def _key(company_id, url: str) -> int:
+    digest = hashlib.blake2b(f"{company_id}\n{normalize_url(url or '')}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class TriggerDedupFilter:
+    """Immutable sorted set of (company_id, normalized source_url) keys."""
+    def __init__(self, keys=()):
+        self._keys = array("Q", sorted(set(keys)))
+        # Companies whose rows were loaded; a company outside this set is "unknown", not "clean"
+        self.company_ids = frozenset()
+
+    @classmethod
+    def build(cls, pairs, company_ids=()) -> "TriggerDedupFilter":
+        """From (company_id, source_url) pairs; company_ids lists every company the rows cover."""
+        f = cls(_key(cid, url) for cid, url in pairs)
+        f.company_ids = frozenset(str(c) for c in company_ids)
+        return f
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def covers(self, company_id) -> bool:
+        return str(company_id) in self.company_ids
+
+    def might_contain(self, company_id, url: str) -> bool:
+        """False = never triggered (as of load). True = check trigger_dedup. Unknown companies are True."""
+        if not self.covers(company_id):
+            return True
+        k = _key(company_id, url)
+        i = bisect_left(self._keys, k)
+        return i < len(self._keys) and self._keys[i] == k
+
+    # ---------------- shipping ----------------
+
+    def to_bytes(self) -> bytes:
+        """Compact wire form for spawn arguments: covered company ids, then the raw key array."""
+        header = "\n".join(sorted(self.company_ids)).encode()
+        return len(header).to_bytes(4, "big") + header + self._keys.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TriggerDedupFilter":
+        n = int.from_bytes(data[:4], "big")
+        header = data[4:4 + n].decode()
+        f = cls()
+        f._keys = array("Q")
+        f._keys.frombytes(data[4 + n:])
+        f.company_ids = frozenset(header.split("\n")) if header else frozenset()
+        return f
+
+
+class TriggerDedupIndex:
+    """
+    Batch-side builder: keeps keys grouped per company so each worker gets a
+    filter with only its own companies' rows.
+    """
+    def __init__(self):
+        self._by_company = {}
+
+    def add(self, company_id, url: str) -> None:
+        self._by_company.setdefault(str(company_id), []).append(_key(company_id, url))
+
+    def filter_for(self, company_ids) -> TriggerDedupFilter:
+        ids = [str(c) for c in company_ids]
+        f = TriggerDedupFilter(k for cid in ids for k in self._by_company.get(cid, ()))
+        f.company_ids = frozenset(ids)
+        return f
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._by_company.values())
+
+
+def load_trigger_dedup_index(supabase, company_ids: list) -> TriggerDedupIndex:
+    """
+    trigger_dedup rows for the batch's companies, chunked by company and paged.
+    Raises on query failure so callers fall back to per-URL checks.
+    """
+    index = TriggerDedupIndex()
+    ids = [c for c in company_ids if c]
+    for start in range(0, len(ids), DEDUP_LOAD_CHUNK):
+        chunk = ids[start:start + DEDUP_LOAD_CHUNK]
+        for offset in range(0, 1_000_000, DEDUP_LOAD_PAGE):
+            rows = (
+                supabase.table("trigger_dedup")
+                .select("company_id, source_url")
+                .in_("company_id", chunk)
+                .order("id")
+                .range(offset, offset + DEDUP_LOAD_PAGE - 1)
+                .execute()
+            ).data or []
+            for row in rows:
+                index.add(row["company_id"], row.get("source_url"))
+            if len(rows) < DEDUP_LOAD_PAGE:
+                break
+    return index
@@ -0,0 +1,175 @@
+"""
+URL Canonicalization — one spelling per article.
+
+The same story reaches the monitor as `?utm_source=...`, AMP (`/amp/`,
+`google.com/amp/s/...`, `*.cdn.ampproject.org`), `m.` / `www.` hosts,
+trailing slashes and http vs https. Two functions collapse those variants:
+
+    normalize_url     pure string rules, identical in every container. Every key
+                      that is stored or shared (article cache, search fingerprint,
+                      company_seen_urls, trigger_dedup + its filter, published
+                      dates, validator memo) uses this.
+    canonicalize_url  normalize_url plus this container's redirect memo. Only for
+                      comparing URLs within one scan (merging scout results that
+                      reach the same article through a shortener).
+
+Redirects (shorteners, feed proxies) and publisher canonical links can't be
+derived from the string alone. Once a fetch learns the real target,
+remember_redirect() memoizes it for the life of the container; a fresh
+container has an empty memo, which is why stored keys never depend on it.
+"""
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Query params that never change the document
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "mkt_tok", "ref", "ref_src", "ref_url", "referrer", "cmpid", "ocid", "_ga", "_gl",
+    "spm", "sharesource", "smid", "sr_share", "icid", "ito", "amp",
+    "outputtype", "__twitter_impression", "taid", "tpcc",
+}
+TRACKING_PREFIXES = ("utm_", "mc_", "pk_", "hsa_", "vero_", "_hs")
+
+# Host prefixes that serve the same document as the bare domain
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.", "www2.")
+
+# Shortener / proxy hosts whose target is only known after following the redirect
+REDIRECT_HOSTS = {
+    "bit.ly", "t.co", "lnkd.in", "ow.ly", "buff.ly", "tinyurl.com", "goo.gl",
+    "feedproxy.google.com", "feeds.feedburner.com", "trib.al", "dlvr.it", "apple.news",
+}
+
+_AMP_CACHE_RE = re.compile(r"^/(?:c/)?(?:s/)?(.+)$")
+_AMP_PATH_RE = re.compile(r"/amp(?=/|$)", re.IGNORECASE)
+_MULTI_SLASH_RE = re.compile(r"/{2,}")
+
+MAX_REDIRECT_MEMO = 20000
+NORMALIZE_CACHE_SIZE = 65536  # normalize_url is pure: repeat spellings skip the parse
+_redirect_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _unwrap_amp_cache(host: str, path: str):
+    """google.com/amp/s/<url> and <x>.cdn.ampproject.org/c/s/<url> -> (host, path) of the publisher."""
+    inner = None
+    if host.endswith("google.com") and path.startswith("/amp/"):
+        inner = path[len("/amp/"):]
+    elif host.endswith(".cdn.ampproject.org"):
+        m = _AMP_CACHE_RE.match(path)
+        inner = m.group(1) if m else None
+    if not inner:
+        return host, path
+    if inner.startswith("s/"):
+        inner = inner[2:]
+    inner_host, _, inner_path = inner.partition("/")
+    return inner_host.lower(), "/" + inner_path
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_url(url: str) -> str:
+    """
+    Deterministic key for `url`: https, lowercase host without www./m./amp.,
+    AMP wrappers removed, tracking params and fragment dropped, remaining
+    query sorted, no trailing slash.
+    """
+    raw = (url or "").strip()
+    if not raw:
+        return ""
+    if raw.startswith("//"):
+        raw = "https:" + raw
+    elif "://" not in raw:
+        raw = "https://" + raw
+    try:
+        parts = urlsplit(raw)
+        port = parts.port
+    except ValueError:
+        return raw
+
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return raw
+    host = (parts.hostname or "").lower().rstrip(".")
+    path = parts.path or "/"
+
+    host, path = _unwrap_amp_cache(host, path)
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    # AMP path variants: /amp/, trailing /amp, .amp.html
+    path = _AMP_PATH_RE.sub("", path)
+    if path.endswith(".amp.html"):
+        path = path[:-len(".amp.html")] + ".html"
+    path = _MULTI_SLASH_RE.sub("/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    path = path or "/"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    normalize_url(url), or the target this container learned it redirects to.
+    Varies between containers: never use it for a stored or shared key.
+    """
+    key = normalize_url(url)
+    if not key:
+        return key
+    with _memo_lock:
+        target = _redirect_memo.get(key)
+        if target:
+            _redirect_memo.move_to_end(key)
+            return target
+    return key
+
+
+def remember_redirect(source_url: str, target_url: str) -> None:
+    """Memoize that `source_url` resolves to `target_url` (redirect or rel=canonical)."""
+    source, target = normalize_url(source_url), canonicalize_url(target_url)
+    if not source or not target or source == target:
+        return
+    if urlsplit(target).path in ("", "/"):
+        return  # Redirect/canonical to a homepage is a soft 404, not the article
+    with _memo_lock:
+        _redirect_memo[source] = target
+        _redirect_memo.move_to_end(source)
+        while len(_redirect_memo) > MAX_REDIRECT_MEMO:
+            _redirect_memo.popitem(last=False)
+
+
+def is_redirect_host(url: str) -> bool:
+    try:
+        host = (urlsplit(normalize_url(url)).hostname or "")
+    except ValueError:
+        return False
+    return host in REDIRECT_HOSTS
+
+
+def resolve_redirect(url: str, timeout: int = 5) -> str:
+    """
+    Canonical target of a shortener / feed-proxy URL, following redirects once
+    and memoizing the answer. Non-redirect hosts are canonicalized without I/O.
+    """
+    key = canonicalize_url(url)
+    if not is_redirect_host(key):
+        return key
+    try:
+        from http_pool import get_http_client
+        resp = get_http_client().head(url, timeout=timeout)
+        if resp.url and str(resp.url) != url:
+            remember_redirect(url, str(resp.url))
+    except Exception as e:
+        print(f"      ⚠️ Redirect resolution failed for {url[:60]}: {e}")
+    return canonicalize_url(url)
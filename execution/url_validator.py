@@ -0,0 +1,210 @@
+"""
+Compiled Article URL Validator — the rules behind is_valid_article_url, built once.
+
+is_valid_article_url runs on every search and scout result of every scan (and on
+bulk URL lists during sourcing). The original implementation rebuilt its domain
+and pattern lists on every call and scanned them linearly. ArticleUrlValidator
+compiles each rule family once:
+
+    URL split                     string slicing for plain http(s) URLs,
+                                  urlparse only for unusual shapes
+    blocked / trusted domains     one alternation regex each (same substring
+                                  semantics as `any(d in domain ...)`)
+    generic landing pages         one end-anchored regex
+    financial noise, portfolio    one regex each (fast reject; the list is only
+                                  walked to name the matching pattern)
+    company slug                  memoized per company name
+    verdicts                      LRU-memoized per (normalize_url(url), company):
+                                  tracking-param / AMP / www. variants of one
+                                  article share a slot
+
+URLs are judged in their normalized form (url_canon.normalize_url, memo-free),
+so the verdict is a function of the memo key. Verdicts and rejection reasons are
+the original function's on that form; see test_url_validator.py for the parity
+check and the cases where normalizing first changes the verdict.
+"""
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from url_canon import normalize_url
+
+
+# BLOCK DIRECTORY SITES (Always Reject) — static profiles, not news
+BLOCKED_DOMAINS = (
+    'zoominfo.com', 'apollo.io', 'crunchbase.com', 'pitchbook.com',
+    'clutch.co', 'upcity.com', 'yelp.com', 'glassdoor.com',
+    'rocketreach.co', 'lusha.com', 'seamless.ai', 'signalhire.com',
+    'dnb.com', 'owler.com', 'g2.com', 'capterra.com', 'trustpilot.com',
+    'google.com', 'bing.com', 'yahoo.com',  # Search results themselves
+    'facebook.com', 'twitter.com', 'instagram.com', 'tiktok.com', 'youtube.com'
+)
+
+# Known valid third-party sources (allow these even if path looks generic)
+TRUSTED_SOURCES = (
+    'prnewswire.com', 'businesswire.com', 'globenewswire.com',
+    'linkedin.com', 'bloomberg.com', 'reuters.com', 'forbes.com',
+    'adweek.com', 'adage.com', 'marketingweek.com', 'thedrum.com',
+    'campaignlive.com', 'prweek.com'
+)
+
+# Generic landing page patterns (reject when the path ends with one)
+GENERIC_PATTERNS = (
+    '/press-releases', '/press-release', '/pressroom', '/press-room',
+    '/news', '/newsroom', '/news-room', '/media', '/media-center',
+    '/about-us', '/about', '/contact', '/team', '/blog',
+    '/articles', '/resources', '/insights',
+    '/careers', '/jobs', '/opportunities', '/join-us', '/working-at'
+)
+
+# Case studies / portfolio on the company's own site are evergreen, not news.
+OWN_SITE_PORTFOLIO_PATTERNS = (
+    '/case-studies', '/case-study', '/portfolio', '/our-work',
+    '/work', '/projects', '/clients', '/testimonials'
+)
+
+# Financial noise keywords in the URL path (earnings, stock, q1-results)
+FINANCIAL_KEYWORDS = ('earnings', 'quarterly-results', 'stock-price', 'dividend', 'investor-relations', '10-k', '10-q')
+
+GENERIC_PAGE_SEGMENTS = {'index', 'home', 'main'}
+
+
+_UNSAFE_CHARS = re.compile(r"[\t\r\n;\\]")
+
+
+def _split_netloc_path(url: str) -> tuple:
+    """
+    (netloc, path) of an already-lowercased URL, as urlparse would return them.
+    Plain http(s) URLs take a string-slicing fast path; anything unusual
+    (tabs/newlines, ';' params, backslashes, other schemes) goes through urlparse.
+    """
+    if url.startswith("https://"):
+        rest = url[8:]
+    elif url.startswith("http://"):
+        rest = url[7:]
+    else:
+        rest = None
+    if rest is None or _UNSAFE_CHARS.search(url):
+        parsed = urlparse(url)
+        return parsed.netloc, parsed.path
+    cut = len(rest)
+    for ch in "/?#":
+        i = rest.find(ch)
+        if i != -1 and i < cut:
+            cut = i
+    netloc, tail = rest[:cut], rest[cut:]
+    end = len(tail)
+    for ch in "?#":
+        i = tail.find(ch)
+        if i != -1 and i < end:
+            end = i
+    return netloc, tail[:end]
+
+
+def _alternation(words, suffix: str = "") -> "re.Pattern":
+    # Longest first so overlapping alternatives resolve to the most specific one
+    ordered = sorted(set(words), key=len, reverse=True)
+    return re.compile("(?:" + "|".join(re.escape(w) for w in ordered) + ")" + suffix)
+
+
+class ArticleUrlValidator:
+    """
+    Precompiled is_valid_article_url. Thread-safe; one instance per process
+    (see get_url_validator) is enough.
+
+    validate(url, company_name) -> (is_valid: bool, rejection_reason: str or None)
+    validate_many(urls, company_name) -> list of the same tuples
+    """
+    def __init__(self, memo_size: int = 100_000):
+        self._blocked_re = _alternation(BLOCKED_DOMAINS)
+        self._trusted_re = _alternation(TRUSTED_SOURCES)
+        self._generic_re = _alternation(GENERIC_PATTERNS, suffix="$")
+        self._financial_re = _alternation(FINANCIAL_KEYWORDS)
+        self._portfolio_re = _alternation(OWN_SITE_PORTFOLIO_PATTERNS)
+        self._memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def company_slug(company_name: str) -> str:
+        return company_name.lower().replace(' ', '').replace('-', '').replace('.', '')
+
+    def validate(self, url: str, company_name: str) -> tuple:
+        if not url:
+            return (False, "No URL provided")
+        url = normalize_url(url) or url
+        key = (url, company_name)
+        with self._lock:
+            verdict = self._memo.get(key)
+            if verdict is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return verdict
+            self.misses += 1
+        verdict = self._evaluate(url, company_name)
+        with self._lock:
+            self._memo[key] = verdict
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return verdict
+
+    def validate_many(self, urls, company_name: str) -> list:
+        return [self.validate(url, company_name) for url in urls]
+
+    def _evaluate(self, url: str, company_name: str) -> tuple:
+        domain, path = _split_netloc_path(url.lower())
+        path = path.rstrip('/')
+
+        if self._blocked_re.search(domain):
+            return (False, f"Directory/Database domain rejected: {domain}")
+
+        is_third_party = self._trusted_re.search(domain) is not None
+
+        # Ends with a generic pattern (no specific article after it)
+        m = self._generic_re.search(path)
+        if m:
+            return (False, f"Generic landing page detected: {m.group(0)}")
+
+        if '/jobs/' in path or '/careers/' in path:
+            return (False, "Job posting page detected")
+
+        if self._financial_re.search(path):
+            return (False, "Financial/Stock news rejected")
+
+        # Company's own domain
+        company_slug = self.company_slug(company_name)
+        domain_slug = domain.replace('www.', '').replace('.com', '').replace('.org', '').replace('-', '')
+
+        if company_slug in domain_slug and not is_third_party:
+            if self._portfolio_re.search(path):
+                # Report the first pattern in rule order, as the original loop did
+                pattern = next(p for p in OWN_SITE_PORTFOLIO_PATTERNS if p in path)
+                return (False, f"Company's own portfolio/case-study page: {pattern}")
+
+            # Only valid if it's a specific article
+            path_parts = [p for p in path.split('/') if p]
+            if len(path_parts) < 2:
+                return (False, "Company's own website without specific article path")
+            last_segment = path_parts[-1]
+            if len(last_segment) < 10 or last_segment in GENERIC_PAGE_SEGMENTS:
+                return (False, "Company's own website - appears to be generic page")
+
+        return (True, None)
+
+
+_validator = None
+_validator_lock = threading.Lock()
+
+
+def get_url_validator() -> ArticleUrlValidator:
+    """Process-wide validator instance."""
+    global _validator
+    with _validator_lock:
+        if _validator is None:
+            _validator = ArticleUrlValidator()
+        return _validator
@@ -0,0 +1,5 @@
+-- Article content cache telemetry.
+-- Per-scan hit/miss counters for the shared article cache consulted by extract_article_content.
+
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS article_cache_hits INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS article_cache_misses INT DEFAULT 0;
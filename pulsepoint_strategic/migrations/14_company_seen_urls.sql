@@ -0,0 +1,17 @@
+-- Per-URL incremental change detection.
+-- Every URL the monitor has judged for a company, keyed on its canonical form.
+-- Scans skip URLs with a verdict younger than SEEN_URL_TTL_DAYS (unless force_rescan),
+-- so one new result no longer forces re-triage of the whole result set.
+
+CREATE TABLE IF NOT EXISTS company_seen_urls (
+  id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+  company_id UUID REFERENCES triggered_companies(id) ON DELETE CASCADE,
+  url_canonical TEXT NOT NULL,
+  verdict TEXT NOT NULL,          -- triage_rejected | stale | deep_rejected | low_confidence | duplicate | triggered
+  confidence FLOAT DEFAULT 0,
+  first_seen_at TIMESTAMPTZ DEFAULT now(),
+  last_seen_at TIMESTAMPTZ DEFAULT now(),
+  UNIQUE(company_id, url_canonical)
+);
+
+CREATE INDEX IF NOT EXISTS idx_seen_urls_company_seen ON company_seen_urls(company_id, last_seen_at DESC);
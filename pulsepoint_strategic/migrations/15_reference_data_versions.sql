@@ -0,0 +1,37 @@
+-- Reference data versions.
+-- One row per slow-changing table the monitor caches in process (reference_cache.py).
+-- A statement-level trigger bumps the row on any write, so workers detect changes
+-- with a single SELECT instead of re-reading the tables on every scan.
+
+CREATE TABLE IF NOT EXISTS reference_data_versions (
+  name TEXT PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 1,
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION bump_reference_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO reference_data_versions (name, version, updated_at)
+  VALUES (TG_TABLE_NAME, 1, now())
+  ON CONFLICT (name) DO UPDATE
+    SET version = reference_data_versions.version + 1, updated_at = now();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['client_strategies', 'client_profiles', 'pulsepoint_email_templates']
+  LOOP
+    IF to_regclass('public.' || t) IS NOT NULL THEN
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_reference_version ON public.%I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_reference_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.%I '
+        'FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version()', t);
+      INSERT INTO reference_data_versions (name) VALUES (t) ON CONFLICT (name) DO NOTHING;
+    END IF;
+  END LOOP;
+END $$;
@@ -0,0 +1,69 @@
+-- Server-side due-company selection.
+-- Replaces `select * from triggered_companies where monitoring_status = 'active'` + Python
+-- filtering: frequency thresholds, per-client daily limits and oldest-first rotation run here,
+-- and only the columns the scanner reads come back (no events_history / contact_info JSONB).
+--
+-- Paging is keyset on (client_key, due_rank): pass the last row's client_key / due_rank back
+-- as p_after_client / p_after_rank until a page comes back shorter than p_page_size.
+
+CREATE INDEX IF NOT EXISTS idx_companies_due_rotation
+ON public.triggered_companies (client_context, last_monitored_at ASC NULLS FIRST, id)
+WHERE monitoring_status = 'active';
+
+CREATE OR REPLACE FUNCTION get_due_companies(
+  p_client_limits JSONB DEFAULT '{}'::jsonb,  -- {client_context: daily_scan_limit}
+  p_default_limit INT DEFAULT 50,
+  p_page_size INT DEFAULT 500,
+  p_after_client TEXT DEFAULT NULL,
+  p_after_rank INT DEFAULT 0
+)
+RETURNS TABLE(
+  id UUID,
+  company TEXT,
+  client_context TEXT,
+  website TEXT,
+  industry TEXT,
+  event_title TEXT,
+  user_id TEXT,
+  score_factors JSONB,
+  last_monitored_at TIMESTAMPTZ,
+  monitoring_frequency TEXT,
+  last_search_hash TEXT,
+  client_key TEXT,
+  due_rank INT,
+  due_total INT
+) AS $$
+  WITH due AS (
+    SELECT tc.id, tc.client_context, tc.last_monitored_at,
+           COALESCE(tc.client_context, '') AS client_key
+    FROM public.triggered_companies tc
+    WHERE tc.monitoring_status = 'active'
+      AND (
+        tc.last_monitored_at IS NULL
+        OR tc.last_monitored_at < now() - CASE tc.monitoring_frequency
+             WHEN 'daily' THEN interval '20 hours'
+             WHEN 'biweekly' THEN interval '3 days'
+             ELSE interval '6 days'
+           END
+      )
+  ),
+  ranked AS (
+    SELECT d.*,
+           (row_number() OVER w)::int AS due_rank,
+           (count(*) OVER (PARTITION BY d.client_key))::int AS due_total
+    FROM due d
+    WINDOW w AS (PARTITION BY d.client_key ORDER BY d.last_monitored_at ASC NULLS FIRST, d.id)
+  )
+  -- Wide columns are read only for the selected rows. industry / user_id are not on every
+  -- deployment's schema, so they go through to_jsonb instead of a hard column reference.
+  SELECT r.id, tc.company::text, r.client_context, tc.website, to_jsonb(tc) ->> 'industry',
+         tc.event_title::text, to_jsonb(tc) ->> 'user_id', tc.score_factors::jsonb,
+         r.last_monitored_at, tc.monitoring_frequency, tc.last_search_hash,
+         r.client_key, r.due_rank, r.due_total
+  FROM ranked r
+  JOIN public.triggered_companies tc ON tc.id = r.id
+  WHERE r.due_rank <= COALESCE((p_client_limits ->> r.client_key)::int, p_default_limit)
+    AND (p_after_client IS NULL OR (r.client_key, r.due_rank) > (p_after_client, p_after_rank))
+  ORDER BY r.client_key, r.due_rank
+  LIMIT p_page_size;
+$$ LANGUAGE sql STABLE;
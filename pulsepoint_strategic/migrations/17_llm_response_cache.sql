@@ -0,0 +1,16 @@
+-- LLM response cache.
+-- Shared remote tier for llm_cache.py (enabled with LLM_CACHE_REMOTE=supabase), keyed on
+-- the prompt hash, plus per-scan hit/miss counters (per call site in llm_cache_sites).
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+  key TEXT PRIMARY KEY,           -- sha256 of model, messages, response_format, temperature, variant
+  value TEXT NOT NULL,            -- raw completion text
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at);
+
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_cache_hits INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_cache_misses INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_cache_sites JSONB DEFAULT '{}'::jsonb;
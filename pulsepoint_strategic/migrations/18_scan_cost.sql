@@ -0,0 +1,23 @@
+-- Per-scan cost accounting (scan_budget.py).
+-- Scans are gated on dollars instead of call counts; what each scan actually spent is
+-- persisted here, and client_spend_today() caps the next scan at the client's remaining
+-- daily budget.
+
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS cost_usd NUMERIC(10, 6) DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_cost_usd NUMERIC(10, 6) DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS apify_cost_usd NUMERIC(10, 6) DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_tokens_in INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS llm_tokens_out INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS cost_breakdown JSONB DEFAULT '{}'::jsonb;  -- {site / actor: usd}
+
+CREATE INDEX IF NOT EXISTS idx_scan_log_client_started ON monitor_scan_log(client_context, started_at DESC);
+
+CREATE OR REPLACE FUNCTION client_spend_today(p_client_context TEXT)
+RETURNS NUMERIC
+LANGUAGE sql STABLE
+AS $$
+  SELECT COALESCE(SUM(cost_usd), 0)
+  FROM monitor_scan_log
+  WHERE client_context = p_client_context
+    AND started_at >= date_trunc('day', now());
+$$;
@@ -0,0 +1,7 @@
+-- Speculative article prefetch counters (article_prefetch.py).
+-- started: free-tier downloads that ran (count toward pages_fetched); used: taken by the
+-- analysis loop; discarded: downloaded for candidates triage then rejected.
+
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS prefetch_started INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS prefetch_used INT DEFAULT 0;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS prefetch_discarded INT DEFAULT 0;
@@ -0,0 +1,112 @@
+-- Yield-based due-company priority (due_priority.py is the Python reference).
+-- Same due rules, columns and keyset paging as get_due_companies (migration 16, which it
+-- replaces and drops below), but each client's limit is filled by expected triggers per
+-- dollar instead of oldest-first:
+--
+--   priority = trigger_rate * velocity * staleness / expected_cost
+--     trigger_rate   (triggers + 1) / (scans + 10) over the last p_history_days of monitor_scan_log
+--     velocity       account_signal_baselines.velocity_ratio clamped to [0.5, 3]
+--     staleness      days since last scan / frequency due interval, capped at 3
+--     expected_cost  skip_rate * mean skip cost + (1 - skip_rate) * mean full-scan cost (cost_usd, migration 18)
+--
+-- Starvation guarantee: never-scanned companies and those not scanned for p_max_interval_days
+-- rank ahead of every scored company, oldest first.
+
+CREATE INDEX IF NOT EXISTS idx_scan_log_company_started ON monitor_scan_log(company_id, started_at DESC);
+
+CREATE OR REPLACE FUNCTION get_prioritized_due_companies(
+  p_client_limits JSONB DEFAULT '{}'::jsonb,  -- {client_context: daily_scan_limit}
+  p_default_limit INT DEFAULT 50,
+  p_page_size INT DEFAULT 500,
+  p_after_client TEXT DEFAULT NULL,
+  p_after_rank INT DEFAULT 0,
+  p_max_interval_days INT DEFAULT 21,
+  p_history_days INT DEFAULT 90
+)
+RETURNS TABLE(
+  id UUID,
+  company TEXT,
+  client_context TEXT,
+  website TEXT,
+  industry TEXT,
+  event_title TEXT,
+  user_id TEXT,
+  score_factors JSONB,
+  last_monitored_at TIMESTAMPTZ,
+  monitoring_frequency TEXT,
+  last_search_hash TEXT,
+  client_key TEXT,
+  due_rank INT,
+  due_total INT,
+  priority FLOAT,
+  starved BOOLEAN
+) AS $$
+  WITH due AS (
+    SELECT tc.id, tc.client_context, tc.last_monitored_at, tc.monitoring_frequency,
+           COALESCE(tc.client_context, '') AS client_key,
+           EXTRACT(EPOCH FROM now() - tc.last_monitored_at) / 86400.0 AS days_since
+    FROM public.triggered_companies tc
+    WHERE tc.monitoring_status = 'active'
+      AND (
+        tc.last_monitored_at IS NULL
+        OR tc.last_monitored_at < now() - CASE tc.monitoring_frequency
+             WHEN 'daily' THEN interval '20 hours'
+             WHEN 'biweekly' THEN interval '3 days'
+             ELSE interval '6 days'
+           END
+      )
+  ),
+  history AS (
+    SELECT l.company_id,
+           count(*) AS scans,
+           count(*) FILTER (WHERE l.trigger_found) AS triggers,
+           count(*) FILTER (WHERE l.status = 'skipped_fingerprint') AS skips,
+           avg(l.cost_usd) FILTER (WHERE l.status = 'success' AND l.cost_usd > 0) AS full_cost,
+           avg(l.cost_usd) FILTER (WHERE l.status = 'skipped_fingerprint' AND l.cost_usd > 0) AS skip_cost
+    FROM monitor_scan_log l
+    WHERE l.company_id IN (SELECT d.id FROM due d)
+      AND l.started_at > now() - make_interval(days => p_history_days)
+    GROUP BY l.company_id
+  ),
+  scored AS (
+    SELECT d.*,
+           (d.last_monitored_at IS NULL OR d.days_since >= p_max_interval_days) AS starved,
+           ((COALESCE(h.triggers, 0) + 1.0) / (COALESCE(h.scans, 0) + 10.0))
+             * LEAST(GREATEST(COALESCE(b.velocity_ratio, 1.0), 0.5), 3.0)
+             * LEAST(COALESCE(d.days_since, 0) / CASE d.monitoring_frequency
+                  WHEN 'daily' THEN 20.0 / 24 WHEN 'biweekly' THEN 3.0 ELSE 6.0 END, 3.0)
+             / GREATEST(0.001,
+                 COALESCE(h.skips::float / NULLIF(h.scans, 0), 0) * COALESCE(h.skip_cost, 0.005)
+                 + (1 - COALESCE(h.skips::float / NULLIF(h.scans, 0), 0)) * COALESCE(h.full_cost, 0.05)
+               ) AS priority
+    FROM due d
+    LEFT JOIN history h ON h.company_id = d.id
+    LEFT JOIN account_signal_baselines b ON b.account_id = d.id AND b.client_id = d.client_context
+  ),
+  ranked AS (
+    SELECT s.*,
+           (row_number() OVER w)::int AS due_rank,
+           (count(*) OVER (PARTITION BY s.client_key))::int AS due_total
+    FROM scored s
+    WINDOW w AS (
+      PARTITION BY s.client_key
+      ORDER BY s.starved DESC,
+               CASE WHEN s.starved THEN s.last_monitored_at END ASC NULLS FIRST,
+               s.priority DESC,
+               s.id
+    )
+  )
+  SELECT r.id, tc.company::text, r.client_context, tc.website, to_jsonb(tc) ->> 'industry',
+         tc.event_title::text, to_jsonb(tc) ->> 'user_id', tc.score_factors::jsonb,
+         r.last_monitored_at, tc.monitoring_frequency, tc.last_search_hash,
+         r.client_key, r.due_rank, r.due_total, r.priority::float, r.starved
+  FROM ranked r
+  JOIN public.triggered_companies tc ON tc.id = r.id
+  WHERE r.due_rank <= COALESCE((p_client_limits ->> r.client_key)::int, p_default_limit)
+    AND (p_after_client IS NULL OR (r.client_key, r.due_rank) > (p_after_client, p_after_rank))
+  ORDER BY r.client_key, r.due_rank
+  LIMIT p_page_size;
+$$ LANGUAGE sql STABLE;
+
+-- Superseded: the monitor only calls get_prioritized_due_companies.
+DROP FUNCTION IF EXISTS get_due_companies(JSONB, INT, INT, TEXT, INT);
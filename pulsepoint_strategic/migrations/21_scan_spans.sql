@@ -0,0 +1,63 @@
+-- Per-stage timing spans (scan_spans.py).
+-- spans: compact per-scan array [{n, t, ms, st, b?, c?, ti?, to?, hit?}]; span_ms: {span name: total ms}.
+-- rollup_scan_spans(day) folds one day of spans into scan_span_daily (p50 / p90 / p99 per
+-- client and span name); the orchestrator rolls up the previous day at the start of each run.
+
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS spans JSONB DEFAULT '[]'::jsonb;
+ALTER TABLE monitor_scan_log ADD COLUMN IF NOT EXISTS span_ms JSONB DEFAULT '{}'::jsonb;
+
+CREATE TABLE IF NOT EXISTS scan_span_daily (
+  day DATE NOT NULL,
+  client_context TEXT NOT NULL,
+  span TEXT NOT NULL,
+  calls INT NOT NULL,
+  errors INT NOT NULL,
+  scans INT NOT NULL,             -- scans with at least one such span
+  p50_ms FLOAT,
+  p90_ms FLOAT,
+  p99_ms FLOAT,
+  max_ms INT,
+  total_ms BIGINT,
+  tokens_in BIGINT,
+  tokens_out BIGINT,
+  bytes BIGINT,
+  PRIMARY KEY (day, client_context, span)
+);
+
+CREATE OR REPLACE FUNCTION rollup_scan_spans(p_day DATE DEFAULT (now() - INTERVAL '1 day')::date)
+RETURNS INT
+LANGUAGE sql
+AS $$
+  WITH rolled AS (
+    INSERT INTO scan_span_daily AS d
+      (day, client_context, span, calls, errors, scans, p50_ms, p90_ms, p99_ms, max_ms, total_ms, tokens_in, tokens_out, bytes)
+    SELECT
+      p_day,
+      COALESCE(l.client_context, 'unknown'),
+      s->>'n',
+      COUNT(*),
+      COUNT(*) FILTER (WHERE s->>'st' = 'error'),
+      COUNT(DISTINCT l.id),
+      percentile_cont(0.5) WITHIN GROUP (ORDER BY (s->>'ms')::int),
+      percentile_cont(0.9) WITHIN GROUP (ORDER BY (s->>'ms')::int),
+      percentile_cont(0.99) WITHIN GROUP (ORDER BY (s->>'ms')::int),
+      MAX((s->>'ms')::int),
+      SUM((s->>'ms')::int),
+      SUM((s->>'ti')::int),
+      SUM((s->>'to')::int),
+      SUM((s->>'b')::bigint)
+    FROM monitor_scan_log l
+    CROSS JOIN LATERAL jsonb_array_elements(l.spans) s
+    WHERE l.started_at >= p_day
+      AND l.started_at < p_day + 1
+      AND s ? 'ms'
+    GROUP BY COALESCE(l.client_context, 'unknown'), s->>'n'
+    ON CONFLICT (day, client_context, span) DO UPDATE SET
+      calls = EXCLUDED.calls, errors = EXCLUDED.errors, scans = EXCLUDED.scans,
+      p50_ms = EXCLUDED.p50_ms, p90_ms = EXCLUDED.p90_ms, p99_ms = EXCLUDED.p99_ms,
+      max_ms = EXCLUDED.max_ms, total_ms = EXCLUDED.total_ms,
+      tokens_in = EXCLUDED.tokens_in, tokens_out = EXCLUDED.tokens_out, bytes = EXCLUDED.bytes
+    RETURNING 1
+  )
+  SELECT COUNT(*)::int FROM rolled;
+$$;
@@ -0,0 +1,80 @@
+-- Fleet-wide circuit breaker state (resilience.SupabaseBreakerState, BREAKER_STATE=supabase).
+-- One row per breaker ("llm", "apify"); times are epoch seconds from the database clock so
+-- containers never compare their own clocks. Each transition is one atomic UPDATE, mirroring
+-- resilience._apply_failure / _apply_probe:
+--   breaker_record_failure  count a failure (restarting the count after p_window_secs); open at
+--                           p_threshold, or at once when the half-open probe failed
+--   breaker_acquire_probe   after p_reset_secs exactly one caller gets the half-open probe
+--                           (leased for p_lease_secs in case that worker dies)
+--   breaker_record_success  the probe succeeded: close
+
+CREATE TABLE IF NOT EXISTS circuit_breakers (
+  name TEXT PRIMARY KEY,
+  state TEXT NOT NULL DEFAULT 'CLOSED',   -- CLOSED | OPEN | HALF_OPEN
+  failures INT NOT NULL DEFAULT 0,
+  window_start DOUBLE PRECISION NOT NULL DEFAULT 0,
+  opened_at DOUBLE PRECISION NOT NULL DEFAULT 0,
+  probe_until DOUBLE PRECISION NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION breaker_record_failure(p_name TEXT, p_threshold INT, p_window_secs DOUBLE PRECISION DEFAULT 0)
+RETURNS TABLE(state TEXT, failures INT, window_start DOUBLE PRECISION, opened_at DOUBLE PRECISION, probe_until DOUBLE PRECISION, opened BOOLEAN)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_now DOUBLE PRECISION := EXTRACT(EPOCH FROM clock_timestamp());
+  v circuit_breakers%ROWTYPE;
+  v_opened BOOLEAN;
+BEGIN
+  INSERT INTO circuit_breakers (name) VALUES (p_name) ON CONFLICT (name) DO NOTHING;
+  SELECT * INTO v FROM circuit_breakers b WHERE b.name = p_name FOR UPDATE;
+
+  IF p_window_secs > 0 AND v_now - v.window_start > p_window_secs THEN
+    v.failures := 0;
+    v.window_start := v_now;
+  END IF;
+  v.failures := v.failures + 1;
+  v_opened := v.state = 'HALF_OPEN' OR (v.state = 'CLOSED' AND v.failures >= p_threshold);
+  IF v_opened THEN
+    v.state := 'OPEN';
+    v.opened_at := v_now;
+    v.probe_until := 0;
+  END IF;
+
+  UPDATE circuit_breakers b
+  SET state = v.state, failures = v.failures, window_start = v.window_start,
+      opened_at = v.opened_at, probe_until = v.probe_until, updated_at = now()
+  WHERE b.name = p_name;
+
+  RETURN QUERY SELECT v.state, v.failures, v.window_start, v.opened_at, v.probe_until, v_opened;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION breaker_acquire_probe(p_name TEXT, p_reset_secs DOUBLE PRECISION, p_lease_secs DOUBLE PRECISION)
+RETURNS BOOLEAN
+LANGUAGE sql
+AS $$
+  WITH probe AS (
+    UPDATE circuit_breakers b
+    SET state = 'HALF_OPEN',
+        probe_until = EXTRACT(EPOCH FROM clock_timestamp()) + p_lease_secs,
+        updated_at = now()
+    WHERE b.name = p_name
+      AND b.state <> 'CLOSED'
+      AND EXTRACT(EPOCH FROM clock_timestamp()) - b.opened_at > p_reset_secs
+      AND b.probe_until <= EXTRACT(EPOCH FROM clock_timestamp())
+    RETURNING 1
+  )
+  SELECT EXISTS (SELECT 1 FROM probe);
+$$;
+
+CREATE OR REPLACE FUNCTION breaker_record_success(p_name TEXT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+  UPDATE circuit_breakers
+  SET state = 'CLOSED', failures = 0, window_start = 0, opened_at = 0, probe_until = 0, updated_at = now()
+  WHERE name = p_name;
+$$;